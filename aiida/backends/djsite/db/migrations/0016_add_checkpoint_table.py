@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name
+"""Add the table of the checkpoints of the processes."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from django.db import migrations, models
+import django.db.models.deletion
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.16'
+DOWN_REVISION = '1.0.15'
+
+
+class Migration(migrations.Migration):
+    """Add the table of the checkpoints of the processes.
+
+    The checkpoints were stored as YAML in an attribute of the node of the process. They are now stored as binary
+    entries in a separate table, such that only the entries that change have to be written. The checkpoints in the
+    attributes are still read, so they are left as they are.
+    """
+
+    dependencies = [
+        ('db', '0015_invalidating_node_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DbCheckpoint',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('key', models.CharField(max_length=255)),
+                ('data', models.BinaryField()),
+                ('dbnode', models.ForeignKey(related_name='dbcheckpoints', to='db.DbNode',
+                                             on_delete=django.db.models.deletion.CASCADE)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='dbcheckpoint',
+            unique_together=set([('dbnode', 'key')]),
+        ),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
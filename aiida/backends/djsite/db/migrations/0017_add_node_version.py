@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name
+"""Add the sequence that is advanced whenever a node is added, changed or deleted."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from django.db import migrations
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+from aiida.backends.sqlalchemy.utils import get_pg_node_version
+
+REVISION = '1.0.17'
+DOWN_REVISION = '1.0.16'
+
+
+class Migration(migrations.Migration):
+    """Add the sequence that is advanced whenever a node is added, changed or deleted.
+
+    The sequence is advanced by a trigger on the node table, such that its value is a version of the whole table that
+    can be read without scanning it, e.g. by the REST API to validate its cached responses.
+    """
+
+    dependencies = [
+        ('db', '0016_add_checkpoint_table'),
+    ]
+
+    operations = [
+        migrations.RunSQL(get_pg_node_version(), reverse_sql="""
+            DROP TRIGGER IF EXISTS autoadvance_node_version ON db_dbnode;
+            DROP FUNCTION IF EXISTS advance_node_version();
+            DROP SEQUENCE IF EXISTS db_dbnode_version_seq;
+        """),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
@@ -11,7 +11,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
-LATEST_MIGRATION = '0015_invalidating_node_hash'
+LATEST_MIGRATION = '0017_add_node_version'
 
 
 def _update_schema_version(version, apps, schema_editor):
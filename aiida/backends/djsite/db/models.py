@@ -1473,6 +1473,19 @@ class DbComment(m.Model):
                                                     self.dbnode.pk, timezone.localtime(self.ctime).strftime("%Y-%m-%d"))
 
 
+class DbCheckpoint(m.Model):
+    """
+    An entry of the checkpoint of a process, see `aiida.work.persistence.AiiDAPersister`.
+    """
+    # Delete the checkpoint if the node is removed
+    dbnode = m.ForeignKey(DbNode, related_name='dbcheckpoints', on_delete=m.CASCADE)
+    key = m.CharField(max_length=255)
+    data = m.BinaryField()
+
+    class Meta:
+        unique_together = (("dbnode", "key"),)
+
+
 @python_2_unicode_compatible
 class DbLog(m.Model):
     # Creation time
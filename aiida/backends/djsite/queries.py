@@ -33,6 +33,26 @@ class DjangoQueryManager(AbstractQueryManager):
 
         return results
 
+    def iter_raw(self, query, batch_size):
+        """Execute a raw SQL statement and iterate over the rows of the result, fetched in batches.
+
+        The rows are fetched from a server side cursor, in a transaction that lasts until the iteration is over.
+
+        :param query: a string containing a raw SQL statement
+        :param batch_size: the number of rows fetched at once
+        :return: an iterator over the rows of the result
+        """
+        from django.db import connection, transaction
+
+        with transaction.atomic():
+            connection.ensure_connection()
+            # Only the cursors of psycopg2 with a name are server side cursors
+            with connection.connection.cursor(name='aiida_iter_raw') as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query)
+                for row in cursor:
+                    yield row
+
     def query_jobcalculations_by_computer_user_state(
             self, state, computer=None, user=None,
             only_computer_user_pairs=False,
@@ -201,7 +221,7 @@ class DjangoQueryManager(AbstractQueryManager):
         from django.db.models import Q
         from aiida.common.utils import grouper
         from aiida.backends.djsite.db import models
-        from aiida.orm.data.structure import (get_formula, get_symbols_string)
+        from aiida.orm.data.structure import get_formula_from_attributes
         from aiida.orm.data.array.bands import BandsData
         from aiida import orm
 
@@ -238,7 +258,7 @@ class DjangoQueryManager(AbstractQueryManager):
             struc_pks = [structure_dict[pk] for pk in pks]
 
             # query for the attributes needed for the structure formula
-            attr_query = Q(key__startswith='kinds') | Q(key__startswith='sites')
+            attr_query = Q(key__startswith='kinds') | Q(key__startswith='sites') | Q(key='site_storage')
             attrs = models.DbAttribute.objects.filter(attr_query,
                                                       dbnode__in=struc_pks).values_list(
                 'dbnode__pk', 'key', 'datatype', 'tval', 'fval',
@@ -273,15 +293,11 @@ class DjangoQueryManager(AbstractQueryManager):
                         if not all([s in all_symbols for s in args.element_only]):
                             continue
 
-                    # build the formula
-                    symbol_dict = {k['name']: get_symbols_string(k['symbols'],
-                                                                 k['weights'])
-                                   for k in deser_data[struc_pk]['kinds']}
+                    # build the formula, the sites are not in the attributes with the 'arrays' site storage
                     try:
-                        symbol_list = [symbol_dict[s['kind_name']]
-                                       for s in deser_data[struc_pk]['sites']]
-                        formula = get_formula(symbol_list,
-                                              mode=args.formulamode)
+                        formula = get_formula_from_attributes(
+                            struc_pk, deser_data[struc_pk]['kinds'], deser_data[struc_pk].get('sites', None),
+                            deser_data[struc_pk].get('site_storage', None), mode=args.formulamode)
                     # If for some reason there is no kind with the name
                     # referenced by the site
                     except KeyError:
@@ -33,6 +33,18 @@ class AbstractQueryManager(object):
         """
         pass
 
+    def iter_raw(self, query, batch_size):
+        """Execute a raw SQL statement and iterate over the rows of the result, fetched in batches.
+
+        Backends override this to fetch the rows from a server side cursor, such that the whole result is never loaded.
+
+        :param query: a string containing a raw SQL statement
+        :param batch_size: the number of rows fetched at once
+        :return: an iterator over the rows of the result
+        """
+        for row in self.raw(query):
+            yield row
+
     def get_duplicate_node_uuids(self):
         """
         Return a list of nodes that have an identical UUID
@@ -231,7 +243,7 @@ class AbstractQueryManager(object):
         from aiida.utils import timezone
         from aiida.orm.querybuilder import QueryBuilder
         from aiida.orm.implementation import Group
-        from aiida.orm.data.structure import (get_formula, get_symbols_string)
+        from aiida.orm.data.structure import SITE_STORAGE_ARRAYS, get_formula_from_attributes
         from aiida.orm.data.array.bands import BandsData
         from aiida.orm.data.structure import StructureData
         from aiida import orm
@@ -266,7 +278,7 @@ class AbstractQueryManager(object):
 
         qb.append(StructureData, tag="sdata", ancestor_of="bdata",
                   # We don't care about the creator of StructureData
-                  project=["id", "attributes.kinds", "attributes.sites"])
+                  project=["id", "attributes.kinds", "attributes.sites", "attributes.site_storage"])
 
         qb.order_by({StructureData: {'ctime': 'desc'}})
 
@@ -275,7 +287,7 @@ class AbstractQueryManager(object):
         entry_list = []
         already_visited_bdata = set()
 
-        for [bid, blabel, bdate, sid, akinds, asites] in list_data.all():
+        for [bid, blabel, bdate, sid, akinds, asites, asite_storage] in list_data.all():
 
             # We process only one StructureData per BandsData.
             # We want to process the closest StructureData to
@@ -302,22 +314,11 @@ class AbstractQueryManager(object):
                     continue
 
             # We want only the StructureData that have attributes
-            if akinds is None or asites is None:
+            if akinds is None or (asites is None and asite_storage != SITE_STORAGE_ARRAYS):
                 continue
 
-            symbol_dict = {}
-            for k in akinds:
-                symbols = k['symbols']
-                weights = k['weights']
-                symbol_dict[k['name']] = get_symbols_string(symbols,
-                                                            weights)
-
             try:
-                symbol_list = []
-                for s in asites:
-                    symbol_list.append(symbol_dict[s['kind_name']])
-                formula = get_formula(symbol_list,
-                                      mode=args.formulamode)
+                formula = get_formula_from_attributes(sid, akinds, asites, asite_storage, mode=args.formulamode)
             # If for some reason there is no kind with the name
             # referenced by the site
             except KeyError:
@@ -340,3 +341,168 @@ class AbstractQueryManager(object):
                   filters={'id': {'in': node_pks}})
         qb.append(Node, ancestor_of='low_node', project=return_values)
         return qb.all()
+
+    @staticmethod
+    def _get_deletion_closure_cte(node_pks, link_types):
+        """
+        Return the common table expression `closure`, with the pks of the given nodes and of all the nodes that
+        originate from them following the links of the given types downwards.
+
+        The recursion has no infinite loops, since the union does not visit the same node twice.
+        """
+        return """
+            WITH RECURSIVE closure(id) AS (
+                SELECT n.id FROM db_dbnode AS n WHERE n.id IN ({node_pks})
+              UNION
+                SELECT l.output_id FROM closure AS c
+                INNER JOIN db_dblink AS l ON l.input_id = c.id
+                WHERE l.type IN ({link_types})
+            )
+            """.format(
+                node_pks=', '.join(str(int(pk)) for pk in node_pks),
+                link_types=', '.join("'{}'".format(link_type.value) for link_type in link_types))
+
+    def get_deletion_closure(self, node_pks, link_types):
+        """
+        Return the given nodes together with all the nodes that originate from them, following the links of
+        the given types downwards, using a single recursive SQL query instead of one query per graph level.
+
+        :param node_pks: an iterable of node pks to start from
+        :param link_types: the link types to follow
+        :type link_types: list of :class:`aiida.common.links.LinkType`
+        :return: a sorted list with the pks of the nodes
+        """
+        node_pks = list(node_pks)
+        if not node_pks:
+            return []
+
+        query = self._get_deletion_closure_cte(node_pks, link_types) + 'SELECT id FROM closure ORDER BY id'
+
+        return [row[0] for row in self.raw(query)]
+
+    def iter_deletion_closure(self, node_pks, link_types, batch_size):
+        """
+        Iterate over the nodes returned by `get_deletion_closure`, sorted by pk, without loading them all at once.
+
+        :param node_pks: an iterable of node pks to start from
+        :param link_types: the link types to follow
+        :type link_types: list of :class:`aiida.common.links.LinkType`
+        :param batch_size: the number of nodes fetched from the database at once
+        :return: an iterator over tuples (pk, uuid, type, label) of the nodes
+        """
+        node_pks = list(node_pks)
+        if not node_pks:
+            return iter([])
+
+        query = self._get_deletion_closure_cte(node_pks, link_types) + """
+            SELECT n.id, n.uuid, n.type, n.label FROM closure AS c
+            INNER JOIN db_dbnode AS n ON n.id = c.id
+            ORDER BY n.id
+            """
+
+        return self.iter_raw(query, batch_size)
+
+    def get_deletion_closure_losses(self, node_pks, link_types):
+        """
+        Return the links from the calculations that are kept to the nodes returned by `get_deletion_closure`, through
+        which the calculations lose a calculation that they called or a data node that they created.
+
+        :param node_pks: an iterable of node pks to start from
+        :param link_types: the link types to follow
+        :type link_types: list of :class:`aiida.common.links.LinkType`
+        :return: a list of tuples (calculation pk, type of the deleted node, link label, link type), sorted by the pk
+            of the calculation
+        """
+        from aiida.common.links import LinkType
+
+        node_pks = list(node_pks)
+        if not node_pks:
+            return []
+
+        query = self._get_deletion_closure_cte(node_pks, link_types) + """
+            SELECT l.input_id, n.type, l.label, l.type FROM closure AS c
+            INNER JOIN db_dblink AS l ON l.output_id = c.id
+            INNER JOIN db_dbnode AS n ON n.id = l.output_id
+            INNER JOIN db_dbnode AS p ON p.id = l.input_id
+            WHERE left(p.type, 12) = 'calculation.'
+            AND (
+                (l.type = '{call}' AND left(n.type, 12) = 'calculation.')
+                OR (l.type = '{create}' AND left(n.type, 5) = 'data.')
+            )
+            AND NOT EXISTS (SELECT 1 FROM closure AS d WHERE d.id = l.input_id)
+            ORDER BY l.input_id, l.id
+            """.format(call=LinkType.CALL.value, create=LinkType.CREATE.value)
+
+        return [tuple(row) for row in self.raw(query)]
+
+    def get_export_closure(self, node_pks, input_forward=False, create_reversed=True, return_reversed=False,
+                           call_reversed=False):
+        """
+        Return the set of nodes that should be exported together with the given nodes, using a single
+        recursive SQL query instead of one round of queries per visited node.
+
+        Starting from the given Data (or Code) and Calculation nodes, the following links are followed recursively:
+
+            * INPUT(Data, Calculation) reversed, CREATE/RETURN(Calculation, Data) forward and
+              CALL(Calculation, Calculation) forward, always
+            * INPUT(Data, Calculation) forward, if ``input_forward`` is True
+            * CREATE(Calculation, Data) reversed, if ``create_reversed`` is True
+            * RETURN(Calculation, Data) reversed, if ``return_reversed`` is True
+            * CALL(Calculation, Calculation) reversed, if ``call_reversed`` is True
+
+        Nodes of the given set that are neither Data, Code nor Calculation nodes are ignored.
+
+        :param node_pks: an iterable of node pks to start from
+        :return: a set with the pks of all the nodes to export
+        """
+        from aiida.common.links import LinkType
+
+        node_pks = [int(pk) for pk in node_pks]
+        if not node_pks:
+            return set()
+
+        is_data = "(left({0}.type, 5) = 'data.' OR left({0}.type, 5) = 'code.')"
+        is_calc = "left({0}.type, 12) = 'calculation.'"
+
+        # Each rule is (follow the link forward, link types, current node is a calculation, next node is a calculation)
+        rules = [
+            (False, [LinkType.INPUT], True, False),
+            (True, [LinkType.CREATE, LinkType.RETURN], True, False),
+            (True, [LinkType.CALL], True, True),
+        ]
+        if input_forward:
+            rules.append((True, [LinkType.INPUT], False, True))
+        if create_reversed:
+            rules.append((False, [LinkType.CREATE], False, True))
+        if return_reversed:
+            rules.append((False, [LinkType.RETURN], False, True))
+        if call_reversed:
+            rules.append((False, [LinkType.CALL], True, True))
+
+        conditions = []
+        for forward, link_types, current_calc, next_calc in rules:
+            conditions.append('({} AND l.type IN ({}) AND {} c.is_calc AND {})'.format(
+                'l.input_id = c.id' if forward else 'l.output_id = c.id',
+                ', '.join("'{}'".format(link_type.value) for link_type in link_types),
+                '' if current_calc else 'NOT',
+                is_calc.format('n') if next_calc else is_data.format('n'),
+            ))
+
+        query = """
+            WITH RECURSIVE closure(id, is_calc) AS (
+                SELECT n.id, {is_calc_n} FROM db_dbnode AS n
+                WHERE n.id IN ({node_pks}) AND ({is_calc_n} OR {is_data_n})
+              UNION
+                SELECT n.id, {is_calc_n} FROM closure AS c
+                INNER JOIN db_dblink AS l ON (l.input_id = c.id OR l.output_id = c.id)
+                INNER JOIN db_dbnode AS n ON n.id = CASE WHEN l.input_id = c.id THEN l.output_id ELSE l.input_id END
+                WHERE {conditions}
+            )
+            SELECT id FROM closure
+            """.format(
+                is_calc_n=is_calc.format('n'),
+                is_data_n=is_data.format('n'),
+                node_pks=', '.join(str(pk) for pk in node_pks),
+                conditions=' OR '.join(conditions))
+
+        return {row[0] for row in self.raw(query)}
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Add the sequence that is advanced whenever a node is added, changed or deleted
+
+The sequence is advanced by a trigger on the node table, such that its value is a version of the whole table that can
+be read without scanning it, e.g. by the REST API to validate its cached responses.
+
+Revision ID: 3d6190594e19
+Revises: b8d9d0ba4f1c
+Create Date: 2018-12-10 11:24:37.519206
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+
+from aiida.backends.sqlalchemy.utils import get_pg_node_version
+
+# revision identifiers, used by Alembic.
+revision = '3d6190594e19'
+down_revision = 'b8d9d0ba4f1c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(get_pg_node_version())
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS autoadvance_node_version ON db_dbnode')
+    op.execute('DROP FUNCTION IF EXISTS advance_node_version()')
+    op.execute('DROP SEQUENCE IF EXISTS db_dbnode_version_seq')
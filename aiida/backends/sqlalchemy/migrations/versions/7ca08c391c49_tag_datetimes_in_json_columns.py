@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Store datetimes in the JSONB columns as tagged objects instead of bare isoformat strings
+
+The datetimes used to be detected when loading the JSON by matching every string against a regex. They are now
+serialized as `{"$datetime": <isoformat>}`, so the strings that were loaded as datetimes are converted to that form.
+
+Revision ID: 7ca08c391c49
+Revises: 5d4d844852b6
+Create Date: 2018-11-12 10:21:47.381206
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import re
+
+import six
+from alembic import op
+from dateutil import parser
+from sqlalchemy.sql import text
+
+from aiida.utils import json
+
+# revision identifiers, used by Alembic.
+revision = '7ca08c391c49'
+down_revision = '5d4d844852b6'
+branch_labels = None
+depends_on = None
+
+# Written out rather than imported, since the migration should not change if the codec changes in the future
+DATETIME_JSON_TAG = '$datetime'
+
+# The regex that was used to recognise datetimes when loading the JSON columns
+DATE_REGEX = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+(\+\d{2}:\d{2})?$')
+
+# Table and JSONB column pairs
+JSON_COLUMNS = (
+    ('db_dbnode', 'attributes'),
+    ('db_dbnode', 'extras'),
+    ('db_dbcomputer', 'metadata'),
+    ('db_dbcomputer', 'transport_params'),
+    ('db_dbauthinfo', 'metadata'),
+    ('db_dbauthinfo', 'auth_params'),
+    ('db_dblog', 'metadata'),
+    ('db_dbsetting', 'val'),
+)
+
+
+def tag_datetimes(value):
+    """Return the value with the strings that the old codec would load as datetimes replaced by tagged objects."""
+    if isinstance(value, list):
+        return [tag_datetimes(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: tag_datetimes(item) for key, item in value.items()}
+    elif isinstance(value, six.string_types) and DATE_REGEX.match(value):
+        try:
+            parser.parse(value)
+        except (ValueError, TypeError):
+            return value
+        return {DATETIME_JSON_TAG: value}
+    return value
+
+
+def untag_datetimes(value):
+    """Return the value with the tagged datetime objects replaced by their isoformat string."""
+    if isinstance(value, list):
+        return [untag_datetimes(item) for item in value]
+    elif isinstance(value, dict):
+        if len(value) == 1 and DATETIME_JSON_TAG in value:
+            return value[DATETIME_JSON_TAG]
+        return {key: untag_datetimes(item) for key, item in value.items()}
+    return value
+
+
+def convert_columns(conn, candidate_filter, convert):
+    """
+    Apply the `convert` function to the values of all JSON columns whose text representation matches the filter.
+
+    The filter is evaluated by PostgreSQL, such that only the rows that may contain a datetime are loaded.
+    """
+    for table, column in JSON_COLUMNS:
+        rows = conn.execute(
+            text('SELECT id, {column}::text FROM {table} WHERE {column}::text {filter}'.format(
+                table=table, column=column, filter=candidate_filter)))
+        for pk, value in rows.fetchall():
+            converted = convert(json.loads(value))
+            conn.execute(
+                text('UPDATE {table} SET {column} = CAST(:value AS JSONB) WHERE id = :pk'.format(
+                    table=table, column=column)),
+                value=json.dumps(converted), pk=pk)
+
+
+def upgrade():
+    conn = op.get_bind()
+    convert_columns(conn, r"""~ '"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+(\+\d{2}:\d{2})?"'""", tag_datetimes)
+
+
+def downgrade():
+    conn = op.get_bind()
+    convert_columns(conn, """LIKE '%"{}"%'""".format(DATETIME_JSON_TAG), untag_datetimes)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Add the table of the checkpoints of the processes
+
+The checkpoints were stored as YAML in an attribute of the node of the process. They are now stored as binary entries
+in a separate table, such that only the entries that change have to be written. The checkpoints in the attributes are
+still read, so they are left as they are.
+
+Revision ID: b8d9d0ba4f1c
+Revises: 7ca08c391c49
+Create Date: 2018-11-26 15:02:11.471263
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b8d9d0ba4f1c'
+down_revision = '7ca08c391c49'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'db_dbcheckpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dbnode_id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['dbnode_id'], [u'db_dbnode.id'], ondelete=u'CASCADE', initially=u'DEFERRED',
+                                deferrable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dbnode_id', 'key'),
+    )
+
+
+def downgrade():
+    op.drop_table('db_dbcheckpoint')
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from sqlalchemy import ForeignKey
+from sqlalchemy.schema import Column, UniqueConstraint
+from sqlalchemy.types import Integer, String, LargeBinary
+
+from aiida.backends.sqlalchemy.models.base import Base
+
+
+class DbCheckpoint(Base):
+    """
+    An entry of the checkpoint of a process, see `aiida.work.persistence.AiiDAPersister`.
+    """
+    __tablename__ = "db_dbcheckpoint"
+
+    id = Column(Integer, primary_key=True)
+
+    dbnode_id = Column(
+        Integer,
+        ForeignKey(
+            'db_dbnode.id', ondelete="CASCADE",
+            deferrable=True, initially="DEFERRED"
+        ),
+        nullable=False
+    )
+    key = Column(String(255), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('dbnode_id', 'key'),
+    )
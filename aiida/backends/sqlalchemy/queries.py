@@ -34,6 +34,30 @@ class SqlaQueryManager(AbstractQueryManager):
 
         return result.fetchall()
 
+    def iter_raw(self, query, batch_size):
+        """Execute a raw SQL statement and iterate over the rows of the result, fetched in batches.
+
+        The rows are fetched from a server side cursor, in the transaction of the session of the thread.
+
+        :param query: a string containing a raw SQL statement
+        :param batch_size: the number of rows fetched at once
+        :return: an iterator over the rows of the result
+        """
+        from sqlalchemy.sql import text
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        session = get_scoped_session()
+        result = session.connection().execution_options(stream_results=True).execute(text(query))
+
+        try:
+            rows = result.fetchmany(batch_size)
+            while rows:
+                for row in rows:
+                    yield row
+                rows = result.fetchmany(batch_size)
+        finally:
+            result.close()
+
     def get_creation_statistics(
             self,
             user_pk=None
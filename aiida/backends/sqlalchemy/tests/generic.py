@@ -199,3 +199,114 @@ class TestDbExtrasSqla(AiidaTestCase):
         self.assertEquals(n1.get_extras(), new_attrs)
         # Also check that other nodes were not damaged
         self.assertEquals(n2.get_extras(), {'pippo2': [3, 4, 'b'], '_aiida_hash': n2.get_hash()})
+
+
+class TestStreamingImportSqla(AiidaTestCase):
+    """
+    Test the streaming import of export archives.
+    """
+
+    def test_streaming_import(self):
+        """
+        Verify that nodes, attributes, links and groups survive an export followed by a streaming import
+        with a batch size smaller than the number of entries.
+        """
+        import tempfile
+        from aiida.common.links import LinkType
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.parameter import ParameterData
+        from aiida.orm.importexport import export, import_data
+        from aiida.orm.querybuilder import QueryBuilder
+
+        calculation = Calculation()
+        calculation._set_attr('key', 'value')
+        calculation.store()
+
+        outputs = []
+        for index in range(5):
+            parameters = ParameterData(dict={'index': index}).store()
+            parameters.add_link_from(calculation, label='output_{}'.format(index), link_type=LinkType.CREATE)
+            outputs.append(parameters)
+
+        group = orm.Group(name='streaming_import').store()
+        group.add_nodes(outputs)
+
+        calculation_uuid = calculation.uuid
+        uuids = set([calculation_uuid] + [node.uuid for node in outputs])
+
+        with tempfile.NamedTemporaryFile() as handle:
+            export([calculation, group], outfile=handle.name, overwrite=True, silent=True)
+
+            self.clean_db()
+            self.insert_data()
+
+            result = import_data(handle.name, silent=True, batch_size=2)
+            # The result has the same shape as with the non-streaming import
+            self.assertEqual(set(orm.load_node(pk).uuid for _, pk in result['Node']['new']), uuids)
+            self.assertEqual(len(result['Node']['new']), len(uuids))
+            calculation_pk = orm.load_node(calculation_uuid).pk
+            self.assertEqual(sorted(result['Link']['new']),
+                             sorted((calculation_pk, pk) for _, pk in result['Node']['new'] if pk != calculation_pk))
+
+            builder = QueryBuilder().append(Node, project=['uuid'])
+            self.assertEqual(set(str(uuid) for uuid, in builder.all()), uuids)
+
+            builder = QueryBuilder().append(Calculation, project=['attributes.key'])
+            self.assertEqual(builder.all(), [['value']])
+
+            builder = QueryBuilder().append(Calculation, tag='calculation').append(
+                ParameterData, output_of='calculation', project=['attributes.index'])
+            self.assertEqual(sorted(index for index, in builder.all()), list(range(len(outputs))))
+
+            imported_group = orm.Group.get(name='streaming_import')
+            self.assertEqual(set(node.uuid for node in imported_group.nodes), set(node.uuid for node in outputs))
+
+            # Importing a second time should only find existing nodes
+            result = import_data(handle.name, silent=True, batch_size=2)
+            self.assertEqual(sorted(pk for _, pk in result['Node']['existing']),
+                             sorted(pk for _, pk in result['Node']['new']))
+            self.assertNotIn('Link', result)
+
+
+class TestJsonCodecSqla(AiidaTestCase):
+    """
+    Test the JSON codec used for the JSONB columns.
+    """
+
+    def test_datetime_round_trip(self):
+        """Datetimes should be stored as tagged objects and restored, other strings should be left untouched."""
+        from aiida.backends.sqlalchemy.utils import dumps_json, loads_json, DATETIME_JSON_TAG
+        from aiida.utils import json, timezone
+
+        now = timezone.now()
+        data = {'now': now, 'nested': [{'date': now.replace(microsecond=0)}], 'string': now.isoformat()}
+
+        serialized = dumps_json(data)
+        self.assertEqual(json.loads(serialized)['now'], {DATETIME_JSON_TAG: now.isoformat()})
+        self.assertEqual(loads_json(serialized), data)
+
+    def test_invalid_datetime_tag(self):
+        """Objects that look like tagged datetimes but do not contain a valid date should be left untouched."""
+        from aiida.backends.sqlalchemy.utils import dumps_json, loads_json, DATETIME_JSON_TAG
+
+        data = {'invalid': {DATETIME_JSON_TAG: 'foo'}, 'number': {DATETIME_JSON_TAG: 1}}
+        self.assertEqual(loads_json(dumps_json(data)), data)
+
+    def test_datetime_attribute(self):
+        """Datetime attributes should survive a reload from the database and be queryable."""
+        from aiida.orm import load_node
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.utils import timezone
+
+        now = timezone.now()
+        node = Node()
+        node._set_attr('now', now)  # pylint: disable=protected-access
+        node._set_attr('string', now.isoformat())  # pylint: disable=protected-access
+        node.store()
+
+        reloaded = load_node(node.pk)
+        self.assertEqual(reloaded.get_attr('now'), now)
+        self.assertEqual(reloaded.get_attr('string'), now.isoformat())
+
+        builder = QueryBuilder().append(Node, filters={'id': node.pk}, project=['attributes.now'])
+        self.assertEqual(builder.all(), [[now]])
@@ -356,3 +356,54 @@ class TestNodeBasicSQLA(AiidaTestCase):
         self.assertEqual(len(res), 1,
                          "There should be a node in the session/DB with the "
                          "UUID {}".format(node_uuid))
+
+
+class TestStoreManySQLA(AiidaTestCase):
+    """
+    Test the bulk storage of nodes
+    """
+
+    def test_store_many(self):
+        """Verify that nodes, attributes, hashes and links are stored by `store_many`."""
+        from aiida.common.links import LinkType
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.int import Int
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.orm.utils import load_node
+
+        calculation = Calculation().store()
+        outputs = [Int(value) for value in range(10)]
+        links = [(calculation, node, 'output_{}'.format(index), LinkType.CREATE) for index, node in enumerate(outputs)]
+
+        # Links between new nodes should be stored as well
+        child = Calculation()
+        child.add_link_from(outputs[0], label='input', link_type=LinkType.INPUT)
+
+        self.backend.store_many(outputs + [child], links)
+
+        for index, node in enumerate(outputs):
+            self.assertTrue(node.is_stored)
+            self.assertEqual(load_node(node.pk).value, index)
+            self.assertEqual(node.get_extra('_aiida_hash'), node.get_hash())
+
+        self.assertTrue(child.is_stored)
+        self.assertEqual(child.get_inputs(also_labels=True)[0][1].uuid, outputs[0].uuid)
+
+        builder = QueryBuilder().append(Calculation, filters={'id': calculation.pk}, tag='calculation')
+        builder.append(Int, output_of='calculation', project=['attributes.value'])
+        self.assertEqual(sorted(value for value, in builder.all()), list(range(10)))
+
+    def test_store_many_loop(self):
+        """Verify that links between new nodes forming a loop are refused and nothing is stored."""
+        from aiida.common.links import LinkType
+
+        first = orm.Node()
+        second = orm.Node()
+        second.add_link_from(first, label='input', link_type=LinkType.INPUT)
+        first.add_link_from(second, label='input', link_type=LinkType.INPUT)
+
+        with self.assertRaises(ValueError):
+            self.backend.store_many([first, second])
+
+        self.assertFalse(first.is_stored)
+        self.assertFalse(second.is_stored)
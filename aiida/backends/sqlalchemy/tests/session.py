@@ -289,3 +289,41 @@ class TestSessionSqla(AiidaTestCase):
         dbnode_reloaded.extras['test_extras'] = 'Boo!'
         custom_session.commit()
         self.assertDictEqual(node._attributes(), dbnode_reloaded.attributes)
+
+
+class TestPoolSqla(AiidaTestCase):
+    """
+    Test the connection pool of the engine and its checkout statistics.
+    """
+
+    def test_checkout_statistics(self):
+        """Every checkout of a connection from the pool of the engine should be recorded."""
+        from aiida.backends.sqlalchemy import engine
+        from aiida.backends.sqlalchemy.utils import POOL_STATISTICS
+
+        checkouts = POOL_STATISTICS.get_statistics()['checkouts']
+
+        connection = engine.connect()
+        connection.close()
+
+        statistics = POOL_STATISTICS.get_statistics()
+        self.assertEqual(statistics['checkouts'], checkouts + 1)
+        self.assertGreaterEqual(statistics['max_wait'], statistics['mean_wait'])
+
+    def test_slow_checkout_warning(self):
+        """A checkout that takes longer than the warning threshold should be counted as slow."""
+        from aiida.backends.sqlalchemy.utils import PoolStatistics, TimedQueuePool
+        from aiida.backends.sqlalchemy import engine
+
+        statistics = PoolStatistics()
+        statistics.warning_threshold = 1
+        statistics.record_checkout(0.5, engine.pool)
+        statistics.record_checkout(2, engine.pool)
+
+        self.assertIsInstance(engine.pool, TimedQueuePool)
+        self.assertEqual(statistics.get_statistics(), {
+            'checkouts': 2,
+            'slow_checkouts': 1,
+            'mean_wait': 1.25,
+            'max_wait': 2,
+        })
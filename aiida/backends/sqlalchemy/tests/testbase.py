@@ -18,9 +18,11 @@ import shutil
 from sqlalchemy.orm import sessionmaker
 
 from aiida.backends.sqlalchemy.models.base import Base
+# Not used by the ORM, imported for its table to be created with the others
+from aiida.backends.sqlalchemy.models.checkpoint import DbCheckpoint  # pylint: disable=unused-import
 from aiida.backends.sqlalchemy.models.computer import DbComputer
 from aiida.backends.sqlalchemy.models.user import DbUser
-from aiida.backends.sqlalchemy.utils import install_tc
+from aiida.backends.sqlalchemy.utils import install_node_version, install_tc
 from aiida.backends.testimplbase import AiidaTestImplementation
 from aiida.common.utils import get_configured_user_email
 from aiida.orm.implementation.sqlalchemy.backend import SqlaBackend
@@ -62,6 +64,7 @@ class SqlAlchemyTests(AiidaTestImplementation):
             Base.metadata.drop_all(self.test_session.connection)
             Base.metadata.create_all(self.test_session.connection)
             install_tc(self.test_session.connection)
+            install_node_version(self.test_session.connection)
         else:
             self.clean_db()
         self.backend = SqlaBackend()
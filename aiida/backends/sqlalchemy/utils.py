@@ -10,39 +10,31 @@
 from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
-try:
-    import ultrajson as json
-    from functools import partial
-
-    # double_precision = 15, to replicate what PostgreSQL numerical type is
-    # using
-    json_dumps = partial(json.dumps, double_precision=15)
-    json_loads = partial(json.loads, precise_float=True)
-except ImportError:
-    import aiida.utils.json as json
-
-    json_dumps = json.dumps
-    json_loads = json.loads
-
 import datetime
-import re
+import logging
+import threading
+import time
 
+import dateutil.parser
 import six
 from alembic import command
 from alembic.config import Config
 from alembic.runtime.environment import EnvironmentContext
 from alembic.script import ScriptDirectory
-from dateutil import parser
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
 from aiida.backends import sqlalchemy as sa, settings
+from aiida.utils import json
 from aiida.common.setup import (get_profile_config)
 
 ALEMBIC_FILENAME = "alembic.ini"
 ALEMBIC_REL_PATH = "migrations"
 
+_LOGGER = logging.getLogger(__name__)
+
 
 def flag_modified(instance, key):
     """Wrapper around `sqlalchemy.orm.attributes.flag_modified` to correctly dereference utils.ModelWrapper
@@ -61,6 +53,105 @@ def flag_modified(instance, key):
     flag_modified_sqla(instance, key)
 
 
+class PoolStatistics(object):
+    """
+    Statistics of the time spent waiting to check out a connection from the pool of the engine.
+    A warning is logged for every checkout that takes longer than the `db.pool_checkout_warning` property,
+    since it means that the pool, or the database behind it, is saturated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.warning_threshold = 0
+        self.reset()
+
+    def reset(self):
+        """Reset all the counters."""
+        with self._lock:
+            self.checkouts = 0
+            self.slow_checkouts = 0
+            self.total_wait = 0.
+            self.max_wait = 0.
+
+    def record_checkout(self, wait, pool):
+        """
+        Record a checkout of a connection.
+
+        :param wait: the time in seconds spent waiting for the connection
+        :param pool: the pool that the connection was checked out from
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            slow = 0 < self.warning_threshold <= wait
+            if slow:
+                self.slow_checkouts += 1
+
+        if slow:
+            _LOGGER.warning('waited %.3f s to check out a database connection (%s)', wait, pool.status())
+
+    def get_statistics(self):
+        """
+        :return: a dictionary with the number of checkouts, the number of slow ones, and the mean and maximum
+            wait times in seconds
+        """
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'slow_checkouts': self.slow_checkouts,
+                'mean_wait': self.total_wait / self.checkouts if self.checkouts else 0.,
+                'max_wait': self.max_wait,
+            }
+
+
+#: The checkout statistics of the engine of this process
+POOL_STATISTICS = PoolStatistics()
+
+
+class _CheckoutTimingMixin(object):
+    """Mixin for pool classes that records the time spent by each checkout in `POOL_STATISTICS`."""
+
+    def _do_get(self):
+        start = time.time()
+        try:
+            return super(_CheckoutTimingMixin, self)._do_get()
+        finally:
+            POOL_STATISTICS.record_checkout(time.time() - start, self)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool that records the checkout wait times."""
+
+
+class TimedNullPool(_CheckoutTimingMixin, NullPool):
+    """NullPool that records the checkout wait times."""
+
+
+def get_pool_options():
+    """
+    Return the keyword arguments for `create_engine` that configure the connection pool, from the `db.*` properties.
+
+    In transaction pooling mode, meant for a server side pooler such as pgbouncer, connections are not kept open
+    by the engine but opened for each session and closed when it is returned, leaving all the pooling to the server.
+    """
+    from aiida.common.setup import get_property
+
+    POOL_STATISTICS.warning_threshold = get_property('db.pool_checkout_warning')
+
+    if get_property('db.transaction_pooling'):
+        return {'poolclass': TimedNullPool}
+
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': get_property('db.pool_size'),
+        'max_overflow': get_property('db.max_overflow'),
+        'pool_timeout': get_property('db.pool_timeout'),
+        'pool_recycle': get_property('db.pool_recycle'),
+        'pool_pre_ping': get_property('db.pool_pre_ping'),
+    }
+
+
 def recreate_after_fork(engine):
     """
     :param engine: the engine that will be used by the sessionmaker
@@ -70,6 +161,7 @@ def recreate_after_fork(engine):
     """
     sa.engine.dispose()
     sa.scopedsessionclass = scoped_session(sessionmaker(bind=sa.engine, expire_on_commit=True))
+    POOL_STATISTICS.reset()
 
 
 def reset_session(config):
@@ -88,7 +180,7 @@ def reset_session(config):
         ).format(sep=':' if config['AIIDADB_PORT'] else '', **config)
 
     sa.engine = create_engine(engine_url, json_serializer=dumps_json,
-                              json_deserializer=loads_json, encoding='utf-8')
+                              json_deserializer=loads_json, encoding='utf-8', **get_pool_options())
     sa.scopedsessionclass = scoped_session(sessionmaker(bind=sa.engine,
                                                         expire_on_commit=True))
     register_after_fork(sa.engine, recreate_after_fork)
@@ -117,52 +209,46 @@ def _load_dbenv_noschemacheck(profile=None, connection=None):
 _aiida_autouser_cache = None
 
 
-def dumps_json(d):
+#: Key of the single-key object that marks a serialized datetime in the JSONB columns, e.g.
+#: ``{"$datetime": "2018-11-05T12:00:00.000000+00:00"}``
+DATETIME_JSON_TAG = '$datetime'
+
+
+def _encode_json_default(value):
     """
-    Transforms all datetime object into isoformat and then returns the JSON
+    Serialize the objects that JSON does not support natively, called by the encoder only for those
     """
+    if isinstance(value, datetime.datetime):
+        return {DATETIME_JSON_TAG: value.isoformat()}
+    raise TypeError('{!r} is not JSON serializable'.format(value))
 
-    def f(v):
-        if isinstance(v, list):
-            return [f(_) for _ in v]
-        elif isinstance(v, dict):
-            return dict((key, f(val)) for key, val in v.items())
-        elif isinstance(v, datetime.datetime):
-            return v.isoformat()
-        return v
-
-    return json_dumps(f(d))
 
+def _decode_json_object(obj):
+    """
+    Turn the tagged objects written by `_encode_json_default` back into the original value
 
-date_reg = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+(\+\d{2}:\d{2})?$')
+    Objects of the user that merely look like tagged objects, i.e. whose value is not a valid date, are left untouched
+    """
+    if len(obj) == 1 and DATETIME_JSON_TAG in obj and isinstance(obj[DATETIME_JSON_TAG], six.string_types):
+        try:
+            return dateutil.parser.parse(obj[DATETIME_JSON_TAG])
+        except (ValueError, OverflowError):
+            pass
+    return obj
 
 
-def loads_json(s):
+def dumps_json(d):
     """
-    Loads the json and try to parse each basestring as a datetime object
+    Returns the JSON of the given object, with datetime objects serialized as tagged objects
     """
+    return json.dumps(d, default=_encode_json_default)
 
-    ret = json_loads(s)
-
-    def f(d):
-        if isinstance(d, list):
-            for i, val in enumerate(d):
-                d[i] = f(val)
-            return d
-        elif isinstance(d, dict):
-            for k, v in d.items():
-                d[k] = f(v)
-            return d
-        elif isinstance(d, six.string_types):
-            if date_reg.match(d):
-                try:
-                    return parser.parse(d)
-                except (ValueError, TypeError):
-                    return d
-            return d
-        return d
 
-    return f(ret)
+def loads_json(s):
+    """
+    Loads the json, restoring the datetime objects from their tagged objects in the same decoding pass
+    """
+    return json.loads(s, object_hook=_decode_json_object)
 
 
 # XXX the code here isn't different from the one use in Django. We may be able
@@ -367,6 +453,224 @@ CREATE TRIGGER autoupdate_tc
                             closure_table_child_field=closure_table_child_field)
 
 
+LINK_CLOSURE_TABLE_NAME = 'db_dblinkclosure'
+# Only these links are followed by the `ancestor_of` and `descendant_of` relationships of the QueryBuilder
+LINK_CLOSURE_LINK_TYPES = ('createlink', 'inputlink')
+
+
+def get_pg_link_closure():
+    """
+    Return the SQL that creates the link closure table and the trigger that keeps it up to date.
+
+    Like the recursive query of the QueryBuilder, the link closure table accounts for every path between two nodes:
+    it stores one row per pair of connected nodes and path length, given in the `depth` column (0 for nodes that are
+    directly linked), with the number of such paths in the `num_paths` column. Inserting a link adds the paths that go
+    through it, from each of its ancestors to each of its descendants; deleting one subtracts them, since the
+    provenance graph has no cycles and a path cannot go twice through the same link.
+    """
+    from string import Template
+
+    paths_through_link = Template("""
+        SELECT a.ancestor_id, d.descendant_id, a.depth + d.depth AS depth, SUM(a.num_paths * d.num_paths) AS num_paths
+        FROM (
+            SELECT $link.input_id AS ancestor_id, 0 AS depth, 1::BIGINT AS num_paths
+            UNION ALL
+            SELECT ancestor_id, depth + 1, num_paths FROM $closure_table_name WHERE descendant_id = $link.input_id
+          ) AS a
+        CROSS JOIN (
+            SELECT $link.output_id AS descendant_id, 0 AS depth, 1::BIGINT AS num_paths
+            UNION ALL
+            SELECT descendant_id, depth + 1, num_paths FROM $closure_table_name WHERE ancestor_id = $link.output_id
+          ) AS d
+        WHERE a.ancestor_id <> d.descendant_id
+        GROUP BY a.ancestor_id, d.descendant_id, a.depth + d.depth""")
+
+    pg_link_closure = Template("""
+
+CREATE TABLE $closure_table_name (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    num_paths BIGINT NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id, depth)
+);
+
+CREATE INDEX ${closure_table_name}_descendant_id ON $closure_table_name (descendant_id, ancestor_id);
+
+CREATE OR REPLACE FUNCTION update_link_closure()
+  RETURNS trigger AS
+$$BODY$$
+BEGIN
+
+  IF tg_op IN ('DELETE', 'UPDATE') THEN
+    IF old.type IN ($link_types) THEN
+
+      DELETE FROM $closure_table_name AS c
+        USING ($old_paths) AS p
+        WHERE c.ancestor_id = p.ancestor_id AND c.descendant_id = p.descendant_id AND c.depth = p.depth
+          AND c.num_paths <= p.num_paths;
+
+      UPDATE $closure_table_name AS c
+        SET num_paths = c.num_paths - p.num_paths
+        FROM ($old_paths) AS p
+        WHERE c.ancestor_id = p.ancestor_id AND c.descendant_id = p.descendant_id AND c.depth = p.depth;
+
+    END IF;
+  END IF;
+
+  IF tg_op IN ('INSERT', 'UPDATE') THEN
+    IF new.type IN ($link_types) THEN
+
+      INSERT INTO $closure_table_name (ancestor_id, descendant_id, depth, num_paths)
+        $new_paths
+      ON CONFLICT (ancestor_id, descendant_id, depth) DO UPDATE
+        SET num_paths = $closure_table_name.num_paths + excluded.num_paths;
+
+    END IF;
+  END IF;
+
+  RETURN NULL;
+
+END
+$$BODY$$
+  LANGUAGE plpgsql VOLATILE
+  COST 100;
+
+""")
+    return pg_link_closure.substitute(
+        closure_table_name=LINK_CLOSURE_TABLE_NAME,
+        link_types=', '.join("'{}'".format(link_type) for link_type in LINK_CLOSURE_LINK_TYPES),
+        old_paths=paths_through_link.substitute(link='old', closure_table_name=LINK_CLOSURE_TABLE_NAME),
+        new_paths=paths_through_link.substitute(link='new', closure_table_name=LINK_CLOSURE_TABLE_NAME))
+
+
+def install_link_closure(session):
+    """
+    Create the link closure table, fill it for the links that are already in the database and install the trigger
+    that keeps it up to date. The table is filled in bulk, one level of depth at a time, which is much faster
+    than inserting the existing links one by one through the trigger.
+
+    The link table is locked while the closure is built, so that no link can be missed.
+
+    :param session: the SQLAlchemy session; the changes are committed
+    """
+    link_types = ', '.join("'{}'".format(link_type) for link_type in LINK_CLOSURE_LINK_TYPES)
+
+    session.execute('LOCK TABLE db_dblink IN SHARE MODE')
+    session.execute(get_pg_link_closure())
+
+    session.execute("""
+        INSERT INTO {closure} (ancestor_id, descendant_id, depth, num_paths)
+        SELECT input_id, output_id, 0, COUNT(*) FROM db_dblink
+        WHERE type IN ({link_types}) AND input_id <> output_id
+        GROUP BY input_id, output_id
+        """.format(closure=LINK_CLOSURE_TABLE_NAME, link_types=link_types))
+
+    # The paths of each length are the paths one link shorter extended by one link
+    session.execute('CREATE INDEX {0}_depth ON {0} (depth)'.format(LINK_CLOSURE_TABLE_NAME))
+    depth = 0
+    while True:
+        result = session.execute("""
+            INSERT INTO {closure} (ancestor_id, descendant_id, depth, num_paths)
+            SELECT c.ancestor_id, l.output_id, :depth + 1, SUM(c.num_paths) FROM {closure} AS c
+            INNER JOIN db_dblink AS l ON l.input_id = c.descendant_id
+            WHERE c.depth = :depth AND l.type IN ({link_types}) AND c.ancestor_id <> l.output_id
+            GROUP BY c.ancestor_id, l.output_id
+            """.format(closure=LINK_CLOSURE_TABLE_NAME, link_types=link_types), {'depth': depth})
+        if not result.rowcount:
+            break
+        depth += 1
+    session.execute('DROP INDEX {}_depth'.format(LINK_CLOSURE_TABLE_NAME))
+
+    session.execute("""
+        CREATE TRIGGER autoupdate_link_closure
+          AFTER INSERT OR DELETE OR UPDATE
+          ON db_dblink FOR each ROW
+          EXECUTE PROCEDURE update_link_closure()
+        """)
+    session.execute('ANALYZE {}'.format(LINK_CLOSURE_TABLE_NAME))
+    session.commit()
+
+
+def uninstall_link_closure(session):
+    """
+    Drop the link closure table and its trigger.
+
+    :param session: the SQLAlchemy session; the changes are committed
+    """
+    session.execute('DROP TRIGGER IF EXISTS autoupdate_link_closure ON db_dblink')
+    session.execute('DROP FUNCTION IF EXISTS update_link_closure()')
+    session.execute('DROP TABLE IF EXISTS {}'.format(LINK_CLOSURE_TABLE_NAME))
+    session.commit()
+
+
+def has_link_closure(session):
+    """
+    Return whether the link closure table is installed.
+
+    :param session: the SQLAlchemy session
+    """
+    query = "SELECT to_regclass('{}')".format(LINK_CLOSURE_TABLE_NAME)
+    return session.execute(query).scalar() is not None
+
+
+NODE_VERSION_SEQUENCE_NAME = 'db_dbnode_version_seq'
+
+
+def get_pg_node_version():
+    """
+    Return the SQL that creates the node version sequence and the trigger that advances it whenever a node is
+    added, changed or deleted.
+
+    The trigger is deferred to the end of the transaction, such that the sequence only advances once the changes are
+    about to become visible to the other transactions. The value of the sequence can then be read without scanning
+    the node table, e.g. to validate the responses of the REST API that are cached.
+    """
+    from string import Template
+
+    pg_node_version = Template("""
+CREATE SEQUENCE IF NOT EXISTS $sequence_name;
+
+CREATE OR REPLACE FUNCTION advance_node_version()
+  RETURNS trigger AS
+$$BODY$$
+BEGIN
+  PERFORM nextval('$sequence_name');
+  RETURN NULL;
+END;
+$$BODY$$
+LANGUAGE plpgsql VOLATILE;
+
+DROP TRIGGER IF EXISTS autoadvance_node_version ON db_dbnode;
+CREATE CONSTRAINT TRIGGER autoadvance_node_version
+  AFTER INSERT OR DELETE OR UPDATE
+  ON db_dbnode DEFERRABLE INITIALLY DEFERRED
+  FOR EACH ROW
+  EXECUTE PROCEDURE advance_node_version();
+""")
+
+    return pg_node_version.substitute(sequence_name=NODE_VERSION_SEQUENCE_NAME)
+
+
+def install_node_version(session):
+    """
+    Install the node version sequence and its trigger, see `get_pg_node_version`.
+
+    :param session: the SQLAlchemy session or connection
+    """
+    session.execute(get_pg_node_version())
+
+
+def get_node_version(session):
+    """
+    Return the current value of the node version sequence, which changes whenever a node is added, changed or deleted.
+
+    :param session: the SQLAlchemy session
+    :return: a tuple with the last value of the sequence and whether it was advanced since its creation
+    """
+    return tuple(session.execute('SELECT last_value, is_called FROM {}'.format(NODE_VERSION_SEQUENCE_NAME)).first())
+
+
 def check_schema_version(force_migration=False, alembic_cfg=None):
     """
     Check if the version stored in the database is the same of the version
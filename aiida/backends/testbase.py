@@ -10,6 +10,7 @@
 from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
+import logging
 import os
 import sys
 import unittest
@@ -133,6 +134,10 @@ class AiidaTestCase(unittest.TestCase):
         if not cls._class_was_setup:
             raise InvalidOperation("You cannot call clean_db before running the setUpClass")
 
+        # Write the log records that are still queued, such that they are not written after the cleaning
+        for handler in logging.getLogger('aiida').handlers:
+            handler.flush()
+
         cls.__backend_instance.clean_db()
 
     @classproperty
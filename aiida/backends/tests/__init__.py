@@ -88,6 +88,7 @@ db_test_list = {
         'common.archive': ['aiida.backends.tests.common.test_archive'],
         'common.datastructures': ['aiida.backends.tests.common.test_datastructures'],
         'daemon.client': ['aiida.backends.tests.daemon.test_client'],
+        'daemon.execmanager': ['aiida.backends.tests.daemon.test_execmanager'],
         'orm.computer': ['aiida.backends.tests.computer'],
         'orm.authinfo': ['aiida.backends.tests.orm.authinfo'],
         'orm.data.frozendict': ['aiida.backends.tests.orm.data.frozendict'],
@@ -98,7 +99,9 @@ db_test_list = {
         'work.class_loader': ['aiida.backends.tests.work.class_loader'],
         'work.daemon': ['aiida.backends.tests.work.daemon'],
         'work.futures': ['aiida.backends.tests.work.test_futures'],
+        'work.job_calcs': ['aiida.backends.tests.work.test_job_calcs'],
         'work.launch': ['aiida.backends.tests.work.test_launch'],
+        'work.parsing': ['aiida.backends.tests.work.test_parsing'],
         'work.persistence': ['aiida.backends.tests.work.persistence'],
         'work.process': ['aiida.backends.tests.work.process'],
         'work.process_builder': ['aiida.backends.tests.work.test_process_builder'],
@@ -711,6 +711,20 @@ class TestVerdiDataStructure(AiidaTestCase, TestVerdiDataListable, TestVerdiData
                           'The string "Succesfully imported" was not found in the output'
                           ' of verdi data structure import.')
 
+    def test_list_site_storage_arrays(self):
+        """The formula of a structure whose sites are stored as arrays should be listed."""
+        from aiida.orm.data.structure import SITE_STORAGE_ARRAYS, StructureData
+
+        struc = StructureData(cell=[[4., 0., 0.], [0., 4., 0.], [0., 0., 4.]])
+        struc.set_site_storage(SITE_STORAGE_ARRAYS)
+        struc.append_atom(position=(0., 0., 0.), symbols='Ba')
+        struc.append_atom(position=(2., 2., 0.), symbols='O')
+        struc.store()
+
+        res = self.cli_runner.invoke(cmd_structure.structure_list, ['--raw'], catch_exceptions=False)
+        lines = [line.split() for line in res.output_bytes.decode('utf-8').splitlines()]
+        self.assertIn([str(struc.pk), 'BaO'], [line[:2] for line in lines])
+
     def test_showhelp(self):
         res = self.runner.invoke(cmd_structure.structure_import, ['--help'])
         self.assertIn(b'Usage:', res.output_bytes, 'The string "Usage: " was not found in the output'
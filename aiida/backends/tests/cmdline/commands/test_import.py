@@ -71,3 +71,17 @@ class TestVerdiImport(AiidaTestCase):
         result = self.cli_runner.invoke(cmd_import.cmd_import, options)
 
         self.assertIsNone(result.exception)
+
+    def test_import_batch_size(self):
+        """Test that the streaming import is only accepted for profiles with the SQLAlchemy backend."""
+        from aiida.backends.profile import BACKEND_SQLA
+        from aiida.backends.settings import BACKEND
+
+        options = ['--batch-size', '2', get_archive_file('export/migrate/export_v0.3.aiida')]
+        result = self.cli_runner.invoke(cmd_import.cmd_import, options)
+
+        if BACKEND == BACKEND_SQLA:
+            self.assertIsNone(result.exception)
+        else:
+            self.assertIsNotNone(result.exception)
+            self.assertIn('Critical', result.output)
@@ -45,6 +45,16 @@ class TestVerdiRehash(AiidaTestCase):
         self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
         self.assertIsNone(result.exception)
 
+    def test_rehash_processes(self):
+        """Computing the hashes in parallel processes should rehash all 5 nodes."""
+        expected_node_count = 5
+        self.node_int.clear_hash()
+        options = ['--processes', '2']
+        result = self.cli_runner.invoke(cmd_rehash.rehash, options)
+        self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
+        self.assertIsNone(result.exception)
+        self.assertEqual(self.node_int.get_extra('_aiida_hash'), self.node_int.get_hash())
+
     def test_rehash_bool(self):
         """Limiting the queryset by defining an entry point, in this case bool, should limit nodes to 2."""
         expected_node_count = 2
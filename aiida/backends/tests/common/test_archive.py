@@ -12,10 +12,11 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import io
 import os
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.common.archive import Archive
+from aiida.common.archive import Archive, JsonSectionReader
 from aiida.common.exceptions import InvalidOperation
 
 
@@ -49,3 +50,47 @@ class TestCommonArchive(AiidaTestCase):
         filepath = get_archive_file('export_v0.1.aiida')
         with Archive(filepath) as archive:
             self.assertEqual(archive.version_format, '0.1')
+
+
+class TestJsonSectionReader(AiidaTestCase):
+    """Tests for the :class:`aiida.common.archive.JsonSectionReader` class."""
+
+    data = {
+        'node_attributes': {str(pk): {'value': pk, 'nested': {'list': [1.5, None, True, 'a' * pk]}} for pk in range(50)},
+        'export_data': {
+            'User': {'1': {'email': u'aiida@localhost'}},
+            'Node': {str(pk): {'uuid': u'uuid-{}'.format(pk), 'label': u'\xe9l\xe9ment'} for pk in range(50)},
+        },
+        'links_uuid': [{'input': u'uuid-0', 'output': u'uuid-{}'.format(pk)} for pk in range(1, 50)],
+        'groups_uuid': {},
+    }
+
+    def iter_section(self, *keys, **kwargs):
+        """Return the items of a section of the test data read with a JsonSectionReader."""
+        import aiida.utils.json as json
+
+        fhandle = io.StringIO(json.dumps(self.data))
+        return list(JsonSectionReader(fhandle, **kwargs).iter_section(*keys))
+
+    def test_iter_section(self):
+        """Verify that the sections are read correctly, also when the chunks split tokens."""
+        for chunk_size in [1, 7, 4096]:
+            self.assertEqual(dict(self.iter_section('node_attributes', chunk_size=chunk_size)),
+                             self.data['node_attributes'])
+            self.assertEqual(dict(self.iter_section('export_data', 'Node', chunk_size=chunk_size)),
+                             self.data['export_data']['Node'])
+            self.assertEqual(dict(self.iter_section('export_data', 'User', chunk_size=chunk_size)),
+                             self.data['export_data']['User'])
+            self.assertEqual([link for _, link in self.iter_section('links_uuid', chunk_size=chunk_size)],
+                             self.data['links_uuid'])
+
+    def test_iter_section_missing(self):
+        """Verify that nothing is yielded for empty or non-existing sections."""
+        self.assertEqual(self.iter_section('groups_uuid'), [])
+        self.assertEqual(self.iter_section('non_existing'), [])
+        self.assertEqual(self.iter_section('export_data', 'Computer'), [])
+
+    def test_malformed(self):
+        """Verify that a malformed document raises a ValueError."""
+        with self.assertRaises(ValueError):
+            list(JsonSectionReader(io.StringIO(u'{"a": [1, 2}')).iter_section('a'))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the retrieval of files in the `aiida.daemon.execmanager` module."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import io
+import os
+import shutil
+import tempfile
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.daemon import execmanager
+from aiida.orm.calculation import Calculation
+from aiida.transport.plugins.local import LocalTransport
+
+
+class TestRetrieveFilesFromList(AiidaTestCase):
+    """Tests for the `retrieve_files_from_list` function."""
+
+    def setUp(self):
+        super(TestRetrieveFilesFromList, self).setUp()
+        self.calculation = Calculation().store()
+        self.remote = tempfile.mkdtemp()
+        self.local = tempfile.mkdtemp()
+
+        for dirname in ['out', os.path.join('out', 'sub'), '.hidden']:
+            os.makedirs(os.path.join(self.remote, dirname))
+        for filename in ['aiida.out', os.path.join('out', 'a.dat'), os.path.join('out', 'sub', 'b.dat'),
+                         os.path.join('out', '.c.dat'), os.path.join('.hidden', 'd.dat')]:
+            with io.open(os.path.join(self.remote, filename), 'w', encoding='utf8') as handle:
+                handle.write(u'content of {}'.format(filename))
+
+    def tearDown(self):
+        shutil.rmtree(self.remote)
+        shutil.rmtree(self.local)
+        super(TestRetrieveFilesFromList, self).tearDown()
+
+    def retrieve(self, retrieve_list):
+        """Retrieve the files of the retrieve list from the remote to the local directory."""
+        with LocalTransport() as transport:
+            transport.chdir(self.remote)
+            execmanager.retrieve_files_from_list(self.calculation, transport, self.local, retrieve_list)
+
+    def get_local_files(self):
+        """Return the set of files in the local directory, relative to it."""
+        return set(
+            os.path.relpath(os.path.join(dirpath, filename), self.local)
+            for dirpath, _, filenames in os.walk(self.local)
+            for filename in filenames)
+
+    def test_glob(self):
+        """Test the expansion of patterns, which should follow the rules of `glob`."""
+        self.retrieve(['aiida.out', 'out/*.dat', ['out/*/*.dat', 'nested', 2], 'missing', '*/d.dat'])
+        self.assertEqual(self.get_local_files(), {'aiida.out', 'a.dat', os.path.join('nested', 'sub', 'b.dat')})
+
+    def test_bundle(self):
+        """Test that many files are retrieved as an archive, with the same result as file by file."""
+        for index in range(execmanager.RETRIEVE_BUNDLE_MIN_FILES):
+            with io.open(os.path.join(self.remote, 'file_{}.txt'.format(index)), 'w', encoding='utf8') as handle:
+                handle.write(u'{}'.format(index))
+
+        self.retrieve(['file_*.txt', 'missing', 'out', ['aiida.out', 'renamed', 0]])
+
+        expected = set('file_{}.txt'.format(index) for index in range(execmanager.RETRIEVE_BUNDLE_MIN_FILES))
+        expected.update({os.path.join('out', 'a.dat'), os.path.join('out', 'sub', 'b.dat'),
+                         os.path.join('out', '.c.dat'), 'renamed'})
+        self.assertEqual(self.get_local_files(), expected)
+
+        with io.open(os.path.join(self.local, 'file_3.txt'), encoding='utf8') as handle:
+            self.assertEqual(handle.read(), u'3')
+
+        # The archive should have been removed from the remote
+        self.assertFalse([name for name in os.listdir(self.remote) if name.startswith('.aiida_retrieve')])
+
+    def test_match_path(self):
+        """Test the matching of relative paths against patterns."""
+        self.assertTrue(execmanager._match_path('out/*.dat', 'out/a.dat'))
+        self.assertTrue(execmanager._match_path('out/.*', 'out/.c.dat'))
+        self.assertFalse(execmanager._match_path('out/*', 'out/.c.dat'))
+        self.assertFalse(execmanager._match_path('*.dat', 'out/a.dat'))
+        self.assertFalse(execmanager._match_path('out/*.dat', 'out/sub/b.dat'))
@@ -829,6 +829,74 @@ _tag   {}
         self.assertNotEquals(f1, f2)
 
 
+class TestUpfData(AiidaTestCase):
+    """
+    Tests the lookup of the pseudopotentials of a UPF family.
+    """
+
+    def setUp(self):
+        import os
+        from aiida.orm.data.upf import upload_upf_family
+
+        self.family_name = 'test_upf_family_{}'.format(self.id().split('.')[-1])
+        folder = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'examples', 'testdata', 'qepseudos')
+        upload_upf_family(folder, self.family_name, 'test family', stop_if_existing=False)
+
+    def get_structures(self):
+        """Return a BaTiO3 and a TiO2 structure."""
+        from aiida.orm.data.structure import StructureData
+
+        batio3 = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        batio3.append_atom(position=(0., 0., 0.), symbols='Ba')
+        batio3.append_atom(position=(2., 2., 2.), symbols='Ti')
+        batio3.append_atom(position=(2., 2., 0.), symbols='O', name='O1')
+        batio3.append_atom(position=(2., 0., 2.), symbols='O', name='O2')
+
+        tio2 = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        tio2.append_atom(position=(0., 0., 0.), symbols='Ti')
+        tio2.append_atom(position=(2., 2., 2.), symbols='O')
+
+        return batio3, tio2
+
+    def test_get_pseudos_for_structures(self):
+        """
+        The pseudos of several structures are found at once
+        """
+        from aiida.orm.data.upf import get_pseudos_for_structures, get_pseudos_from_structure
+
+        batio3, tio2 = self.get_structures()
+        pseudos_batio3, pseudos_tio2 = get_pseudos_for_structures([batio3, tio2], self.family_name)
+
+        self.assertEqual({name: pseudo.element for name, pseudo in pseudos_batio3.items()},
+                         {'Ba': 'Ba', 'Ti': 'Ti', 'O1': 'O', 'O2': 'O'})
+        self.assertEqual({name: pseudo.element for name, pseudo in pseudos_tio2.items()}, {'Ti': 'Ti', 'O': 'O'})
+        self.assertEqual(pseudos_batio3['O1'].pk, pseudos_tio2['O'].pk)
+        self.assertEqual(
+            {name: pseudo.pk for name, pseudo in get_pseudos_from_structure(tio2, self.family_name).items()},
+            {name: pseudo.pk for name, pseudo in pseudos_tio2.items()})
+
+    def test_membership_changes(self):
+        """
+        Changes of the members of the family are taken into account by the next lookup
+        """
+        from aiida.common.exceptions import NotExistent
+        from aiida.orm.data.upf import UpfData, get_pseudos_from_structure
+
+        _, tio2 = self.get_structures()
+        oxygen = get_pseudos_from_structure(tio2, self.family_name)['O']
+
+        family = UpfData.get_upf_group(self.family_name)
+        family.remove_nodes([oxygen])
+        with self.assertRaises(NotExistent):
+            get_pseudos_from_structure(tio2, self.family_name)
+
+        family.add_nodes([oxygen])
+        self.assertEqual(get_pseudos_from_structure(tio2, self.family_name)['O'].pk, oxygen.pk)
+
+        with self.assertRaises(NotExistent):
+            get_pseudos_from_structure(tio2, 'non_existent_family')
+
+
 class TestKindValidSymbols(AiidaTestCase):
     """
     Tests the symbol validation of the
@@ -2131,6 +2199,94 @@ class TestStructureDataReload(AiidaTestCase):
             self.assertAlmostEqual(c.sites[1].position[i], 1.)
 
 
+class TestStructureDataSiteArrays(AiidaTestCase):
+    """
+    Tests the storage of the sites of a StructureData as arrays in the repository.
+    """
+
+    def test_append_atoms(self):
+        """
+        The sites appended in bulk are the same with both site storages, and the arrays are reloaded after storing
+        """
+        import numpy
+        from aiida.orm.data.structure import StructureData, SITE_STORAGE_ARRAYS
+
+        structures = []
+        for site_storage in [None, SITE_STORAGE_ARRAYS]:
+            a = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+            if site_storage is not None:
+                a.set_site_storage(site_storage)
+            a.append_atom(position=(0., 0., 0.), symbols='Ba')
+            a.append_atoms([(2., 2., 2.), (2., 2., 0.), (2., 0., 2.), (0., 2., 2.)], ['Ti', 'O', 'O', 'O'])
+            structures.append(a)
+
+        attributes, arrays = structures
+        self.assertNotIn('sites', arrays.get_attrs())
+        self.assertEqual(arrays.get_kind_names(), ['Ba', 'Ti', 'O'])
+        self.assertEqual(arrays.get_site_kindnames(), attributes.get_site_kindnames())
+        self.assertEqual([site.get_raw() for site in arrays.sites], [site.get_raw() for site in attributes.sites])
+        self.assertEqual(arrays.get_formula(), 'BaO3Ti')
+        self.assertEqual(arrays.get_composition(), {'Ba': 1, 'Ti': 1, 'O': 3})
+
+        arrays.store()
+        b = load_node(arrays.uuid)
+
+        self.assertEqual(b.get_num_sites(), 5)
+        self.assertTrue(numpy.array_equal(b.get_positions(), attributes.get_positions()))
+        self.assertEqual(b.get_kind_indices().tolist(), [0, 1, 2, 2, 2])
+        with self.assertRaises(ModificationNotAllowed):
+            b.append_atoms([(1., 1., 1.)], ['Ba'])
+
+        c = b.clone()
+        c.set_positions(c.get_positions() + 1.)
+        self.assertEqual(c.sites[0].position, (1., 1., 1.))
+
+    def test_site_storage_conversion(self):
+        """
+        Converting between the site storages keeps the sites
+        """
+        from aiida.orm.data.structure import StructureData, SITE_STORAGE_ATTRIBUTES, SITE_STORAGE_ARRAYS
+
+        a = StructureData(cell=((2., 0., 0.), (0., 2., 0.), (0., 0., 2.)))
+        a.append_atom(position=(0., 0., 0.), symbols=['Ba'])
+        a.append_atom(position=(1., 1., 1.), symbols=['Ti'], name='Ti1')
+        sites = [site.get_raw() for site in a.sites]
+
+        a.set_site_storage(SITE_STORAGE_ARRAYS)
+        self.assertEqual([site.get_raw() for site in a.sites], sites)
+        self.assertNotIn('sites', a.get_attrs())
+
+        a.set_site_storage(SITE_STORAGE_ATTRIBUTES)
+        self.assertEqual(a.get_attr('sites'), sites)
+        self.assertEqual(a.get_folder_list(), [])
+
+        with self.assertRaises(ValueError):
+            a.set_site_storage('unknown')
+
+    def test_validation(self):
+        """
+        Invalid sites or positions are detected
+        """
+        from aiida.common.exceptions import ValidationError
+        from aiida.orm.data.structure import Kind, StructureData, SITE_STORAGE_ARRAYS
+
+        a = StructureData(cell=((2., 0., 0.), (0., 2., 0.), (0., 0., 2.)), site_storage=SITE_STORAGE_ARRAYS)
+        with self.assertRaises(ValueError):
+            a.append_atoms([(0., 0., 0.)], ['Unknown'])
+        with self.assertRaises(ValueError):
+            a.append_atoms([(0., 0.)], ['Ba'])
+        with self.assertRaises(ValueError):
+            a.append_atoms([(0., 0., 0.)], ['Ba', 'Ti'])
+
+        a.append_atoms([(0., 0., 0.)], ['Ba'])
+        with self.assertRaises(ValueError):
+            a.set_positions([(0., 0., 0.), (1., 1., 1.)])
+
+        a.append_kind(Kind(symbols='Ti'))
+        with self.assertRaises(ValidationError):
+            a.store()
+
+
 class TestStructureDataFromAse(AiidaTestCase):
     """
     Tests the creation of Sites from/to a ASE object.
@@ -2888,6 +3044,64 @@ class TestArrayData(AiidaTestCase):
             if name == 'third':
                 self.assertAlmostEquals(abs(third - array).max(), 0.)
 
+    def test_mmap_and_slice(self):
+        """
+        Check the memory-mapped and sliced access to the arrays
+        """
+        from aiida.orm.data.array import ArrayData
+        import numpy
+
+        n = ArrayData()
+        first = numpy.random.rand(5, 3, 4)
+        n.set_array('first', first)
+        n.store()
+
+        mapped = n.get_array('first', mmap_mode='r')
+        self.assertIsInstance(mapped, numpy.memmap)
+        self.assertAlmostEquals(abs(first - mapped).max(), 0.)
+        del mapped
+
+        with self.assertRaises(ValueError):
+            n.get_array('first', mmap_mode='r+')
+
+        # Slices are read from disk without caching the array, and then from the cache
+        for _ in range(2):
+            part = n.get_array_slice('first', (2, slice(None), 1))
+            self.assertNotIsInstance(part, numpy.memmap)
+            self.assertAlmostEquals(abs(first[2, :, 1] - part).max(), 0.)
+            self.assertAlmostEquals(n.get_array_slice('first', (4, 2, 3)), first[4, 2, 3])
+            n.get_array('first')
+
+        with self.assertRaises(KeyError):
+            n.get_array_slice('nonexistent_array', 0)
+
+    def test_array_cache(self):
+        """
+        Check that the cache of the arrays respects its size
+        """
+        from aiida.orm.data.array import ArrayCache
+        import numpy
+
+        cache = ArrayCache(max_bytes=200)
+        cache.set('first', numpy.zeros(10))
+        cache.set('second', numpy.zeros(10))
+        self.assertEquals(cache.nbytes, 160)
+
+        # Using the first array makes the second one the least recently used, discarded to make space
+        cache.get('first')
+        cache.set('third', numpy.zeros(6))
+        self.assertIn('first', cache)
+        self.assertNotIn('second', cache)
+        self.assertEquals(cache.nbytes, 128)
+
+        # Arrays larger than the cache are not cached
+        cache.set('fourth', numpy.zeros(100))
+        self.assertNotIn('fourth', cache)
+
+        cache.clear()
+        self.assertEquals(len(cache), 0)
+        self.assertEquals(cache.nbytes, 0)
+
 
 class TestTrajectoryData(AiidaTestCase):
     """
@@ -2086,3 +2086,213 @@ class TestLinks(AiidaTestCase):
                               .format(qb.count()))
         finally:
             shutil.rmtree(tmp_folder, ignore_errors=True)
+
+
+class TestExportFiles(AiidaTestCase):
+    """
+    Tests for the export of the repository files of the nodes.
+    """
+
+    def setUp(self):
+        super(TestExportFiles, self).setUp()
+        self.clean_db()
+        self.insert_data()
+
+    def test_deduplicated_export(self):
+        """
+        Identical files are stored only once in a deduplicated archive and are
+        restored for every node when importing it.
+        """
+        import os
+        import shutil
+        import tarfile
+        import tempfile
+
+        from aiida.orm import load_node
+        from aiida.orm.data.singlefile import SinglefileData
+        from aiida.orm.importexport import export
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tmp_folder, 'content.txt')
+            with io.open(filename, 'w', encoding='utf8') as fhandle:
+                fhandle.write(u'identical content')
+
+            uuids = [SinglefileData(file=filename).store().uuid for _ in range(3)]
+
+            export_file = os.path.join(tmp_folder, 'export.tar.gz')
+            export([load_node(uuid) for uuid in uuids], outfile=export_file, silent=True,
+                   deduplicate=True, num_workers=2)
+
+            with tarfile.open(export_file, 'r:*') as tar:
+                stored_files = [member.name for member in tar.getmembers()
+                                if member.isfile() and member.name.startswith('files' + os.sep)]
+            self.assertEqual(len(stored_files), 1)
+
+            self.clean_db()
+            self.insert_data()
+
+            import_data(export_file, silent=True)
+
+            for uuid in uuids:
+                with io.open(load_node(uuid).get_file_abs_path(), 'r', encoding='utf8') as fhandle:
+                    self.assertEqual(fhandle.read(), u'identical content')
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def test_resume_export(self):
+        """
+        The repository folders of the nodes listed in the checkpoint file of an
+        interrupted export are not copied again.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.common.folders import Folder
+        from aiida.common.utils import export_shard_uuid
+        from aiida.orm.data.base import Int
+        from aiida.orm.importexport import export_tree, EXPORT_CHECKPOINT_FILENAME
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            copied, missing = Int(1).store(), Int(2).store()
+
+            folder = Folder(tmp_folder)
+            marker = os.path.join(tmp_folder, 'nodes', export_shard_uuid(copied.uuid), 'marker')
+            os.makedirs(os.path.dirname(marker))
+            io.open(marker, 'w', encoding='utf8').close()
+            with io.open(folder.get_abs_path(EXPORT_CHECKPOINT_FILENAME), 'w', encoding='utf8') as fhandle:
+                fhandle.write(u'{}\n'.format(copied.uuid))
+
+            export_tree([copied, missing], folder=folder, silent=True, checkpoint=True)
+
+            self.assertTrue(os.path.exists(marker))
+            self.assertTrue(folder.isdir(os.path.join('nodes', export_shard_uuid(missing.uuid))))
+            self.assertFalse(folder.isfile(EXPORT_CHECKPOINT_FILENAME))
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def test_zip_export(self):
+        """
+        The repository files of the nodes exported to a zip file are
+        restored when importing it.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.orm import load_node
+        from aiida.orm.data.singlefile import SinglefileData
+        from aiida.orm.importexport import export_zip
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tmp_folder, 'content.txt')
+            with io.open(filename, 'w', encoding='utf8') as fhandle:
+                fhandle.write(u'zipped content')
+            uuid = SinglefileData(file=filename).store().uuid
+
+            export_file = os.path.join(tmp_folder, 'export.zip')
+            export_zip([load_node(uuid)], outfile=export_file, silent=True)
+
+            self.clean_db()
+            self.insert_data()
+
+            import_data(export_file, silent=True)
+
+            with io.open(load_node(uuid).get_file_abs_path(), 'r', encoding='utf8') as fhandle:
+                self.assertEqual(fhandle.read(), u'zipped content')
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def test_resume_export_partial_folder(self):
+        """
+        The repository folder of a node that was being copied when an export
+        was interrupted is copied again from scratch, and not nested in it.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.common.folders import Folder, RepositoryFolder
+        from aiida.common.utils import export_shard_uuid
+        from aiida.orm.data.singlefile import SinglefileData
+        from aiida.orm.importexport import export_tree
+        from aiida.orm.node import Node
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tmp_folder, 'content.txt')
+            with io.open(filename, 'w', encoding='utf8') as fhandle:
+                fhandle.write(u'content')
+            node = SinglefileData(file=filename).store()
+
+            folder = Folder(os.path.join(tmp_folder, 'export'))
+            node_folder = os.path.join(folder.abspath, 'nodes', export_shard_uuid(node.uuid))
+            os.makedirs(node_folder)
+            io.open(os.path.join(node_folder, 'partial'), 'w', encoding='utf8').close()
+
+            export_tree([node], folder=folder, silent=True, checkpoint=True)
+
+            repository_folder = RepositoryFolder(section=Node._section_name, uuid=node.uuid).abspath
+            self.assertEqual(sorted(os.listdir(node_folder)), sorted(os.listdir(repository_folder)))
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def test_deduplicated_export_version(self):
+        """
+        A deduplicated archive is flagged as such, with its own export version.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.common.archive import DEDUPLICATED_EXPORT_VERSION, DEDUPLICATION_METADATA_KEY
+        from aiida.common.folders import Folder
+        from aiida.orm.data.base import Int
+        from aiida.orm.importexport import export_tree
+        import aiida.utils.json as json
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            folder = Folder(tmp_folder)
+            export_tree([Int(1).store()], folder=folder, silent=True, deduplicate=True)
+
+            with io.open(folder.get_abs_path('metadata.json'), 'r', encoding='utf8') as fhandle:
+                metadata = json.load(fhandle)
+            self.assertEqual(metadata['export_version'], DEDUPLICATED_EXPORT_VERSION)
+            self.assertTrue(metadata[DEDUPLICATION_METADATA_KEY])
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def test_restore_invalid_manifest(self):
+        """
+        A manifest referring to a path outside of its node folder is refused.
+        """
+        import os
+
+        from aiida.common.archive import (DEDUPLICATION_MANIFEST, DEDUPLICATION_METADATA_KEY,
+                                          FILES_EXPORT_SUBFOLDER, restore_deduplicated_files)
+        from aiida.common.folders import SandboxFolder
+        import aiida.utils.json as json
+
+        digest = 'a' * 40
+        for relpath in ['../../../../outside', '/tmp/outside']:
+            with SandboxFolder() as folder:
+                with folder.open('metadata.json', 'w') as fhandle:
+                    fhandle.write(json.dumps({DEDUPLICATION_METADATA_KEY: True}))
+                files_folder = folder.get_subfolder(FILES_EXPORT_SUBFOLDER, create=True)
+                with files_folder.open(digest, 'w') as fhandle:
+                    fhandle.write(u'content')
+                node_folder = folder.get_subfolder(os.path.join('nodes', 'aa', 'bb', 'cc'), create=True)
+                with node_folder.open(DEDUPLICATION_MANIFEST, 'w') as fhandle:
+                    fhandle.write(json.dumps({'folders': [], 'files': {relpath: digest}}))
+
+                with self.assertRaises(ValueError):
+                    restore_deduplicated_files(folder)
@@ -2226,3 +2226,99 @@ class TestNodeDeletion(AiidaTestCase):
             delete_nodes([called.pk], verbosity=2, force=True, follow_returns=True)
 
         self._check_existence(uuids_check_existence, uuids_check_deleted)
+
+    def test_deletion_chunks(self):
+        """
+        Deleting in chunks smaller than the number of nodes should delete all of them and their folders
+        """
+        nodes = [Node().store() for i in range(7)]
+        for i in range(6):
+            nodes[i + 1].add_link_from(nodes[i], link_type=LinkType.INPUT)
+        folders = [node.folder for node in nodes[2:]]
+
+        with Capturing():
+            delete_nodes([nodes[2].pk], force=True, verbosity=1, chunk_size=2, workers=2)
+
+        self._check_existence([n.uuid for n in nodes[:2]], [n.uuid for n in nodes[2:]])
+        for folder in folders:
+            self.assertFalse(folder.exists())
+
+    def test_deletion_resume(self):
+        """
+        An interrupted deletion should be completed by resume_delete_nodes, and block new deletions until then
+        """
+        import json
+        import os
+        import tempfile
+        from aiida.common.exceptions import InvalidOperation
+        from aiida.utils.delete_nodes import resume_delete_nodes
+
+        nodes = [Node().store() for i in range(3)]
+        folders = [node.folder for node in nodes]
+
+        handle, journal = tempfile.mkstemp()
+        os.close(handle)
+        # Emulate a confirmed deletion interrupted after recording the first chunk, with an incomplete last line
+        with io.open(journal, 'w', encoding='utf8') as handle:
+            handle.write(u'{}\n'.format(json.dumps({'pks': [node.pk for node in nodes[:2]]})))
+            handle.write(u'{}\n'.format(json.dumps({'pks': [nodes[2].pk]})))
+            handle.write(u'{}\n'.format(json.dumps({'total': len(nodes)})))
+            handle.write(u'{}\n'.format(json.dumps({'uuids': [nodes[0].uuid]})))
+            handle.write(u'{"uuids": ["')
+
+        with self.assertRaises(InvalidOperation):
+            delete_nodes([nodes[0].pk], force=True, journal=journal)
+
+        self.assertTrue(resume_delete_nodes(journal=journal, chunk_size=2))
+
+        self._check_existence([], [n.uuid for n in nodes])
+        for folder in folders:
+            self.assertFalse(folder.exists())
+        self.assertFalse(os.path.exists(journal))
+        self.assertFalse(resume_delete_nodes(journal=journal))
+
+    def test_deletion_resume_unconfirmed(self):
+        """
+        A deletion interrupted before it was confirmed should not delete anything when resumed
+        """
+        import json
+        import os
+        import tempfile
+        from aiida.utils.delete_nodes import resume_delete_nodes
+
+        nodes = [Node().store() for i in range(2)]
+
+        handle, journal = tempfile.mkstemp()
+        os.close(handle)
+        with io.open(journal, 'w', encoding='utf8') as handle:
+            handle.write(u'{}\n'.format(json.dumps({'pks': [node.pk for node in nodes]})))
+
+        self.assertFalse(resume_delete_nodes(journal=journal))
+
+        self._check_existence([n.uuid for n in nodes], [])
+        self.assertFalse(os.path.exists(journal))
+
+    def test_deletion_losses(self):
+        """
+        The calculations that are kept but lose a called calculation or a created data node should be reported
+        """
+        from aiida.orm.backends import construct_backend
+
+        caller, called, creator = [Calculation().store() for i in range(3)]
+        created = Data().store()
+        called.add_link_from(caller, link_type=LinkType.CALL, label='call')
+        created.add_link_from(creator, link_type=LinkType.CREATE, label='create')
+
+        query_manager = construct_backend().query_manager
+        link_types = [LinkType.CREATE, LinkType.INPUT]
+        losses = query_manager.get_deletion_closure_losses([called.pk], link_types)
+
+        self.assertEqual(losses, [(caller.pk, called.type, 'call', LinkType.CALL.value)])
+        self.assertEqual(
+            [row[0] for row in query_manager.iter_deletion_closure([called.pk], link_types, 1)], [called.pk])
+
+        losses = query_manager.get_deletion_closure_losses([caller.pk], link_types + [LinkType.CALL])
+        self.assertEqual(losses, [])
+
+        losses = query_manager.get_deletion_closure_losses([created.pk], link_types)
+        self.assertEqual(losses, [(creator.pk, created.type, 'create', LinkType.CREATE.value)])
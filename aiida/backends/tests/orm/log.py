@@ -15,7 +15,7 @@ import logging
 from six.moves import range
 
 from aiida.utils.timezone import now
-from aiida.common.log import LOG_LEVEL_REPORT
+from aiida.common.log import LOG_LEVEL_REPORT, flush_db_log_handlers
 from aiida.orm.log import OrderSpecifier, ASCENDING, DESCENDING
 from aiida.orm.backends import construct_backend
 from aiida.orm.calculation import Calculation
@@ -144,10 +144,64 @@ class TestBackendLog(AiidaTestCase):
 
         self.assertEquals(len(logs), 0)
 
-        # After storing the node, logs above log level should be stored
+        # After storing the node, logs above log level should be stored, once the handler is flushed
         calc.store()
         calc.logger.critical(message)
+        flush_db_log_handlers()
         logs = self._backend.logs.find()
 
         self.assertEquals(len(logs), 1)
         self.assertEquals(logs[0].message, message)
+
+    def test_db_log_handler_batch(self):
+        """
+        Verify that the db log handler writes the queued records together, with the whitelisted metadata only
+        """
+        from aiida.common.log import DBLogHandler
+
+        calc = Calculation().store()
+        handler = DBLogHandler(batch_size=1000, flush_interval=1000, metadata_keys=['lineno'])
+        logger = logging.getLogger('aiida.test_db_log_handler_batch')
+        logger.propagate = False
+        logger.addHandler(handler)
+
+        try:
+            for index in range(10):
+                logging.LoggerAdapter(logger, extra={'objpk': calc.pk, 'objname': 'node.'}).error('message %d', index)
+
+            self.assertEquals(len(self._backend.logs.find()), 0)
+            handler.flush()
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        logs = self._backend.logs.find(order_by=[OrderSpecifier('id', ASCENDING)])
+        self.assertEquals([log.message for log in logs], ['message {}'.format(index) for index in range(10)])
+        self.assertEquals(list(logs[0].metadata.keys()), ['lineno'])
+
+    def test_db_log_handler_after_fork(self):
+        """
+        Verify that a forked process neither writes the records queued by its parent nor relies on its thread
+        """
+        from aiida.common.log import DBLogHandler
+
+        calc = Calculation().store()
+        handler = DBLogHandler(batch_size=1000, flush_interval=1000)
+        logger = logging.getLogger('aiida.test_db_log_handler_after_fork')
+        logger.propagate = False
+        logger.addHandler(handler)
+
+        try:
+            adapter = logging.LoggerAdapter(logger, extra={'objpk': calc.pk, 'objname': 'node.'})
+            adapter.error('parent message')
+            handler._reset_after_fork()  # pylint: disable=protected-access
+            self.assertIsNone(handler._thread)  # pylint: disable=protected-access
+
+            adapter.error('child message')
+            self.assertIsNotNone(handler._thread)  # pylint: disable=protected-access
+            handler.flush()
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        self.assertEquals([log.message for log in self._backend.logs.find()], ['child message'])
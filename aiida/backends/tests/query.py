@@ -11,7 +11,6 @@
 from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
-import unittest
 
 from six.moves import range, zip
 
@@ -617,8 +616,6 @@ class TestAttributes(AiidaTestCase):
 
 
 class QueryBuilderDateTimeAttribute(AiidaTestCase):
-    @unittest.skipIf(settings.BACKEND == u'sqlalchemy',
-                     "SQLA doesn't have full datetime support in attributes")
     def test_date(self):
         from aiida.orm.querybuilder import QueryBuilder
         from aiida.utils import timezone
@@ -1000,6 +997,138 @@ class TestConsistency(AiidaTestCase):
         self.assertTrue(len(QueryBuilder().append(Node, project=['id', 'label']).all(batch_size=10)) > 99)
 
 
+class TestColumns(AiidaTestCase):
+    def test_iter_columns(self):
+        """
+        Test that iter_columns and to_arrays return the same values as all, as numpy arrays
+        """
+        import numpy
+        from aiida.common.exceptions import InputValidationError
+        from aiida.orm.data.float import Float
+        from aiida.orm.querybuilder import QueryBuilder
+
+        for value in range(25):
+            Float(value * 0.5).store()
+
+        qb = QueryBuilder().append(Float, project=['id', 'attributes.value'], tag='float')
+        expected = sorted(qb.all())
+
+        batches = list(qb.iter_columns(batch_size=10))
+        self.assertEqual([len(ids) for ids, values in batches], [10, 10, 5])
+        for ids, values in batches:
+            self.assertIsInstance(ids, numpy.ndarray)
+            self.assertIsInstance(values, numpy.ndarray)
+        self.assertEqual(sorted((pk, value) for ids, values in batches for pk, value in zip(ids, values)), expected)
+
+        arrays = qb.to_arrays(batch_size=10)
+        self.assertEqual(set(arrays['float'].keys()), set(['id', 'attributes.value']))
+        self.assertEqual(sorted(zip(arrays['float']['id'], arrays['float']['attributes.value'])), expected)
+        self.assertEqual(arrays['float']['attributes.value'].dtype, numpy.float64)
+
+        with self.assertRaises(InputValidationError):
+            list(QueryBuilder().append(Float, project=['*']).iter_columns())
+
+
+class TestLinkClosure(AiidaTestCase):
+
+    def tearDown(self):
+        from aiida.manage.database.closure import uninstall_link_closure
+        uninstall_link_closure()
+        super(TestLinkClosure, self).tearDown()
+
+    def get_descendants(self, node):
+        """Return the sorted list of the pk and depth of the descendants of a node, one per path."""
+        from aiida.orm import Node
+        from aiida.orm.querybuilder import QueryBuilder
+
+        qb = QueryBuilder()
+        qb.append(Node, filters={'id': node.pk}, tag='ancestor')
+        qb.append(Node, descendant_of='ancestor', project='id', edge_project='depth')
+        descendants = sorted(tuple(row) for row in qb.all())
+        self.assertEqual(qb.count(), len(descendants))
+        return descendants
+
+    def test_link_closure(self):
+        """
+        Test that the link closure table gives the same ancestors and descendants as the recursive query,
+        and that it is kept up to date when links are added or removed
+        """
+        from aiida.common.links import LinkType
+        from aiida.manage.database.closure import get_session, has_link_closure, install_link_closure
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.int import Int
+
+        data_in = Int(0).store()
+        calc1 = Calculation()
+        calc1.add_link_from(data_in, label='input', link_type=LinkType.INPUT)
+        calc1.store()
+        data1 = Int(1)
+        data1.add_link_from(calc1, label='output', link_type=LinkType.CREATE)
+        data1.store()
+        calc2 = Calculation()
+        calc2.add_link_from(data1, label='input', link_type=LinkType.INPUT)
+        calc2.add_link_from(data_in, label='shortcut', link_type=LinkType.INPUT)
+        calc2.store()
+        data2 = Int(2)
+        data2.add_link_from(calc2, label='output', link_type=LinkType.CREATE)
+        data2.store()
+
+        # There are two paths from data_in to calc2 and data2, of different lengths
+        expected = self.get_descendants(data_in)
+        self.assertEqual(expected, sorted([(calc1.pk, 0), (data1.pk, 1), (calc2.pk, 0), (calc2.pk, 2),
+                                           (data2.pk, 1), (data2.pk, 3)]))
+
+        self.assertFalse(has_link_closure())
+        install_link_closure()
+        self.assertTrue(has_link_closure())
+        self.assertEqual(self.get_descendants(data_in), expected)
+
+        calc3 = Calculation()
+        calc3.add_link_from(data2, label='input', link_type=LinkType.INPUT)
+        calc3.store()
+        self.assertEqual(self.get_descendants(data_in), sorted(expected + [(calc3.pk, 2), (calc3.pk, 4)]))
+
+        session = get_session()
+        session.execute('DELETE FROM db_dblink WHERE input_id = {} AND output_id = {}'.format(data_in.pk, calc2.pk))
+        session.commit()
+        self.assertEqual(self.get_descendants(data_in), sorted([(calc1.pk, 0), (data1.pk, 1), (calc2.pk, 2),
+                                                                (data2.pk, 3), (calc3.pk, 4)]))
+
+        session.execute('DELETE FROM db_dblink WHERE input_id = {} AND output_id = {}'.format(data1.pk, calc2.pk))
+        session.commit()
+        self.assertEqual(self.get_descendants(data_in), sorted([(calc1.pk, 0), (data1.pk, 1)]))
+
+    def test_link_closure_multiple_paths(self):
+        """
+        Test that the link closure table gives one row per path, as the recursive query, also for paths of the
+        same length and after links are removed
+        """
+        from aiida.common.links import LinkType
+        from aiida.manage.database.closure import get_session, install_link_closure
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.int import Int
+
+        data_in = Int(0).store()
+        calc = Calculation()
+        calc.add_link_from(data_in, label='first', link_type=LinkType.INPUT)
+        calc.add_link_from(data_in, label='second', link_type=LinkType.INPUT)
+        calc.store()
+        data_out = Int(1)
+        data_out.add_link_from(calc, label='output', link_type=LinkType.CREATE)
+        data_out.store()
+
+        expected = self.get_descendants(data_in)
+        self.assertEqual(expected, sorted([(calc.pk, 0), (calc.pk, 0), (data_out.pk, 1), (data_out.pk, 1)]))
+
+        install_link_closure()
+        self.assertEqual(self.get_descendants(data_in), expected)
+
+        session = get_session()
+        session.execute("DELETE FROM db_dblink WHERE input_id = {} AND label = 'second'".format(data_in.pk))
+        session.commit()
+        self.assertEqual(self.get_descendants(data_in), sorted([(calc.pk, 0), (data_out.pk, 1)]))
+
+
 class TestManager(AiidaTestCase):
     def test_statistics(self):
         """
@@ -14,6 +14,7 @@ Unittests for REST API
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import os
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.common.links import LinkType
@@ -39,6 +40,7 @@ class RESTApiTestCase(AiidaTestCase):
     _dummy_data = {}
     _PERPAGE_DEFAULT = 20
     _LIMIT_DEFAULT = 400
+    _cache_config = None
 
     @classmethod
     def setUpClass(cls, *args, **kwargs):
@@ -54,7 +56,11 @@ class RESTApiTestCase(AiidaTestCase):
         # connect the app and the api
         # Init the api by connecting it the the app (N.B. respect the following
         # order, api.__init__)
-        kwargs = dict(PREFIX=cls._url_prefix, PERPAGE_DEFAULT=cls._PERPAGE_DEFAULT, LIMIT_DEFAULT=cls._LIMIT_DEFAULT)
+        kwargs = dict(
+            PREFIX=cls._url_prefix,
+            PERPAGE_DEFAULT=cls._PERPAGE_DEFAULT,
+            LIMIT_DEFAULT=cls._LIMIT_DEFAULT,
+            CACHE_CONFIG=cls._cache_config)
 
         cls.app = App(__name__)
         cls.app.config['TESTING'] = True
@@ -614,6 +620,63 @@ class RESTApiTestSuite(RESTApiTestCase):
         """
         pass
 
+    ############### keyset pagination and count modes #######################
+    def test_computers_list_after(self):
+        """
+        Walk through the computer list with keyset pagination, following the
+        links to the next pages
+        """
+        computer_ids = sorted(computer["id"] for computer in self.get_dummy_data()["computers"])
+
+        url = self.get_url_prefix() + "/computers?limit=2&after=0"
+        visited_ids = []
+        with self.app.test_client() as client:
+            while url:
+                rv_obj = client.get(url)
+                response = json.loads(rv_obj.data)
+                visited_ids.extend(computer["id"] for computer in response["data"]["computers"])
+
+                link = rv_obj.headers.get("Link")
+                url = link[link.index("<") + 1:link.index(">")] if link else None
+
+        self.assertEqual(visited_ids, computer_ids)
+
+    def test_computers_list_after_descending(self):
+        """
+        Get the computers preceding a given id with keyset pagination
+        """
+        computer_ids = sorted(computer["id"] for computer in self.get_dummy_data()["computers"])
+        url = self.get_url_prefix() + "/computers?orderby=-id&after=" + str(computer_ids[2])
+
+        with self.app.test_client() as client:
+            response = json.loads(client.get(url).data)
+            self.assertEqual([computer["id"] for computer in response["data"]["computers"]],
+                             computer_ids[1::-1])
+
+    def test_computers_list_after_page(self):
+        """
+        Keyset pagination is incompatible with pages
+        """
+        RESTApiTestCase.process_test(
+            self,
+            "computers",
+            "/computers/page/1?after=1",
+            expected_errormsg="after key is incompatible with pages and offset")
+
+    def test_computers_list_count_modes(self):
+        """
+        The total count is estimated or omitted depending on the count mode
+        """
+        with self.app.test_client() as client:
+            rv_obj = client.get(self.get_url_prefix() + "/computers?count=estimate")
+            self.assertEqual(rv_obj.headers["X-Total-Count-Estimated"], "true")
+            self.assertGreaterEqual(int(rv_obj.headers["X-Total-Count"]), 0)
+
+            rv_obj = client.get(self.get_url_prefix() + "/computers?count=none")
+            self.assertNotIn("X-Total-Count", rv_obj.headers)
+            response = json.loads(rv_obj.data)
+            self.assertEqual(len(response["data"]["computers"]), len(self.get_dummy_data()["computers"]))
+
     ############### list filter combinations #######################
     def test_computers_filter_mixed1(self):
         """
@@ -829,6 +892,41 @@ class RESTApiTestSuite(RESTApiTestCase):
         cif = load_node(node_uuid)._prepare_cif()[0]  # pylint: disable=protected-access
         self.assertEqual(rv_obj.data, cif)
 
+    ############### stream #############
+    def test_nodes_stream(self):
+        """
+        Streaming should return all the nodes, one JSON object per line
+        """
+        url = self.get_url_prefix() + '/calculations/stream/?orderby=id'
+
+        with self.app.test_client() as client:
+            rv_obj = client.get(url)
+            self.assertEqual(rv_obj.status_code, 200)
+            self.assertEqual(rv_obj.mimetype, 'application/x-ndjson')
+            rows = [json.loads(line) for line in rv_obj.data.decode('utf-8').splitlines()]
+
+        expected = sorted(calc['uuid'] for calc in self.get_dummy_data()['calculations'])
+        self.assertEqual(sorted(row['uuid'] for row in rows), expected)
+        self.assertEqual([row['id'] for row in rows], sorted(row['id'] for row in rows))
+
+    def test_nodes_stream_gzip(self):
+        """
+        Streaming should compress the response if the client accepts gzip
+        """
+        import gzip
+        import io
+
+        url = self.get_url_prefix() + '/calculations/stream/?limit=1'
+
+        with self.app.test_client() as client:
+            rv_obj = client.get(url, headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(rv_obj.headers['Content-Encoding'], 'gzip')
+            with gzip.GzipFile(fileobj=io.BytesIO(rv_obj.data)) as handle:
+                lines = handle.read().decode('utf-8').splitlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertIn('uuid', json.loads(lines[0]))
+
     ############### schema #############
     def test_schema(self):
         """
@@ -851,3 +949,99 @@ class RESTApiTestSuite(RESTApiTestCase):
                 available_properties = response["data"]["fields"].keys()
                 for prop in response["data"]["ordering"]:
                     self.assertIn(prop, available_properties)
+
+
+class RESTApiCacheTestSuite(RESTApiTestCase):
+    """
+    Test the caching of the results of the node endpoints and the ETag support
+    """
+    _cache_config = {'CACHE_TYPE': 'memory'}
+
+    def setUp(self):
+        from aiida.restapi.common.cache import get_response_cache
+        super(RESTApiCacheTestSuite, self).setUp()
+        get_response_cache(self._cache_config).clear()
+
+    def test_not_modified(self):
+        """
+        A request with the ETag of the previous response should be answered with 304 Not Modified
+        """
+        url = self.get_url_prefix() + '/calculations/'
+
+        with self.app.test_client() as client:
+            rv_obj = client.get(url)
+            self.assertEqual(rv_obj.status_code, 200)
+            etag = rv_obj.headers['ETag']
+
+            rv_obj = client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(rv_obj.status_code, 304)
+            self.assertEqual(rv_obj.headers['ETag'], etag)
+
+            rv_obj = client.get(url + '?limit=1', headers={'If-None-Match': etag})
+            self.assertEqual(rv_obj.status_code, 200)
+
+    def test_cached_results_invalidated(self):
+        """
+        Cached results should be returned until the node changes
+        """
+        from aiida.orm import load_node
+
+        node_uuid = self.get_dummy_data()["calculations"][1]["uuid"]
+        url = self.get_url_prefix() + '/calculations/' + str(node_uuid) + '/content/extras'
+
+        with self.app.test_client() as client:
+            rv_obj = client.get(url)
+            etag = rv_obj.headers['ETag']
+            self.assertNotIn('cached', json.loads(rv_obj.data)['data']['extras'])
+
+            rv_obj = client.get(url)
+            self.assertEqual(rv_obj.headers['ETag'], etag)
+
+            load_node(node_uuid).set_extra('cached', False)
+
+            rv_obj = client.get(url)
+            self.assertNotEqual(rv_obj.headers['ETag'], etag)
+            self.assertEqual(json.loads(rv_obj.data)['data']['extras']['cached'], False)
+
+    def test_list_etag_invalidated(self):
+        """
+        The ETag of a list should change when any node changes
+        """
+        from aiida.orm import load_node
+
+        node_uuid = self.get_dummy_data()["calculations"][1]["uuid"]
+        url = self.get_url_prefix() + '/calculations/'
+
+        with self.app.test_client() as client:
+            etag = client.get(url).headers['ETag']
+
+            load_node(node_uuid).set_extra('list_cached', False)
+
+            rv_obj = client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(rv_obj.status_code, 200)
+            self.assertNotEqual(rv_obj.headers['ETag'], etag)
+
+    def test_filesystem_backend(self):
+        """
+        The filesystem backend should store the entries as files and discard the oldest ones when full
+        """
+        import shutil
+        import tempfile
+        from aiida.restapi.common.cache import FileSystemCacheBackend
+
+        directory = tempfile.mkdtemp()
+        try:
+            backend = FileSystemCacheBackend(directory, maxsize=2)
+            self.assertIsNone(backend.get('first'))
+
+            backend.set('first', (None, {'data': [1, 2]}))
+            self.assertEqual(backend.get('first'), (None, {'data': [1, 2]}))
+
+            backend.set('second', (None, {}))
+            backend.set('third', (None, {}))
+            self.assertEqual(len(os.listdir(directory)), 2)
+
+            backend.clear()
+            self.assertIsNone(backend.get('third'))
+        finally:
+            shutil.rmtree(directory)
@@ -12,10 +12,12 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
-import six
+import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.work.persistence import AiiDAPersister
+from aiida.common.extendeddicts import AttributeDict
+from aiida.utils import serialize
+from aiida.work.persistence import AiiDAPersister, CONTEXT_KEY, get_object_loader
 from aiida.work import Process
 from aiida.work.test_utils import DummyProcess
 from aiida import work
@@ -61,7 +63,34 @@ class TestAiiDAPersister(AiidaTestCase):
         process = DummyProcess()
 
         self.persister.save_checkpoint(process)
-        self.assertTrue(isinstance(process.calc.checkpoint, six.string_types))
+        self.persister.load_checkpoint(process.pid)
+        self.assertIsNone(process.calc.checkpoint)
 
         self.persister.delete_checkpoint(process.pid)
-        self.assertEquals(process.calc.checkpoint, None)
+        with self.assertRaises(plumpy.PersistenceError):
+            self.persister.load_checkpoint(process.pid)
+
+    def test_save_load_delta(self):
+        """Only the changed entries are written, and a new persister loads the latest state."""
+        process = DummyProcess()
+        bundle = self.persister.save_checkpoint(process)
+
+        bundle[CONTEXT_KEY] = AttributeDict({'first': 1, 'second': [2, 3]})
+        self.persister.save_bundle(process.pid, bundle)
+        bundle[CONTEXT_KEY]['second'].append(4)
+        self.persister.save_bundle(process.pid, bundle)
+
+        bundle_loaded = AiiDAPersister().load_checkpoint(process.pid)
+        self.assertDictEqual(bundle, bundle_loaded)
+        self.assertIsInstance(bundle_loaded[CONTEXT_KEY], AttributeDict)
+
+    def test_load_legacy_checkpoint(self):
+        """A checkpoint stored in the attributes is loaded, and removed when the next checkpoint is saved."""
+        process = DummyProcess()
+        bundle = plumpy.Bundle(process, plumpy.LoadSaveContext(loader=get_object_loader()))
+        process.calc.set_checkpoint(serialize.serialize(bundle))
+
+        self.assertDictEqual(bundle, self.persister.load_checkpoint(process.pid))
+
+        self.persister.save_checkpoint(process)
+        self.assertIsNone(process.calc.checkpoint)
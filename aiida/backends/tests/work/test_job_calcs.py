@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import contextlib
+import time
+
+import mock
+from tornado import concurrent, gen, ioloop
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.scheduler.datastructures import JobInfo, JOB_STATES
+from aiida.work.job_calcs import JobsList, SubmissionsList
+
+
+class DummyTransportQueue(object):
+    """A transport queue whose transport requests are resolved by the test."""
+
+    def __init__(self, loop):
+        self._loop = loop
+        self.transport_requests = []
+
+    def loop(self):
+        return self._loop
+
+    @contextlib.contextmanager
+    def request_transport(self, authinfo):  # pylint: disable=unused-argument
+        request = concurrent.Future()
+        self.transport_requests.append(request)
+        yield request
+
+
+class DummyCommunicator(object):
+    """A communicator that delivers the broadcasts to its subscribers straight away."""
+
+    def __init__(self):
+        self.subscribers = []
+        self.broadcasts = []
+
+    def add_broadcast_subscriber(self, subscriber):
+        self.subscribers.append(subscriber)
+
+    def remove_broadcast_subscriber(self, subscriber):
+        self.subscribers.remove(subscriber)
+
+    def broadcast_send(self, body, sender=None, subject=None, correlation_id=None):
+        self.broadcasts.append(body)
+        for subscriber in list(self.subscribers):
+            subscriber(body, sender=sender, subject=subject, correlation_id=correlation_id)
+
+
+@gen.coroutine
+def resolve_transport(transport_queue):
+    """Wait for a transport to be requested from the queue and give it one."""
+    while not transport_queue.transport_requests:
+        yield gen.moment
+    transport_queue.transport_requests.pop(0).set_result(mock.Mock())
+
+
+def get_job_info(job_id, job_state):
+    """Return a JobInfo of the given job."""
+    job_info = JobInfo()
+    job_info.job_id = job_id
+    job_info.job_state = job_state
+    return job_info
+
+
+class TestJobsListBroadcast(AiidaTestCase):
+    """Tests for the sharing of the jobs polled from the scheduler between jobs lists."""
+
+    def setUp(self):
+        super(TestJobsListBroadcast, self).setUp()
+        self.loop = ioloop.IOLoop()
+        self.transport_queue = DummyTransportQueue(self.loop)
+        self.communicator = DummyCommunicator()
+
+        self.scheduler = mock.Mock()
+        self.scheduler.get_feature.return_value = True
+        self.scheduler.getJobs.return_value = {'1': get_job_info('1', JOB_STATES.RUNNING)}
+        self.scheduler.get_detailed_jobsinfo.return_value = {}
+
+        self.authinfo = mock.Mock()
+        self.authinfo.id = 1
+        self.authinfo.computer.get_minimum_job_poll_interval.return_value = 10.
+        self.authinfo.computer.get_scheduler.return_value = self.scheduler
+
+    def tearDown(self):
+        self.loop.close()
+        super(TestJobsListBroadcast, self).tearDown()
+
+    def get_jobs_list(self):
+        return JobsList(self.authinfo, self.transport_queue, self.communicator)
+
+    def get_body(self, poll_time, job_ids=None):
+        return {
+            'job_ids': job_ids,
+            'time': poll_time,
+            'jobs': {'1': get_job_info('1', JOB_STATES.RUNNING).serialize()},
+        }
+
+    def test_update_from_broadcast(self):
+        """The requests made before the poll are resolved, with None for the jobs missing from the poll."""
+        jobs_list = self.get_jobs_list()
+        with jobs_list.request_job_info_update('1') as request1, jobs_list.request_job_info_update('2') as request2:
+            jobs_list._update_from_broadcast(self.get_body(time.time() + 1.))
+
+            self.assertEqual(request1.result().job_state, JOB_STATES.RUNNING)
+            self.assertIsNone(request2.result())
+
+        self.assertIsNotNone(jobs_list.get_last_updated())
+
+    def test_update_from_older_broadcast(self):
+        """The requests made after the poll are left pending."""
+        jobs_list = self.get_jobs_list()
+        with jobs_list.request_job_info_update('1') as request1, jobs_list.request_job_info_update('2') as request2:
+            jobs_list._update_from_broadcast(self.get_body(time.time() - 1.))
+
+            self.assertFalse(request1.done())
+            self.assertFalse(request2.done())
+
+    def test_update_from_broadcast_job_ids(self):
+        """The requests of the jobs that were not queried are left pending."""
+        jobs_list = self.get_jobs_list()
+        with jobs_list.request_job_info_update('1') as request1, jobs_list.request_job_info_update('2') as request2:
+            jobs_list._update_from_broadcast(self.get_body(time.time() + 1., job_ids=['1']))
+
+            self.assertTrue(request1.done())
+            self.assertFalse(request2.done())
+
+    def test_shared_poll(self):
+        """The jobs polled by one list resolve the requests of another subscribed one."""
+        polling_list = self.get_jobs_list()
+        following_list = self.get_jobs_list()
+        # Let the follower believe it just polled, such that it waits for the broadcast
+        following_list._last_updated = time.time()
+
+        @gen.coroutine
+        def run():
+            with polling_list.request_job_info_update('1') as own_request:
+                with following_list.request_job_info_update('1') as request:
+                    self.assertEqual(len(self.communicator.subscribers), 2)
+                    yield resolve_transport(self.transport_queue)
+                    job_info = yield gen.with_timeout(self.loop.time() + 5., request)
+                    own_job_info = yield own_request
+
+            raise gen.Return((job_info, own_job_info))
+
+        job_info, own_job_info = self.loop.run_sync(run)
+
+        self.assertEqual(job_info.job_state, JOB_STATES.RUNNING)
+        self.assertEqual(own_job_info.job_state, JOB_STATES.RUNNING)
+        self.assertEqual(self.scheduler.getJobs.call_count, 1)
+        self.assertEqual(len(self.communicator.broadcasts), 1)
+        self.assertIsNone(self.communicator.broadcasts[0]['job_ids'])
+        self.assertIn('time', self.communicator.broadcasts[0])
+
+
+class TestSubmissionsList(AiidaTestCase):
+    """Tests for the list of pending job submissions."""
+
+    def setUp(self):
+        super(TestSubmissionsList, self).setUp()
+        self.loop = ioloop.IOLoop()
+        self.transport_queue = DummyTransportQueue(self.loop)
+        self.submissions_list = SubmissionsList(mock.Mock(), self.transport_queue, window=0.)
+
+    def tearDown(self):
+        self.loop.close()
+        super(TestSubmissionsList, self).tearDown()
+
+    def test_submitted_together(self):
+        """The jobs requested within the window are submitted with a single call."""
+
+        @gen.coroutine
+        def submit(calculation):
+            with self.submissions_list.request_submission(calculation, 'script.sh') as request:
+                job_id = yield request
+            raise gen.Return(job_id)
+
+        @gen.coroutine
+        def run():
+            job_ids = yield [submit('calc1'), submit('calc2'), resolve_transport(self.transport_queue)]
+            raise gen.Return(job_ids[:2])
+
+        with mock.patch('aiida.daemon.execmanager.submit_calculations', return_value=['1', '2']) as submit_mock:
+            job_ids = self.loop.run_sync(run)
+
+        self.assertEqual(job_ids, ['1', '2'])
+        self.assertEqual(submit_mock.call_count, 1)
+        self.assertEqual(submit_mock.call_args[0][0], [('calc1', 'script.sh'), ('calc2', 'script.sh')])
+
+    def test_failures(self):
+        """A job that fails to submit sets the exception on its own request, a failed batch on all of them."""
+
+        @gen.coroutine
+        def submit(calculation):
+            with self.submissions_list.request_submission(calculation, 'script.sh') as request:
+                try:
+                    yield request
+                except RuntimeError as exception:
+                    raise gen.Return(str(exception))
+            raise gen.Return(None)
+
+        @gen.coroutine
+        def run():
+            results = yield [submit('calc1'), submit('calc2'), resolve_transport(self.transport_queue)]
+            raise gen.Return(results[:2])
+
+        with mock.patch('aiida.daemon.execmanager.submit_calculations', return_value=['1', RuntimeError('job')]):
+            self.assertEqual(self.loop.run_sync(run), [None, 'job'])
+
+        with mock.patch('aiida.daemon.execmanager.submit_calculations', side_effect=RuntimeError('batch')):
+            self.assertEqual(self.loop.run_sync(run), ['batch', 'batch'])
+
+    def test_withdrawn_in_window(self):
+        """A request left before the window has passed is not submitted."""
+        self.submissions_list = SubmissionsList(mock.Mock(), self.transport_queue, window=0.1)
+
+        @gen.coroutine
+        def withdraw():
+            with self.submissions_list.request_submission('calc1', 'script.sh'):
+                pass
+            yield gen.sleep(0.2)
+
+        with mock.patch('aiida.daemon.execmanager.submit_calculations') as submit_mock:
+            self.loop.run_sync(withdraw)
+
+        self.assertFalse(submit_mock.called)
+        self.assertEqual(self.transport_queue.transport_requests, [])
+
+    def test_withdrawn_waiting_for_transport(self):
+        """A request left while its batch waits for the transport is left out of the batch."""
+
+        @gen.coroutine
+        def withdraw():
+            with self.submissions_list.request_submission('calc1', 'script.sh'):
+                while not self.transport_queue.transport_requests:
+                    yield gen.moment
+
+        @gen.coroutine
+        def submit():
+            with self.submissions_list.request_submission('calc2', 'script.sh') as request:
+                job_id = yield request
+            raise gen.Return(job_id)
+
+        @gen.coroutine
+        def run():
+            submitted = submit()
+            yield withdraw()
+            yield resolve_transport(self.transport_queue)
+            job_id = yield submitted
+            raise gen.Return(job_id)
+
+        with mock.patch('aiida.daemon.execmanager.submit_calculations', return_value=['2']) as submit_mock:
+            self.assertEqual(self.loop.run_sync(run), '2')
+
+        self.assertEqual(submit_mock.call_args[0][0], [('calc2', 'script.sh')])
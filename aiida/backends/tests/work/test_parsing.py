@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import threading
+
+from tornado import ioloop
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.daemon import execmanager
+from aiida.orm.calculation.job import JobCalculation
+from aiida.work import ExitCode
+from aiida.work.parsing import ParserExecutor
+
+
+class TestParserExecutor(AiidaTestCase):
+    """ Tests for the parser executor """
+
+    def setUp(self):
+        super(TestParserExecutor, self).setUp()
+        self.calc = JobCalculation(
+            computer=self.computer, resources={
+                'num_machines': 1,
+                'num_mpiprocs_per_machine': 1
+            }).store()
+        self.threads = []
+
+        def parse_results(job, retrieved_temporary_folder=None):
+            self.threads.append(threading.current_thread())
+            self.assertEqual(job.pk, self.calc.pk)
+            return ExitCode(0)
+
+        # Replace the actual parsing, which requires a calculation that was run
+        self.original_parse_results = execmanager.parse_results
+        execmanager.parse_results = parse_results
+
+    def tearDown(self):
+        execmanager.parse_results = self.original_parse_results
+        super(TestParserExecutor, self).tearDown()
+
+    def test_parse_on_loop(self):
+        """ Without workers, the parser should run on the thread of the loop """
+        executor = ParserExecutor()
+        exit_code = ioloop.IOLoop.current().run_sync(lambda: executor.parse(self.calc))
+
+        self.assertEqual(exit_code, ExitCode(0))
+        self.assertEqual(self.threads, [threading.current_thread()])
+
+    def test_parse_in_thread(self):
+        """ With workers, the parser should run in another thread and its time should be recorded """
+        executor = ParserExecutor(max_workers=1)
+        try:
+            for _ in range(2):
+                exit_code = ioloop.IOLoop.current().run_sync(lambda: executor.parse(self.calc))
+                self.assertEqual(exit_code, ExitCode(0))
+        finally:
+            executor.close()
+
+        self.assertEqual(len(self.threads), 2)
+        self.assertNotIn(threading.current_thread(), self.threads)
+
+        statistics = executor.get_statistics()
+        self.assertEqual(list(statistics.keys()), ['none'])
+        self.assertEqual(statistics['none']['count'], 2)
+
+    def test_parse_in_thread_releases_connection(self):
+        """ The connection to the database of the worker thread should be released after each parse """
+        import mock
+
+        executor = ParserExecutor(max_workers=1)
+        try:
+            with mock.patch('aiida.backends.utils.release_thread_database_connection') as release:
+                for _ in range(2):
+                    ioloop.IOLoop.current().run_sync(lambda: executor.parse(self.calc))
+        finally:
+            executor.close()
+
+        self.assertEqual(release.call_count, 2)
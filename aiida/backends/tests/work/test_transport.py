@@ -143,3 +143,44 @@ class TestTransportQueue(AiidaTestCase):
 
         finally:
             transport_class._DEFAULT_SAFE_OPEN_INTERVAL = original_interval
+
+    def test_idle_transport_reused(self):
+        """Verify that with an idle timeout, an unused transport is kept open and given to the next request."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        try:
+            trans1 = loop.run_sync(lambda: test())
+            self.assertTrue(trans1.is_open)
+            trans2 = loop.run_sync(lambda: test())
+            self.assertIs(trans1, trans2)
+        finally:
+            queue.close()
+
+        self.assertFalse(trans1.is_open)
+
+    def test_dead_transport_discarded(self):
+        """Verify that an idle transport whose connection was lost is replaced by a new one."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        try:
+            trans1 = loop.run_sync(lambda: test())
+            trans1.is_alive = lambda: False
+            trans2 = loop.run_sync(lambda: test())
+            self.assertIsNot(trans1, trans2)
+            self.assertFalse(trans1.is_open)
+        finally:
+            queue.close()
@@ -11,6 +11,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 import inspect
+import logging
 
 import six
 import plumpy
@@ -606,6 +607,8 @@ class TestWorkchain(AiidaTestCase):
                 return
 
             def check(self):
+                for handler in logging.getLogger('aiida').handlers:
+                    handler.flush()
                 logs = self._backend.logs.find()
                 assert len(logs) == 1
 
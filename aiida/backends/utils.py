@@ -143,6 +143,43 @@ def get_global_setting_description(key):
     return get_global_setting_description(key)
 
 
+def close_database_connections():
+    """
+    Close the connections of this process to the database, for example before forking
+    processes that use the database, such that they do not share the connections.
+    New connections are opened when the database is used again.
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connections
+        connections.close_all()
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends import sqlalchemy as sa
+        session = sa.get_scoped_session()
+        if session is not None:
+            session.close()
+        if sa.engine is not None:
+            sa.engine.dispose()
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
+def release_thread_database_connection():
+    """
+    Release the connection to the database of the current thread, for example at the end of the work of a
+    thread of a pool, such that its session or connection is not kept open while the thread is idle.
+    A new connection is opened when the thread uses the database again.
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection
+        connection.close()
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends import sqlalchemy as sa
+        if sa.scopedsessionclass is not None:
+            sa.scopedsessionclass.remove()
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
 def get_backend_type():
     """
     Set the schema version stored in the DB. Use only if you know what
@@ -175,6 +175,10 @@ def calculation_show(calculations):
 def calculation_logshow(calculations):
     """Show the log for one or multiple calculations."""
     from aiida.cmdline.utils.common import get_calculation_log_report
+    from aiida.common.log import flush_db_log_handlers
+
+    # The records logged by this process may still be queued by the database log handler
+    flush_db_log_handlers()
 
     for calculation in calculations:
         echo.echo(get_calculation_log_report(calculation))
@@ -82,6 +82,7 @@ def data_list(datatype, columns, elements, elements_only, formula_mode, past_day
         'Formula': 'attributes.formula',
         'Kinds': 'attributes.kinds',
         'Sites': 'attributes.sites',
+        'Site storage': 'attributes.site_storage',
         'Formulae': 'attributes.formulae',
         'Source': 'attributes.source',
         'Source.URI': 'attributes.source.uri',
@@ -44,15 +44,16 @@ def structure():
 def structure_list(elements, raw, formula_mode, past_days, groups, all_users):
     """List stored StructureData objects."""
     from aiida.orm.data.structure import StructureData
-    from aiida.orm.data.structure import (get_formula, get_symbols_string)
+    from aiida.orm.data.structure import SITE_STORAGE_ARRAYS, get_formula_from_attributes
     from tabulate import tabulate
 
     elements_only = False
-    lst = data_list(StructureData, LIST_PROJECT_HEADERS, elements, elements_only, formula_mode, past_days, groups,
-                    all_users)
+    # The site storage tells whether the sites are in the attributes, see StructureData.set_site_storage
+    lst = data_list(StructureData, LIST_PROJECT_HEADERS + ['Site storage'], elements, elements_only, formula_mode,
+                    past_days, groups, all_users)
 
     entry_list = []
-    for [pid, label, akinds, asites] in lst:
+    for [pid, label, akinds, asites, asite_storage] in lst:
         # If symbols are defined there is a filtering of the structures
         # based on the element
         # When QueryBuilder will support this (attribute)s filtering,
@@ -66,20 +67,11 @@ def structure_list(elements, raw, formula_mode, past_days, groups, all_users):
                 echo.echo_critical("Not implemented elements-only search")
 
         # We want only the StructureData that have attributes
-        if akinds is None or asites is None:
+        if akinds is None or (asites is None and asite_storage != SITE_STORAGE_ARRAYS):
             continue
 
-        symbol_dict = {}
-        for k in akinds:
-            symbols = k['symbols']
-            weights = k['weights']
-            symbol_dict[k['name']] = get_symbols_string(symbols, weights)
-
         try:
-            symbol_list = []
-            for site in asites:
-                symbol_list.append(symbol_dict[site['kind_name']])
-            formula = get_formula(symbol_list, mode=formula_mode)
+            formula = get_formula_from_attributes(pid, akinds, asites, asite_storage, mode=formula_mode)
         # If for some reason there is no kind with the name
         # referenced by the site
         except KeyError:
@@ -15,7 +15,9 @@ from __future__ import absolute_import
 import click
 
 from aiida.cmdline.commands.cmd_verdi import verdi
+from aiida.cmdline.utils import decorators
 from aiida.cmdline.utils import echo
+from aiida.manage.repository import PACK_MIN_AGE
 
 
 @verdi.group('database')
@@ -70,3 +72,71 @@ def database_integrity(apply_patch):
             echo.echo_success('integrity patch completed')
         else:
             echo.echo_success('dry-run of integrity patch completed')
+
+
+@verdi_database.group('link-closure')
+def verdi_database_link_closure():
+    """Manage the transitive closure table that speeds up ancestor and descendant queries."""
+    pass
+
+
+@verdi_database_link_closure.command('install')
+@decorators.with_dbenv()
+def database_link_closure_install():
+    """Build the transitive closure table of the links between nodes.
+
+    Once installed, the table is kept up to date when links are stored or deleted and the QueryBuilder uses it for all
+    the `ancestor_of` and `descendant_of` relationships. Building the table for a large database can take a while and
+    the links cannot be modified in the meantime.
+    """
+    from aiida.manage.database.closure import install_link_closure
+
+    try:
+        install_link_closure()
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
+    else:
+        echo.echo_success('link closure table installed')
+
+
+@verdi_database_link_closure.command('uninstall')
+@decorators.with_dbenv()
+def database_link_closure_uninstall():
+    """Remove the transitive closure table of the links between nodes."""
+    from aiida.manage.database.closure import uninstall_link_closure
+
+    uninstall_link_closure()
+    echo.echo_success('link closure table removed')
+
+
+@verdi_database.group('repository')
+def verdi_database_repository():
+    """Manage the file repository."""
+    pass
+
+
+@verdi_database_repository.command('pack')
+@click.option(
+    '--min-age',
+    type=click.INT,
+    default=PACK_MIN_AGE,
+    show_default=True,
+    help='Skip the node folders that were modified less than this many seconds ago.')
+@decorators.with_dbenv()
+def database_repository_pack(min_age):
+    """Move the node files of the repository into the pack files of the object store.
+
+    Only works with the 'objectstore' repository backend, see the repository.backend property. New files are first
+    written as loose files, and files of nodes that are accessed are checked out to the disk, so this command should
+    run regularly, e.g. from cron, to keep the number of files in the repository small. It can run while the daemon
+    is running: the processes check out again the node folders that were packed when they next access them.
+    """
+    from aiida.common.exceptions import ConfigurationError
+    from aiida.manage.repository import pack_repository
+
+    try:
+        folders, objects = pack_repository(min_age=min_age)
+    except ConfigurationError as exception:
+        echo.echo_critical(str(exception))
+    else:
+        echo.echo_success('moved {} node folders to the object store and packed {} objects'.format(folders, objects))
@@ -89,8 +89,26 @@ def inspect(archive, version, data, meta_data):
     default=False,
     show_default=True,
     help='Follow reverse CALL links (recursively) when calculating the node set to export.')
+@click.option(
+    '-w',
+    '--workers',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of threads used to copy the repository files (tar.gz format only).')
+@click.option(
+    '--deduplicate',
+    is_flag=True,
+    default=False,
+    help='Store identical repository files only once in the archive (tar.gz format only).')
+@click.option(
+    '--work-folder',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Folder in which the archive is prepared; rerun with the same folder to resume an interrupted export '
+    '(tar.gz format only).')
 def create(output_file, codes, computers, groups, nodes, input_forward, create_reversed, return_reversed, call_reversed,
-           force, archive_format):
+           workers, deduplicate, work_folder, force, archive_format):
     """
     Export various entities, such as Codes, Computers, Groups and Nodes, to an archive file for backup or
     sharing purposes.
@@ -127,6 +145,10 @@ def create(output_file, codes, computers, groups, nodes, input_forward, create_r
         kwargs.update({'use_compression': False})
     elif archive_format == 'tar.gz':
         export_function = export
+        kwargs.update({'num_workers': workers, 'deduplicate': deduplicate, 'work_folder': work_folder})
+
+    if archive_format != 'tar.gz' and (workers > 1 or deduplicate or work_folder is not None):
+        echo.echo_critical('the --workers, --deduplicate and --work-folder options require the tar.gz format')
 
     try:
         export_function(entities, outfile=output_file, **kwargs)
@@ -28,8 +28,15 @@ from aiida.common import exceptions
     cls=MultipleValueOption,
     help="Discover all URL targets pointing to files with the .aiida extension for these HTTP addresses. "
     "Automatically discovered archive URLs will be downloadeded and added to ARCHIVES for importing")
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stream the archive data and import it in batches of this many entries, keeping the memory usage bounded "
+    "for very large archives. Only supported for the SQLAlchemy backend.")
 @decorators.with_dbenv()
-def cmd_import(archives, webpages):
+def cmd_import(archives, webpages, batch_size):
     """Import one or multiple exported AiiDA archives
 
     The ARCHIVES can be specified by their relative or absolute file path, or their HTTP URL.
@@ -41,6 +48,12 @@ def cmd_import(archives, webpages):
     from aiida.common.folders import SandboxFolder
     from aiida.orm.importexport import get_valid_import_links, import_data
 
+    from aiida.backends.profile import BACKEND_SQLA
+    from aiida.backends.settings import BACKEND
+
+    if batch_size is not None and BACKEND != BACKEND_SQLA:
+        echo.echo_critical('the --batch-size option is only supported for profiles with the SQLAlchemy backend')
+
     archives_url = []
     archives_file = []
 
@@ -71,7 +84,7 @@ def cmd_import(archives, webpages):
         echo.echo_info('importing archive {}'.format(archive))
 
         try:
-            import_data(archive)
+            import_data(archive, batch_size=batch_size)
         except exceptions.IncompatibleArchiveVersionError as exception:
             echo.echo_warning('{} cannot be imported: {}'.format(archive, exception))
             echo.echo_warning('run `verdi export migrate {}` to update it'.format(archive))
@@ -98,7 +111,7 @@ def cmd_import(archives, webpages):
             echo.echo_success('archive downloaded, proceeding with import')
 
             try:
-                import_data(temp_folder.get_abs_path(temp_file))
+                import_data(temp_folder.get_abs_path(temp_file), batch_size=batch_size)
             except exceptions.IncompatibleArchiveVersionError as exception:
                 echo.echo_warning('{} cannot be imported: {}'.format(archive, exception))
                 echo.echo_warning('download the archive file and run `verdi export migrate` to update it')
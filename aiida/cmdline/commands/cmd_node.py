@@ -245,16 +245,14 @@ class NodeTreePrinter(object):
 #@click.option('-r', '--follow-returns', is_flag=True, help='follow return links downwards when deleting')
 @click.option('-n', '--dry-run', is_flag=True, help='dry run, does not delete')
 @click.option('-v', '--verbose', is_flag=True, help='print individual nodes marked for deletion.')
+@click.option('--resume', is_flag=True, help='complete a previous deletion that was interrupted.')
 @options.NON_INTERACTIVE()
 @with_dbenv()
-def node_delete(nodes, follow_calls, dry_run, verbose, non_interactive):
+def node_delete(nodes, follow_calls, dry_run, verbose, resume, non_interactive):
     """
     Deletes a node and everything that originates from it.
     """
-    from aiida.utils.delete_nodes import delete_nodes
-
-    if not nodes:
-        return
+    from aiida.utils.delete_nodes import delete_nodes, resume_delete_nodes
 
     verbosity = 1
     if non_interactive:
@@ -262,6 +260,12 @@ def node_delete(nodes, follow_calls, dry_run, verbose, non_interactive):
     elif verbose:
         verbosity = 2
 
+    if resume:
+        resume_delete_nodes(verbosity=verbosity)
+
+    if not nodes:
+        return
+
     node_pks_to_delete = [node.pk for node in nodes]
 
     delete_nodes(
@@ -18,6 +18,9 @@ from aiida.cmdline.params import arguments
 from aiida.cmdline.params.types.plugin import PluginParamType
 from aiida.cmdline.utils import decorators, echo
 
+# Number of nodes re-hashed between two progress dots, and sent to each process at a time
+REHASH_BATCH_SIZE = 100
+
 
 @verdi.command('rehash')
 @arguments.NODES()
@@ -27,8 +30,15 @@ from aiida.cmdline.utils import decorators, echo
     type=PluginParamType(group=('node', 'calculations', 'data'), load=True),
     default='node',
     help='Only include nodes that are class or sub class of the class identified by this entry point.')
+@click.option(
+    '-p',
+    '--processes',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='The number of processes that compute the hashes in parallel.')
 @decorators.with_dbenv()
-def rehash(nodes, entry_point):
+def rehash(nodes, entry_point, processes):
     """Recompute the hash for nodes in the database
 
     The set of nodes that will be rehashed can be filtered by their identifier and/or based on their class.
@@ -36,24 +46,51 @@ def rehash(nodes, entry_point):
     from aiida.orm.querybuilder import QueryBuilder
 
     if nodes:
-        to_hash = [(node,) for node in nodes if isinstance(node, entry_point)]
+        to_hash = [node.pk for node in nodes if isinstance(node, entry_point)]
     else:
         builder = QueryBuilder()
-        builder.append(entry_point, tag='node')
-        to_hash = builder.all()
+        builder.append(entry_point, tag='node', project='id')
+        to_hash = [pk for pk, in builder.iterall()]
 
     if not to_hash:
         echo.echo_critical('no matching nodes found')
 
+    batches = [to_hash[i:i + REHASH_BATCH_SIZE] for i in range(0, len(to_hash), REHASH_BATCH_SIZE)]
     count = 0
 
-    for i, (node,) in enumerate(to_hash):
-
-        if i % 100 == 0:
+    if processes == 1:
+        for batch in batches:
+            count += _rehash_nodes(batch)
             echo.echo('.', nl=False)
+    else:
+        from multiprocessing import Pool
+        from aiida.backends.utils import close_database_connections
 
-        node.rehash()
-        count += 1
+        # The forked processes should open their own connections to the database
+        close_database_connections()
+        pool = Pool(processes)
+        try:
+            for batch_count in pool.imap_unordered(_rehash_nodes, batches):
+                count += batch_count
+                echo.echo('.', nl=False)
+        finally:
+            pool.terminate()
+            pool.join()
 
     echo.echo('')
     echo.echo_success('{} nodes re-hashed'.format(count))
+
+
+def _rehash_nodes(pks):
+    """
+    Recompute the hash of the nodes with the given pks
+
+    :param pks: a list of node pks
+    :return: the number of nodes re-hashed
+    """
+    from aiida.orm import load_node
+
+    for pk in pks:
+        load_node(pk).rehash()
+
+    return len(pks)
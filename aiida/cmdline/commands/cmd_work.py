@@ -18,7 +18,7 @@ from aiida.cmdline.commands.cmd_verdi import verdi
 from aiida.cmdline.params import arguments, options, types
 from aiida.cmdline.utils import decorators, echo
 from aiida.cmdline.utils.query.calculation import CalculationQueryBuilder
-from aiida.common.log import LOG_LEVELS
+from aiida.common.log import LOG_LEVELS, flush_db_log_handlers
 
 
 @verdi.group('work')
@@ -85,6 +85,9 @@ def work_report(calculations, levelname, indent_size, max_depth):
     from aiida.orm.querybuilder import QueryBuilder
     from aiida.orm.calculation.work import WorkCalculation
 
+    # The records logged by this process may still be queued by the database log handler
+    flush_db_log_handlers()
+
     def get_report_messages(pk, depth, levelname):
         """Return list of log messages with given levelname and their depth for a node with a given pk."""
         backend = construct_backend()
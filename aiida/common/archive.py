@@ -25,6 +25,16 @@ from aiida.common.exceptions import ContentNotExistent, InvalidOperation
 from aiida.common.folders import SandboxFolder
 import aiida.utils.json as json
 
+# Subfolder of a deduplicated export archive that contains each repository file once, named after its content hash
+FILES_EXPORT_SUBFOLDER = 'files'
+# Name of the file that, in a deduplicated archive, replaces the content of each node folder
+DEDUPLICATION_MANIFEST = '.aiida_manifest.json'
+# Key of the metadata of an export archive that flags that its repository files are deduplicated
+DEDUPLICATION_METADATA_KEY = 'deduplicated'
+# Version of the deduplicated export archives. They differ from those of version 0.3 only by the layout of the
+# repository files, but need a different version so that older versions of AiiDA refuse to import them
+DEDUPLICATED_EXPORT_VERSION = '0.4'
+
 
 class Archive(object):
     """
@@ -239,6 +249,165 @@ class Archive(object):
             return json.load(fhandle)
 
 
+class JsonSectionReader(object):
+    """
+    Incremental reader for large JSON documents, such as the `data.json` file of an export archive.
+
+    Rather than decoding the whole document at once, the reader walks the document with a bounded buffer and only
+    decodes the entries of the section it is asked for, one at a time. This keeps the memory footprint independent
+    of the size of the document, as long as each individual entry is reasonably small. Example::
+
+        with io.open('data.json', 'r', encoding='utf8') as handle:
+            for pk, attributes in JsonSectionReader(handle).iter_section('node_attributes'):
+                pass
+
+    """
+
+    DEFAULT_CHUNK_SIZE = 2**20
+    WHITESPACE = u' \t\n\r'
+
+    # Values nested deeper than this below a skipped key are decoded as a whole rather than walked entry by entry
+    SKIP_DEPTH = 2
+
+    def __init__(self, fhandle, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        :param fhandle: a file-like object opened in text mode, positioned at the start of the document
+        :param chunk_size: the number of characters to read from the handle at a time
+        """
+        import simplejson
+
+        self._fhandle = fhandle
+        self._chunk_size = chunk_size
+        self._decoder = simplejson.JSONDecoder()
+        self._buffer = u''
+        self._position = 0
+        self._eof = False
+
+    def iter_section(self, *keys):
+        """
+        Iterate over the entries of the object or array found by following `keys` from the document root.
+
+        The reader consumes the handle, so a new reader on a rewound handle is needed for every section.
+
+        :param keys: the sequence of object keys that lead to the section, e.g. `('export_data', 'Node')`
+        :return: generator of `(key, value)` tuples for an object or `(index, value)` tuples for an array. Nothing
+            is yielded if the section does not exist.
+        """
+        if not keys:
+            for key in self._iter_members():
+                yield key, self._decode()
+            return
+
+        for key in self._iter_members():
+            if key == keys[0] and self._peek() in (u'{', u'['):
+                for item in self.iter_section(*keys[1:]):
+                    yield item
+                return
+            self._skip(self.SKIP_DEPTH)
+
+    def _fill(self, size):
+        """
+        Append the next `size` characters of the handle to the buffer, discarding the part already consumed.
+
+        :return: False if the end of the handle was reached, True otherwise
+        """
+        if self._eof:
+            return False
+
+        chunk = self._fhandle.read(size)
+
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+
+        return True
+
+    def _peek(self):
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        :return: the next character or an empty string at the end of the document
+        """
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in self.WHITESPACE:
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._fill(self._chunk_size):
+                return u''
+
+    def _consume(self, *expected):
+        """Consume the next character, which should be one of `expected`, and return it."""
+        char = self._peek()
+
+        if char not in expected:
+            raise ValueError('malformed JSON document: expected one of {} but got {!r}'.format(expected, char))
+
+        self._position += 1
+        return char
+
+    def _decode(self):
+        """Decode the next complete JSON value, growing the buffer until it contains the whole value."""
+        size = self._chunk_size
+
+        while True:
+            self._peek()
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # A value that runs up to the end of the buffer, like a number, may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return value
+
+            self._fill(size)
+            size *= 2
+
+    def _iter_members(self):
+        """
+        Iterate over the members of the object or array that starts at the current position.
+
+        For objects the keys are yielded, for arrays the indices. The caller has to consume the value of each member
+        before advancing the generator.
+        """
+        opening = self._consume(u'{', u'[')
+        closing = u'}' if opening == u'{' else u']'
+
+        if self._peek() == closing:
+            self._position += 1
+            return
+
+        index = 0
+        while True:
+            if closing == u'}':
+                key = self._decode()
+                self._consume(u':')
+            else:
+                key = index
+
+            yield key
+            index += 1
+
+            if self._consume(u',', closing) == closing:
+                return
+
+    def _skip(self, depth):
+        """Consume the next value without keeping it, walking containers up to `depth` levels deep."""
+        if depth > 0 and self._peek() in (u'{', u'['):
+            for _ in self._iter_members():
+                self._skip(depth - 1)
+        else:
+            self._decode()
+
+
 def extract_zip(infile, folder, nodes_export_subfolder="nodes", silent=False):
     """
     Extract the nodes to be imported from a zip file.
@@ -271,12 +440,14 @@ def extract_zip(infile, folder, nodes_export_subfolder="nodes", silent=False):
                 # the subfolder!
                 # TODO: better check such that there are no .. in the
                 # path; use probably the folder limit checks
-                if not membername.startswith(nodes_export_subfolder + os.sep):
+                if not membername.startswith((nodes_export_subfolder + os.sep, FILES_EXPORT_SUBFOLDER + os.sep)):
                     continue
                 zip.extract(path=folder.abspath, member=membername)
     except zipfile.BadZipfile:
         raise ValueError("The input file format for import is not valid (not" " a zip file)")
 
+    restore_deduplicated_files(folder, nodes_export_subfolder)
+
 
 def extract_tar(infile, folder, nodes_export_subfolder="nodes", silent=False):
     """
@@ -316,12 +487,14 @@ def extract_tar(infile, folder, nodes_export_subfolder="nodes", silent=False):
                 # the subfolder!
                 # TODO: better check such that there are no .. in the
                 # path; use probably the folder limit checks
-                if not member.name.startswith(nodes_export_subfolder + os.sep):
+                if not member.name.startswith((nodes_export_subfolder + os.sep, FILES_EXPORT_SUBFOLDER + os.sep)):
                     continue
                 tar.extract(path=folder.abspath, member=member)
     except tarfile.ReadError:
         raise ValueError("The input file format for import is not valid (1)")
 
+    restore_deduplicated_files(folder, nodes_export_subfolder)
+
 
 def extract_tree(infile, folder, silent=False):
     """
@@ -350,6 +523,69 @@ def extract_tree(infile, folder, silent=False):
 
     os.path.walk(infile, add_files, {'folder': folder, 'root': infile})
 
+    restore_deduplicated_files(folder)
+
+
+def restore_deduplicated_files(folder, nodes_export_subfolder='nodes'):
+    """
+    Rebuild the node folders of an extracted archive whose repository files were deduplicated on export.
+
+    In such an archive every file is stored once in the ``files`` subfolder, named after the hash of its content, and
+    each node folder only contains a manifest listing its subfolders and the hash of each of its files. The node
+    folders are rebuilt in place, so that the rest of the import does not need to know about the deduplication.
+    Archives whose metadata does not flag them as deduplicated are left untouched.
+
+    :param folder: a SandboxFolder with the extracted archive
+    :param nodes_export_subfolder: name of the subfolder for AiiDA nodes
+    :raises ValueError: if a manifest refers to a path outside of its node folder or to an invalid file hash
+    """
+    import re
+    import shutil
+
+    try:
+        with io.open(folder.get_abs_path('metadata.json'), 'r', encoding='utf8') as handle:
+            metadata = json.load(handle)
+    except IOError:
+        return
+
+    if not metadata.get(DEDUPLICATION_METADATA_KEY, False):
+        return
+
+    files_folder = folder.get_abs_path(FILES_EXPORT_SUBFOLDER)
+    digest_regex = re.compile(r'^[0-9a-f]{40}$')
+
+    def get_node_path(node_folder, relpath):
+        """Return the absolute path of a manifest entry, making sure that it is within the node folder."""
+        path = os.path.realpath(os.path.join(node_folder, relpath))
+        if os.path.isabs(relpath) or not path.startswith(os.path.realpath(node_folder) + os.sep):
+            raise ValueError('The manifest of the node folder {} contains the invalid path {}'.format(
+                node_folder, relpath))
+        return path
+
+    for dirpath, _, filenames in os.walk(folder.get_abs_path(nodes_export_subfolder)):
+        if DEDUPLICATION_MANIFEST not in filenames:
+            continue
+
+        manifest_path = os.path.join(dirpath, DEDUPLICATION_MANIFEST)
+        with io.open(manifest_path, 'r', encoding='utf8') as handle:
+            manifest = json.load(handle)
+        os.remove(manifest_path)
+
+        for relpath in manifest['folders']:
+            path = get_node_path(dirpath, relpath)
+            if not os.path.isdir(path):
+                os.makedirs(path)
+
+        for relpath, digest in manifest['files'].items():
+            source = os.path.join(files_folder, digest)
+            if not digest_regex.match(digest) or os.path.islink(source):
+                raise ValueError('The manifest of the node folder {} contains the invalid hash {}'.format(
+                    dirpath, digest))
+            shutil.copyfile(source, get_node_path(dirpath, relpath))
+
+    if os.path.isdir(files_folder):
+        shutil.rmtree(files_folder)
+
 
 def extract_cif(infile, folder, nodes_export_subfolder="nodes", aiida_export_subfolder="aiida", silent=False):
     """
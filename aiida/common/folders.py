@@ -15,9 +15,11 @@ import shutil
 import fnmatch
 import tempfile
 import io
+import uuid as uuid_module
 
 import six
 
+from aiida.common.objectstore import get_object_store
 from aiida.common.utils import get_repository_folder
 
 # If True, tries to make everything (dirs, files) group-writable.
@@ -426,9 +428,15 @@ class Folder(object):
         else:
             shutil.copytree(srcdir, self.abspath)
 
-        # Set the mode also for the current dir, recursively
-        for dirpath, dirnames, filenames in os.walk(self.abspath,
-                                                    followlinks=False):
+        self._set_mode_recursively(self.abspath)
+
+    def _set_mode_recursively(self, path):
+        """
+        Set the mode of a folder and of its content, recursively.
+
+        :param path: the absolute path of the folder
+        """
+        for dirpath, dirnames, filenames in os.walk(path, followlinks=False):
             # dirpath should already be absolute, because I am passing
             # an absolute path to os.walk
             os.chmod(dirpath, self.mode_dir)
@@ -525,10 +533,129 @@ class RepositoryFolder(Folder):
         # Internal variable of this class
         self._subfolder = subfolder
 
+        # With the 'objectstore' repository backend, the files of the nodes are kept in the object store and are only
+        # written to the entity folder, as a checkout, when the folder is accessed. Workflows always use loose files.
+        self._object_store = get_object_store() if section == 'node' else None
+        self._checked_out = False
+
         # This will also do checks on the folder limits
         super(RepositoryFolder, self).__init__(
             abspath=dest, folder_limit=entity_dir)
 
+    @property
+    def abspath(self):
+        """
+        The absolute path of the folder.
+
+        With the 'objectstore' repository backend, the files of the entity are checked out on first access, and
+        again if the checkout was removed in the meantime, e.g. by `verdi database repository pack` in another process.
+        """
+        if self._object_store is not None and not (self._checked_out and os.path.isdir(self.folder_limit)):
+            self._checkout()
+        return self._abspath
+
+    @property
+    def _manifest_key(self):
+        return '{}/{}'.format(self._section, self._uuid)
+
+    def _checkout(self):
+        """
+        Write the files of the entity from the object store to the entity folder, unless the folder already exists.
+
+        The files are written to a temporary folder that is then renamed, such that concurrent readers never see a
+        partial checkout. If the object store has no manifest for the entity, nothing is written, such that folders
+        written by the 'folder' backend are used as they are.
+        """
+        entity_dir = self.folder_limit
+        if not os.path.isdir(entity_dir):
+            temp_dir = os.path.join(os.path.dirname(entity_dir), '.checkout-{}'.format(uuid_module.uuid4().hex))
+            if not self._object_store.checkout_folder(self._manifest_key, temp_dir):
+                return
+            self._set_mode_recursively(temp_dir)
+            try:
+                os.rename(temp_dir, entity_dir)
+            except OSError:
+                # Another process checked out the same entity in the meantime
+                shutil.rmtree(temp_dir)
+
+        self._checked_out = True
+
+    def sync(self):
+        """
+        Store the current files of the entity in the object store of the 'objectstore' repository backend.
+
+        It has to be called after writing to the folder of an entity that is already in the repository, since the
+        checkout is only a copy. It does nothing with the 'folder' backend.
+        """
+        if self._object_store is not None and os.path.isdir(self.folder_limit):
+            self._object_store.add_folder(self._manifest_key, self.folder_limit)
+
+    def release(self):
+        """
+        Store the files of the entity in the object store of the 'objectstore' repository backend and remove them from
+        the disk. They are checked out again when the folder is accessed. It does nothing with the 'folder' backend.
+        """
+        if self._object_store is not None and os.path.isdir(self.folder_limit):
+            self.sync()
+            shutil.rmtree(self.folder_limit)
+            self._checked_out = False
+
+    def erase(self, create_empty_folder=False):
+        """
+        Erases the folder, and with the 'objectstore' repository backend the manifest of the entity, if this is its
+        top folder. The objects themselves are kept, since they may be shared with other entities.
+
+        :param create_empty_folder: if True, after erasing, creates an empty dir.
+        """
+        if self._object_store is not None and self._subfolder == os.curdir:
+            self._object_store.delete_manifest(self._manifest_key)
+            self._checked_out = False
+
+        super(RepositoryFolder, self).erase(create_empty_folder)
+
+        if self._object_store is not None and self._subfolder != os.curdir:
+            self.sync()
+
+    def replace_with_folder(self, srcdir, move=False, overwrite=False):
+        """
+        This routine copies or moves the source folder 'srcdir' to the local
+        folder pointed by this Folder object.
+
+        With the 'objectstore' repository backend, the files of the top folder of an entity are stored directly in
+        the object store, without writing a checkout.
+
+        :param srcdir: the source folder on the disk; this must be a string with
+                an absolute path
+        :param move: if True, the srcdir is removed afterwards. Otherwise, it
+                is only copied.
+        :param overwrite: if True, the folder will be erased first.
+                if False, a IOError is raised if the folder already exists.
+        """
+        if self._object_store is None:
+            super(RepositoryFolder, self).replace_with_folder(srcdir, move=move, overwrite=overwrite)
+            return
+
+        if self._subfolder != os.curdir:
+            super(RepositoryFolder, self).replace_with_folder(srcdir, move=move, overwrite=overwrite)
+            self.sync()
+            return
+
+        if not os.path.isabs(srcdir):
+            raise ValueError('srcdir must be an absolute path')
+        if not overwrite and self.exists():
+            raise IOError("Location {} already exists, and overwrite is set to "
+                          "False".format(self.abspath))
+
+        self._object_store.add_folder(self._manifest_key, srcdir)
+
+        # Remove the checkout of the previous files, if any
+        if os.path.isdir(self.folder_limit):
+            shutil.rmtree(self.folder_limit)
+        self._checked_out = False
+
+        if move:
+            shutil.rmtree(srcdir)
+
     @property
     def section(self):
         """
@@ -20,7 +20,9 @@ try:  # Python3
 except ImportError:  # Python2
     from pyblake2 import blake2b
 import numbers
+import os
 import random
+import threading
 import time
 import uuid
 import struct
@@ -188,6 +190,84 @@ def _single_digest(obj_type, obj_bytes=b''):
 
 _END_DIGEST = _single_digest(')')
 
+# Size of the chunks in which files are read to compute the digest of their content
+FILE_CHUNK_SIZE = 1024**2
+
+# Files modified less than this number of seconds ago are not cached, since a later modification
+# could go unnoticed if it does not change the size and happens within the resolution of the mtime
+_FILE_DIGEST_CACHE_MIN_AGE = 2.
+
+
+def _file_digest(path):
+    """
+    Return the digest of the content of a file, reading it in chunks of `FILE_CHUNK_SIZE` bytes.
+    It is the same as `_single_digest('fcontent', content)`.
+    """
+    digest = blake2b(person=b'fcontent', node_depth=0, **BLAKE2B_OPTIONS)
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(FILE_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class FileDigestCache(object):
+    """
+    A cache of the digests of the content of files, keyed on their absolute path, size and
+    modification time, such that unchanged files are not read again when they are rehashed.
+    When the cache is full, the least recently used digests are discarded.
+
+    The cache lives in the memory of the process and is not persisted, so it only helps when the
+    same process hashes a file several times, e.g. a daemon runner or a shell that computes the
+    hash of a node more than once. Every `verdi rehash`, and every process of its pool, starts
+    with an empty cache and reads all the files.
+    """
+
+    def __init__(self, maxsize=65536):
+        """
+        :param maxsize: the maximum number of digests to keep
+        """
+        self._maxsize = maxsize
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_digest(self, path):
+        """
+        Return the digest of the content of a file, from the cache if the file did not change.
+
+        :param path: the path of the file
+        :return: the digest, see `_file_digest`
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime)
+
+        with self._lock:
+            digest = self._digests.pop(key, None)
+            if digest is not None:
+                self._digests[key] = digest
+                return digest
+
+        digest = _file_digest(path)
+
+        if time.time() - stat.st_mtime > _FILE_DIGEST_CACHE_MIN_AGE:
+            with self._lock:
+                self._digests[key] = digest
+                while len(self._digests) > self._maxsize:
+                    self._digests.popitem(last=False)
+
+        return digest
+
+    def clear(self):
+        """Remove all the digests from the cache."""
+        with self._lock:
+            self._digests.clear()
+
+    def __len__(self):
+        return len(self._digests)
+
+
+FILE_DIGEST_CACHE = FileDigestCache()
+
 
 @_make_hash.register(six.binary_type)
 def _(bytes_obj, **kwargs):
@@ -303,7 +383,9 @@ def _(val, **kwargs):
 @_make_hash.register(Folder)
 def _(folder, **kwargs):
     """
-    Hash the content of a Folder object. The name of the folder itself is actually ignored
+    Hash the content of a Folder object. The name of the folder itself is actually ignored.
+    The digests of the files are read from the `FILE_DIGEST_CACHE` of the process if they did not change.
+
     :param ignored_folder_content: list of filenames to be ignored for the hashing
     """
 
@@ -317,8 +399,7 @@ def _(folder, **kwargs):
 
             if isfile:
                 yield _single_digest('fname', name.encode('utf-8'))
-                with subfolder.open(name, mode='rb') as fhandle:
-                    yield _single_digest('fcontent', fhandle.read())
+                yield FILE_DIGEST_CACHE.get_digest(subfolder.get_abs_path(name))
             else:
                 yield _single_digest('dir(', name.encode('utf-8'))
                 for digest in folder_digests(subfolder.get_subfolder(name)):
@@ -11,7 +11,10 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 import logging
+import threading
 from copy import deepcopy
+from multiprocessing.util import register_after_fork
+
 from aiida.common import setup
 
 # Custom logging level, intended specifically for informative log messages
@@ -44,8 +47,63 @@ class NotInTestingFilter(logging.Filter):
         return not settings.TESTING_MODE
 
 
+#: The number of queued records above which the DBLogHandler writes them to the database
+DB_LOG_BATCH_SIZE = 200
+
+#: The time in seconds after which the DBLogHandler writes the queued records, if there are fewer than the batch size
+DB_LOG_FLUSH_INTERVAL = 1.
+
+#: The number of queued records above which the DBLogHandler writes them in the thread that logs, when the database is
+#: slower than the rate of logging
+DB_LOG_MAX_QUEUE_SIZE = 10000
+
+
 # A logging handler that will store the log record in the database DbLog table
 class DBLogHandler(logging.Handler):
+    """
+    Store the log records in the database DbLog table.
+
+    The records are queued and written by a background thread with a single multi-row insert, when the batch size is
+    reached or after the flush interval, and when the handler is flushed or closed, which the logging module does when
+    the interpreter exits. The metadata of the entries only contains the attributes of the record that are listed in
+    the logging.db_metadata_keys property.
+    """
+
+    def __init__(self, level=logging.NOTSET, batch_size=DB_LOG_BATCH_SIZE, flush_interval=DB_LOG_FLUSH_INTERVAL,
+                 metadata_keys=None):
+        """
+        :param level: the minimum level of the records to store
+        :param batch_size: the number of queued records above which they are written
+        :param flush_interval: the time in seconds after which the queued records are written
+        :param metadata_keys: the attributes of the records to store in the metadata, by default the value of the
+            logging.db_metadata_keys property
+        """
+        super(DBLogHandler, self).__init__(level)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._metadata_keys = metadata_keys if metadata_keys is not None else setup.get_property(
+            'logging.db_metadata_keys')
+        self._records = []
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        # Serializes the writes of the background thread and of flush(), such that a flush returns only after all the
+        # records queued before it are in the database
+        self._write_lock = threading.Lock()
+        register_after_fork(self, DBLogHandler._reset_after_fork)
+
+    def _reset_after_fork(self):
+        """
+        Forget the background thread and the queued records of the parent process in a forked child.
+
+        The thread does not exist in the child and the records are written by the parent, so the child starts its own
+        thread when it logs and only writes its own records.
+        """
+        self._records = []
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
 
     def emit(self, record):
         # If this is reached before a backend is defined, simply pass
@@ -53,29 +111,97 @@ class DBLogHandler(logging.Handler):
         if not is_dbenv_loaded():
             return
 
+        # Records without object are not stored, see `aiida.orm.log.get_entry_from_record`
+        if record.__dict__.get('objpk', None) is None or record.__dict__.get('objname', None) is None:
+            return
+
         if record.exc_info:
             # We do this because if there is exc_info this will put an appropriate string in exc_text.
             # See: https://github.com/python/cpython/blob/1c2cb516e49ceb56f76e90645e67e8df4e5df01a/Lib/logging/handlers.py#L590
             self.format(record)
 
-        from aiida.orm.backends import construct_backend
-        from django.core.exceptions import ImproperlyConfigured
+        # Format the message now, since the arguments may change before the record is written, and drop what may not
+        # be serializable or may keep objects alive
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+
+        with self._condition:
+            self._records.append(record)
+            queue_size = len(self._records)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='DBLogHandler')
+                self._thread.daemon = True
+                self._thread.start()
+            if queue_size == 1 or queue_size >= self._batch_size:
+                self._condition.notify()
+
+        if queue_size >= DB_LOG_MAX_QUEUE_SIZE:
+            self._write_queued_records()
+
+    def _run(self):
+        """Write the queued records when the batch size is reached or after the flush interval, until closed."""
+        while True:
+            with self._condition:
+                while not self._records and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                if len(self._records) < self._batch_size:
+                    self._condition.wait(self._flush_interval)
+
+            self._write_queued_records()
+
+    def _write_queued_records(self):
+        """Write all the queued records to the database."""
+        with self._write_lock:
+            with self._condition:
+                records, self._records = self._records, []
+
+            if not records:
+                return
+
+            from aiida.orm.backends import construct_backend
+            from django.core.exceptions import ImproperlyConfigured
+
+            try:
+                backend = construct_backend()
+                backend.logs.create_entries_from_records(records, self._metadata_keys)
+
+            except ImproperlyConfigured:
+                # Probably, the logger was called without the
+                # Django settings module loaded. Then,
+                # This ignore should be a no-op.
+                pass
+            except Exception:
+                # To avoid loops with the error handler, I just print.
+                # Hopefully, though, this should not happen!
+                import traceback
+
+                traceback.print_exc()
+
+    def flush(self):
+        """Write the queued records to the database, returning once they are written."""
+        self._write_queued_records()
+
+    def close(self):
+        """Stop the background thread and write the queued records."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join()
 
-        try:
-            backend = construct_backend()
-            backend.logs.create_entry_from_record(record)
+        self._write_queued_records()
+        super(DBLogHandler, self).close()
 
-        except ImproperlyConfigured:
-            # Probably, the logger was called without the
-            # Django settings module loaded. Then,
-            # This ignore should be a no-op.
-            pass
-        except Exception:
-            # To avoid loops with the error handler, I just print.
-            # Hopefully, though, this should not happen!
-            import traceback
 
-            traceback.print_exc()
+def flush_db_log_handlers():
+    """Write the log records queued by the DBLogHandlers of the AiiDA logger to the database."""
+    for handler in aiidalogger.handlers:
+        if isinstance(handler, DBLogHandler):
+            handler.flush()
 
 
 # The default logging dictionary for AiiDA that can be used in conjunction
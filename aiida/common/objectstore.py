@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Content addressed store of the files of the repository, used by the 'objectstore' repository backend.
+
+The contents of the files are stored once, under their SHA-256 hash. New objects are written as loose files in
+`loose/ab/cdef...`, and the maintenance step `pack_loose_objects` appends them to the pack files `packs/<n>.pack`,
+after which the loose files are removed. A SQLite index records the position of each object in the packs, and the
+manifests, i.e. the relative paths of the files of a folder with the hash of their content.
+
+Objects are never removed from the packs, such that writers and readers do not need to coordinate with the packing.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+
+#: The size of the chunks in which the contents are hashed and copied
+CHUNK_SIZE = 1024 * 1024
+
+#: The size above which a new pack file is started when packing the loose objects
+PACK_SIZE_LIMIT = 4 * 1024 * 1024 * 1024
+
+#: The relative path of the manifest entry that marks the top folder, such that empty folders have a manifest too
+MANIFEST_ROOT = '.'
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS objects '
+    '(hashkey TEXT PRIMARY KEY, pack INTEGER NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS manifests '
+    '(key TEXT NOT NULL, relpath TEXT NOT NULL, hashkey TEXT, PRIMARY KEY (key, relpath))',
+)
+
+
+class ObjectStore(object):
+    """
+    Store of file contents addressed by their hash, with the manifests of the folders that contain them.
+
+    Directory entries of a manifest have a hash key of None.
+    """
+
+    def __init__(self, root):
+        """
+        :param root: the folder of the store, created if it does not exist
+        """
+        self._root = os.path.abspath(root)
+        self._loose = os.path.join(self._root, 'loose')
+        self._packs = os.path.join(self._root, 'packs')
+        self._index = os.path.join(self._root, 'index.sqlite')
+
+        for folder in [self._loose, self._packs]:
+            if not os.path.isdir(folder):
+                try:
+                    os.makedirs(folder)
+                except OSError:
+                    if not os.path.isdir(folder):
+                        raise
+
+        with self._connect() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    @property
+    def root(self):
+        """The folder of the store."""
+        return self._root
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        Return a connection to the index, committing the transaction on success and rolling it back otherwise.
+
+        A new connection is opened each time, such that the store can be used from several threads and processes.
+        """
+        connection = sqlite3.connect(self._index, timeout=60)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _get_loose_path(self, hashkey):
+        return os.path.join(self._loose, hashkey[:2], hashkey[2:])
+
+    def _get_pack_path(self, pack):
+        return os.path.join(self._packs, '{}.pack'.format(pack))
+
+    def add_object(self, path):
+        """
+        Add the content of a file to the store, unless an object with the same content is already present.
+
+        :param path: the absolute path of the file
+        :return: the hash key of the object
+        """
+        hasher = hashlib.sha256()
+        with io.open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        hashkey = hasher.hexdigest()
+
+        if self.has_object(hashkey):
+            return hashkey
+
+        loose_path = self._get_loose_path(hashkey)
+        folder = os.path.dirname(loose_path)
+        if not os.path.isdir(folder):
+            try:
+                os.mkdir(folder)
+            except OSError:
+                if not os.path.isdir(folder):
+                    raise
+
+        # Write to a temporary file first, such that other processes never read a partially written object
+        handle, temp_path = tempfile.mkstemp(dir=folder, prefix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as target, io.open(path, 'rb') as source:
+                shutil.copyfileobj(source, target, CHUNK_SIZE)
+                target.flush()
+                os.fsync(target.fileno())
+            os.rename(temp_path, loose_path)
+        except:
+            os.remove(temp_path)
+            raise
+
+        return hashkey
+
+    def _get_packed_location(self, hashkey):
+        """Return the pack, offset and length of a packed object, or None if it is not packed."""
+        with self._connect() as connection:
+            return connection.execute('SELECT pack, offset, length FROM objects WHERE hashkey = ?',
+                                      (hashkey,)).fetchone()
+
+    def has_object(self, hashkey):
+        """
+        :param hashkey: the hash key of the object
+        :return: True if the object is in the store, either loose or packed
+        """
+        return os.path.exists(self._get_loose_path(hashkey)) or self._get_packed_location(hashkey) is not None
+
+    def copy_object(self, hashkey, path):
+        """
+        Write the content of an object to a file.
+
+        :param hashkey: the hash key of the object
+        :param path: the absolute path of the file to write
+        :raise KeyError: if the object is not in the store
+        """
+        # The loose file is only removed after the object is in the index, so it is looked up there if it is missing
+        try:
+            shutil.copyfile(self._get_loose_path(hashkey), path)
+            return
+        except (IOError, OSError):
+            location = self._get_packed_location(hashkey)
+
+        if location is None:
+            raise KeyError('object {} is not in the store'.format(hashkey))
+
+        pack, offset, length = location
+        with io.open(self._get_pack_path(pack), 'rb') as source, io.open(path, 'wb') as target:
+            source.seek(offset)
+            while length > 0:
+                chunk = source.read(min(length, CHUNK_SIZE))
+                if not chunk:
+                    raise IOError('pack {} is truncated'.format(pack))
+                target.write(chunk)
+                length -= len(chunk)
+
+    def get_object_content(self, hashkey):
+        """
+        :param hashkey: the hash key of the object
+        :return: the content of the object as bytes
+        :raise KeyError: if the object is not in the store
+        """
+        try:
+            with io.open(self._get_loose_path(hashkey), 'rb') as handle:
+                return handle.read()
+        except (IOError, OSError):
+            location = self._get_packed_location(hashkey)
+
+        if location is None:
+            raise KeyError('object {} is not in the store'.format(hashkey))
+
+        pack, offset, length = location
+        with io.open(self._get_pack_path(pack), 'rb') as handle:
+            handle.seek(offset)
+            return handle.read(length)
+
+    def add_folder(self, key, path):
+        """
+        Add the files of a folder to the store and record them as the manifest of the given key.
+
+        Symbolic links are followed, such that their target is stored as a regular file.
+
+        :param key: the key of the manifest
+        :param path: the absolute path of the folder
+        :return: the manifest, a dictionary with the relative paths as keys and the hash keys as values
+        """
+        manifest = {MANIFEST_ROOT: None}
+        for dirpath, dirnames, filenames in os.walk(path, followlinks=True):
+            relpath = os.path.relpath(dirpath, path)
+            for dirname in dirnames:
+                manifest[os.path.normpath(os.path.join(relpath, dirname))] = None
+            for filename in filenames:
+                manifest[os.path.normpath(os.path.join(relpath, filename))] = self.add_object(
+                    os.path.join(dirpath, filename))
+
+        self.set_manifest(key, manifest)
+        return manifest
+
+    def checkout_folder(self, key, path):
+        """
+        Write the files of a manifest to a folder.
+
+        :param key: the key of the manifest
+        :param path: the absolute path of the folder, which should not exist yet
+        :return: True if the folder was written, False if there is no manifest for the key
+        """
+        manifest = self.get_manifest(key)
+        if manifest is None:
+            return False
+
+        for relpath, hashkey in sorted(manifest.items()):
+            target = os.path.normpath(os.path.join(path, relpath))
+            if hashkey is None:
+                if not os.path.isdir(target):
+                    os.makedirs(target)
+            else:
+                if not os.path.isdir(os.path.dirname(target)):
+                    os.makedirs(os.path.dirname(target))
+                self.copy_object(hashkey, target)
+
+        return True
+
+    def set_manifest(self, key, manifest):
+        """
+        Set the manifest of a key, replacing the existing one.
+
+        :param key: the key of the manifest
+        :param manifest: a dictionary with the relative paths as keys and the hash keys, or None for folders, as values
+        """
+        with self._connect() as connection:
+            connection.execute('DELETE FROM manifests WHERE key = ?', (key,))
+            connection.executemany('INSERT INTO manifests (key, relpath, hashkey) VALUES (?, ?, ?)',
+                                   [(key, relpath, hashkey) for relpath, hashkey in manifest.items()])
+
+    def get_manifest(self, key):
+        """
+        :param key: the key of the manifest
+        :return: the manifest, a dictionary with the relative paths as keys and the hash keys as values, or None if
+            there is no manifest for the key
+        """
+        with self._connect() as connection:
+            rows = connection.execute('SELECT relpath, hashkey FROM manifests WHERE key = ?', (key,)).fetchall()
+        return dict(rows) if rows else None
+
+    def delete_manifest(self, key):
+        """
+        Delete the manifest of a key. The objects remain in the store, since other manifests may refer to them.
+
+        :param key: the key of the manifest
+        """
+        with self._connect() as connection:
+            connection.execute('DELETE FROM manifests WHERE key = ?', (key,))
+
+    def _create_pack(self):
+        """Create a new empty pack file and return its number."""
+        numbers = [int(filename.split('.')[0]) for filename in os.listdir(self._packs) if filename.endswith('.pack')]
+        pack = max(numbers) + 1 if numbers else 0
+        while True:
+            try:
+                os.close(os.open(self._get_pack_path(pack), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return pack
+            except OSError:
+                # Another process created the same pack in the meantime
+                pack += 1
+
+    def pack_loose_objects(self):
+        """
+        Append the loose objects to new pack files and remove them.
+
+        The packs are synced to disk and the index is committed before the loose files are removed, such that an
+        interruption at any point leaves every object readable, at worst leaving unreferenced data in a pack.
+
+        :return: the number of objects that were packed
+        """
+        loose_paths = []
+        for dirname in os.listdir(self._loose):
+            folder = os.path.join(self._loose, dirname)
+            for filename in os.listdir(folder):
+                if not filename.startswith('.'):
+                    loose_paths.append((dirname + filename, os.path.join(folder, filename)))
+
+        if not loose_paths:
+            return 0
+
+        rows = []
+        pack = None
+        target = None
+        try:
+            for hashkey, path in loose_paths:
+                if target is None or target.tell() > PACK_SIZE_LIMIT:
+                    if target is not None:
+                        target.flush()
+                        os.fsync(target.fileno())
+                        target.close()
+                    pack = self._create_pack()
+                    target = io.open(self._get_pack_path(pack), 'ab')
+                offset = target.tell()
+                with io.open(path, 'rb') as source:
+                    shutil.copyfileobj(source, target, CHUNK_SIZE)
+                rows.append((hashkey, pack, offset, target.tell() - offset))
+            target.flush()
+            os.fsync(target.fileno())
+        finally:
+            if target is not None:
+                target.close()
+
+        with self._connect() as connection:
+            connection.executemany('INSERT OR IGNORE INTO objects (hashkey, pack, offset, length) VALUES (?, ?, ?, ?)',
+                                   rows)
+
+        for _, path in loose_paths:
+            os.remove(path)
+
+        return len(rows)
+
+    def count_objects(self):
+        """
+        :return: a tuple with the number of loose and packed objects
+        """
+        loose = sum(
+            len([filename for filename in os.listdir(os.path.join(self._loose, dirname)) if not filename.startswith('.')])
+            for dirname in os.listdir(self._loose))
+        with self._connect() as connection:
+            packed = connection.execute('SELECT COUNT(*) FROM objects').fetchone()[0]
+        return loose, packed
+
+
+_OBJECT_STORES = {}
+
+
+def get_object_store():
+    """
+    Return the object store of the repository of the current profile, if the 'objectstore' repository backend is
+    configured with the `repository.backend` property.
+
+    The configuration is read once per process, since it is needed for every repository folder.
+
+    :return: an `ObjectStore`, or None for the default 'folder' backend
+    """
+    from aiida.common.setup import get_property
+    from aiida.common.utils import get_repository_folder
+
+    root = get_repository_folder('objects')
+    if root not in _OBJECT_STORES:
+        if get_property('repository.backend') == 'objectstore':
+            _OBJECT_STORES[root] = ObjectStore(root)
+        else:
+            _OBJECT_STORES[root] = None
+
+    return _OBJECT_STORES[root]
@@ -786,8 +786,52 @@ class _NoDefaultValue(object):
 _property_table = {
     "runner.poll.interval": ("runner_poll_interval", "int", "The polling interval in seconds to be used by process runners",
                        1, None),
+    "runner.parser_workers": ("runner_parser_workers", "int",
+                              "The number of threads that process runners use to parse the results of job "
+                              "calculations, 0 to parse them on the event loop", 2, None),
+    "runner.submission_window": ("runner_submission_window", "int",
+                                 "The time in seconds during which process runners collect the submissions of jobs "
+                                 "to the same computer and user, to submit them together with a single command", 1,
+                                 None),
     "daemon.timeout": ("daemon_timeout", "int", "The timeout in seconds for calls to the circus client",
                        DEFAULT_DAEMON_TIMEOUT, None),
+    "transport.idle_timeout": ("transport_idle_timeout", "int",
+                               "The time in seconds that process runners keep an unused transport open, "
+                               "to reuse it for following requests on the same computer", 60, None),
+    "transport.max_per_authinfo": ("transport_max_per_authinfo", "int",
+                                   "The maximum number of transports that a process runner keeps open at the same "
+                                   "time for the same computer and user", 1, None),
+    "transport.keepalive_interval": ("transport_keepalive_interval", "int",
+                                     "The interval in seconds at which process runners check the connection of "
+                                     "unused open transports, which also keeps it alive; 0 to disable", 30, None),
+    "db.pool_size": ("db_pool_size", "int",
+                     "The number of database connections that each process keeps open (SQLAlchemy backend)", 5, None),
+    "db.max_overflow": ("db_max_overflow", "int",
+                        "The number of database connections that each process can open temporarily on top of "
+                        "db.pool_size (SQLAlchemy backend)", 10, None),
+    "db.pool_timeout": ("db_pool_timeout", "int",
+                        "The time in seconds to wait for a free database connection before giving up "
+                        "(SQLAlchemy backend)", 30, None),
+    "db.pool_recycle": ("db_pool_recycle", "int",
+                        "The time in seconds after which open database connections are replaced; -1 to disable "
+                        "(SQLAlchemy backend)", -1, None),
+    "db.pool_pre_ping": ("db_pool_pre_ping", "bool",
+                         "Whether to test database connections before using them, such that connections closed "
+                         "by the server are replaced (SQLAlchemy backend)", False, None),
+    "db.transaction_pooling": ("db_transaction_pooling", "bool",
+                               "Whether to leave the pooling of database connections to a server side pooler such as "
+                               "pgbouncer in transaction mode, instead of keeping connections open in each process "
+                               "(SQLAlchemy backend)", False, None),
+    "db.pool_checkout_warning": ("db_pool_checkout_warning", "int",
+                                 "Log a warning when waiting longer than this many seconds for a database connection; "
+                                 "0 to disable (SQLAlchemy backend)", 1, None),
+    "arraydata.cache_size": ("arraydata_cache_size", "int",
+                             "The maximum number of megabytes of arrays that each ArrayData node keeps in memory "
+                             "after reading them from disk", 1024, None),
+    "repository.backend": ("repository_backend", "string",
+                           "How the files of the nodes are stored in the repository: 'folder' as a folder of loose "
+                           "files for each node, 'objectstore' deduplicated by content in pack files, see "
+                           "'verdi database repository pack'", "folder", ["folder", "objectstore"]),
     "verdishell.modules": ("modules_for_verdi_shell", "string",
                            "Additional modules/functions/classes to be automaticaly loaded in the "
                            "verdi shell (but not in the runaiida environment); it should be a "
@@ -828,6 +872,11 @@ _property_table = {
                                 ["CRITICAL", "ERROR", "WARNING", "REPORT", "INFO", "DEBUG"]),
     "logging.db_loglevel": ("logging_db_log_level", "string", "Minimum level to log to the DbLog table", "REPORT",
                             ["CRITICAL", "ERROR", "WARNING", "REPORT", "INFO", "DEBUG"]),
+    "logging.db_metadata_keys": ("logging_db_metadata_keys", "list_of_str",
+                                 "The attributes of the log records that are stored in the metadata of the DbLog "
+                                 "entries. Set by passing them space separated as a string",
+                                 ('levelno', 'pathname', 'lineno', 'funcName', 'process', 'thread', 'exc_text'),
+                                 None),
     "tcod.depositor_username": ("tcod_depositor_username", "string", "Username for TCOD deposition", None, None),
     "tcod.depositor_password": ("tcod_depositor_password", "string", "Password for TCOD deposition", None, None),
     "tcod.depositor_email": ("tcod_depositor_email", "string", "E-mail address for TCOD deposition", None, None),
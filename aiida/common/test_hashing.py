@@ -18,6 +18,8 @@ import itertools
 import collections
 import uuid
 import math
+import os
+import time
 from datetime import datetime
 
 import numpy as np
@@ -28,6 +30,7 @@ try:
 except ImportError:
     import unittest
 
+from aiida.common import hashing
 from aiida.common.hashing import make_hash, create_unusable_pass, is_password_usable, truncate_float64
 from aiida.common.folders import SandboxFolder
 
@@ -228,3 +231,46 @@ class MakeHashTest(unittest.TestCase):
 
             self.assertNotEqual(make_hash(folder), folder_hash)
             self.assertEqual(make_hash(folder, ignored_folder_content=['file3.npy', 'some_subdir']), folder_hash)
+
+
+class FileDigestCacheTest(unittest.TestCase):
+    """
+    Tests for the chunked digests of files and their cache
+    """
+
+    def test_chunked_digest(self):
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            content = b'0123456789' * 100
+            with folder.open('file', 'wb') as fhandle:
+                fhandle.write(content)
+
+            original_chunk_size = hashing.FILE_CHUNK_SIZE
+            try:
+                hashing.FILE_CHUNK_SIZE = 64
+                digest = hashing._file_digest(folder.get_abs_path('file'))
+            finally:
+                hashing.FILE_CHUNK_SIZE = original_chunk_size
+
+            self.assertEqual(digest, hashing._single_digest('fcontent', content))
+
+    def test_cache(self):
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            path = folder.get_abs_path('file')
+            with folder.open('file', 'w') as fhandle:
+                fhandle.write(u'hello')
+            # Files that were just modified are not cached
+            cache = hashing.FileDigestCache(maxsize=1)
+            digest = cache.get_digest(path)
+            self.assertEqual(len(cache), 0)
+
+            old = time.time() - 3600
+            os.utime(path, (old, old))
+            self.assertEqual(cache.get_digest(path), digest)
+            self.assertEqual(len(cache), 1)
+
+            # Changing the content and the size invalidates the cached digest
+            with folder.open('file', 'w') as fhandle:
+                fhandle.write(u'hello there')
+            os.utime(path, (old, old))
+            self.assertNotEqual(cache.get_digest(path), digest)
+            self.assertEqual(len(cache), 1)
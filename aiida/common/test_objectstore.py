@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Tests for the object store of the repository
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from aiida.common.objectstore import ObjectStore, MANIFEST_ROOT
+
+
+class ObjectStoreTest(unittest.TestCase):
+    """
+    Tests for the ObjectStore class.
+    """
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.store = ObjectStore(os.path.join(self.workdir, 'objects'))
+
+        self.source = os.path.join(self.workdir, 'source')
+        os.makedirs(os.path.join(self.source, 'sub', 'empty'))
+        self.contents = {
+            'a.txt': b'content a',
+            'b.txt': b'content b',
+            os.path.join('sub', 'c.txt'): b'content a',
+        }
+        for relpath, content in self.contents.items():
+            with io.open(os.path.join(self.source, relpath), 'wb') as handle:
+                handle.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def assert_checkout(self, key):
+        """Check that the checkout of the given key has the files of the source folder."""
+        target = os.path.join(self.workdir, 'target')
+        self.assertTrue(self.store.checkout_folder(key, target))
+        for relpath, content in self.contents.items():
+            with io.open(os.path.join(target, relpath), 'rb') as handle:
+                self.assertEqual(handle.read(), content)
+        self.assertTrue(os.path.isdir(os.path.join(target, 'sub', 'empty')))
+        shutil.rmtree(target)
+
+    def test_deduplication(self):
+        """Files with the same content are stored once."""
+        manifest = self.store.add_folder('node/first', self.source)
+        self.store.add_folder('node/second', self.source)
+
+        self.assertEqual(manifest['a.txt'], manifest[os.path.join('sub', 'c.txt')])
+        self.assertIsNone(manifest[MANIFEST_ROOT])
+        self.assertIsNone(manifest[os.path.join('sub', 'empty')])
+        self.assertEqual(self.store.count_objects(), (2, 0))
+        self.assertEqual(self.store.get_manifest('node/second'), manifest)
+
+    def test_pack_loose_objects(self):
+        """Packed objects are read from the packs and the loose files are removed."""
+        manifest = self.store.add_folder('node/first', self.source)
+
+        self.assertEqual(self.store.pack_loose_objects(), 2)
+        self.assertEqual(self.store.count_objects(), (0, 2))
+        self.assertEqual(self.store.pack_loose_objects(), 0)
+        self.assertEqual(self.store.get_object_content(manifest['b.txt']), b'content b')
+        self.assert_checkout('node/first')
+
+        # Adding the same content again does not create a loose object
+        self.store.add_folder('node/second', self.source)
+        self.assertEqual(self.store.count_objects(), (0, 2))
+        self.assert_checkout('node/second')
+
+    def test_delete_manifest(self):
+        """A deleted manifest can no longer be checked out, while its objects are kept."""
+        manifest = self.store.add_folder('node/first', self.source)
+        self.store.delete_manifest('node/first')
+
+        self.assertIsNone(self.store.get_manifest('node/first'))
+        self.assertFalse(self.store.checkout_folder('node/first', os.path.join(self.workdir, 'target')))
+        self.assertFalse(os.path.exists(os.path.join(self.workdir, 'target')))
+        self.assertTrue(self.store.has_object(manifest['a.txt']))
+
+
+class RepositoryFolderTest(unittest.TestCase):
+    """
+    Tests for the checkouts of the RepositoryFolder class with the 'objectstore' repository backend.
+    """
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.store = ObjectStore(os.path.join(self.workdir, 'objects'))
+
+        self.source = os.path.join(self.workdir, 'source')
+        os.makedirs(self.source)
+        with io.open(os.path.join(self.source, 'a.txt'), 'wb') as handle:
+            handle.write(b'content a')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_checkout_removed(self):
+        """A folder whose checkout was released by another instance, as when packing, is checked out again."""
+        from aiida.common.folders import RepositoryFolder
+
+        uuid = '0123456789abcdef0123456789abcdef'
+        self.store.add_folder('node/{}'.format(uuid), self.source)
+        repository = os.path.join(self.workdir, 'repository')
+
+        with mock.patch('aiida.common.folders.get_object_store', return_value=self.store), \
+                mock.patch('aiida.common.folders.get_repository_folder', return_value=repository):
+            folder = RepositoryFolder(section='node', uuid=uuid)
+            self.assertTrue(os.path.isfile(os.path.join(folder.abspath, 'a.txt')))
+
+            RepositoryFolder(section='node', uuid=uuid).release()
+            self.assertFalse(os.path.exists(folder.folder_limit))
+
+            self.assertTrue(os.path.isfile(os.path.join(folder.abspath, 'a.txt')))
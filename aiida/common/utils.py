@@ -136,6 +136,8 @@ def get_repository_folder(subfolder=None):
             retval = os.path.abspath(os.path.join(REPOSITORY_PATH, 'sandbox'))
         elif subfolder == "repository":
             retval = os.path.abspath(os.path.join(REPOSITORY_PATH, 'repository'))
+        elif subfolder == "objects":
+            retval = os.path.abspath(os.path.join(REPOSITORY_PATH, 'objects'))
         else:
             raise ValueError("Invalid 'subfolder' passed to " "get_repository_folder: {}".format(subfolder))
         _repository_folder_cache[subfolder] = retval
@@ -17,6 +17,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 import os
+import time
 
 from six.moves import zip
 
@@ -27,11 +28,15 @@ from aiida.common.folders import SandboxFolder
 from aiida.common.links import LinkType
 from aiida.common.log import get_dblogger_extra
 from aiida.orm import DataFactory
+from aiida.orm.backends import construct_backend
 from aiida.orm.data.folder import FolderData
 from aiida.scheduler.datastructures import JOB_STATES
 
 REMOTE_WORK_DIRECTORY_LOST_FOUND = 'lost+found'
 
+# Minimum number of remote items to retrieve them as a single compressed archive
+RETRIEVE_BUNDLE_MIN_FILES = 20
+
 execlogger = aiidalogger.getChild('execmanager')
 
 
@@ -139,19 +144,36 @@ def upload_calculation(calculation, transport, calc_info, script_filename):
     # default files to be overwritten by the plugin itself.
     # Still, beware! The code file itself could be overwritten...
     # But I checked for this earlier.
-    for code in input_codes:
-        if code.is_local():
+    local_codes = [code for code in input_codes if code.is_local()]
+    sources = [(code.get_abs_path(f), f) for code in local_codes for f in code.get_folder_list()]
+    sources.extend((folder.get_abs_path(f), f) for f in folder.get_content_list())
+
+    # Upload everything at once if the transport supports it, otherwise file by file
+    try:
+        upload_bundle(transport, sources, workdir)
+    except NotImplementedError:
+        bundled = False
+    except IOError as exc:
+        execlogger.warning("[submission of calculation {}] bundled upload failed, uploading file by file: {}".format(
+            calculation.pk, exc), extra=logger_extra)
+        bundled = False
+    else:
+        bundled = True
+
+    for code in local_codes:
+        if not bundled:
             # Note: this will possibly overwrite files
             for f in code.get_folder_list():
                 transport.put(code.get_abs_path(f), f)
-            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
+        transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
 
     # copy all files, recursively with folders
-    for f in folder.get_content_list():
-        execlogger.debug("[submission of calculation {}] "
-                         "copying file/folder {}...".format(calculation.pk, f),
-                         extra=logger_extra)
-        transport.put(folder.get_abs_path(f), f)
+    if not bundled:
+        for f in folder.get_content_list():
+            execlogger.debug("[submission of calculation {}] "
+                             "copying file/folder {}...".format(calculation.pk, f),
+                             extra=logger_extra)
+            transport.put(folder.get_abs_path(f), f)
 
     # local_copy_list is a list of tuples,
     # each with (src_abs_path, dest_rel_path)
@@ -221,6 +243,30 @@ def upload_calculation(calculation, transport, calc_info, script_filename):
     return calc_info, script_filename
 
 
+def upload_bundle(transport, sources, remotepath):
+    """
+    Upload files and folders with a single transfer, by packing them into a compressed tar archive
+    that is extracted on the remote machine, instead of putting them one by one.
+
+    :param transport: an already opened transport to use for the upload.
+    :param sources: a list of tuples (src_abs_path, dest_rel_path) of the files and folders to upload,
+        where later entries overwrite the earlier ones with the same destination
+    :param remotepath: the existing remote folder relative to which the files are written
+    :raises NotImplementedError: if the transport does not support the extraction of archives
+    :raises IOError: if the remote extraction fails
+    """
+    import tarfile
+    import tempfile
+
+    with tempfile.TemporaryFile() as handle:
+        with tarfile.open(fileobj=handle, mode='w:gz', dereference=True) as archive:
+            for src_abs_path, dest_rel_path in sources:
+                archive.add(src_abs_path, arcname=dest_rel_path)
+
+        handle.seek(0)
+        transport.putarchive(handle, remotepath)
+
+
 def submit_calculation(calculation, transport, calc_info, script_filename):
     """
     Submit a calculation
@@ -230,12 +276,32 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
     :param calc_info: the calculation info datastructure returned by `JobCalculation._presubmit`
     :param script_filename: the job launch script returned by `JobCalculation._presubmit`
     """
-    scheduler = calculation.get_computer().get_scheduler()
+    result, = submit_calculations([(calculation, script_filename)], transport)
+    if isinstance(result, Exception):
+        raise result
+
+
+def submit_calculations(calculations, transport):
+    """
+    Submit several calculations with a single command executed over the transport
+
+    :param calculations: a list of tuples (calculation, script_filename) with the instances of JobCalculation to
+        submit, all of the same computer and user, and their job launch scripts returned by `JobCalculation._presubmit`
+    :param transport: an already opened transport to use to submit the calculations.
+    :return: a list with, for each calculation in the same order, either the job id or the exception that prevented
+        its submission
+    """
+    scheduler = calculations[0][0].get_computer().get_scheduler()
     scheduler.set_transport(transport)
 
-    workdir = calculation._get_remote_workdir()
-    job_id = scheduler.submit_from_script(workdir, script_filename)
-    calculation._set_job_id(job_id)
+    submissions = [(calculation._get_remote_workdir(), script_filename) for calculation, script_filename in calculations]
+    results = scheduler.submit_from_scripts(submissions)
+
+    for (calculation, _), result in zip(calculations, results):
+        if not isinstance(result, Exception):
+            calculation._set_job_id(result)
+
+    return results
 
 
 def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
@@ -384,7 +450,9 @@ def parse_results(job, retrieved_temporary_folder=None):
 
         for label, n in new_nodes_tuple:
             n.add_link_from(job, label=label, link_type=LinkType.CREATE)
-            n.store()
+
+        # Parsers can create many output nodes, so they are stored in bulk where the backend supports it
+        construct_backend().store_many([n for _, n in new_nodes_tuple])
 
     try:
         if exit_code.status == 0:
@@ -456,40 +524,272 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
     treated as the work directory of the folder and the depth integer determines
     upto what level of the original remotepath nesting the files will be copied.
 
+    The relative file patterns are expanded with a single listing of the remote
+    working directory. If at least `RETRIEVE_BUNDLE_MIN_FILES` files are retrieved,
+    they are transferred as a single compressed archive created on the remote,
+    rather than one by one.
+
     :param transport: the Transport instance
     :param folder: an absolute path to a folder to copy files in
     :param retrieve_list: the list of files to retrieve
     """
+    time_start = time.time()
+
+    remote_local_pairs = _expand_retrieve_list(transport, retrieve_list)
+
+    for _, local_name in remote_local_pairs:
+        # create directories in the folder, if needed
+        new_folder = os.path.dirname(os.path.join(folder, local_name))
+        if not os.path.exists(new_folder):
+            os.makedirs(new_folder)
+
+    bundle_pairs = [(rem, loc) for rem, loc in remote_local_pairs if _is_relative_path(rem)]
+    if len(bundle_pairs) >= RETRIEVE_BUNDLE_MIN_FILES and _retrieve_bundle(calculation, transport, folder, bundle_pairs):
+        method = 'archive'
+        single_pairs = [(rem, loc) for rem, loc in remote_local_pairs if not _is_relative_path(rem)]
+    else:
+        method = 'single files'
+        single_pairs = remote_local_pairs
+
+    for rem, loc in single_pairs:
+        transport.logger.debug(
+            "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
+        transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+
+    _log_retrieval_metrics(calculation, folder, remote_local_pairs, time.time() - time_start, method)
+
+
+def _expand_retrieve_list(transport, retrieve_list):
+    """
+    Expand the items of a retrieve list into the remote and local names of the files to retrieve,
+    see `retrieve_files_from_list` for the format of the list.
+
+    :param transport: the Transport instance
+    :param retrieve_list: the list of files to retrieve
+    :return: a list of tuples (remote name, local name relative to the folder to copy the files in)
+    """
+    patterns = set()
+    for item in retrieve_list:
+        remote_name = item[0] if isinstance(item, list) else item
+        if transport.has_magic(remote_name):
+            patterns.add(remote_name)
+
+    matches = _glob_many(transport, patterns)
+
+    remote_local_pairs = []
     for item in retrieve_list:
         if isinstance(item, list):
             tmp_rname, tmp_lname, depth = item
             # if there are more than one file I do something differently
             if transport.has_magic(tmp_rname):
-                remote_names = transport.glob(tmp_rname)
-                local_names = []
-                for rem in remote_names:
-                    to_append = rem.split(os.path.sep)[-depth:] if depth > 0 else []
-                    local_names.append(os.path.sep.join([tmp_lname] + to_append))
+                remote_names = matches[tmp_rname]
             else:
                 remote_names = [tmp_rname]
-                to_append = remote_names.split(os.path.sep)[-depth:] if depth > 0 else []
-                local_names = [os.path.sep.join([tmp_lname] + to_append)]
-            if depth > 1:  # create directories in the folder, if needed
-                for this_local_file in local_names:
-                    new_folder = os.path.join(
-                        folder,
-                        os.path.split(this_local_file)[0])
-                    if not os.path.exists(new_folder):
-                        os.makedirs(new_folder)
+            for rem in remote_names:
+                to_append = rem.split(os.path.sep)[-depth:] if depth > 0 else []
+                remote_local_pairs.append((rem, os.path.sep.join([tmp_lname] + to_append)))
         else:  # it is a string
             if transport.has_magic(item):
-                remote_names = transport.glob(item)
-                local_names = [os.path.split(rem)[1] for rem in remote_names]
+                remote_names = matches[item]
             else:
                 remote_names = [item]
-                local_names = [os.path.split(item)[1]]
+            for rem in remote_names:
+                remote_local_pairs.append((rem, os.path.split(rem)[1]))
+
+    return remote_local_pairs
+
+
+def _glob_many(transport, patterns):
+    """
+    Expand several glob patterns on the remote. The relative patterns are matched against
+    a single recursive listing of the current directory, instead of listing the directories
+    of each pattern separately. The other patterns, or all of them if the listing fails,
+    are expanded by the transport.
+
+    :param transport: the Transport instance
+    :param patterns: an iterable of glob patterns
+    :return: a dictionary {pattern: list of matching paths}
+    """
+    relative_patterns = [pattern for pattern in patterns if _is_relative_path(pattern)]
+
+    listing = None
+    if relative_patterns:
+        depth = max(len(pattern.split(os.path.sep)) for pattern in relative_patterns)
+        listing = _list_remote_tree(transport, depth)
+
+    matches = {}
+    for pattern in patterns:
+        if listing is not None and pattern in relative_patterns:
+            matches[pattern] = [path for path in listing if _match_path(pattern, path)]
+        else:
+            matches[pattern] = transport.glob(pattern)
+
+    return matches
+
 
-        for rem, loc in zip(remote_names, local_names):
-            transport.logger.debug(
-                "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
-            transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+def _list_remote_tree(transport, depth):
+    """
+    List the paths in the current remote directory up to the given depth, with a single `find` command.
+
+    :param transport: the Transport instance
+    :param depth: the maximum depth of the listed paths
+    :return: the list of paths relative to the current directory, or None if the listing failed
+    """
+    command = 'find -L . -mindepth 1 -maxdepth {}'.format(depth)
+
+    try:
+        retval, stdout, stderr = transport.exec_command_wait(command)
+    except NotImplementedError:
+        return None
+
+    if retval != 0:
+        execlogger.debug("listing with '{}' failed, falling back to glob: {}".format(command, stderr))
+        return None
+
+    return [line[2:] for line in stdout.splitlines() if line.startswith('./')]
+
+
+def _is_relative_path(path):
+    """
+    Return whether the path is relative, normalized and does not point outside of the current directory.
+    """
+    return not os.path.isabs(path) and all(part not in ('', '.', '..') for part in path.split(os.path.sep))
+
+
+def _match_path(pattern, path):
+    """
+    Return whether a relative path matches a relative glob pattern, following the rules of `glob.glob`:
+    wildcards do not match path separators, nor hidden names unless the pattern component starts with a dot.
+    """
+    import fnmatch
+
+    pattern_parts = pattern.split(os.path.sep)
+    path_parts = path.split(os.path.sep)
+
+    if len(pattern_parts) != len(path_parts):
+        return False
+
+    for pattern_part, path_part in zip(pattern_parts, path_parts):
+        if path_part.startswith('.') and not pattern_part.startswith('.'):
+            return False
+        if not fnmatch.fnmatchcase(path_part, pattern_part):
+            return False
+
+    return True
+
+
+def _retrieve_bundle(calculation, transport, folder, remote_local_pairs):
+    """
+    Retrieve files as a single compressed archive, that is created in the current remote directory,
+    copied and removed. Remote files that do not exist are ignored.
+
+    :param calculation: the calculation whose files are retrieved
+    :param transport: the Transport instance
+    :param folder: an absolute path to a folder to copy files in
+    :param remote_local_pairs: a list of tuples (remote name, local name), with relative remote names
+    :return: True if the files were retrieved, False if the archive could not be created
+    """
+    import shutil
+    import tarfile
+    import uuid
+    from aiida.common.utils import escape_for_bash
+
+    remote_names = sorted(set(rem for rem, _ in remote_local_pairs))
+    archive = '.aiida_retrieve_{}.tar.gz'.format(uuid.uuid4().hex)
+
+    # Dereference symbolic links like `transport.get` does, and only warn about the files that do not exist
+    command = 'tar -czhf {} --ignore-failed-read -- {}'.format(
+        archive, ' '.join(escape_for_bash(name) for name in remote_names))
+
+    transport.logger.debug("[retrieval of calc {}] Creating the archive of {} remote items".format(
+        calculation.pk, len(remote_names)))
+    retval, _, stderr = transport.exec_command_wait(command)
+
+    try:
+        if retval != 0:
+            execlogger.debug("[retrieval of calc {}] creating the archive failed, retrieving files one by one: {}"
+                             "".format(calculation.pk, stderr))
+            return False
+
+        with SandboxFolder() as sandbox:
+            local_archive = os.path.join(sandbox.abspath, archive)
+            extracted = os.path.join(sandbox.abspath, 'extracted')
+            transport.get(archive, local_archive)
+
+            with tarfile.open(local_archive, 'r:gz') as handle:
+                members = [member for member in handle.getmembers() if _is_relative_path(member.name)]
+                handle.extractall(extracted, members=members)
+
+            retrieved = {}
+            for rem, loc in remote_local_pairs:
+                source = os.path.join(extracted, rem)
+                destination = os.path.join(folder, loc)
+
+                if rem in retrieved:
+                    # The same remote item was retrieved to another local name, that now holds the extracted copy
+                    source = retrieved[rem]
+                    _copy_local(source, destination)
+                elif os.path.lexists(source):
+                    _remove_local(destination)
+                    shutil.move(source, destination)
+                    retrieved[rem] = destination
+    finally:
+        try:
+            transport.remove(archive)
+        except (IOError, OSError):
+            pass
+
+    return True
+
+
+def _copy_local(source, destination):
+    """Copy a local file or directory, replacing the destination if it exists."""
+    import shutil
+
+    _remove_local(destination)
+    if os.path.isdir(source):
+        shutil.copytree(source, destination)
+    else:
+        shutil.copy2(source, destination)
+
+
+def _remove_local(path):
+    """Remove a local file or directory, if it exists."""
+    import shutil
+
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _log_retrieval_metrics(calculation, folder, remote_local_pairs, elapsed, method):
+    """
+    Log the number of files and bytes retrieved for a calculation, and the throughput of the retrieval.
+
+    :param calculation: the calculation whose files were retrieved
+    :param folder: the absolute path of the folder in which the files were copied
+    :param remote_local_pairs: a list of tuples (remote name, local name) of the retrieved items
+    :param elapsed: the time taken by the retrieval, in seconds
+    :param method: a string describing how the files were transferred
+    """
+    number_files = 0
+    number_bytes = 0
+
+    for local_name in set(loc for _, loc in remote_local_pairs):
+        path = os.path.join(folder, local_name)
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for filename in filenames:
+                    number_files += 1
+                    number_bytes += os.path.getsize(os.path.join(dirpath, filename))
+        elif os.path.isfile(path):
+            number_files += 1
+            number_bytes += os.path.getsize(path)
+
+    throughput = number_bytes / elapsed / 1024**2 if elapsed > 0 else 0.
+
+    execlogger.info(
+        "[retrieval of calc {}] Retrieved {} files, {} bytes in {:.3f} s ({:.2f} MB/s) as {}".format(
+            calculation.pk, number_files, number_bytes, elapsed, throughput, method),
+        extra=get_dblogger_extra(calculation))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Generic functions to manage the optional transitive closure table of the links between nodes.
+
+When the table is installed, the `ancestor_of` and `descendant_of` relationships of the QueryBuilder are computed with
+a join on the table instead of a recursive query over the links, which is much faster on large provenance graphs. The
+table is kept up to date by a trigger on the link table, which makes storing links somewhat slower.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+
+def get_session():
+    """Return an SQLAlchemy session for the current profile, whatever its backend.
+
+    :return: an instance of sqlalchemy.orm.session.Session
+    """
+    from aiida.backends import settings
+    from aiida.backends.profile import BACKEND_DJANGO
+
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.orm.implementation.django.dummy_model import get_aldjemy_session
+        return get_aldjemy_session()
+
+    from aiida.backends.sqlalchemy import get_scoped_session
+    return get_scoped_session()
+
+
+def has_link_closure():
+    """Return whether the transitive closure table of the links is installed."""
+    from aiida.backends.sqlalchemy.utils import has_link_closure as _has_link_closure
+
+    return _has_link_closure(get_session())
+
+
+def install_link_closure():
+    """Build the transitive closure table of the links and install the trigger that keeps it up to date.
+
+    :raises: ValueError if the table is already installed
+    """
+    from aiida.backends.sqlalchemy.utils import install_link_closure as _install_link_closure
+
+    if has_link_closure():
+        raise ValueError('the link closure table is already installed')
+
+    _install_link_closure(get_session())
+
+
+def uninstall_link_closure():
+    """Remove the transitive closure table of the links and its trigger."""
+    from aiida.backends.sqlalchemy.utils import uninstall_link_closure as _uninstall_link_closure
+
+    _uninstall_link_closure(get_session())
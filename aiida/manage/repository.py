@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Maintenance of the file repository with the 'objectstore' backend.
+
+With that backend, the files of new nodes are written as loose objects of the object store, and the folders of the
+nodes only exist on disk as checkouts while they are accessed, or as loose files written by the 'folder' backend before
+switching. Packing moves both into the pack files, such that the number of files in the repository stays small.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import time
+
+#: The time in seconds since the last modification below which node folders are not packed, since they may be written
+PACK_MIN_AGE = 3600
+
+
+def _get_latest_mtime(path):
+    """Return the latest modification time of a folder and of its content."""
+    latest = os.path.getmtime(path)
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in dirnames + filenames:
+            try:
+                latest = max(latest, os.lstat(os.path.join(dirpath, name)).st_mtime)
+            except OSError:
+                pass
+    return latest
+
+
+def iter_node_folders():
+    """
+    Iterate over the node folders that exist on disk in the repository.
+
+    :return: an iterator over tuples of the uuid and the absolute path of the folder of each node
+    """
+    from aiida.common.utils import get_repository_folder
+
+    section_dir = os.path.join(get_repository_folder('repository'), 'node')
+    if not os.path.isdir(section_dir):
+        return
+
+    for first in sorted(os.listdir(section_dir)):
+        first_dir = os.path.join(section_dir, first)
+        for second in sorted(os.listdir(first_dir)):
+            second_dir = os.path.join(first_dir, second)
+            for rest in sorted(os.listdir(second_dir)):
+                # Hidden folders are checkouts that are being written
+                if not rest.startswith('.'):
+                    yield first + second + rest, os.path.join(second_dir, rest)
+
+
+def pack_repository(min_age=PACK_MIN_AGE):
+    """
+    Move the node folders on disk into the object store and append its loose objects to pack files.
+
+    :param min_age: the time in seconds since the last modification below which node folders are skipped
+    :return: a tuple with the number of node folders that were moved and the number of objects that were packed
+    :raise aiida.common.exceptions.ConfigurationError: if the repository backend is not 'objectstore'
+    """
+    from aiida.common.exceptions import ConfigurationError
+    from aiida.common.folders import RepositoryFolder
+    from aiida.common.objectstore import get_object_store
+
+    store = get_object_store()
+    if store is None:
+        raise ConfigurationError("the repository backend is not 'objectstore', see the repository.backend property")
+
+    now = time.time()
+    folders = 0
+    for uuid, path in iter_node_folders():
+        if now - _get_latest_mtime(path) < min_age:
+            continue
+
+        RepositoryFolder(section='node', uuid=uuid).release()
+        folders += 1
+
+        # Remove the sharding folders that became empty
+        for parent in [os.path.dirname(path), os.path.dirname(os.path.dirname(path))]:
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+
+    return folders, store.pack_loose_objects()
@@ -10,8 +10,79 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+from collections import OrderedDict
+
 from aiida.orm import Data
 
+# The modes of `numpy.load` that can be used to memory-map the arrays, which should not modify the files
+MMAP_MODES = ('r', 'c')
+
+
+class ArrayCache(object):
+    """
+    A cache of arrays that holds at most a given number of bytes, discarding the
+    least recently used arrays when it is full. Arrays larger than the whole
+    budget are not cached.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        :param max_bytes: the maximum total number of bytes of the cached arrays
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._arrays = OrderedDict()
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def get(self, name):
+        """
+        Return a cached array, marking it as the most recently used.
+
+        :param name: the name of the array
+        :raise KeyError: if the array is not in the cache
+        """
+        array = self._arrays.pop(name)
+        self._arrays[name] = array
+        return array
+
+    def set(self, name, array):
+        """
+        Add an array to the cache, discarding the least recently used arrays if needed.
+
+        :param name: the name of the array
+        :param array: the numpy array
+        """
+        self.discard(name)
+
+        if array.nbytes > self.max_bytes:
+            return
+
+        while self._arrays and self.nbytes + array.nbytes > self.max_bytes:
+            _, discarded = self._arrays.popitem(last=False)
+            self.nbytes -= discarded.nbytes
+
+        self._arrays[name] = array
+        self.nbytes += array.nbytes
+
+    def discard(self, name):
+        """
+        Remove an array from the cache, if it is there.
+
+        :param name: the name of the array
+        """
+        array = self._arrays.pop(name, None)
+        if array is not None:
+            self.nbytes -= array.nbytes
+
+    def clear(self):
+        """Remove all the arrays from the cache."""
+        self._arrays.clear()
+        self.nbytes = 0
 
 
 class ArrayData(Data):
@@ -26,15 +97,20 @@ class ArrayData(Data):
       :py:meth:`.get_array` call, the array will be re-read from disk.
       If instead the ArrayData node has already been stored,
       the array is cached in memory after the first read, and the cached array
-      is used thereafter.
+      is used thereafter. The cache of each node holds at most the number of
+      megabytes set by the ``arraydata.cache_size`` property, discarding the
+      least recently used arrays.
       If too much RAM memory is used, you can clear the
-      cache with the :py:meth:`.clear_internal_cache` method.
+      cache with the :py:meth:`.clear_internal_cache` method, or read large
+      arrays memory-mapped with the ``mmap_mode`` parameter of
+      :py:meth:`.get_array`, or only the part you need with
+      :py:meth:`.get_array_slice`.
     """
     array_prefix = "array|"
 
     def __init__(self, *args, **kwargs):
         super(ArrayData, self).__init__(*args, **kwargs)
-        self._cached_arrays = {}
+        self._cached_arrays = None
 
     def delete_array(self, name):
         """
@@ -52,6 +128,7 @@ class ArrayData(Data):
 
         # remove both file and attribute
         self.remove_path(fname)
+        self._get_array_cache().discard(name)
         try:
             self._del_attr("{}{}".format(self.array_prefix, name))
         except (KeyError, AttributeError):
@@ -115,33 +192,87 @@ class ArrayData(Data):
         for name in self.get_arraynames():
             yield (name, self.get_array(name))
 
-    def get_array(self, name):
+    def get_array(self, name, mmap_mode=None):
         """
         Return an array stored in the node
 
         :param name: The name of the array to return.
+        :param mmap_mode: If 'r' or 'c', return the array memory-mapped from its file, read-only
+            or copy-on-write respectively (see `numpy.load`). The array is then read from disk
+            only where it is accessed and it is not cached.
         """
-        import numpy
-
-        # raw function used only internally
-        def get_array_from_file(self, name):
-            fname = '{}.npy'.format(name)
-            if fname not in self.get_folder_list():
-                raise KeyError(
-                    "Array with name '{}' not found in node pk= {}".format(
-                        name, self.pk))
-
-            array = numpy.load(self.get_abs_path(fname))
-            return array
+        if mmap_mode is not None:
+            if mmap_mode not in MMAP_MODES:
+                raise ValueError("mmap_mode should be None or one of {}, got '{}'".format(MMAP_MODES, mmap_mode))
+            return self._get_array_from_file(name, mmap_mode=mmap_mode)
 
         # Return with proper caching, but only after storing. Before, instead,
         # always re-read from disk
         if not self.is_stored:
-            return get_array_from_file(self, name)
-        else:
-            if name not in self._cached_arrays:
-                self._cached_arrays[name] = get_array_from_file(self, name)
-            return self._cached_arrays[name]
+            return self._get_array_from_file(name)
+
+        cache = self._get_array_cache()
+        if name in cache:
+            return cache.get(name)
+
+        array = self._get_array_from_file(name)
+        cache.set(name, array)
+        return array
+
+    def get_array_slice(self, name, index):
+        """
+        Return a part of an array stored in the node, reading from disk only that part
+        unless the whole array is already cached.
+
+        :param name: The name of the array.
+        :param index: The index of the part of the array, as passed to the `[]` operator
+            of numpy arrays, e.g. an integer, a slice or a tuple of them.
+        :return: A numpy array (or scalar) that does not share memory with the file.
+        """
+        import numpy
+
+        if self.is_stored and name in self._get_array_cache():
+            return self._get_array_cache().get(name)[index]
+
+        try:
+            array = self._get_array_from_file(name, mmap_mode='r')
+        except ValueError:
+            # Arrays of objects cannot be memory-mapped
+            return self.get_array(name)[index]
+
+        part = array[index]
+        if isinstance(part, numpy.ndarray):
+            part = numpy.array(part)
+        del array
+        return part
+
+    def _get_array_from_file(self, name, mmap_mode=None):
+        """
+        Read an array from its file in the repository folder of the node.
+
+        :param name: The name of the array.
+        :param mmap_mode: The `mmap_mode` passed to `numpy.load`.
+        """
+        import numpy
+
+        fname = '{}.npy'.format(name)
+        if fname not in self.get_folder_list():
+            raise KeyError(
+                "Array with name '{}' not found in node pk= {}".format(
+                    name, self.pk))
+
+        return numpy.load(self.get_abs_path(fname), mmap_mode=mmap_mode)
+
+    def _get_array_cache(self):
+        """
+        Return the cache of the arrays read from disk, creating it with the size
+        from the ``arraydata.cache_size`` property if needed.
+        """
+        from aiida.common.setup import get_property
+
+        if self._cached_arrays is None:
+            self._cached_arrays = ArrayCache(get_property('arraydata.cache_size') * 1024**2)
+        return self._cached_arrays
 
     def clear_internal_cache(self):
         """
@@ -151,7 +282,7 @@ class ArrayData(Data):
         This function is useful if you want to keep the node in memory, but you
         do not want to waste memory to cache the arrays in RAM.
         """
-        self._cached_arrays = {}
+        self._get_array_cache().clear()
 
     def set_array(self, name, array):
         """
@@ -186,6 +317,8 @@ class ArrayData(Data):
             # will just copy an empty file
             self.add_path(f.name, fname)
 
+        self._get_array_cache().discard(name)
+
         # Mainly for convenience, for querying purposes (both stores the fact
         # that there is an array with that name, and its shape)
         self._set_attr("{}{}".format(self.array_prefix, name),
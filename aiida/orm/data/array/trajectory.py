@@ -173,14 +173,14 @@ class TrajectoryData(ArrayData):
 
         stepids = numpy.arange(len(structurelist))
         cells = numpy.array([x.cell for x in structurelist])
-        symbols_first = [str(s.kind_name) for s in structurelist[0].sites]
-        for symbols_now in [[str(s.kind_name) for s in structurelist[i].sites]
+        symbols_first = [str(kind_name) for kind_name in structurelist[0].get_site_kindnames()]
+        for symbols_now in [[str(kind_name) for kind_name in structurelist[i].get_site_kindnames()]
                             for i in stepids]:
             if symbols_first != symbols_now:
                 raise ValueError("Symbol lists have to be the same for "
                                  "all of the supplied structures")
         symbols = numpy.array(symbols_first)
-        positions = numpy.array([[list(s.position) for s in x.sites] for x in structurelist])
+        positions = numpy.array([x.get_positions() for x in structurelist])
         self.set_trajectory(stepids, cells, symbols, positions)
 
     def _validate(self):
@@ -354,14 +354,18 @@ class TrajectoryData(ArrayData):
             raise IndexError("You have only {} steps, but you are looking beyond"
                              " (index={})".format(self.numsteps, index))
 
-        vel = self.get_velocities()
-        if vel is not None:
-            vel = vel[index, :, :]
-        time = self.get_times()
-        if time is not None:
-            time = time[index]
-        return (self.get_stepids()[index], time, self.get_cells()[index, :, :],
-                self.get_symbols(), self.get_positions()[index, :, :], vel)
+        # Only read the requested step from disk, the arrays of the whole trajectory can be large
+        try:
+            vel = self.get_array_slice('velocities', (index, slice(None), slice(None)))
+        except (AttributeError, KeyError):
+            vel = None
+        try:
+            time = self.get_array_slice('times', index)
+        except (AttributeError, KeyError):
+            time = None
+        return (self.get_array_slice('steps', index), time,
+                self.get_array_slice('cells', (index, slice(None), slice(None))),
+                self.get_symbols(), self.get_array_slice('positions', (index, slice(None), slice(None))), vel)
 
 
     def step_to_structure(self, index, custom_kinds=None):
@@ -43,6 +43,10 @@ _valid_symbols = tuple(i['symbol'] for i in elements.values())
 _atomic_masses = {el['symbol']: el['mass'] for el in elements.values()}
 _atomic_numbers = {data['symbol']: num for num, data in elements.items()}
 
+# The ways in which the sites of a structure can be stored, see StructureData.set_site_storage
+SITE_STORAGE_ATTRIBUTES = 'attributes'
+SITE_STORAGE_ARRAYS = 'arrays'
+
 
 def _get_valid_cell(inputcell):
     """
@@ -98,6 +102,29 @@ def get_valid_pbc(inputpbc):
     return the_pbc
 
 
+def _get_valid_positions(positions):
+    """
+    Return the positions of sites as a float array of shape (N, 3).
+
+    :raise ValueError: if the positions are not a list of lists of three float numbers
+    """
+    import numpy
+
+    try:
+        valid_positions = numpy.array(positions, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("Wrong format for the positions, expecting a list of lists of three float numbers")
+
+    if valid_positions.size == 0:
+        return valid_positions.reshape(0, 3)
+
+    if valid_positions.ndim != 2 or valid_positions.shape[1] != 3:
+        raise ValueError("Wrong format for the positions, expecting a list of lists of three float numbers, "
+                         "found instead an array of shape {}".format(valid_positions.shape))
+
+    return valid_positions
+
+
 def has_ase():
     """
     :return: True if the ase module can be imported, False otherwise.
@@ -586,6 +613,32 @@ def get_symbols_string(symbols, weights):
         return "{{{}}}".format("".join(sorted(pieces)))
 
 
+def get_formula_from_attributes(pk, kinds, sites, site_storage=None, mode='hill'):
+    """
+    Return the chemical formula of a stored structure from its attributes, as projected by a query.
+
+    The structure is only loaded when its sites are stored as arrays in the repository, see
+    :py:meth:`StructureData.set_site_storage`, since they are then not in the attributes.
+
+    :param pk: the pk of the structure
+    :param kinds: the value of the 'kinds' attribute
+    :param sites: the value of the 'sites' attribute, None with SITE_STORAGE_ARRAYS
+    :param site_storage: the value of the 'site_storage' attribute
+    :param mode: the mode of the formula, see :py:func:`get_formula`
+    :return: a string with the formula
+    :raise KeyError: if the sites are missing or a site refers to a kind that does not exist
+    """
+    if site_storage == SITE_STORAGE_ARRAYS:
+        from aiida.orm import load_node
+        return load_node(pk).get_formula(mode=mode)
+
+    if sites is None:
+        raise KeyError('sites')
+
+    symbol_dict = {kind['name']: get_symbols_string(kind['symbols'], kind['weights']) for kind in kinds}
+    return get_formula([symbol_dict[site['kind_name']] for site in sites], mode=mode)
+
+
 def has_vacancies(weights):
     """
     Returns True if the sum of the weights is less than one.
@@ -779,6 +832,15 @@ class StructureData(Data):
         3: "volume"
     }
 
+    # The files of the repository with the sites, for the 'arrays' site storage
+    _site_positions_filename = 'site_positions.npy'
+    _site_kind_indices_filename = 'site_kind_indices.npy'
+
+    def __init__(self, **kwargs):
+        # Positions and kind indices of the sites in the 'arrays' site storage, read from the files when needed
+        self._site_arrays = None
+        super(StructureData, self).__init__(**kwargs)
+
     @property
     def _set_defaults(self):
         parent_dict = super(StructureData, self)._set_defaults
@@ -832,8 +894,20 @@ class StructureData(Data):
             self.cell = aseatoms.cell
             self.pbc = aseatoms.pbc
             self.clear_kinds()  # This also calls clear_sites
-            for atom in aseatoms:
-                self.append_atom(ase=atom)
+
+            # The kind of an atom only depends on its symbol, mass and tag, so it is determined once for each of them
+            kind_names = {}
+            site_kind_names = []
+            keys = zip(aseatoms.get_chemical_symbols(), aseatoms.get_masses().tolist(), aseatoms.get_tags().tolist())
+            for index, key in enumerate(keys):
+                try:
+                    kind_name = kind_names[key]
+                except KeyError:
+                    kind = self._get_or_append_kind(Kind(ase=aseatoms[index]), name_specified=False)
+                    kind_name = kind_names[key] = kind.name
+                site_kind_names.append(kind_name)
+
+            self.append_atoms(aseatoms.get_positions(), site_kind_names)
         else:
             raise TypeError("The value is not an ase.Atoms object")
 
@@ -976,21 +1050,26 @@ class StructureData(Data):
                                       "instead of only one".format(
                     c, counts[c]))
 
+        import numpy
+
         try:
-            # This will try to create the sites objects
-            sites = self.sites
+            # This will check the sites and find the indices of their kinds
+            positions, kind_indices = self._get_site_arrays()
         except ValueError as exc:
             raise ValidationError(
                 "Unable to validate the sites: {}".format(exc))
 
-        for site in sites:
-            if site.kind_name not in [k.name for k in kinds]:
-                raise ValidationError(
-                    "A site has kind {}, but no specie with that name exists"
-                    "".format(site.kind_name))
+        if positions.shape != (len(kind_indices), 3):
+            raise ValidationError(
+                "The positions of the sites have shape {} instead of ({}, 3)"
+                "".format(positions.shape, len(kind_indices)))
+
+        if len(kind_indices) and (kind_indices.min() < 0 or kind_indices.max() >= len(kinds)):
+            raise ValidationError(
+                "A site has a kind index outside of the {} kinds".format(len(kinds)))
 
-        kinds_without_sites = (
-            set(k.name for k in kinds) - set(s.kind_name for s in sites))
+        counts = numpy.bincount(kind_indices, minlength=len(kinds))
+        kinds_without_sites = [kind.name for kind, count in zip(kinds, counts) if count == 0]
         if kinds_without_sites:
             raise ValidationError("The following kinds are defined, but there "
                                   "are no sites with that kind: {}".format(
@@ -1049,7 +1128,8 @@ class StructureData(Data):
 
         # Get cell vectors and atomic position
         lattice_vectors = np.array(self.get_attr('cell'))
-        base_sites = self.get_attr('sites')
+        base_positions = self.get_positions().tolist()
+        base_kind_names = self.get_site_kindnames()
 
         start1 = -int(supercell_factors[0] / 2)
         start2 = -int(supercell_factors[1] / 2)
@@ -1070,18 +1150,17 @@ class StructureData(Data):
                   lattice_vectors[2]) / 2.
 
         for ix, iy, iz in product(grid1, grid2, grid3):
-            for base_site in base_sites:
+            for base_position, kind_name in zip(base_positions, base_kind_names):
                 shift = (ix * lattice_vectors[0] + iy * lattice_vectors[1] + \
                          iz * lattice_vectors[2] - center).tolist()
 
-                kind_name = base_site['kind_name']
                 kind_string = self.get_kind(kind_name).get_symbols_string()
 
                 atoms_json.append(
                     {'l': kind_string,
-                     'x': base_site['position'][0] + shift[0],
-                     'y': base_site['position'][1] + shift[1],
-                     'z': base_site['position'][2] + shift[2],
+                     'x': base_position[0] + shift[0],
+                     'y': base_position[1] + shift[1],
+                     'z': base_position[2] + shift[2],
                      # 'atomic_elements_html': kind_string
                      'atomic_elements_html': atom_kinds_to_html(kind_string)
                      })
@@ -1118,22 +1197,23 @@ class StructureData(Data):
             raise NotImplementedError("XYZ for alloys or systems with "
                                       "vacancies not implemented.")
 
-        sites = self.sites
+        positions = self.get_positions().tolist()
+        kind_names = self.get_site_kindnames()
         cell = self.cell
 
-        return_list = ["{}".format(len(sites))]
+        return_list = ["{}".format(len(positions))]
         return_list.append('Lattice="{} {} {} {} {} {} {} {} {}" pbc="{} {} {}"'.format(
             cell[0][0], cell[0][1], cell[0][2],
             cell[1][0], cell[1][1], cell[1][2],
             cell[2][0], cell[2][1], cell[2][2],
             self.pbc[0], self.pbc[1], self.pbc[2]
         ))
-        for site in sites:
+        for position, kind_name in zip(positions, kind_names):
             # I checked above that it is not an alloy, therefore I take the
             # first symbol
             return_list.append("{:6s} {:18.10f} {:18.10f} {:18.10f}".format(
-                self.get_kind(site.kind_name).symbols[0],
-                site.position[0], site.position[1], site.position[2]))
+                self.get_kind(kind_name).symbols[0],
+                position[0], position[1], position[2]))
 
         return_string = "\n".join(return_list)
         return return_string.encode('utf-8'), {}
@@ -1174,14 +1254,13 @@ class StructureData(Data):
         self.set_pbc(pbc)
 
         # Calculating the minimal cell:
-        positions = np.array([site.position for site in self.sites])
+        positions = self.get_positions()
         position_min, position_max = get_extremas_from_positions(positions)
 
         # Translate the structure to the origin, such that the minimal values in each dimension
         # amount to (0,0,0)
         positions -= position_min
-        for index, site in enumerate(self.get_attr('sites')):
-            site['position'] = list(positions[index])
+        self.set_positions(positions)
 
         # The orthorhombic cell that (just) accomodates the whole structure is now given by the
         # extremas of position in each dimension:
@@ -1264,8 +1343,8 @@ class StructureData(Data):
             used to group and/or order the symbols in the formula
         """
 
-        symbol_list = [self.get_kind(s.kind_name).get_symbols_string()
-                       for s in self.sites]
+        kind_symbols = [kind.get_symbols_string() for kind in self.kinds]
+        symbol_list = [kind_symbols[index] for index in self.get_kind_indices().tolist()]
 
         return get_formula(symbol_list, mode=mode, separator=separator)
 
@@ -1280,7 +1359,8 @@ class StructureData(Data):
 
         :return: a list of strings
         """
-        return [this_site.kind_name for this_site in self.sites]
+        kind_names = self.get_kind_names()
+        return [kind_names[index] for index in self.get_kind_indices().tolist()]
 
     def get_composition(self):
         """
@@ -1292,13 +1372,16 @@ class StructureData(Data):
 
         :returns: a dictionary with the composition
         """
-        symbols_list = [self.get_kind(s.kind_name).get_symbols_string()
-                        for s in self.sites]
-        composition = {
-            symbol: symbols_list.count(symbol)
-            for symbol
-            in set(symbols_list)
-            }
+        import numpy
+
+        kinds = self.kinds
+        counts = numpy.bincount(self.get_kind_indices(), minlength=len(kinds))
+
+        composition = {}
+        for kind, count in zip(kinds, counts.tolist()):
+            if count:
+                symbol = kind.get_symbols_string()
+                composition[symbol] = composition.get(symbol, 0) + count
         return composition
 
     def get_ase(self):
@@ -1423,7 +1506,11 @@ class StructureData(Data):
                                          [k.name for k in self.kinds]))
 
         # If here, no exceptions have been raised, so I add the site.
-        self._append_to_attr('sites', new_site.get_raw())
+        if self.get_site_storage() == SITE_STORAGE_ARRAYS:
+            # Rewrites the arrays, use append_atoms to add many sites
+            self.append_atoms([new_site.position], [new_site.kind_name])
+        else:
+            self._append_to_attr('sites', new_site.get_raw())
 
     def append_atom(self, **kwargs):
         """
@@ -1473,56 +1560,7 @@ class StructureData(Data):
             # all remaining parameters
             kind = Kind(**kwargs)
 
-        # I look for identical species only if the name is not specified
-        _kinds = self.kinds
-
-        if 'name' not in kwargs:
-            # If the kind is identical to an existing one, I use the existing
-            # one, otherwise I replace it
-            exists_already = False
-            for idx, existing_kind in enumerate(_kinds):
-                try:
-                    existing_kind._internal_tag = self._internal_kind_tags[idx]
-                except KeyError:
-                    # self._internal_kind_tags does not contain any info for
-                    # the kind in position idx: I don't have to add anything
-                    # then, and I continue
-                    pass
-                if (kind.compare_with(existing_kind)[0]):
-                    kind = existing_kind
-                    exists_already = True
-                    break
-            if not exists_already:
-                # There is not an identical kind.
-                # By default, the name of 'kind' just contains the elements.
-                # I then check that the name of 'kind' does not already exist,
-                # and if it exists I add a number (starting from 1) until I
-                # find a non-used name.
-                existing_names = [k.name for k in _kinds]
-                simplename = kind.name
-                counter = 1
-                while kind.name in existing_names:
-                    kind.name = "{}{}".format(simplename, counter)
-                    counter += 1
-                self.append_kind(kind)
-        else:  # 'name' was specified
-            old_kind = None
-            for existing_kind in _kinds:
-                if existing_kind.name == kwargs['name']:
-                    old_kind = existing_kind
-                    break
-            if old_kind is None:
-                self.append_kind(kind)
-            else:
-                is_the_same, firstdiff = kind.compare_with(old_kind)
-                if is_the_same:
-                    kind = old_kind
-                else:
-                    raise ValueError("You are explicitly setting the name "
-                                     "of the kind to '{}', that already "
-                                     "exists, but the two kinds are different!"
-                                     " (first difference: {})".format(
-                        kind.name, firstdiff))
+        kind = self._get_or_append_kind(kind, name_specified='name' in kwargs)
 
         site = Site(kind_name=kind.name, position=position)
         self.append_site(site)
@@ -1595,6 +1633,68 @@ class StructureData(Data):
     #             append_int += 1
     #         new_site.type = new_typename
 
+    def _get_or_append_kind(self, kind, name_specified):
+        """
+        Return the kind of the structure to use for a new site of the given kind, appending the kind if needed.
+
+        :param kind: the Kind of the new site
+        :param name_specified: whether the name of the kind was given explicitly, see `append_atom`
+        :return: the Kind to use for the site
+        :raise ValueError: if the name was specified and a different kind with the same name exists
+        """
+        # I look for identical species only if the name is not specified
+        _kinds = self.kinds
+
+        if not name_specified:
+            # If the kind is identical to an existing one, I use the existing
+            # one, otherwise I replace it
+            exists_already = False
+            for idx, existing_kind in enumerate(_kinds):
+                try:
+                    existing_kind._internal_tag = self._internal_kind_tags[idx]
+                except KeyError:
+                    # self._internal_kind_tags does not contain any info for
+                    # the kind in position idx: I don't have to add anything
+                    # then, and I continue
+                    pass
+                if (kind.compare_with(existing_kind)[0]):
+                    kind = existing_kind
+                    exists_already = True
+                    break
+            if not exists_already:
+                # There is not an identical kind.
+                # By default, the name of 'kind' just contains the elements.
+                # I then check that the name of 'kind' does not already exist,
+                # and if it exists I add a number (starting from 1) until I
+                # find a non-used name.
+                existing_names = [k.name for k in _kinds]
+                simplename = kind.name
+                counter = 1
+                while kind.name in existing_names:
+                    kind.name = "{}{}".format(simplename, counter)
+                    counter += 1
+                self.append_kind(kind)
+        else:  # 'name' was specified
+            old_kind = None
+            for existing_kind in _kinds:
+                if existing_kind.name == kind.name:
+                    old_kind = existing_kind
+                    break
+            if old_kind is None:
+                self.append_kind(kind)
+            else:
+                is_the_same, firstdiff = kind.compare_with(old_kind)
+                if is_the_same:
+                    kind = old_kind
+                else:
+                    raise ValueError("You are explicitly setting the name "
+                                     "of the kind to '{}', that already "
+                                     "exists, but the two kinds are different!"
+                                     " (first difference: {})".format(
+                        kind.name, firstdiff))
+
+        return kind
+
     def clear_kinds(self):
         """
         Removes all kinds for the StructureData object.
@@ -1623,19 +1723,255 @@ class StructureData(Data):
                 "The StructureData object cannot be modified, "
                 "it has already been stored")
 
-        self._set_attr('sites', [])
+        if self.get_site_storage() == SITE_STORAGE_ARRAYS:
+            self._set_site_arrays(*self._get_empty_site_arrays())
+        else:
+            self._set_attr('sites', [])
 
     @property
     def sites(self):
         """
         Returns a list of sites.
+
+        .. note:: This creates a Site object for each site, use
+            :py:meth:`get_positions` and :py:meth:`get_kind_indices`
+            for large structures.
         """
+        if self.get_site_storage() == SITE_STORAGE_ARRAYS:
+            positions, kind_indices = self._get_site_arrays()
+            kind_names = self.get_kind_names()
+            return [Site(kind_name=kind_names[index], position=position)
+                    for position, index in zip(positions.tolist(), kind_indices.tolist())]
+
         try:
             raw_sites = self.get_attr('sites')
         except AttributeError:
             raw_sites = []
         return [Site(raw=i) for i in raw_sites]
 
+    def get_site_storage(self):
+        """
+        Return how the sites are stored, see :py:meth:`set_site_storage`.
+
+        :return: either SITE_STORAGE_ATTRIBUTES or SITE_STORAGE_ARRAYS
+        """
+        return self.get_attr('site_storage', SITE_STORAGE_ATTRIBUTES)
+
+    def set_site_storage(self, value):
+        """
+        Set how the sites are stored, converting the existing sites.
+
+        With SITE_STORAGE_ATTRIBUTES (the default), the sites are a list of
+        dictionaries in the 'sites' attribute. With SITE_STORAGE_ARRAYS, the
+        positions and the indices of the kinds of the sites are stored as
+        numpy arrays in the repository, which is much more efficient for
+        large structures, while the kinds remain in the attributes. The
+        sites can then not be queried through their attributes.
+
+        :param value: either SITE_STORAGE_ATTRIBUTES or SITE_STORAGE_ARRAYS
+        :raise ValueError: if the value is not a valid site storage
+        """
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        if value not in (SITE_STORAGE_ATTRIBUTES, SITE_STORAGE_ARRAYS):
+            raise ValueError("Invalid site storage '{}', it should be '{}' or '{}'".format(
+                value, SITE_STORAGE_ATTRIBUTES, SITE_STORAGE_ARRAYS))
+
+        if value == self.get_site_storage():
+            return
+
+        positions, kind_indices = self._get_site_arrays()
+
+        if value == SITE_STORAGE_ARRAYS:
+            try:
+                self._del_attr('sites')
+            except AttributeError:
+                pass
+            self._set_attr('site_storage', value)
+        else:
+            for filename in [self._site_positions_filename, self._site_kind_indices_filename]:
+                if filename in self.get_folder_list():
+                    self.remove_path(filename)
+            self._site_arrays = None
+            self._del_attr('site_storage')
+
+        self._set_site_arrays(positions, kind_indices)
+
+    @staticmethod
+    def _get_empty_site_arrays():
+        """Return the positions and kind indices of a structure without sites."""
+        import numpy
+
+        return numpy.zeros((0, 3), dtype=float), numpy.zeros((0,), dtype=numpy.int32)
+
+    def _get_site_arrays(self):
+        """
+        Return the positions and the kind indices of the sites, whatever the site storage.
+
+        The arrays are shared with the internal cache and should not be modified.
+
+        :return: a tuple with a float array of shape (N, 3) and an integer array of shape (N,)
+        :raise ValueError: if the sites are not valid, e.g. if a site refers to a kind that does not exist
+        """
+        import numpy
+
+        if self.get_site_storage() == SITE_STORAGE_ARRAYS:
+            if self._site_arrays is None:
+                filenames = [self._site_positions_filename, self._site_kind_indices_filename]
+                if all(filename in self.get_folder_list() for filename in filenames):
+                    arrays = tuple(numpy.load(self.get_abs_path(filename)) for filename in filenames)
+                else:
+                    arrays = self._get_empty_site_arrays()
+                for array in arrays:
+                    array.flags.writeable = False
+                self._site_arrays = arrays
+            return self._site_arrays
+
+        try:
+            raw_sites = self.get_attr('sites')
+        except AttributeError:
+            raw_sites = []
+
+        try:
+            site_kind_names = [raw['kind_name'] for raw in raw_sites]
+            positions = numpy.array([raw['position'] for raw in raw_sites], dtype=float).reshape(len(raw_sites), 3)
+        except KeyError as exc:
+            raise ValueError("Invalid raw site, it does not contain any key {}".format(exc.args[0]))
+        except (TypeError, ValueError):
+            raise ValueError("Wrong format for the positions of the sites, each must be a list of three float numbers")
+
+        kind_index = {name: index for index, name in enumerate(self.get_kind_names())}
+        try:
+            kind_indices = numpy.array([kind_index[name] for name in site_kind_names], dtype=numpy.int32)
+        except KeyError as exc:
+            raise ValueError("A site has kind {}, but no specie with that name exists".format(exc.args[0]))
+
+        return positions, kind_indices
+
+    def _set_site_arrays(self, positions, kind_indices):
+        """
+        Replace the sites with the given positions and kind indices, whatever the site storage.
+
+        :param positions: a float array of shape (N, 3)
+        :param kind_indices: an integer array of shape (N,), with the indices of the kinds in ``self.kinds``
+        """
+        import tempfile
+
+        import numpy
+
+        if self.get_site_storage() == SITE_STORAGE_ARRAYS:
+            arrays = (numpy.array(positions, dtype=float), numpy.array(kind_indices, dtype=numpy.int32))
+            for filename, array in zip([self._site_positions_filename, self._site_kind_indices_filename], arrays):
+                with tempfile.NamedTemporaryFile() as handle:
+                    numpy.save(handle, array)
+                    handle.flush()
+                    self.add_path(handle.name, filename)
+                array.flags.writeable = False
+            self._site_arrays = arrays
+        else:
+            kind_names = self.get_kind_names()
+            self._set_attr('sites', [{
+                'position': position,
+                'kind_name': kind_names[index]
+            } for position, index in zip(numpy.asarray(positions).tolist(), numpy.asarray(kind_indices).tolist())])
+
+    def get_num_sites(self):
+        """
+        Return the number of sites.
+        """
+        return len(self._get_site_arrays()[1])
+
+    def get_positions(self):
+        """
+        Return the positions of all the sites.
+
+        :return: a numpy array of floats of shape (N, 3), in angstrom
+        """
+        import numpy
+
+        return numpy.array(self._get_site_arrays()[0])
+
+    def get_kind_indices(self):
+        """
+        Return for each site the index of its kind in the list of kinds,
+        i.e. in ``self.kinds`` and ``self.get_kind_names()``.
+
+        :return: a numpy array of integers of shape (N,)
+        """
+        import numpy
+
+        return numpy.array(self._get_site_arrays()[1])
+
+    def set_positions(self, positions):
+        """
+        Replace the positions of all the sites, keeping their kinds.
+
+        :param positions: an array-like of shape (N, 3) with the new positions
+            in angstrom, in the same order as the sites
+        :raise ValueError: if the positions are not valid or their number is
+            not the number of sites
+        """
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        positions = _get_valid_positions(positions)
+        kind_indices = self._get_site_arrays()[1]
+        if len(positions) != len(kind_indices):
+            raise ValueError("the new positions should be as many as the previous structure.")
+
+        self._set_site_arrays(positions, kind_indices)
+
+    def append_atoms(self, positions, kind_names):
+        """
+        Append many sites to the structure at once.
+
+        :param positions: an array-like of shape (N, 3) with the positions in angstrom
+        :param kind_names: a list of N strings with the kind names of the sites.
+            Each must be the name of a kind of the structure, or a chemical
+            symbol, in which case the kind with that name is created with
+            the default mass if it does not exist.
+        :raise ValueError: if the positions are not valid, if the number of
+            kind names is not the number of positions, or if a kind name does
+            not exist and is not a chemical symbol
+        """
+        import numpy
+
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        positions = _get_valid_positions(positions)
+        if len(kind_names) != len(positions):
+            raise ValueError("There are {} kind names for {} positions".format(len(kind_names), len(positions)))
+
+        kind_index = {name: index for index, name in enumerate(self.get_kind_names())}
+        kind_indices = numpy.empty((len(kind_names),), dtype=numpy.int32)
+        for site_index, kind_name in enumerate(kind_names):
+            try:
+                kind_indices[site_index] = kind_index[kind_name]
+            except KeyError:
+                if not is_valid_symbol(kind_name):
+                    raise ValueError("No kind with name '{}', available kinds are: {}".format(
+                        kind_name, list(kind_index)))
+                self.append_kind(Kind(symbols=kind_name))
+                kind_index[kind_name] = kind_indices[site_index] = len(kind_index)
+
+        old_positions, old_kind_indices = self._get_site_arrays()
+        self._set_site_arrays(
+            numpy.concatenate([old_positions, positions]), numpy.concatenate([old_kind_indices, kind_indices]))
+
     @property
     def kinds(self):
         """
@@ -1750,36 +2086,8 @@ class StructureData(Data):
         if not conserve_particle:
             # TODO:
             raise NotImplementedError
-        else:
-
-            # test consistency of th enew input
-            n_sites = len(self.sites)
-            if n_sites != len(new_positions) and conserve_particle:
-                raise ValueError(
-                    "the new positions should be as many as the previous structure.")
-
-            new_sites = []
-            for i in range(n_sites):
-                try:
-                    this_pos = [float(j) for j in new_positions[i]]
-                except ValueError:
-                    raise ValueError(
-                        "Expecting a list of floats. Found instead {}"
-                        .format(new_positions[i]))
 
-                if len(this_pos) != 3:
-                    raise ValueError("Expecting a list of lists of length 3. "
-                                     "found instead {}".format(len(this_pos)))
-
-                # now append this Site to the new_site list.
-                new_site = Site(site=self.sites[i])  # So we make a copy
-                new_site.position = copy.deepcopy(this_pos)
-                new_sites.append(new_site)
-
-            # now clear the old sites, and substitute with the new ones
-            self.clear_sites()
-            for this_new_site in new_sites:
-                self.append_site(this_new_site)
+        self.set_positions(new_positions)
 
     @property
     def pbc(self):
@@ -1907,10 +2215,10 @@ class StructureData(Data):
         """
         from phonopy.structure.atoms import Atoms as PhonopyAtoms
 
-        atoms = PhonopyAtoms(symbols=[_.kind_name for _ in self.sites])
+        atoms = PhonopyAtoms(symbols=self.get_site_kindnames())
         # Phonopy internally uses scaled positions, so you must store cell first!
         atoms.set_cell(self.cell)
-        atoms.set_positions([_.position for _ in self.sites])
+        atoms.set_positions(self.get_positions())
 
         return atoms
 
@@ -1924,12 +2232,27 @@ class StructureData(Data):
         """
         import ase
 
-        asecell = ase.Atoms(cell=self.cell, pbc=self.pbc)
-        _kinds = self.kinds
+        import numpy
 
-        for site in self.sites:
-            asecell.append(site.get_ase(kinds=_kinds))
-        return asecell
+        positions, kind_indices = self._get_site_arrays()
+        if not len(kind_indices):
+            return ase.Atoms(cell=self.cell, pbc=self.pbc)
+
+        _kinds = self.kinds
+        tags = _get_ase_tags(_kinds)
+        for index in numpy.unique(kind_indices).tolist():
+            if _kinds[index].is_alloy() or _kinds[index].has_vacancies():
+                raise ValueError("Cannot convert to ASE if the kind represents "
+                                 "an alloy or it has vacancies.")
+
+        symbols = [str(kind.symbols[0]) for kind in _kinds]
+        return ase.Atoms(
+            symbols=[symbols[index] for index in kind_indices.tolist()],
+            positions=positions,
+            masses=numpy.array([kind.mass for kind in _kinds])[kind_indices],
+            tags=numpy.array([tag or 0 for tag in tags], dtype=int)[kind_indices],
+            cell=self.cell,
+            pbc=self.pbc)
 
     def _get_object_pymatgen(self,**kwargs):
         """
@@ -2444,6 +2767,59 @@ class Kind(object):
         return "name '{}', symbol '{}'".format(self.name, symbol)
 
 
+def _get_ase_tags(kinds):
+    """
+    Return the tags of the atoms of each kind when converting to ASE, or None
+    for the kinds whose atoms have no tag, i.e. if the kind name is the
+    chemical symbol, or if the kind is an alloy or has vacancies.
+
+    :param kinds: the list of kinds of the structure
+    :return: a list with a tag or None for each kind
+    """
+    from collections import defaultdict
+
+    # I create the list of tags
+    tag_list = []
+    used_tags = defaultdict(list)
+    for k in kinds:
+        # Skip alloys and vacancies
+        if k.is_alloy() or k.has_vacancies():
+            tag_list.append(None)
+        # If the kind name is equal to the specie name,
+        # then no tag should be set
+        elif six.text_type(k.name) == six.text_type(k.symbols[0]):
+            tag_list.append(None)
+        else:
+            # Name is not the specie name
+            if k.name.startswith(k.symbols[0]):
+                try:
+                    new_tag = int(k.name[len(k.symbols[0])])
+                    tag_list.append(new_tag)
+                    used_tags[k.symbols[0]].append(new_tag)
+                    continue
+                except ValueError:
+                    pass
+            tag_list.append(k.symbols[0])  # I use a string as a placeholder
+
+    for i in range(len(tag_list)):
+        # If it is a string, it is the name of the element,
+        # and I have to generate a new integer for this element
+        # and replace tag_list[i] with this new integer
+        if isinstance(tag_list[i], six.string_types):
+            # I get a list of used tags for this element
+            existing_tags = used_tags[tag_list[i]]
+            if existing_tags:
+                new_tag = max(existing_tags) + 1
+            else:  # empty list
+                new_tag = 1
+            # I store it also as a used tag!
+            used_tags[tag_list[i]].append(new_tag)
+            # I update the tag
+            tag_list[i] = new_tag
+
+    return tag_list
+
+
 class Site(object):
     """
     This class contains the information about a given site of the system.
@@ -2519,47 +2895,9 @@ class Site(object):
         .. note:: If any site is an alloy or has vacancies, a ValueError
             is raised (from the site.get_ase() routine).
         """
-        from collections import defaultdict
         import ase
 
-        # I create the list of tags
-        tag_list = []
-        used_tags = defaultdict(list)
-        for k in kinds:
-            # Skip alloys and vacancies
-            if k.is_alloy() or k.has_vacancies():
-                tag_list.append(None)
-            # If the kind name is equal to the specie name,
-            # then no tag should be set
-            elif six.text_type(k.name) == six.text_type(k.symbols[0]):
-                tag_list.append(None)
-            else:
-                # Name is not the specie name
-                if k.name.startswith(k.symbols[0]):
-                    try:
-                        new_tag = int(k.name[len(k.symbols[0])])
-                        tag_list.append(new_tag)
-                        used_tags[k.symbols[0]].append(new_tag)
-                        continue
-                    except ValueError:
-                        pass
-                tag_list.append(k.symbols[0])  # I use a string as a placeholder
-
-        for i in range(len(tag_list)):
-            # If it is a string, it is the name of the element,
-            # and I have to generate a new integer for this element
-            # and replace tag_list[i] with this new integer
-            if isinstance(tag_list[i], six.string_types):
-                # I get a list of used tags for this element
-                existing_tags = used_tags[tag_list[i]]
-                if existing_tags:
-                    new_tag = max(existing_tags) + 1
-                else:  # empty list
-                    new_tag = 1
-                # I store it also as a used tag!
-                used_tags[tag_list[i]].append(new_tag)
-                # I update the tag
-                tag_list[i] = new_tag
+        tag_list = _get_ase_tags(kinds)
 
         found = False
         for k, t in zip(kinds, tag_list):
@@ -50,6 +50,100 @@ _element_v2_regexp = re.compile(
    """, re.VERBOSE)
 
 
+# The elements of the UpfData nodes of the families, by profile and family name, see `_get_family_index`
+_FAMILY_ELEMENTS = {}
+
+
+def _get_family_index(family_name):
+    """
+    Return the pks of the UpfData nodes of a family, grouped by element.
+
+    The elements of the members of each family are cached, and only queried for the nodes that were added to the
+    family since the last call. A lookup thus costs a single query of the pks of the members, which also detects
+    the changes of the membership done by other processes.
+
+    :param family_name: the name of the UpfFamily group
+    :return: a dictionary with the elements as keys and the lists of pks of the UpfData nodes as values
+    :raise NotExistent: if there is no family with the given name
+    """
+    from aiida.backends import settings
+    from aiida.orm import Group
+    from aiida.orm.querybuilder import QueryBuilder
+
+    qb = QueryBuilder()
+    qb.append(Group, filters={'name': family_name, 'type': UPFGROUP_TYPE}, tag='group')
+    qb.append(UpfData, member_of='group', project=['id'])
+    pks = set(pk for [pk] in qb.all())
+
+    if not pks:
+        # Raise if the family does not exist, rather than being empty
+        UpfData.get_upf_group(family_name)
+
+    key = (settings.AIIDADB_PROFILE, family_name)
+    elements = {pk: element for pk, element in _FAMILY_ELEMENTS.get(key, {}).items() if pk in pks}
+
+    new_pks = pks.difference(elements)
+    if new_pks:
+        qb = QueryBuilder()
+        qb.append(UpfData, filters={'id': {'in': list(new_pks)}}, project=['id', 'attributes.element'])
+        elements.update((pk, element) for pk, element in qb.all())
+
+    _FAMILY_ELEMENTS[key] = elements
+
+    index = {}
+    for pk, element in elements.items():
+        index.setdefault(element, []).append(pk)
+
+    return index
+
+
+def get_pseudos_for_structures(structures, family_name):
+    """
+    Given a family name (a UpfFamily group in the DB) and a list of AiiDA
+    structures, return for each structure a dictionary associating each kind
+    name with its UpfData object.
+
+    The family is looked up once for all structures, so this is faster than
+    calling get_pseudos_from_structure for each of them.
+
+    :raise NotExistent: if the family does not exist, or if no UPF for an
+       element is found in the group.
+    :raise MultipleObjectsError: if more than one UPF for the same element is
+       found in the group.
+    """
+    from aiida.common.exceptions import NotExistent, MultipleObjectsError
+    from aiida.orm.querybuilder import QueryBuilder
+
+    family_pks = {}
+    for element, pks in _get_family_index(family_name).items():
+        if len(pks) > 1:
+            raise MultipleObjectsError(
+                "More than one UPF for element {} found in "
+                "family {}".format(element, family_name))
+        family_pks[element] = pks[0]
+
+    kind_pks = []
+    for structure in structures:
+        pks = {}
+        for kind in structure.kinds:
+            symbol = kind.symbol
+            try:
+                pks[kind.name] = family_pks[symbol]
+            except KeyError:
+                raise NotExistent("No UPF for element {} found in family {}".format(
+                    symbol, family_name))
+        kind_pks.append(pks)
+
+    needed_pks = set(pk for pks in kind_pks for pk in pks.values())
+    pseudos = {}
+    if needed_pks:
+        qb = QueryBuilder()
+        qb.append(UpfData, filters={'id': {'in': list(needed_pks)}})
+        pseudos = {node.pk: node for [node] in qb.all()}
+
+    return [{kind_name: pseudos[pk] for kind_name, pk in pks.items()} for pks in kind_pks]
+
+
 def get_pseudos_from_structure(structure, family_name):
     """
     Given a family name (a UpfFamily group in the DB) and a AiiDA
@@ -61,28 +155,7 @@ def get_pseudos_from_structure(structure, family_name):
     :raise NotExistent: if no UPF for an element in the group is
        found in the group.
     """
-    from aiida.common.exceptions import NotExistent, MultipleObjectsError
-
-    family_pseudos = {}
-    family = UpfData.get_upf_group(family_name)
-    for node in family.nodes:
-        if isinstance(node, UpfData):
-            if node.element in family_pseudos:
-                raise MultipleObjectsError(
-                    "More than one UPF for element {} found in "
-                    "family {}".format(node.element, family_name))
-            family_pseudos[node.element] = node
-
-    pseudo_list = {}
-    for kind in structure.kinds:
-        symbol = kind.symbol
-        try:
-            pseudo_list[kind.name] = family_pseudos[symbol]
-        except KeyError:
-            raise NotExistent("No UPF for element {} found in family {}".format(
-                symbol, family_name))
-
-    return pseudo_list
+    return get_pseudos_for_structures([structure], family_name)[0]
 
 
 def get_pseudos_dict(structure, family_name):
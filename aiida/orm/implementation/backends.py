@@ -76,6 +76,26 @@ class Backend(object):
         :rtype: :class:`aiida.orm.implementation.BackendQueryBuilder`
         """
 
+    def store_many(self, nodes, links=None):
+        """
+        Store a list of new nodes, together with their cached input links and the given links.
+
+        This default implementation stores the nodes one by one. Backends can override it with a bulk implementation.
+
+        :param nodes: list of nodes. Nodes that are already stored are skipped.
+        :param links: optional list of ``(source, target, label, link_type)`` tuples. The target has to be one of the
+            unstored ``nodes``, the source can be stored or be one of ``nodes``.
+        :return: the list of nodes
+        """
+        for source, target, label, link_type in links or []:
+            target.add_link_from(source, label=label, link_type=link_type)
+
+        for node in nodes:
+            if not node.is_stored:
+                node.store_all()
+
+        return nodes
+
 
 @six.add_metaclass(abc.ABCMeta)
 class BackendEntity(object):
@@ -455,6 +455,12 @@ class DjangoQueryBuilder(BackendQueryBuilder):
         with transaction.atomic():
             return query.count()
 
+    def estimate_count(self, query):
+
+        from django.db import transaction
+        with transaction.atomic():
+            return super(DjangoQueryBuilder, self).estimate_count(query)
+
     def first(self, query):
         """
         Executes query in the backend asking for one instance.
@@ -490,6 +496,28 @@ class DjangoQueryBuilder(BackendQueryBuilder):
                         for colindex, rowitem in enumerate(resultrow)
                     ]
 
+    def iter_columns(self, query, batch_size, tag_to_index_dict):
+        """
+        Stream the results from a server-side cursor, without constructing any ORM instance.
+        Projected attributes and extras are still resolved one by one.
+
+        :returns: An iterator over batches of results, each a list with one list of values per projection.
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            results = self.get_session().execute(query.statement.execution_options(stream_results=True))
+            while True:
+                rows = results.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = [list(column) for column in zip(*rows)]
+                for index, column in enumerate(columns):
+                    key = tag_to_index_dict[index]
+                    if key.startswith('attributes.') or key.startswith('extras.'):
+                        columns[index] = [self.get_aiida_res(key, value) for value in column]
+                yield columns
+
     def iterdict(self, query, batch_size, tag_to_projected_entity_dict):
         from django.db import transaction
 
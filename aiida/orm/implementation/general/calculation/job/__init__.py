@@ -308,6 +308,9 @@ class AbstractJobCalculation(AbstractCalculation):
         _raw_input_folder = self.folder.get_subfolder(_input_subfolder, create=True)
         _raw_input_folder.replace_with_folder(folder_path, move=False, overwrite=True)
 
+        # The calculation is already stored, so the new files have to be stored in the object store, if it is used
+        self.folder.sync()
+
     @property
     def _raw_input_folder(self):
         """
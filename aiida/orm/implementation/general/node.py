@@ -1391,6 +1391,17 @@ class AbstractNode(object):
         """
         pass
 
+    def _ensure_model_uptodate(self, attribute_names=None):
+        """
+        Make sure that the values of the database model of a stored node that are
+        cached in memory are reloaded from the database when they are next accessed,
+        e.g. after the node was modified through another connection.
+        Backends that do not cache these values do not need to do anything.
+
+        :param attribute_names: the names of the fields to reload, or None for all of them
+        """
+        pass
+
     @abstractmethod
     def _increment_version_number_db(self):
         """
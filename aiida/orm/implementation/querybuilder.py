@@ -13,12 +13,27 @@ from __future__ import print_function
 from __future__ import absolute_import
 import abc
 import six
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.expression import ClauseElement
 
 from aiida.common.utils import abstractclassmethod
 
 __all__ = ('BackendQueryBuilder',)
 
 
+class Explain(Executable, ClauseElement):
+    """An EXPLAIN statement of a query, returning the plan of the PostgreSQL planner as JSON."""
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element, compiler, **kwargs):
+    return 'EXPLAIN (FORMAT JSON) {}'.format(compiler.process(element.statement, **kwargs))
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BackendQueryBuilder(object):
     """Backend query builder interface"""
@@ -98,6 +113,27 @@ class BackendQueryBuilder(object):
         """
         pass
 
+    @property
+    def LinkClosure(self):
+        """
+        A property. Returns the table of the optional transitive closure of the links,
+        see :py:func:`aiida.backends.sqlalchemy.utils.install_link_closure`.
+        """
+        from sqlalchemy import column, table
+        from sqlalchemy.types import BigInteger, Integer
+        from aiida.backends.sqlalchemy.utils import LINK_CLOSURE_TABLE_NAME
+
+        return table(LINK_CLOSURE_TABLE_NAME, column('ancestor_id', Integer), column('descendant_id', Integer),
+                     column('depth', Integer), column('num_paths', BigInteger))
+
+    def has_link_closure(self):
+        """
+        :returns: True if the transitive closure table of the links is installed in the database
+        """
+        from aiida.backends.sqlalchemy.utils import has_link_closure
+
+        return has_link_closure(self.get_session())
+
     @abc.abstractmethod
     def modify_expansions(self, alias, expansions):
         """
@@ -161,6 +197,17 @@ class BackendQueryBuilder(object):
         """
         pass
 
+    def estimate_count(self, query):
+        """
+        :returns: the number of results estimated by the PostgreSQL planner
+        """
+        import json
+
+        plan = self.get_session().execute(Explain(query.statement)).scalar()
+        if isinstance(plan, six.string_types):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
     @abc.abstractmethod
     def first(self, query):
         """
@@ -184,3 +231,12 @@ class BackendQueryBuilder(object):
         :returns: An iterator over all the results of a list of dictionaries.
         """
         pass
+
+    @abc.abstractmethod
+    def iter_columns(self, query, batch_size, tag_to_index_dict):
+        """
+        Stream the results from a server-side cursor, without constructing any ORM instance.
+
+        :returns: An iterator over batches of results, each a list with one list of values per projection.
+        """
+        pass
@@ -51,3 +51,7 @@ class SqlaBackend(Backend):
 
     def query(self):
         return querybuilder.SqlaQueryBuilder()
+
+    def store_many(self, nodes, links=None):
+        from aiida.orm.implementation.sqlalchemy.node import store_many
+        return store_many(nodes, links)
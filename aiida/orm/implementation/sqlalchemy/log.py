@@ -42,6 +42,31 @@ class SqlaLogCollection(LogCollection):
 
         return entry
 
+    def create_entries(self, entries):
+        """
+        Create several log entries at once, with a single multi-row insert.
+
+        This is called from the writer thread of the database log handler, so it must not use the session of the
+        thread that imported this module: the rows are inserted in their own transaction on a dedicated connection.
+        """
+        from aiida.backends import sqlalchemy as sa
+
+        rows = [{
+            'time': entry['time'],
+            'loggername': entry['loggername'],
+            'levelname': entry['levelname'],
+            'objname': entry['objname'],
+            'objpk': entry['objpk'],
+            'message': entry.get('message', ''),
+            'metadata': entry.get('metadata', None) or {},
+        } for entry in entries if entry.get('objpk', None) is not None and entry['objname'] is not None]
+
+        if not rows:
+            return
+
+        with sa.engine.begin() as connection:
+            connection.execute(DbLog.__table__.insert().values(rows))
+
     def find(self, filter_by=None, order_by=None, limit=None):
         """
         Find all entries in the Log collection that confirm to the filter and
@@ -742,3 +742,222 @@ class Node(AbstractNode):
     def _ensure_model_uptodate(self, attribute_names=None):
         if self.is_stored:
             self._dbnode.session.expire(self._dbnode, attribute_names=attribute_names)
+
+
+def store_many(nodes, links=None, with_transaction=True, batch_size=1000):
+    """
+    Store a list of new nodes, together with their cached input links, using bulk statements.
+
+    Instead of a flush, link inserts and commit per node, all repository folders are first moved in place and then
+    the DbNode rows (including the attributes and the hash extra) and the DbLink rows are inserted with a few
+    multi-row INSERT statements, within a single transaction.
+
+    Nodes whose class customizes ``store``, or for which caching is enabled, cannot be inserted in bulk and are
+    stored one by one with ``store_all``, within the same transaction.
+
+    :param nodes: list of nodes. Nodes that are already stored are skipped.
+    :param links: optional list of ``(source, target, label, link_type)`` tuples. The target has to be one of the
+        unstored ``nodes``, the source can be stored or be one of ``nodes``.
+    :param with_transaction: if False, no transaction is used. This
+      is meant to be used ONLY if the outer calling function has already
+      a transaction open!
+    :param batch_size: the maximum number of rows inserted by a single statement
+    :return: the list of nodes
+    """
+    from sqlalchemy.orm import make_transient_to_detached
+
+    from aiida.backends.sqlalchemy import get_scoped_session
+    from aiida.common.caching import get_use_cache
+    from aiida.common.utils import grouper
+    from aiida.utils import timezone
+
+    session = get_scoped_session()
+
+    new_nodes = []
+    new_uuids = set()
+    for node in nodes:
+        if not node.is_stored and node.uuid not in new_uuids:
+            new_nodes.append(node)
+            new_uuids.add(node.uuid)
+
+    for source, target, label, link_type in links or []:
+        if target.uuid not in new_uuids:
+            raise ModificationNotAllowed("The target of the link '{}' is not one of the nodes to be stored".format(label))
+        target.add_link_from(source, label=label, link_type=link_type)
+
+    # The bulk insert bypasses the `store` method, so nodes that customize it or that may be taken from the cache
+    # have to go through the normal route
+    bulk_nodes = []
+    individual_nodes = []
+    for node in new_nodes:
+        if six.get_unbound_function(type(node).store) is six.get_unbound_function(Node.store) and \
+                not get_use_cache(type(node)):
+            bulk_nodes.append(node)
+        else:
+            individual_nodes.append(node)
+
+    moved_nodes = []
+
+    try:
+        # Parents that are not part of the bulk insert have to be stored first
+        bulk_uuids = set(node.uuid for node in bulk_nodes)
+        for node in bulk_nodes:
+            for source, _ in node._inputlinks_cache.values():
+                if not source.is_stored and source.uuid not in bulk_uuids:
+                    source.store_all(with_transaction=False)
+
+        bulk_nodes = [node for node in bulk_nodes if not node.is_stored]
+
+        for node in bulk_nodes:
+            node._validate()
+        _check_bulk_links(bulk_nodes)
+
+        # The hash has to be computed while the files are still in the sandbox and the attributes in the cache
+        now = timezone.now()
+        rows = []
+        for node in bulk_nodes:
+            dbnode = node._dbnode
+            rows.append({
+                'uuid': dbnode.uuid,
+                'type': dbnode.type,
+                'process_type': dbnode.process_type,
+                'label': dbnode.label if dbnode.label is not None else '',
+                'description': dbnode.description if dbnode.description is not None else '',
+                'ctime': dbnode.ctime or now,
+                'mtime': dbnode.mtime or now,
+                'nodeversion': dbnode.nodeversion or 1,
+                'public': bool(dbnode.public),
+                'attributes': node._attrs_cache,
+                'extras': dict(dbnode.extras or {}, **{_HASH_EXTRA_KEY: node.get_hash()}),
+                'dbcomputer_id': dbnode.dbcomputer.id if dbnode.dbcomputer is not None else None,
+                'user_id': dbnode.user.id,
+            })
+
+        # I first store the files, then only if this is successful, I store the DB entries, see `_db_store`
+        for node in bulk_nodes:
+            node._repository_folder.replace_with_folder(node._get_temp_folder().abspath, move=True, overwrite=True)
+            moved_nodes.append(node)
+
+        node_table = DbNode.__table__
+        pks = {}
+        for chunk in grouper(batch_size, rows):
+            result = session.execute(node_table.insert().values(list(chunk)).returning(node_table.c.id,
+                                                                                       node_table.c.uuid))
+            pks.update((six.text_type(uuid), pk) for pk, uuid in result)
+
+        link_rows = []
+        for node in bulk_nodes:
+            for label, (source, link_type) in node._inputlinks_cache.items():
+                link_rows.append({
+                    'input_id': source.pk if source.is_stored else pks[source.uuid],
+                    'output_id': pks[node.uuid],
+                    'label': label,
+                    'type': link_type.value,
+                })
+
+        link_table = DbLink.__table__
+        for chunk in grouper(batch_size, link_rows):
+            session.execute(link_table.insert().values(list(chunk)))
+
+        for node in individual_nodes:
+            if not node.is_stored:
+                node.store_all(with_transaction=False)
+
+        if with_transaction:
+            session.commit()
+
+    # This is one of the few cases where it is ok to do a 'global'
+    # except, also because I am re-raising the exception
+    except:
+        if with_transaction:
+            session.rollback()
+        # I put back the files in the sandbox folders since the
+        # transaction did not succeed
+        for node in moved_nodes:
+            node._get_temp_folder().replace_with_folder(node._repository_folder.abspath, move=True, overwrite=True)
+        raise
+
+    # Turn the in-memory models into persistent instances without querying them back from the database
+    for node, row in zip(bulk_nodes, rows):
+        dbnode = node._dbnode
+        for key, value in row.items():
+            setattr(dbnode, key, value)
+        dbnode.id = pks[node.uuid]
+        make_transient_to_detached(dbnode)
+        session.add(dbnode)
+
+        del node._attrs_cache
+        node._temp_folder = None
+        node._to_be_stored = False
+        node._inputlinks_cache.clear()
+
+    _add_to_current_autogroup(bulk_nodes)
+
+    return nodes
+
+
+def _check_bulk_links(nodes):
+    """
+    Check that the cached input links of the given nodes can be stored together.
+
+    All sources have to be stored or be part of `nodes`. Moreover, since the nodes are new, a loop of CREATE or INPUT
+    links can only be formed among the nodes themselves, which is checked here rather than with one descendant query
+    per link as in `_add_dblink_from`.
+
+    :param nodes: list of unstored nodes
+    :raise ModificationNotAllowed: if a source node is not stored and not part of `nodes`
+    :raise ValueError: if the links would generate a loop
+    """
+    uuids = set(node.uuid for node in nodes)
+    children = {}
+    for node in nodes:
+        for label, (source, link_type) in node._inputlinks_cache.items():
+            if source.uuid == node.uuid:
+                raise ValueError("Cannot link to itself")
+            if not source.is_stored and source.uuid not in uuids:
+                raise ModificationNotAllowed(
+                    "Cannot store the input link '{}' because the source node is not stored".format(label))
+            if link_type is LinkType.CREATE or link_type is LinkType.INPUT:
+                children.setdefault(source.uuid, []).append(node.uuid)
+
+    # Iterative depth first search, where 1 marks nodes on the current path and 2 nodes that were fully visited
+    state = {}
+    for start in children:
+        if start in state:
+            continue
+        state[start] = 1
+        stack = [(start, iter(children.get(start, [])))]
+        while stack:
+            current, iterator = stack[-1]
+            child = next(iterator, None)
+            if child is None:
+                state[current] = 2
+                stack.pop()
+            elif state.get(child) == 1:
+                raise ValueError("The links you are attempting to create would generate a loop")
+            elif child not in state:
+                state[child] = 1
+                stack.append((child, iter(children.get(child, []))))
+
+
+def _add_to_current_autogroup(nodes):
+    """
+    Add the nodes that should be grouped to the current autogroup, if any, as done by `store` for a single node.
+
+    :param nodes: list of stored nodes
+    """
+    from aiida.common.exceptions import ValidationError
+    from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
+    from aiida.orm import Group
+
+    if current_autogroup is None or not nodes:
+        return
+
+    if not isinstance(current_autogroup, Autogroup):
+        raise ValidationError("current_autogroup is not an AiiDA Autogroup")
+
+    group_name = current_autogroup.get_group_name()
+    to_be_grouped = [node for node in nodes if current_autogroup.is_to_be_grouped(node)]
+    if group_name is not None and to_be_grouped:
+        group = Group.get_or_create(name=group_name, type_string=VERDIAUTOGROUP_TYPE)[0]
+        group.add_nodes(to_be_grouped)
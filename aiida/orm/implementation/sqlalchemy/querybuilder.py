@@ -26,6 +26,7 @@ from sqlalchemy.orm.attributes import InstrumentedAttribute, QueryableAttribute
 from sqlalchemy.ext.compiler import compiles
 
 import aiida.backends.sqlalchemy
+from aiida.backends.sqlalchemy.utils import DATETIME_JSON_TAG
 from aiida.common.exceptions import InputValidationError
 from aiida.orm.implementation.querybuilder import BackendQueryBuilder
 from aiida.backends.utils import get_column
@@ -329,17 +330,11 @@ class SqlaQueryBuilder(BackendQueryBuilder):
                 type_filter = jsonb_typeof(path_in_json) == 'null'
                 casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
             elif isinstance(value, datetime):
-                # type filter here is filter whether this attributes stores
-                # a string and a filter whether this string
-                # is compatible with a datetime (using a regex)
-                #  - What about historical values (BC, or before 1000AD)??
-                #  - Different ways to represent the timezone
-
-                type_filter = jsonb_typeof(path_in_json) == 'string'
-                regex_filter = path_in_json.astext.op("SIMILAR TO")(
-                    "\d\d\d\d-[0-1]\d-[0-3]\dT[0-2]\d:[0-5]\d:\d\d\.\d+((\+|\-)\d\d:\d\d)?")  # pylint: disable=anomalous-backslash-in-string
-                type_filter = and_(type_filter, regex_filter)
-                casted_entity = path_in_json.cast(DateTime)
+                # datetimes are stored as single-key objects tagged with DATETIME_JSON_TAG, whose value is the
+                # isoformat string. For any other value the lookup of the tag yields NULL, which is falsy in the case
+                tagged_value = path_in_json[DATETIME_JSON_TAG]
+                type_filter = jsonb_typeof(tagged_value) == 'string'
+                casted_entity = tagged_value.astext.cast(DateTime(timezone=True))
             else:
                 raise TypeError('Unknown type {}'.format(type(value)))
             return type_filter, casted_entity
@@ -420,7 +415,7 @@ class SqlaQueryBuilder(BackendQueryBuilder):
         elif cast == 'j':
             entity = entity.astext.cast(JSONB)
         elif cast == 'd':
-            entity = entity.astext.cast(DateTime)
+            entity = entity[DATETIME_JSON_TAG].astext.cast(DateTime(timezone=True))
         else:
             raise InputValidationError("Unkown casting key {}".format(cast))
         return entity
@@ -509,6 +504,27 @@ class SqlaQueryBuilder(BackendQueryBuilder):
             self.get_session().rollback()
             raise
 
+    def iter_columns(self, query, batch_size, tag_to_index_dict):
+        """
+        Stream the results from a server-side cursor, without constructing any ORM instance.
+
+        :returns: An iterator over batches of results, each a list with one list of values per projection.
+        """
+        try:
+            results = self.get_session().execute(query.statement.execution_options(stream_results=True))
+            while True:
+                rows = results.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = [list(column) for column in zip(*rows)]
+                for index, column in enumerate(columns):
+                    if isinstance(column[0], Choice):
+                        columns[index] = [self.get_aiida_res(tag_to_index_dict[index], value) for value in column]
+                yield columns
+        except Exception:
+            self.get_session().rollback()
+            raise
+
     def iterdict(self, query, batch_size, tag_to_projected_entity_dict):
 
         nr_items = sum(len(v) for v in tag_to_projected_entity_dict.values())
@@ -26,6 +26,8 @@ from aiida.orm.users import User
 
 IMPORTGROUP_TYPE = 'aiida.import'
 COMP_DUPL_SUFFIX = ' (Imported #{})'
+# File in an export folder listing the nodes whose repository files have already been copied
+EXPORT_CHECKPOINT_FILENAME = '.export_checkpoint'
 
 # Giving names to the various entities. Attributes and links are not AiiDA
 # entities but we will refer to them as entities in the file (to simplify
@@ -312,10 +314,25 @@ def deserialize_field(k, v, fields_info, import_unique_ids_mappings,
 
 
 def import_data(in_path, ignore_unknown_nodes=False,
-                silent=False):
+                silent=False, batch_size=None):
+    """
+    Import exported AiiDA environment to the AiiDA database, dispatching to the implementation of the current backend.
+
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param ignore_unknown_nodes: if True, links and group members that refer to unknown nodes are skipped
+    :param silent: suppress progress output
+    :param batch_size: if specified, stream the archive data and import it in batches of this size instead of loading
+        it entirely in memory, see :func:`import_data_sqla_streaming`. Only supported for the SQLAlchemy backend.
+    """
     from aiida.backends.settings import BACKEND
     from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
 
+    if batch_size is not None:
+        if BACKEND != BACKEND_SQLA:
+            raise NotImplementedError("The streaming import is only implemented for the SQLAlchemy backend")
+        return import_data_sqla_streaming(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
+                                          silent=silent, batch_size=batch_size)
+
     if BACKEND == BACKEND_SQLA:
         return import_data_sqla(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
                                 silent=silent)
@@ -346,7 +363,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
     from aiida.utils import timezone
 
     from aiida.orm import Node, Group
-    from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
+    from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif, DEDUPLICATED_EXPORT_VERSION
     from aiida.common.links import LinkType
     from aiida.common.exceptions import UniquenessError
     from aiida.common.folders import SandboxFolder, RepositoryFolder
@@ -355,7 +372,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
     from aiida.common.datastructures import calc_states
     import aiida.utils.json as json
 
-    # This is the export version expected by this function
+    # This is the export version expected by this function, besides the one of the deduplicated archives
     expected_export_version = '0.3'
 
     # The name of the subfolder in which the node files are stored
@@ -408,7 +425,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
         ######################
         # PRELIMINARY CHECKS #
         ######################
-        if metadata['export_version'] != expected_export_version:
+        if metadata['export_version'] not in (expected_export_version, DEDUPLICATED_EXPORT_VERSION):
             raise exceptions.IncompatibleArchiveVersionError('Archive schema version {} is incompatible with the '
                 'currently supported schema version {}'.format(metadata['export_version'], expected_export_version))
 
@@ -871,7 +888,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     from aiida.utils import timezone
 
     from aiida.orm import Node, Group
-    from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
+    from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif, DEDUPLICATED_EXPORT_VERSION
     from aiida.common.folders import SandboxFolder, RepositoryFolder
     from aiida.common.utils import get_object_from_string
     from aiida.common.datastructures import calc_states
@@ -882,7 +899,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     # Backend specific imports
     from aiida.backends.sqlalchemy.models.node import DbCalcState
 
-    # This is the export version expected by this function
+    # This is the export version expected by this function, besides the one of the deduplicated archives
     expected_export_version = '0.3'
 
     # The name of the subfolder in which the node files are stored
@@ -930,7 +947,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
         ######################
         # PRELIMINARY CHECKS #
         ######################
-        if metadata['export_version'] != expected_export_version:
+        if metadata['export_version'] not in (expected_export_version, DEDUPLICATED_EXPORT_VERSION):
             raise exceptions.IncompatibleArchiveVersionError('Archive schema version {} is incompatible with the '
                 'currently supported schema version {}'.format(metadata['export_version'], expected_export_version))
 
@@ -1462,6 +1479,455 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     return ret_dict
 
 
+def iter_data_section(folder, *keys):
+    """
+    Iterate over a section of the `data.json` file of an unpacked export archive without loading the whole file.
+
+    :param folder: the folder in which the archive was unpacked
+    :param keys: the sequence of keys that lead to the section, e.g. `('export_data', 'Node')`
+    :return: generator of `(key, value)` tuples, see :meth:`aiida.common.archive.JsonSectionReader.iter_section`
+    """
+    from aiida.common.archive import JsonSectionReader
+
+    with io.open(folder.get_abs_path('data.json'), encoding='utf8') as fhandle:
+        for item in JsonSectionReader(fhandle).iter_section(*keys):
+            yield item
+
+
+def import_data_sqla_streaming(in_path, ignore_unknown_nodes=False, silent=False, batch_size=1000):
+    """
+    Import exported AiiDA environment to the AiiDA database, streaming the archive data in batches.
+
+    Contrary to :func:`import_data_sqla`, the `data.json` file of the archive is never loaded as a whole. Each section
+    (nodes, attributes, links and group members) is parsed incrementally and its entries are inserted with multi-row
+    statements in batches of `batch_size`. Apart from the batch itself, only the mapping of the primary keys of the
+    newly created nodes is kept in memory, so the peak memory no longer depends on the size of the node payloads.
+    Everything is still done within a single transaction.
+
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param ignore_unknown_nodes: if True, links and group members that refer to unknown nodes are skipped
+    :param silent: suppress progress output
+    :param batch_size: the number of entries that are inserted with a single statement
+    :return: a dictionary with, for each entity name, the lists of the 'new' and 'existing' entries, as tuples with
+        the import PK and the PK in the database, like :func:`import_data_sqla`, and the list of the 'new' links as
+        tuples with the PKs of their input and output nodes
+    """
+    import os
+    import tarfile
+    import zipfile
+    from itertools import chain
+
+    from sqlalchemy.sql.expression import bindparam
+
+    from aiida.utils import timezone
+
+    from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif, DEDUPLICATED_EXPORT_VERSION
+    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.datastructures import calc_states
+    from aiida.common.links import LinkType
+    import aiida.utils.json as json
+
+    # Backend specific imports
+    import aiida.backends.sqlalchemy
+    from aiida.backends.sqlalchemy.models.group import DbGroup, table_groups_nodes
+    from aiida.backends.sqlalchemy.models.node import DbCalcState, DbLink, DbNode
+
+    # This is the export version expected by this function, besides the one of the deduplicated archives
+    expected_export_version = '0.3'
+
+    # The name of the subfolder in which the node files are stored
+    nodes_export_subfolder = 'nodes'
+
+    if batch_size < 1:
+        raise ValueError('the batch size should be a positive integer')
+
+    # The returned dictionary with the new and existing entries
+    ret_dict = {}
+
+    def add_entry(entity_name, status, import_entry_id, pk):
+        ret_dict.setdefault(entity_name, {'new': [], 'existing': []})[status].append((import_entry_id, pk))
+
+    def get_node_pks(uuids):
+        """Return a mapping of the given UUIDs to the PK of the corresponding node in the database."""
+        uuids = [uuid for uuid in set(uuids) if validate_uuid(uuid)]
+        if not uuids:
+            return {}
+        return {str(uuid): pk for uuid, pk in session.query(DbNode.uuid, DbNode.id).filter(DbNode.uuid.in_(uuids))}
+
+    ################
+    # EXTRACT DATA #
+    ################
+    # The sandbox has to remain open until the end
+    with SandboxFolder() as folder:
+        if os.path.isdir(in_path):
+            extract_tree(in_path, folder, silent=silent)
+        else:
+            if tarfile.is_tarfile(in_path):
+                extract_tar(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+            elif zipfile.is_zipfile(in_path):
+                extract_zip(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+            elif os.path.isfile(in_path) and in_path.endswith('.cif'):
+                extract_cif(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+            else:
+                raise ValueError("Unable to detect the input file format, it "
+                                 "is neither a (possibly compressed) tar "
+                                 "file, nor a zip file.")
+
+        if not folder.get_content_list():
+            from aiida.common.exceptions import ContentNotExistent
+            raise ContentNotExistent("The provided file/folder ({}) is empty"
+                                     .format(in_path))
+
+        if not os.path.isfile(folder.get_abs_path('data.json')):
+            raise ValueError("Unable to find the file data.json in the import file or folder")
+
+        try:
+            with io.open(folder.get_abs_path('metadata.json'), encoding='utf8') as fhandle:
+                metadata = json.load(fhandle)
+        except IOError as e:
+            raise ValueError("Unable to find the file {} in the import "
+                             "file or folder".format(e.filename))
+
+        ######################
+        # PRELIMINARY CHECKS #
+        ######################
+        if metadata['export_version'] not in (expected_export_version, DEDUPLICATED_EXPORT_VERSION):
+            raise exceptions.IncompatibleArchiveVersionError('Archive schema version {} is incompatible with the '
+                'currently supported schema version {}'.format(metadata['export_version'], expected_export_version))
+
+        all_entity_names = [USER_ENTITY_NAME, COMPUTER_ENTITY_NAME, NODE_ENTITY_NAME, GROUP_ENTITY_NAME,
+                            LINK_ENTITY_NAME, ATTRIBUTE_ENTITY_NAME]
+        for import_field_name in metadata['all_fields_info']:
+            if import_field_name not in all_entity_names:
+                raise NotImplementedError("Apparently, you are importing a "
+                                          "file with a model '{}', but this "
+                                          "does not appear in "
+                                          "all_known_models!"
+                                          .format(import_field_name))
+
+        ###############
+        # IMPORT DATA #
+        ###############
+        # DO ALL WITH A TRANSACTION
+        session = aiida.backends.sqlalchemy.get_scoped_session()
+
+        try:
+            import_unique_ids_mappings = {}
+            foreign_ids_reverse_mappings = {}
+
+            # Users, computers and groups are few, so each of these sections is loaded at once. Groups only depend on
+            # users, so they are created before the nodes and the group members are added at the end.
+            for entity_name in (USER_ENTITY_NAME, COMPUTER_ENTITY_NAME, GROUP_ENTITY_NAME):
+                entries = dict(iter_data_section(folder, 'export_data', entity_name))
+                fields_info = metadata['all_fields_info'].get(entity_name, {})
+                unique_identifier = metadata['unique_identifiers'][entity_name]
+                db_entity = get_object_from_string(entity_names_to_sqla_schema[entity_name])
+                unique_column = getattr(db_entity, unique_identifier)
+
+                import_unique_ids_mappings[entity_name] = {
+                    int(k): v[unique_identifier] for k, v in entries.items()}
+                foreign_ids_reverse_mappings[entity_name] = {}
+
+                if not entries:
+                    continue
+
+                import_unique_ids = list(import_unique_ids_mappings[entity_name].values())
+                for unique_id, pk in session.query(unique_column, db_entity.id).filter(
+                        unique_column.in_(import_unique_ids)):
+                    foreign_ids_reverse_mappings[entity_name][six.text_type(unique_id)] = pk
+
+                imported_comp_names = set()
+                objects_to_create = {}
+
+                for import_entry_id, entry_data in entries.items():
+                    unique_id = entry_data[unique_identifier]
+
+                    if unique_id in foreign_ids_reverse_mappings[entity_name]:
+                        add_entry(entity_name, 'existing', import_entry_id,
+                                  foreign_ids_reverse_mappings[entity_name][unique_id])
+                        continue
+
+                    if entity_name == COMPUTER_ENTITY_NAME:
+                        # Export files generated with Django store the metadata and the transport parameters as
+                        # serialized JSON strings, see import_data_sqla
+                        for key in ('metadata', 'transport_params'):
+                            if isinstance(entry_data[key], (six.string_types, six.binary_type)):
+                                entry_data[key] = json.loads(entry_data[key])
+
+                        # Rename the new computer if there is already one with the same name
+                        orig_name = entry_data['name']
+                        dupl_counter = 0
+                        while (entry_data['name'] in imported_comp_names or session.query(db_entity).filter(
+                                db_entity.name == entry_data['name']).count()):
+                            entry_data['name'] = orig_name + COMP_DUPL_SUFFIX.format(dupl_counter)
+                            dupl_counter += 1
+                        imported_comp_names.add(entry_data['name'])
+
+                    import_data = dict(deserialize_field(
+                        k, v, fields_info=fields_info,
+                        import_unique_ids_mappings=import_unique_ids_mappings,
+                        foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                                       for k, v in entry_data.items())
+
+                    for file_fkey, model_fkey in file_fields_to_model_fields.get(entity_name, {}).items():
+                        if model_fkey not in import_data and file_fkey in import_data:
+                            import_data[model_fkey] = import_data.pop(file_fkey)
+
+                    objects_to_create[unique_id] = (import_entry_id, db_entity(**import_data))
+
+                session.add_all(db_object for _, db_object in objects_to_create.values())
+                session.flush()
+
+                for unique_id, (import_entry_id, db_object) in objects_to_create.items():
+                    foreign_ids_reverse_mappings[entity_name][unique_id] = db_object.id
+                    add_entry(entity_name, 'new', import_entry_id, db_object.id)
+
+            ##########
+            # NODES  #
+            ##########
+            if not silent:
+                print("STORING NEW NODES & FILES...")
+
+            fields_info = metadata['all_fields_info'].get(NODE_ENTITY_NAME, {})
+            node_fields_mapping = file_fields_to_model_fields[NODE_ENTITY_NAME]
+
+            # Mapping of the import PK of the new nodes on their new PK, needed to set the attributes later on
+            new_node_pks = {}
+            import_group_id = None
+
+            for batch in grouper(batch_size, iter_data_section(folder, 'export_data', NODE_ENTITY_NAME)):
+                existing_pks = get_node_pks(entry_data['uuid'] for _, entry_data in batch)
+                rows_to_insert = []
+                import_entry_ids = {}
+
+                for import_entry_id, entry_data in batch:
+                    unique_id = entry_data['uuid']
+
+                    if unique_id in existing_pks:
+                        add_entry(NODE_ENTITY_NAME, 'existing', import_entry_id, existing_pks[unique_id])
+                        continue
+
+                    import_data = dict(deserialize_field(
+                        k, v, fields_info=fields_info,
+                        import_unique_ids_mappings=import_unique_ids_mappings,
+                        foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                                       for k, v in entry_data.items())
+
+                    for file_fkey, model_fkey in node_fields_mapping.items():
+                        if model_fkey not in import_data and file_fkey in import_data:
+                            import_data[model_fkey] = import_data.pop(file_fkey)
+
+                    # The attributes are set in a separate pass, since they live in another section of the data file
+                    import_data.setdefault('attributes', {})
+                    import_data.setdefault('extras', {})
+
+                    subfolder = folder.get_subfolder(os.path.join(
+                        nodes_export_subfolder, export_shard_uuid(unique_id)))
+                    if not subfolder.exists():
+                        raise ValueError("Unable to find the repository "
+                                         "folder for node with UUID={} "
+                                         "in the exported file"
+                                         .format(unique_id))
+                    destdir = RepositoryFolder(section=Node._section_name, uuid=unique_id)
+                    destdir.replace_with_folder(subfolder.abspath, move=True, overwrite=True)
+
+                    rows_to_insert.append(import_data)
+                    import_entry_ids[unique_id] = import_entry_id
+
+                batch_pks = list(existing_pks.values())
+
+                if rows_to_insert:
+                    session.execute(DbNode.__table__.insert(), rows_to_insert)
+
+                    just_saved = get_node_pks(import_entry_ids.keys())
+                    for unique_id, new_pk in just_saved.items():
+                        new_node_pks[int(import_entry_ids[unique_id])] = new_pk
+                        add_entry(NODE_ENTITY_NAME, 'new', import_entry_ids[unique_id], new_pk)
+
+                    # I set for all nodes, even if I should set it only for calculations
+                    session.execute(DbCalcState.__table__.insert(), [
+                        {'dbnode_id': new_pk, 'state': calc_states.IMPORTED} for new_pk in just_saved.values()])
+                    batch_pks.extend(just_saved.values())
+
+                # Put everything in a specific group, created as soon as there is at least one node
+                if batch_pks and import_group_id is None:
+                    basename = timezone.localtime(timezone.now()).strftime("%Y%m%d-%H%M%S")
+                    group_name = basename
+                    counter = 0
+                    while session.query(DbGroup).filter(
+                            DbGroup.name == group_name, DbGroup.type == IMPORTGROUP_TYPE).count():
+                        counter += 1
+                        group_name = "{}_{}".format(basename, counter)
+                    import_group = Group(name=group_name, type_string=IMPORTGROUP_TYPE)
+                    session.add(import_group._dbgroup)
+                    session.flush()
+                    import_group_id = import_group.pk
+
+                if batch_pks:
+                    session.execute(table_groups_nodes.insert(), [
+                        {'dbgroup_id': import_group_id, 'dbnode_id': pk} for pk in set(batch_pks)])
+
+                if not silent:
+                    print("   ({} nodes processed...)".format(
+                        sum(len(entries) for entries in ret_dict.get(NODE_ENTITY_NAME, {}).values())))
+
+            ##############
+            # ATTRIBUTES #
+            ##############
+            if not silent:
+                print("STORING NEW NODE ATTRIBUTES...")
+
+            # Attributes and their conversion info are written by the export in the same order
+            conversions = iter_data_section(folder, 'node_attributes_conversion')
+            update_attributes = DbNode.__table__.update().where(
+                DbNode.__table__.c.id == bindparam('node_id')).values(attributes=bindparam('node_attributes'))
+            num_updated = 0
+
+            for batch in grouper(batch_size, iter_data_section(folder, 'node_attributes')):
+                rows_to_update = []
+
+                for import_entry_id, attributes in batch:
+                    conversion_entry_id, attributes_conversion = next(conversions, (None, None))
+                    if conversion_entry_id != import_entry_id:
+                        raise ValueError("The attributes and attribute conversions of the node with import PK {} "
+                                         "are not in the same order, use the non-streaming import instead"
+                                         .format(import_entry_id))
+                    try:
+                        new_pk = new_node_pks[int(import_entry_id)]
+                    except KeyError:
+                        # The node already existed, its attributes are not touched
+                        continue
+
+                    rows_to_update.append({
+                        'node_id': new_pk,
+                        'node_attributes': deserialize_attributes(attributes, attributes_conversion)
+                    })
+
+                if rows_to_update:
+                    session.execute(update_attributes, rows_to_update)
+                    num_updated += len(rows_to_update)
+
+            conversions.close()
+
+            if num_updated != len(new_node_pks):
+                raise ValueError("Unable to find attribute info for {} of the new nodes"
+                                 .format(len(new_node_pks) - num_updated))
+
+            del new_node_pks
+
+            #########
+            # LINKS #
+            #########
+            if not silent:
+                print("STORING NODE LINKS...")
+
+            ## TODO: check that we are not creating input links of an already
+            ##       existing node...
+            new_links = []
+            for batch in grouper(batch_size, iter_data_section(folder, 'links_uuid')):
+                import_links = [link for _, link in batch]
+                node_pks = get_node_pks(chain.from_iterable((l['input'], l['output']) for l in import_links))
+
+                # Needed for fast checks of existing links, restricted to the nodes of this batch
+                existing_links_raw = session.query(DbLink.input_id, DbLink.output_id, DbLink.label).filter(
+                    DbLink.output_id.in_(list(node_pks.values()))).all() if node_pks else []
+                existing_links_labels = {(l[0], l[1]): l[2] for l in existing_links_raw}
+                existing_input_links = {(l[1], l[2]): l[0] for l in existing_links_raw}
+
+                links_to_store = []
+                for link in import_links:
+                    try:
+                        in_id = node_pks[link['input']]
+                        out_id = node_pks[link['output']]
+                    except KeyError:
+                        if ignore_unknown_nodes:
+                            continue
+                        raise ValueError("Trying to create a link with one "
+                                         "or both unknown nodes, stopping "
+                                         "(in_uuid={}, out_uuid={}, "
+                                         "label={})".format(link['input'],
+                                                            link['output'],
+                                                            link['label']))
+
+                    if (in_id, out_id) in existing_links_labels:
+                        existing_label = existing_links_labels[in_id, out_id]
+                        if existing_label != link['label']:
+                            raise ValueError("Trying to rename an existing link "
+                                             "name, stopping (in={}, out={}, "
+                                             "old_label={}, new_label={})"
+                                             .format(in_id, out_id, existing_label,
+                                                     link['label']))
+                    elif (out_id, link['label']) in existing_input_links:
+                        # Only RETURN links of workflows can share the label of an existing input link
+                        if link['type'] != LinkType.RETURN:
+                            raise ValueError(
+                                "There exists already an input link to node "
+                                "with UUID {} with label {} but it does not "
+                                "come from the expected input with UUID {} "
+                                "but from a node with UUID {}."
+                                    .format(link['output'], link['label'], link['input'],
+                                            existing_input_links[out_id, link['label']]))
+                    else:
+                        links_to_store.append({'input_id': in_id, 'output_id': out_id, 'label': link['label'],
+                                               'type': LinkType(link['type']).value})
+
+                if links_to_store:
+                    session.execute(DbLink.__table__.insert(), links_to_store)
+                    new_links.extend((link['input_id'], link['output_id']) for link in links_to_store)
+
+            if new_links:
+                ret_dict[LINK_ENTITY_NAME] = {'new': new_links}
+            if not silent:
+                print("   ({} new links...)".format(len(new_links)))
+
+            #################
+            # GROUP MEMBERS #
+            #################
+            if not silent:
+                print("STORING GROUP ELEMENTS...")
+
+            for group_uuid, group_node_uuids in iter_data_section(folder, 'groups_uuid'):
+                group_pk = session.query(DbGroup.id).filter(DbGroup.uuid == group_uuid).scalar()
+
+                for node_uuids in grouper(batch_size, group_node_uuids):
+                    node_pks = get_node_pks(node_uuids)
+                    if len(node_pks) != len(set(node_uuids)) and not ignore_unknown_nodes:
+                        raise ValueError("The group with UUID {} contains nodes with unknown UUID: {}".format(
+                            group_uuid, ', '.join(set(node_uuids) - set(node_pks))))
+
+                    if not node_pks:
+                        continue
+
+                    members = set(pk for pk, in session.query(table_groups_nodes.c.dbnode_id).filter(
+                        table_groups_nodes.c.dbgroup_id == group_pk,
+                        table_groups_nodes.c.dbnode_id.in_(list(node_pks.values()))))
+                    new_members = set(node_pks.values()) - members
+
+                    if new_members:
+                        session.execute(table_groups_nodes.insert(), [
+                            {'dbgroup_id': group_pk, 'dbnode_id': pk} for pk in new_members])
+
+            if not silent:
+                if import_group_id is not None:
+                    print("IMPORTED NODES GROUPED IN IMPORT GROUP NAMED '{}'".format(import_group.name))
+                else:
+                    print("NO DBNODES TO IMPORT, SO NO GROUP CREATED")
+                print("COMMITTING EVERYTHING...")
+            session.commit()
+        except:
+            print("Rolling back")
+            session.rollback()
+            raise
+
+    if not silent:
+        print("DONE.")
+
+    return ret_dict
+
+
 class HTMLGetLinksParser(HTMLParser):
     def __init__(self, filter_extension=None):
         """
@@ -1686,7 +2152,8 @@ def fill_in_query(partial_query, originating_entity_str, current_entity_str,
 
 def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
                 silent=False, input_forward=False, create_reversed=True,
-                return_reversed=False, call_reversed=False, **kwargs):
+                return_reversed=False, call_reversed=False, num_workers=1,
+                deduplicate=False, checkpoint=False, **kwargs):
     """
     Export the entries passed in the 'what' list to a file tree.
     :todo: limit the export to finished or failed calculations.
@@ -1710,31 +2177,37 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     then calls function for licenses of Data nodes expecting True if
     license is allowed, False otherwise.
     :param silent: suppress debug prints
+    :param num_workers: number of threads used to copy the repository
+    files of the nodes. Only used when exporting to a Folder.
+    :param deduplicate: store each repository file only once in the
+    export, identified by the hash of its content. Only supported when
+    exporting to a Folder.
+    :param checkpoint: record in the folder which node repositories have
+    already been copied, such that an export that was interrupted can be
+    resumed by calling this function again on the same folder. Only
+    supported when exporting to a Folder.
     :raises LicensingException: if any node is licensed under forbidden
     license
     """
     import aiida
     from aiida.orm import Node, Calculation, Data, Group, Code
     from aiida.common.links import LinkType
-    from aiida.common.folders import RepositoryFolder
+    from aiida.orm.backends import construct_backend
     from aiida.orm.querybuilder import QueryBuilder
     import aiida.utils.json as json
 
     if not silent:
         print("STARTING EXPORT...")
 
+    from aiida.common.archive import DEDUPLICATED_EXPORT_VERSION, DEDUPLICATION_METADATA_KEY
+
     EXPORT_VERSION = '0.3'
 
     all_fields_info, unique_identifiers = get_all_fields_info()
 
-    # The set that contains the nodes ids of the nodes that should be exported
-    to_be_exported = set()
-
-    given_data_entry_ids = set()
-    given_calculation_entry_ids = set()
+    given_node_entry_ids = set()
     given_group_entry_ids = set()
     given_computer_entry_ids = set()
-    given_groups = set()
 
     # I store a list of the actual dbnodes
     for entry in what:
@@ -1745,214 +2218,28 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
         entry_entity_name = schema_to_entity_names(entry_class_string)
         if issubclass(entry.__class__, Group):
             given_group_entry_ids.add(entry.pk)
-            given_groups.add(entry)
         elif issubclass(entry.__class__, Node):
-            # The Code node should be treated as a Data node
-            if (issubclass(entry.__class__, Data) or issubclass(entry.__class__, Code)):
-                given_data_entry_ids.add(entry.pk)
-            elif issubclass(entry.__class__, Calculation):
-                given_calculation_entry_ids.add(entry.pk)
+            # The Code node should be treated as a Data node, other nodes are not exported
+            if issubclass(entry.__class__, (Data, Code, Calculation)):
+                given_node_entry_ids.add(entry.pk)
         elif issubclass(entry.__class__, Computer):
             given_computer_entry_ids.add(entry.pk)
         else:
             raise ValueError("I was given {}, which is not a DbNode or DbGroup instance".format(entry))
 
     # Add all the nodes contained within the specified groups
-    for group in given_groups:
-        for entry in group.nodes:
-            # The Code node should be treated as a Data nodes
-            if (issubclass(entry.__class__, Data) or issubclass(entry.__class__, Code)):
-                given_data_entry_ids.add(entry.pk)
-            elif issubclass(entry.__class__, Calculation):
-                given_calculation_entry_ids.add(entry.pk)
-
-    # We will iteratively explore the AiiDA graph to find further nodes that
-    # should also be exported.
-
-    # We repeat until there are no further nodes to be visited
-    while given_calculation_entry_ids or given_data_entry_ids:
-
-        # If is is a calculation node
-        if given_calculation_entry_ids:
-            curr_node_id = given_calculation_entry_ids.pop()
-            # If it is already visited continue to the next node
-            if curr_node_id in to_be_exported:
-                continue
-            # Otherwise say that it is a node to be exported
-            else:
-                to_be_exported.add(curr_node_id)
+    if given_group_entry_ids:
+        qb = QueryBuilder()
+        qb.append(Group, filters={'id': {'in': given_group_entry_ids}}, tag='group')
+        qb.append(Node, member_of='group', project=['id'])
+        # Nodes that are neither Data, Code nor Calculation nodes are ignored by the closure query
+        given_node_entry_ids.update(pk for pk, in qb.iterall())
 
-            # INPUT(Data, Calculation) - Reversed
-            qb = QueryBuilder()
-            qb.append(Data, tag='predecessor', project=['id'])
-            qb.append(Calculation, output_of='predecessor',
-                      filters={'id': {'==': curr_node_id}},
-                      edge_filters={
-                          'type': {
-                              '==': LinkType.INPUT.value}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-            # The same until Code becomes a subclass of Data
-            qb = QueryBuilder()
-            qb.append(Code, tag='predecessor', project=['id'])
-            qb.append(Calculation, output_of='predecessor',
-                      filters={'id': {'==': curr_node_id}},
-                      edge_filters={
-                          'type': {
-                              '==': LinkType.INPUT.value}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-
-
-            # INPUT(Data, Calculation) - Forward
-            if input_forward:
-                qb = QueryBuilder()
-                qb.append(Data, tag='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}})
-                qb.append(Calculation, output_of='predecessor',
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.INPUT.value}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Code, tag='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}})
-                qb.append(Calculation, output_of='predecessor',
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.INPUT.value}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-
-            # CREATE/RETURN(Calculation, Data) - Forward
-            qb = QueryBuilder()
-            qb.append(Calculation, tag='predecessor',
-                      filters={'id': {'==': curr_node_id}})
-            qb.append(Data, output_of='predecessor', project=['id'],
-                      edge_filters={
-                          'type': {
-                              'in': [LinkType.CREATE.value,
-                                     LinkType.RETURN.value]}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-            # The same until Code becomes a subclass of Data
-            qb = QueryBuilder()
-            qb.append(Calculation, tag='predecessor',
-                      filters={'id': {'==': curr_node_id}})
-            qb.append(Code, output_of='predecessor', project=['id'],
-                      edge_filters={
-                          'type': {
-                              'in': [LinkType.CREATE.value,
-                                     LinkType.RETURN.value]}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-
-
-            # CREATE(Calculation, Data) - Reversed
-            if create_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Data, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.CREATE.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Code, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.CREATE.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-
-            # RETURN(Calculation, Data) - Reversed
-            if return_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Data, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.RETURN.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Code, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.RETURN.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-            # CALL(Calculation, Calculation) - Forward
-            qb = QueryBuilder()
-            qb.append(Calculation, tag='predecessor',
-                      filters={'id': {'==': curr_node_id}})
-            qb.append(Calculation, output_of='predecessor', project=['id'],
-                      edge_filters={
-                          'type': {
-                              '==': LinkType.CALL.value}})
-            res = {_[0] for _ in qb.all()}
-            given_calculation_entry_ids.update(res - to_be_exported)
-
-
-            # CALL(Calculation, Calculation) - Reversed
-            if call_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Calculation, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.CALL.value}})
-                res = {_[0] for _ in qb.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
-
-
-        # If it is a Data node
-        else:
-            curr_node_id = given_data_entry_ids.pop()
-            # If it is already visited continue to the next node
-            if curr_node_id in to_be_exported:
-                continue
-            # Otherwise say that it is a node to be exported
-            else:
-                to_be_exported.add(curr_node_id)
-
-            # Case 2:
-            # CREATE(Calculation, Data) - Reversed
-            if create_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor', project=['id'])
-                qb.append(Data, output_of='predecessor',
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.CREATE.value}})
-                res = {_[0] for _ in qb.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor', project=['id'])
-                qb.append(Code, output_of='predecessor',
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.CREATE.value}})
-                res = {_[0] for _ in qb.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
+    # Explore the AiiDA graph to find all further nodes that should also be
+    # exported, following the links recursively in a single query
+    to_be_exported = construct_backend().query_manager.get_export_closure(
+        given_node_entry_ids, input_forward=input_forward,
+        create_reversed=create_reversed, return_reversed=return_reversed, call_reversed=call_reversed)
 
     # Here we get all the columns that we plan to project per entity that we
     # would like to extract
@@ -2339,10 +2626,6 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     ######################################
     # Now I store
     ######################################
-    # subfolder inside the export package
-    nodesubfolder = folder.get_subfolder('nodes', create=True,
-                                         reset_limit=True)
-
     # Add the proper signatures to the exported data
     for entity_name in export_data.keys():
         export_data[entity_name] = (
@@ -2375,6 +2658,10 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
         'unique_identifiers': unique_identifiers,
     }
 
+    if deduplicate:
+        metadata['export_version'] = DEDUPLICATED_EXPORT_VERSION
+        metadata[DEDUPLICATION_METADATA_KEY] = True
+
     with folder.open('metadata.json', "w") as fhandle:
         fhandle.write(json.dumps(metadata))
 
@@ -2388,20 +2675,149 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
         uuid_query = QueryBuilder()
         uuid_query.append(Node, filters={"id": {"in": all_nodes_pk}},
                           project=["uuid"])
-        for res in uuid_query.all():
-            uuid = str(res[0])
-            sharded_uuid = export_shard_uuid(uuid)
-
-            # Important to set create=False, otherwise creates
-            # twice a subfolder. Maybe this is a bug of insert_path??
-            thisnodefolder = nodesubfolder.get_subfolder(
-                sharded_uuid, create=False,
-                reset_limit=True)
-            # In this way, I copy the content of the folder, and not the folder
-            # itself
-            thisnodefolder.insert_path(src=RepositoryFolder(
-                section=Node._section_name, uuid=uuid).abspath,
-                                       dest_name='.')
+        uuids = [str(res[0]) for res in uuid_query.iterall()]
+        export_repository_files(uuids, folder, num_workers=num_workers,
+                                deduplicate=deduplicate, checkpoint=checkpoint)
+
+
+def export_repository_files(uuids, folder, num_workers=1, deduplicate=False,
+                            checkpoint=False):
+    """
+    Copy the repository folders of the nodes with the given UUIDs in the
+    `nodes` subfolder of an export folder.
+
+    :param uuids: a list of node UUIDs
+    :param folder: a :py:class:`Folder <aiida.common.folders.Folder>` or a
+    :py:class:`ZipFolder` object
+    :param num_workers: number of threads used to copy the files
+    :param deduplicate: if True, each file is stored only once in the
+    `files` subfolder, named after the hash of its content, and the folder
+    of each node only contains the subfolders and a manifest with the hash
+    of each of its files
+    :param checkpoint: if True, the UUID of each node is appended to a
+    checkpoint file in the folder as soon as its files are copied, and the
+    nodes that are already listed there are skipped. The checkpoint file is
+    removed once all files are copied.
+    """
+    import os
+    import threading
+    from multiprocessing.pool import ThreadPool
+
+    from aiida.common.archive import FILES_EXPORT_SUBFOLDER
+    from aiida.common.folders import Folder
+
+    nodesubfolder = folder.get_subfolder('nodes', create=True,
+                                         reset_limit=True)
+
+    if not isinstance(folder, Folder):
+        if num_workers > 1 or deduplicate or checkpoint:
+            raise ValueError("Parallel, deduplicated or resumable exports "
+                             "are only supported when exporting to a Folder")
+        for uuid in uuids:
+            _copy_node_repository(uuid, nodesubfolder)
+        return
+
+    files_folder = None
+    stored_digests = set()
+    if deduplicate:
+        files_folder = folder.get_subfolder(FILES_EXPORT_SUBFOLDER,
+                                            create=True, reset_limit=True)
+        # Files are written under a temporary name and only renamed once
+        # complete, so only those of an interrupted export can be incomplete
+        for name in os.listdir(files_folder.abspath):
+            if name.endswith('.tmp'):
+                os.remove(files_folder.get_abs_path(name))
+            else:
+                stored_digests.add(name)
+
+    checkpoint_path = folder.get_abs_path(EXPORT_CHECKPOINT_FILENAME)
+    if checkpoint and os.path.exists(checkpoint_path):
+        with io.open(checkpoint_path, 'r', encoding='utf8') as fhandle:
+            copied = set(line.strip() for line in fhandle)
+        uuids = [uuid for uuid in uuids if uuid not in copied]
+
+    lock = threading.Lock()
+
+    def copy_node(uuid):
+        _copy_node_repository(uuid, nodesubfolder, files_folder,
+                              stored_digests, lock)
+        return uuid
+
+    checkpoint_handle = None
+    if checkpoint:
+        checkpoint_handle = io.open(checkpoint_path, 'a', encoding='utf8')
+
+    pool = ThreadPool(max(num_workers, 1))
+    try:
+        for uuid in pool.imap_unordered(copy_node, uuids):
+            if checkpoint_handle is not None:
+                checkpoint_handle.write(u'{}\n'.format(uuid))
+                checkpoint_handle.flush()
+    finally:
+        pool.terminate()
+        pool.join()
+        if checkpoint_handle is not None:
+            checkpoint_handle.close()
+
+    if checkpoint:
+        os.remove(checkpoint_path)
+
+
+def _copy_node_repository(uuid, nodesubfolder, files_folder=None,
+                          stored_digests=None, lock=None):
+    """
+    Copy the repository folder of a node in the `nodes` subfolder of an
+    export folder. If `files_folder` is given, the files are deduplicated
+    as described in :py:func:`export_repository_files`.
+    """
+    import os
+    import shutil
+    from aiida.common.archive import DEDUPLICATION_MANIFEST
+    from aiida.common.folders import Folder, RepositoryFolder
+    from aiida.common.utils import sha1_file
+    import aiida.utils.json as json
+
+    src = RepositoryFolder(section=Node._section_name, uuid=uuid).abspath
+
+    # Important to set create=False, otherwise creates
+    # twice a subfolder. Maybe this is a bug of insert_path??
+    thisnodefolder = nodesubfolder.get_subfolder(
+        export_shard_uuid(uuid), create=False, reset_limit=True)
+
+    # Start from scratch, the folder may be left over by an interrupted
+    # export, in which case `insert_path` would nest the files in it. This
+    # is only possible when exporting to a Folder, not to a ZipFolder
+    if isinstance(thisnodefolder, Folder):
+        thisnodefolder.erase()
+
+    if files_folder is None:
+        # In this way, I copy the content of the folder, and not the folder
+        # itself
+        thisnodefolder.insert_path(src=src, dest_name='.')
+        return
+
+    thisnodefolder.create()
+
+    manifest = {'folders': [], 'files': {}}
+    for dirpath, dirnames, filenames in os.walk(src):
+        relpath = os.path.relpath(dirpath, src)
+        for dirname in dirnames:
+            manifest['folders'].append(os.path.normpath(os.path.join(relpath, dirname)))
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            digest = sha1_file(path)
+            manifest['files'][os.path.normpath(os.path.join(relpath, filename))] = digest
+
+            with lock:
+                is_new = digest not in stored_digests
+                stored_digests.add(digest)
+            if is_new:
+                tmp_path = files_folder.get_abs_path('{}.{}.tmp'.format(digest, uuid))
+                shutil.copyfile(path, tmp_path)
+                os.rename(tmp_path, files_folder.get_abs_path(digest))
+
+    with thisnodefolder.open(DEDUPLICATION_MANIFEST, mode='w') as fhandle:
+        fhandle.write(json.dumps(manifest))
 
 
 def check_licences(node_licenses, allowed_licenses, forbidden_licenses):
@@ -2623,7 +3039,7 @@ def export_zip(what, outfile='testzip', overwrite=False,
 
 
 def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
-           silent=False, **kwargs):
+           silent=False, work_folder=None, **kwargs):
     """
     Export the entries passed in the 'what' list to a file tree.
     :todo: limit the export to finished or failed calculations.
@@ -2649,6 +3065,11 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
     :param overwrite: if True, overwrite the output file without asking.
     if False, raise an IOError in this case.
     :param silent: suppress debug print
+    :param work_folder: path of the folder in which the export is prepared
+    before being compressed. If an export into the same work folder was
+    interrupted, the node files that were already copied are not copied
+    again. The folder is removed once the archive is written. If None, a
+    temporary sandbox folder is used.
 
     :raise IOError: if overwrite==False and the filename already exists.
     """
@@ -2656,13 +3077,19 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
     import tarfile
     import time
 
-    from aiida.common.folders import SandboxFolder
+    from aiida.common.folders import Folder, SandboxFolder
 
     if not overwrite and os.path.exists(outfile):
         raise IOError("The output file '{}' already "
                       "exists".format(outfile))
 
-    folder = SandboxFolder()
+    if work_folder is None:
+        folder = SandboxFolder()
+    else:
+        folder = Folder(work_folder)
+        folder.create()
+        kwargs['checkpoint'] = True
+
     t1 = time.time()
     export_tree(what, folder=folder, silent=silent, **kwargs)
 
@@ -2677,6 +3104,9 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
         tar.add(folder.abspath, arcname="")
     t4 = time.time()
 
+    if work_folder is not None:
+        folder.erase()
+
     if not silent:
         filecr_time = t2 - t1
         filecomp_time = t4 - t3
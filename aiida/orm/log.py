@@ -27,6 +27,41 @@ DESCENDING = -1
 OrderSpecifier = namedtuple("OrderSpecifier", ['field', 'direction'])
 
 
+def get_entry_from_record(record, metadata_keys=None):
+    """
+    Return the keyword arguments of `LogCollection.create_entry` for a record created by the logging module.
+
+    :param record: the record
+    :param metadata_keys: the attributes of the record to store in the metadata, None to store all of them
+    :return: a dictionary, or None if the record should not be stored because it has no `objpk` or `objname`
+    """
+    from datetime import datetime
+
+    objpk = record.__dict__.get('objpk', None)
+    objname = record.__dict__.get('objname', None)
+
+    # Do not store if objpk and objname are not set
+    if objpk is None or objname is None:
+        return None
+
+    if metadata_keys is None:
+        metadata = dict(record.__dict__)
+        # Get rid of the exc info because this is usually not serializable
+        metadata['exc_info'] = None
+    else:
+        metadata = {key: record.__dict__[key] for key in metadata_keys if key in record.__dict__}
+
+    return {
+        'time': timezone.make_aware(datetime.fromtimestamp(record.created)),
+        'loggername': record.name,
+        'levelname': record.levelname,
+        'objname': objname,
+        'objpk': objpk,
+        'message': record.getMessage(),
+        'metadata': metadata,
+    }
+
+
 @six.add_metaclass(ABCMeta)
 class LogCollection(Collection):
     """
@@ -59,36 +94,43 @@ class LogCollection(Collection):
         # pylint: disable=too-many-arguments
         pass
 
-    def create_entry_from_record(self, record):
+    def create_entries(self, entries):
+        """
+        Create several log entries at once.
+
+        The default implementation creates them one by one, backends should override it with a bulk insert.
+
+        :param entries: a list of dictionaries with the keyword arguments of `create_entry` for each entry
+        """
+        for entry in entries:
+            self.create_entry(**entry)
+
+    def create_entry_from_record(self, record, metadata_keys=None):
         """
         Helper function to create a log entry from a record created as by the
         python logging lobrary
 
         :param record: The record created by the logging module
         :type record: :class:`logging.record`
+        :param metadata_keys: the attributes of the record to store in the metadata, None to store all of them
         :return: An object implementing the log entry interface
         :rtype: :class:`aiida.orm.log.Log`
         """
-        from datetime import datetime
+        entry = get_entry_from_record(record, metadata_keys)
+        if entry is None:
+            return None
 
-        objpk = record.__dict__.get('objpk', None)
-        objname = record.__dict__.get('objname', None)
+        return self.create_entry(**entry)
 
-        # Do not store if objpk and objname are not set
-        if objpk is None or objname is None:
-            return None
+    def create_entries_from_records(self, records, metadata_keys=None):
+        """
+        Create the log entries of several records at once, see `create_entry_from_record`.
 
-        metadata = dict(record.__dict__)
-        # Get rid of the exc info because this is usually not serializable
-        metadata['exc_info'] = None
-        return self.create_entry(
-            time=timezone.make_aware(datetime.fromtimestamp(record.created)),
-            loggername=record.name,
-            levelname=record.levelname,
-            objname=objname,
-            objpk=objpk,
-            message=record.getMessage(),
-            metadata=metadata)
+        :param records: a list of records created by the logging module
+        :param metadata_keys: the attributes of the records to store in the metadata, None to store all of them
+        """
+        entries = [get_entry_from_record(record, metadata_keys) for record in records]
+        self.create_entries([entry for entry in entries if entry is not None])
 
     @abstractmethod
     def find(self, filter_by=None, order_by=None, limit=None):
@@ -33,7 +33,7 @@ from six.moves import range, zip
 from aiida.orm.node import Node
 
 # The SQLAlchemy functionalities:
-from sqlalchemy import and_, or_, not_, func as sa_func, select, join
+from sqlalchemy import and_, or_, not_, func as sa_func, select, join, true
 from sqlalchemy.types import Integer
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import cast
@@ -215,6 +215,9 @@ class QueryBuilder(object):
         backend = backend or backends.construct_backend()
         self._impl = backend.query()
 
+        # Whether the link closure table is installed, checked once by `_has_link_closure` when first needed
+        self._link_closure_installed = None
+
         # A list storing the path being traversed by the query
         self._path = []
 
@@ -1281,6 +1284,9 @@ class QueryBuilder(object):
         self._check_dbentities((joined_entity, self._impl.Node), (entity_to_join, self._impl.Node),
                                'descendant_of_beta')
 
+        if not expand_path and self._has_link_closure():
+            return self._join_link_closure(joined_entity, entity_to_join, isouterjoin, descendants=True)
+
         link1 = aliased(self._impl.Link)
         link2 = aliased(self._impl.Link)
         node1 = aliased(self._impl.Node)
@@ -1335,6 +1341,9 @@ class QueryBuilder(object):
         self._check_dbentities((joined_entity, self._impl.Node), (entity_to_join, self._impl.Node),
                                'descendant_of_beta')
 
+        if not expand_path and self._has_link_closure():
+            return self._join_link_closure(joined_entity, entity_to_join, isouterjoin, descendants=False)
+
         link1 = aliased(self._impl.Link)
         link2 = aliased(self._impl.Link)
         node1 = aliased(self._impl.Node)
@@ -1380,6 +1389,37 @@ class QueryBuilder(object):
             isouter=isouterjoin)
         return ancestors_recursive.c
 
+    def _has_link_closure(self):
+        """
+        :returns: True if the transitive closure table of the links is installed in the database,
+            which is only checked the first time for each instance
+        """
+        if self._link_closure_installed is None:
+            self._link_closure_installed = self._impl.has_link_closure()
+        return self._link_closure_installed
+
+    def _join_link_closure(self, joined_entity, entity_to_join, isouterjoin, descendants):
+        """
+        joining descendants or ancestors using the transitive closure table of the links,
+        which replaces the recursive query when it is installed in the database.
+        The closure table has one row per pair of connected nodes and path length, with the
+        number of such paths, which are expanded to one row per path as with the recursive query.
+
+        :param descendants: if True, join the descendants of joined_entity, otherwise its ancestors
+        """
+        closure = self._impl.LinkClosure.alias()
+        # A function in the FROM clause can refer to the tables before it, without LATERAL
+        paths = sa_func.generate_series(1, closure.c.num_paths).alias()
+
+        if descendants:
+            joined_column, column_to_join = closure.c.ancestor_id, closure.c.descendant_id
+        else:
+            joined_column, column_to_join = closure.c.descendant_id, closure.c.ancestor_id
+
+        self._query = self._query.join(closure, joined_column == joined_entity.id).join(paths, true()).join(
+            entity_to_join, column_to_join == entity_to_join.id, isouter=isouterjoin)
+        return closure.c
+
     def _join_group_members(self, joined_entity, entity_to_join, isouterjoin):
         """
         :param joined_entity:
@@ -1954,6 +1994,17 @@ class QueryBuilder(object):
         query = self.get_query()
         return self._impl.count(query)
 
+    def estimate_count(self):
+        """
+        Estimates the number of rows returned by the backend from the statistics of the PostgreSQL planner,
+        without running the query. This takes constant time, unlike :meth:`count`, but is only as accurate
+        as the statistics of the tables, which PostgreSQL updates when analyzing them.
+
+        :returns: the estimated number of rows as an integer
+        """
+        query = self.get_query()
+        return self._impl.estimate_count(query)
+
     def iterall(self, batch_size=100):
         """
         Same as :meth:`.all`, but returns a generator.
@@ -2080,6 +2131,63 @@ class QueryBuilder(object):
         """
         return list(self.iterdict(batch_size=batch_size))
 
+    def iter_columns(self, batch_size=10000):
+        """
+        Executes the full query and returns the results in batches of columns.
+        Contrary to :meth:`.iterall`, the rows are streamed from a server-side cursor
+        and no AiiDA or ORM instance is ever constructed, which makes it much faster
+        to retrieve a large number of values for further analysis.
+        Therefore, only columns and attributes can be projected, not entire entities.
+
+        :param int batch_size: The number of rows in each batch.
+
+        :returns:
+            a generator of lists of numpy arrays, one for each projection,
+            in the same order as the projections in a row of :meth:`.all`.
+
+        Usage::
+
+            qb = QueryBuilder()
+            qb.append(Node, project=['id', 'attributes.energy'])
+            for ids, energies in qb.iter_columns():
+                print(energies.mean())
+        """
+        query = self.get_query()
+
+        if '*' in self._attrkeys_as_in_sql_result.values():
+            raise InputValidationError("Only columns and attributes can be projected when iterating over columns, "
+                                       "not entire entities")
+
+        for columns in self._impl.iter_columns(query, batch_size, self._attrkeys_as_in_sql_result):
+            yield [_column_to_array(column) for column in columns]
+
+    def to_arrays(self, batch_size=10000):
+        """
+        Executes the full query and returns all results as numpy arrays, one for each
+        projection, using :meth:`.iter_columns`.
+
+        :param int batch_size: The number of rows to retrieve from the backend at a time.
+
+        :returns:
+            a dictionary with the same keys as the dictionaries returned by :meth:`.dict`,
+            where each value is the array of all the results of that projection.
+        """
+        import numpy
+
+        batches = list(self.iter_columns(batch_size=batch_size))
+
+        results = {}
+        for tag, projected_entities_dict in self.tag_to_projected_entity_dict.items():
+            results[tag] = {}
+            for attrkey, index_in_sql_result in projected_entities_dict.items():
+                if batches:
+                    column = numpy.concatenate([batch[index_in_sql_result] for batch in batches])
+                else:
+                    column = _column_to_array([])
+                results[tag][attrkey] = column
+
+        return results
+
     def get_results_dict(self):
         """
         Deprecated, use :meth:`.dict` instead
@@ -2133,3 +2241,24 @@ class QueryBuilder(object):
         cls = kwargs.pop('cls', Node)
         self.append(cls=cls, ancestor_of=join_to, autotag=True, **kwargs)
         return self
+
+
+def _column_to_array(values):
+    """
+    Convert a list of values returned by the backend to a numpy array.
+    Values that do not form a one-dimensional array of a numpy type, like dictionaries,
+    lists or a mix of types, are returned in an array of objects.
+    """
+    import numpy
+
+    try:
+        array = numpy.array(values)
+    except ValueError:
+        array = None
+
+    if array is None or array.ndim != 1:
+        array = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            array[index] = value
+
+    return array
@@ -126,6 +126,7 @@ class AiidaApi(Api):
             Node,
             '/nodes/',
             '/nodes/schema/',
+            '/nodes/stream/',
             '/nodes/statistics/',
             '/nodes/page/',
             '/nodes/page/<int:page>/',
@@ -148,6 +149,7 @@ class AiidaApi(Api):
             Calculation,
             '/calculations/',
             '/calculations/schema/',
+            '/calculations/stream/',
             '/calculations/page/',
             '/calculations/page/<int:page>/',
             '/calculations/<id>/',
@@ -170,6 +172,7 @@ class AiidaApi(Api):
             Data,
             '/data/',
             '/data/schema/',
+            '/data/stream/',
             '/data/page/',
             '/data/page/<int:page>',
             '/data/<id>/',
@@ -192,6 +195,7 @@ class AiidaApi(Api):
             Code,
             '/codes/',
             '/codes/schema/',
+            '/codes/stream/',
             '/codes/page/',
             '/codes/page/<int:page>/',
             '/codes/<id>/',
@@ -213,6 +217,7 @@ class AiidaApi(Api):
             StructureData,
             '/structures/',
             '/structures/schema/',
+            '/structures/stream/',
             '/structures/page/',
             '/structures/page/<int:page>',
             '/structures/<id>/',
@@ -235,6 +240,7 @@ class AiidaApi(Api):
             KpointsData,
             '/kpoints/',
             '/kpoints/schema/',
+            '/kpoints/stream/',
             '/kpoints/page/',
             '/kpoints/page/<int:page>',
             '/kpoints/<id>/',
@@ -256,6 +262,7 @@ class AiidaApi(Api):
             BandsData,
             '/bands/',
             '/bands/schema/',
+            '/bands/stream/',
             '/bands/page/',
             '/bands/page/<int:page>',
             '/bands/<id>/',
@@ -277,6 +284,7 @@ class AiidaApi(Api):
             UpfData,
             '/upfs/',
             '/upfs/schema/',
+            '/upfs/stream/',
             '/upfs/page/',
             '/upfs/page/<int:page>',
             '/upfs/<id>/',
@@ -299,6 +307,7 @@ class AiidaApi(Api):
             CifData,
             '/cifs/',
             '/cifs/schema/',
+            '/cifs/stream/',
             '/cifs/page/',
             '/cifs/page/<int:page>',
             '/cifs/<id>/',
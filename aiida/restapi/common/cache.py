@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Cache of the results of the REST API requests.
+
+Results are stored under their ETag, which is computed from the normalized query and from a version token of the
+data it reads: the `mtime` and `nodeversion` of the node for requests of a single node, or the latest `mtime` and
+`id` of all nodes for list requests. A change of the data thus yields a new ETag, such that entries of unchanged
+nodes never expire, while list entries can additionally be given a timeout to bound the staleness caused by changes
+that do not affect their version token, such as deletions.
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from six.moves import cPickle as pickle
+
+from aiida.common.exceptions import ConfigurationError
+from aiida.utils import json
+
+#: The supported values of the `CACHE_TYPE` key of the `CACHE_CONFIG`
+CACHE_TYPES = ('memory', 'filesystem')
+
+
+class MemoryCacheBackend(object):
+    """
+    Keep the entries in the memory of the process, discarding the least recently used ones when it is full.
+    """
+
+    def __init__(self, maxsize=1000):
+        """
+        :param maxsize: the maximum number of entries to keep
+        """
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: the key of the entry
+        :return: the entry, or None if it is not in the cache
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        """
+        :param key: the key of the entry
+        :param entry: the entry to store
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class FileSystemCacheBackend(object):
+    """
+    Keep the entries as files in a directory, such that they are shared by all the processes serving the API.
+    When it is full, the least recently written entries are discarded.
+    """
+
+    def __init__(self, directory, maxsize=1000):
+        """
+        :param directory: the directory where the entries are written, created if it does not exist
+        :param maxsize: the maximum number of entries to keep
+        """
+        self._directory = directory
+        self._maxsize = maxsize
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _get_path(self, key):
+        return os.path.join(self._directory, key)
+
+    def get(self, key):
+        """
+        :param key: the key of the entry
+        :return: the entry, or None if it is not in the cache
+        """
+        try:
+            with open(self._get_path(key), 'rb') as handle:
+                return pickle.load(handle)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, entry):
+        """
+        :param key: the key of the entry
+        :param entry: the entry to store
+        """
+        # Write to a temporary file first, such that other processes never read a partially written entry
+        handle, path = tempfile.mkstemp(dir=self._directory, prefix='.tmp')
+        with os.fdopen(handle, 'wb') as fhandle:
+            pickle.dump(entry, fhandle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(path, self._get_path(key))
+        self._prune()
+
+    def _prune(self):
+        """Remove the oldest entries if there are more than the maximum number."""
+        filenames = [filename for filename in os.listdir(self._directory) if not filename.startswith('.')]
+        if len(filenames) <= self._maxsize:
+            return
+
+        paths = sorted((self._get_path(filename) for filename in filenames), key=_get_mtime)
+        for path in paths[:len(paths) - self._maxsize]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all the entries."""
+        for filename in os.listdir(self._directory):
+            try:
+                os.remove(self._get_path(filename))
+            except OSError:
+                pass
+
+
+def _get_mtime(path):
+    """Return the modification time of a file, or 0 if it was removed in the meantime."""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+class ResponseCache(object):
+    """
+    Cache of the results of the REST API requests, stored under their ETag.
+    """
+
+    def __init__(self, backend, timeouts=None):
+        """
+        :param backend: the backend that stores the entries, e.g. a `MemoryCacheBackend`
+        :param timeouts: a dictionary with the timeout in seconds of the list entries for each resource type
+        """
+        self._backend = backend
+        self._timeouts = timeouts or {}
+
+    @staticmethod
+    def get_version(node_pk=None):
+        """
+        Return the version token of the data read by a request.
+
+        :param node_pk: the pk of the node for requests of a single node, None for list requests
+        :return: a string that changes when the data changes
+        """
+        from aiida.backends.sqlalchemy.utils import get_node_version
+        from aiida.orm.backends import construct_backend
+        from aiida.orm.node import Node
+        from aiida.orm.querybuilder import QueryBuilder
+
+        if node_pk is not None:
+            builder = QueryBuilder().append(Node, filters={'id': node_pk}, project=['mtime', 'nodeversion'])
+            return str(builder.first())
+
+        # The node version sequence is advanced by a trigger whenever a node is added, changed or deleted, so reading
+        # it does not scan the node table
+        return str(get_node_version(construct_backend().query().get_session()))
+
+    def get_etag(self, request_key, node_pk=None):
+        """
+        Return the ETag of the response to a request.
+
+        :param request_key: the normalized description of the request, see `get_request_key`
+        :param node_pk: the pk of the node for requests of a single node, None for list requests
+        :return: the ETag, without the enclosing quotes
+        """
+        version = self.get_version(node_pk)
+        return hashlib.sha256('{}:{}'.format(request_key, version).encode('utf-8')).hexdigest()
+
+    def get(self, etag):
+        """
+        :param etag: the ETag of the response
+        :return: the cached result, or None if it is not cached or it expired
+        """
+        entry = self._backend.get(etag)
+        if entry is None:
+            return None
+
+        expires, result = entry
+        if expires is not None and expires < time.time():
+            return None
+
+        return result
+
+    def set(self, etag, result, resource_type=None):
+        """
+        :param etag: the ETag of the response
+        :param result: the result to cache
+        :param resource_type: the resource type of a list request, to apply its timeout. None for requests of a
+            single node, which never expire
+        """
+        timeout = self._timeouts.get(resource_type) if resource_type is not None else None
+        expires = time.time() + timeout if timeout else None
+        self._backend.set(etag, (expires, result))
+
+    def clear(self):
+        """Remove all the entries."""
+        self._backend.clear()
+
+
+def get_request_key(**kwargs):
+    """
+    Return a normalized representation of a request, that is equal for requests that yield the same response.
+
+    :param kwargs: everything that determines the response, e.g. the query help of the translator and the
+        pagination parameters
+    :return: a string
+    """
+    return json.dumps(kwargs, sort_keys=True, default=str)
+
+
+_RESPONSE_CACHES = {}
+
+
+def get_response_cache(cache_config=None, timeouts=None):
+    """
+    Return the response cache of this process for the given configuration.
+
+    :param cache_config: a dictionary with the `CACHE_TYPE`, one of `CACHE_TYPES` or None to disable caching, the
+        maximum number of entries `CACHE_MAXSIZE` and, for the 'filesystem' type, the directory `CACHE_DIR`
+    :param timeouts: a dictionary with the timeout in seconds of the list entries for each resource type
+    :return: a `ResponseCache`, or None if caching is disabled
+    """
+    if not cache_config or cache_config.get('CACHE_TYPE') is None:
+        return None
+
+    cache_type = cache_config['CACHE_TYPE']
+    maxsize = cache_config.get('CACHE_MAXSIZE', 1000)
+    directory = cache_config.get('CACHE_DIR', None)
+    identifier = (cache_type, maxsize, directory)
+
+    if identifier not in _RESPONSE_CACHES:
+        if cache_type == 'memory':
+            backend = MemoryCacheBackend(maxsize)
+        elif cache_type == 'filesystem':
+            if not directory:
+                raise ConfigurationError("the 'filesystem' cache type requires the CACHE_DIR option")
+            backend = FileSystemCacheBackend(directory, maxsize)
+        else:
+            raise ConfigurationError('unknown CACHE_TYPE {}, valid types are {}'.format(cache_type, CACHE_TYPES))
+        _RESPONSE_CACHES[identifier] = ResponseCache(backend, timeouts)
+
+    return _RESPONSE_CACHES[identifier]
@@ -46,11 +46,18 @@ DATETIME_FORMAT: allowed values are 'asinput' and 'default'.
 """
 SERIALIZER_CONFIG = {'datetime_format': 'default'}
 """
-Caching configuration
+Caching configuration of the results of the node endpoints, see aiida.restapi.common.cache
 
-memcached: backend caching system
+CACHE_TYPE: 'memory' to keep the results in each process, 'filesystem' to share
+them between processes through the directory CACHE_DIR, None to disable caching.
+CACHE_MAXSIZE: maximum number of cached results.
+
+Results for single nodes are kept until the node changes. Results of lists are
+also discarded when any node is added, changed or deleted, and in addition expire
+after the timeout of their resource type in CACHING_TIMEOUTS, e.g. to account for
+changes of the links, users or computers.
 """
-CACHE_CONFIG = {'CACHE_TYPE': 'memcached'}
+CACHE_CONFIG = {'CACHE_TYPE': 'memory', 'CACHE_MAXSIZE': 1000, 'CACHE_DIR': None}
 CACHING_TIMEOUTS = { #Caching TIMEOUTS (in seconds)
     'nodes': 10,
     'users': 10,
@@ -25,6 +25,16 @@ from aiida.restapi.common.exceptions import RestValidationError, \
 PK_DBSYNONYM = 'id'
 # Example uuid (version 4)
 UUID_REF = 'd55082b6-76dc-426b-af89-0e08b59524d2'
+# Ways of counting the results of a list request: running a count query, estimating it from the PostgreSQL
+# statistics, or not at all
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+# Number of rows fetched at a time from the database, and approximate size in bytes of the chunks sent to the client,
+# when streaming results
+STREAM_BATCH_SIZE = 1000
+STREAM_CHUNK_SIZE = 65536
 
 
 ########################## Classes #####################
@@ -226,6 +236,12 @@ class Utils(object):
                 raise RestInputValidationError("url requesting statistics resources do not " "admit further fields")
             else:
                 return (resource_type, page, node_id, query_type)
+        elif path[0] == 'stream':
+            query_type = path.pop(0)
+            if path:
+                raise RestInputValidationError("url requesting stream resources do not " "admit further fields")
+            else:
+                return (resource_type, page, node_id, query_type)
         elif path[0] == "io" or path[0] == "content":
             path.pop(0)
             query_type = path.pop(0)
@@ -248,7 +264,9 @@ class Utils(object):
                          perpage=None,
                          page=None,
                          query_type=None,
-                         is_querystring_defined=False):
+                         is_querystring_defined=False,
+                         after=None,
+                         count_mode=None):
         # pylint: disable=fixme,no-self-use,too-many-arguments,too-many-branches
         """
         Performs various checks on the consistency of the request.
@@ -272,6 +290,67 @@ class Utils(object):
         # 4. No querystring if query type = schema'
         if query_type in ('schema') and is_querystring_defined:
             raise RestInputValidationError("schema requests do not allow " "specifying a query string")
+        # 5. keyset pagination (after) is incompatible with pages and offset
+        if after is not None and (page is not None or offset is not None):
+            raise RestValidationError("after key is incompatible with pages " "and offset")
+        # 6. count mode must be known, and pages require an exact count
+        if count_mode is not None:
+            if count_mode not in COUNT_MODES:
+                raise RestInputValidationError("count must be one of {}".format(', '.join(COUNT_MODES)))
+            if count_mode != COUNT_EXACT and page is not None:
+                raise RestValidationError("requesting a specific page requires " "an exact count")
+
+    @staticmethod
+    def apply_keyset(after, orderby, filters):
+        """
+        Restrict a query to the rows that follow a given pk in the order of the pks (keyset pagination).
+        Unlike an offset, this is resolved by the index on the pk, so that deep pages are as fast as the first one.
+
+        :param after: the pk of the last row of the previous page
+        :param orderby: the list of orderings of the request, which may only order by pk (ascending by default)
+        :param filters: the dictionary of filters of the request
+        :return: the orderby and filters for the translator
+        """
+        if not isinstance(after, int) or isinstance(after, bool):
+            raise RestInputValidationError("after must be an integer pk")
+
+        if not orderby:
+            orderby = ['+id']
+        elif len(orderby) > 1 or orderby[0].lstrip('+-') not in ('id', 'pk'):
+            raise RestInputValidationError("after key only supports ordering by id")
+
+        keyset_filter = {'<': after} if orderby[0].startswith('-') else {'>': after}
+
+        filters = dict(filters)
+        existing_filter = filters.pop('id', filters.pop('pk', None))
+        if existing_filter is None:
+            filters['id'] = keyset_filter
+        elif 'and' in existing_filter:
+            filters['id'] = {'and': existing_filter['and'] + [keyset_filter]}
+        else:
+            filters['id'] = {'and': [existing_filter, keyset_filter]}
+
+        return orderby, filters
+
+    def get_next_after(self, after, limit, results):
+        """
+        Return the pk after which the next page of a keyset pagination starts.
+
+        :param after: the after key of the request, None if it does not use keyset pagination
+        :param limit: the limit of the request, None for the default one
+        :param results: the results of the translator, a dictionary with a single list of rows
+        :return: the pk of the last row, or None if the request does not use keyset pagination
+            or this is the last page
+        """
+        if after is None or not isinstance(results, dict) or len(results) != 1:
+            return None
+
+        rows = list(results.values())[0]
+        limit = self.limit_default if limit is None else int(limit)
+        if not rows or len(rows) < limit:
+            return None
+
+        return rows[-1].get(PK_DBSYNONYM)
 
     def paginate(self, page, perpage, total_count):
         """
@@ -337,21 +416,25 @@ class Utils(object):
 
         return (limit, offset, rel_pages)
 
-    def build_headers(self, rel_pages=None, url=None, total_count=None):
+    def build_headers(self, rel_pages=None, url=None, total_count=None, count_mode=COUNT_EXACT, next_after=None):
+        # pylint: disable=too-many-arguments
         """
         Construct the header dictionary for an HTTP response. It includes related
         pages, total count of results (before pagination).
 
         :param rel_pages: a dictionary defining related pages (first, prev, next, last)
         :param url: (string) the full url, i.e. the url that the client uses to get Rest resources
+        :param count_mode: how total_count was obtained, see COUNT_MODES. With COUNT_NONE, no count is included
+        :param next_after: for keyset pagination, the pk of the last row, used to link the next page
         """
 
         ## Type validation
         # mandatory parameters
-        try:
-            total_count = int(total_count)
-        except ValueError:
-            raise InputValidationError("total_count must be a long integer")
+        if count_mode != COUNT_NONE:
+            try:
+                total_count = int(total_count)
+            except (TypeError, ValueError):
+                raise InputValidationError("total_count must be a long integer")
 
         # non mandatory parameters
         if rel_pages is not None and not isinstance(rel_pages, dict):
@@ -369,11 +452,16 @@ class Utils(object):
             raise InputValidationError("'rel_pages' parameter requires 'url' " "parameter to be defined")
 
         headers = {}
+        expose_header = []
 
         ## Setting mandatory headers
-        # set X-Total-Count
-        headers['X-Total-Count'] = total_count
-        expose_header = ["X-Total-Count"]
+        # set X-Total-Count, flagged if it is only an estimate
+        if count_mode != COUNT_NONE:
+            headers['X-Total-Count'] = total_count
+            expose_header.append("X-Total-Count")
+        if count_mode == COUNT_ESTIMATE:
+            headers['X-Total-Count-Estimated'] = 'true'
+            expose_header.append("X-Total-Count-Estimated")
 
         ## Two auxiliary functions
         def split_url(url):
@@ -408,6 +496,14 @@ class Utils(object):
             else:
                 pass
 
+        # set the link to the next page of a keyset pagination
+        if next_after is not None and url is not None:
+            (path, query_string, question_mark) = split_url(url)
+            fields = [field for field in query_string.split('&') if field and not field.startswith('after=')]
+            fields.append('after={}'.format(next_after))
+            headers['Link'] = '<' + path + '?' + '&'.join(fields) + '>; rel=next'
+            expose_header.append("Link")
+
         # to expose header access in cross-domain requests
         headers['Access-Control-Expose-Headers'] = ','.join(expose_header)
 
@@ -451,6 +547,47 @@ class Utils(object):
 
         return response
 
+    @staticmethod
+    def build_stream_response(rows, compress=False, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Build a response that streams rows as newline-delimited JSON (one JSON object per line), serializing them
+        only as they are sent, such that the memory usage does not depend on the number of rows.
+
+        :param rows: an iterable of the rows, e.g. a generator fetching them from the database
+        :param compress: whether to compress the stream with gzip
+        :param chunk_size: the approximate size in bytes of the chunks sent to the client
+
+        :return: a Flask response object
+        """
+        import zlib
+        from flask import Response, json, stream_with_context
+
+        def generate():
+            """Serialize the rows, yielding them in chunks of about chunk_size bytes."""
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+            lines = []
+            size = 0
+
+            for row in rows:
+                line = (json.dumps(row) + '\n').encode('utf-8')
+                lines.append(line)
+                size += len(line)
+
+                if size >= chunk_size:
+                    chunk = b''.join(lines)
+                    yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH) if compress else chunk
+                    lines = []
+                    size = 0
+
+            chunk = b''.join(lines)
+            yield compressor.compress(chunk) + compressor.flush() if compress else chunk
+
+        response = Response(stream_with_context(generate()), status=200, mimetype='application/x-ndjson')
+        if compress:
+            response.headers['Content-Encoding'] = 'gzip'
+
+        return response
+
     @staticmethod
     def build_datetime_filter(dtobj):
         """
@@ -515,6 +652,8 @@ class Utils(object):
         visformat = None
         filename = None
         rtype = None
+        after = None
+        count_mode = None
 
         ## Count how many time a key has been used for the filters and check if
         # reserved keyword
@@ -561,6 +700,10 @@ class Utils(object):
             raise RestInputValidationError("You cannot specify filename more than " "once")
         if 'rtype' in field_counts.keys() and field_counts['rtype'] > 1:
             raise RestInputValidationError("You cannot specify rtype more than " "once")
+        if 'after' in field_counts.keys() and field_counts['after'] > 1:
+            raise RestInputValidationError("You cannot specify after more than " "once")
+        if 'count' in field_counts.keys() and field_counts['count'] > 1:
+            raise RestInputValidationError("You cannot specify count more than " "once")
 
         ## Extract results
         for field in field_list:
@@ -637,6 +780,18 @@ class Utils(object):
                 else:
                     raise RestInputValidationError("only assignment operator '=' " "is permitted after 'rtype'")
 
+            elif field[0] == 'after':
+                if field[1] == '=':
+                    after = field[2]
+                else:
+                    raise RestInputValidationError("only assignment operator '=' " "is permitted after 'after'")
+
+            elif field[0] == 'count':
+                if field[1] == '=':
+                    count_mode = field[2]
+                else:
+                    raise RestInputValidationError("only assignment operator '=' " "is permitted after 'count'")
+
             else:
 
                 ## Construct the filter entry.
@@ -664,7 +819,7 @@ class Utils(object):
         #     limit = self.limit_default
 
         return (limit, offset, perpage, orderby, filters, alist, nalist, elist, nelist, downloadformat, visformat,
-                filename, rtype)
+                filename, rtype, after, count_mode)
 
     def parse_query_string(self, query_string):
         # pylint: disable=too-many-locals
@@ -17,7 +17,8 @@ from six.moves.urllib.parse import unquote  # pylint: disable=import-error
 from flask import request, make_response
 from flask_restful import Resource
 
-from aiida.restapi.common.utils import Utils
+from aiida.restapi.common.cache import get_request_key, get_response_cache
+from aiida.restapi.common.utils import Utils, COUNT_EXACT
 
 
 class ServerInfo(Resource):
@@ -124,7 +125,7 @@ class BaseResource(Resource):
         ## Parse request
         (resource_type, page, node_id, query_type) = self.utils.parse_path(path, parse_pk_uuid=self.parse_pk_uuid)
         (limit, offset, perpage, orderby, filters, _alist, _nalist, _elist, _nelist, _downloadformat, _visformat,
-         _filename, _rtype) = self.utils.parse_query_string(query_string)
+         _filename, _rtype, after, count_mode) = self.utils.parse_query_string(query_string)
 
         ## Validate request
         self.utils.validate_request(
@@ -133,7 +134,13 @@ class BaseResource(Resource):
             perpage=perpage,
             page=page,
             query_type=query_type,
-            is_querystring_defined=(bool(query_string)))
+            is_querystring_defined=(bool(query_string)),
+            after=after,
+            count_mode=count_mode)
+
+        ## Keyset pagination
+        if after is not None:
+            orderby, filters = self.utils.apply_keyset(after, orderby, filters)
 
         ## Treat the schema case which does not imply access to the DataBase
         if query_type == 'schema':
@@ -146,6 +153,8 @@ class BaseResource(Resource):
         else:
             ## Set the query, and initialize qb object
             self.trans.set_query(filters=filters, orders=orderby, node_id=node_id)
+            if count_mode is not None:
+                self.trans.set_count_mode(count_mode)
 
             ## Count results
             total_count = self.trans.get_total_count()
@@ -154,13 +163,22 @@ class BaseResource(Resource):
             if page is not None:
                 (limit, offset, rel_pages) = self.utils.paginate(page, perpage, total_count)
                 self.trans.set_limit_offset(limit=limit, offset=offset)
+
+                ## Retrieve results
+                results = self.trans.get_results()
+
                 headers = self.utils.build_headers(rel_pages=rel_pages, url=request.url, total_count=total_count)
             else:
                 self.trans.set_limit_offset(limit=limit, offset=offset)
-                headers = self.utils.build_headers(url=request.url, total_count=total_count)
 
-            ## Retrieve results
-            results = self.trans.get_results()
+                ## Retrieve results
+                results = self.trans.get_results()
+
+                headers = self.utils.build_headers(
+                    url=request.url,
+                    total_count=total_count,
+                    count_mode=count_mode or COUNT_EXACT,
+                    next_after=self.utils.get_next_after(after, limit, results))
 
         ## Build response and return it
         data = dict(
@@ -182,12 +200,20 @@ class Node(Resource):
     query_type as an input and the presence of additional result types like "tree"
     """
 
+    # Query types whose results are cached, and among those the ones that, when an id is given, only depend on the
+    # requested node. The others depend on any node, e.g. through links, like lists
+    _CACHED_QUERY_TYPES = ('default', 'inputs', 'outputs', 'attributes', 'extras', 'visualization')
+    _NODE_QUERY_TYPES = ('default', 'attributes', 'extras', 'visualization')
+
     def __init__(self, **kwargs):
 
         # Set translator
         from aiida.restapi.translator.node import NodeTranslator
         self.trans = NodeTranslator(**kwargs)
 
+        # Cache of the results, shared by all the requests served by this process
+        self.cache = get_response_cache(kwargs.get('CACHE_CONFIG', None), kwargs.get('CACHING_TIMEOUTS', None))
+
         from aiida.orm import Node as tNode
         self.tclass = tNode
 
@@ -220,7 +246,7 @@ class Node(Resource):
         (resource_type, page, node_id, query_type) = self.utils.parse_path(path, parse_pk_uuid=self.parse_pk_uuid)
 
         (limit, offset, perpage, orderby, filters, alist, nalist, elist, nelist, downloadformat, visformat, filename,
-         rtype) = self.utils.parse_query_string(query_string)
+         rtype, after, count_mode) = self.utils.parse_query_string(query_string)
 
         ## Validate request
         self.utils.validate_request(
@@ -229,7 +255,16 @@ class Node(Resource):
             perpage=perpage,
             page=page,
             query_type=query_type,
-            is_querystring_defined=(bool(query_string)))
+            is_querystring_defined=(bool(query_string)),
+            after=after,
+            count_mode=count_mode)
+
+        ## Keyset pagination
+        if after is not None:
+            orderby, filters = self.utils.apply_keyset(after, orderby, filters)
+
+        # ETag of the response, only set if its results are cached
+        etag = None
 
         ## Treat the schema case which does not imply access to the DataBase
         if query_type == 'schema':
@@ -243,7 +278,7 @@ class Node(Resource):
         ## Treat the statistics
         elif query_type == "statistics":
             (limit, offset, perpage, orderby, filters, alist, nalist, elist, nelist, downloadformat, visformat,
-             filename, rtype) = self.utils.parse_query_string(query_string)
+             filename, rtype, after, count_mode) = self.utils.parse_query_string(query_string)
             headers = self.utils.build_headers(url=request.url, total_count=0)
             if filters:
                 usr = filters["user"]["=="]
@@ -251,6 +286,13 @@ class Node(Resource):
                 usr = None
             results = self.trans.get_statistics(usr)
 
+        ## Stream all the rows of the query, without pagination
+        elif query_type == "stream":
+            self.trans.set_query(filters=filters, orders=orderby)
+            rows = self.trans.iter_results(limit=limit, offset=offset)
+            compress = 'gzip' in request.accept_encodings
+            return self.utils.build_stream_response(rows, compress=compress)
+
         # TODO Might need to be improved
         elif query_type == "tree":
             headers = self.utils.build_headers(url=request.url, total_count=0)
@@ -270,22 +312,48 @@ class Node(Resource):
                 visformat=visformat,
                 filename=filename,
                 rtype=rtype)
+            if count_mode is not None:
+                self.trans.set_count_mode(count_mode)
+
+            ## Look up the results in the cache
+            cached = None
+            if self.cache is not None and query_type in self._CACHED_QUERY_TYPES:
+                node_pk = self.trans.get_id() if query_type in self._NODE_QUERY_TYPES else None
+                request_key = get_request_key(
+                    query_help=self.trans.get_query_help(),
+                    query_type=query_type,
+                    page=page,
+                    perpage=perpage,
+                    limit=limit,
+                    offset=offset,
+                    alist=alist,
+                    nalist=nalist,
+                    elist=elist,
+                    nelist=nelist,
+                    visformat=visformat,
+                    count_mode=count_mode)
+                etag = self.cache.get_etag(request_key, node_pk)
+
+                if etag in request.if_none_match:
+                    response = make_response('', 304)
+                    response.set_etag(etag)
+                    return response
+
+                cached = self.cache.get(etag)
 
             ## Count results
-            total_count = self.trans.get_total_count()
+            if cached is not None:
+                total_count, results = cached
+            else:
+                total_count = self.trans.get_total_count()
 
             ## Pagination (if required)
             if page is not None:
                 (limit, offset, rel_pages) = self.utils.paginate(page, perpage, total_count)
-                self.trans.set_limit_offset(limit=limit, offset=offset)
-
-                ## Retrieve results
-                results = self.trans.get_results()
-
-                headers = self.utils.build_headers(rel_pages=rel_pages, url=request.url, total_count=total_count)
-            else:
 
+            if cached is None:
                 self.trans.set_limit_offset(limit=limit, offset=offset)
+
                 ## Retrieve results
                 results = self.trans.get_results()
 
@@ -320,7 +388,18 @@ class Node(Resource):
                     elif status == 500:
                         results = results[query_type]["data"]
 
-                headers = self.utils.build_headers(url=request.url, total_count=total_count)
+                if etag is not None:
+                    # Results of single nodes never expire, lists expire after the timeout of their resource type
+                    self.cache.set(etag, (total_count, results), resource_type if node_pk is None else None)
+
+            if page is not None:
+                headers = self.utils.build_headers(rel_pages=rel_pages, url=request.url, total_count=total_count)
+            else:
+                headers = self.utils.build_headers(
+                    url=request.url,
+                    total_count=total_count,
+                    count_mode=count_mode or COUNT_EXACT,
+                    next_after=self.utils.get_next_after(after, limit, results))
 
         ## Build response
         data = dict(
@@ -333,7 +412,13 @@ class Node(Resource):
             resource_type=resource_type,
             data=results)
 
-        return self.utils.build_response(status=200, headers=headers, data=data)
+        response = self.utils.build_response(status=200, headers=headers, data=data)
+
+        if etag is not None:
+            response.set_etag(etag)
+            response.headers['Access-Control-Expose-Headers'] += ',ETag'
+
+        return response
 
 
 class Computer(BaseResource):
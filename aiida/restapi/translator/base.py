@@ -21,7 +21,8 @@ from aiida.common.utils import get_object_from_string
 from aiida.orm.querybuilder import QueryBuilder
 from aiida.restapi.common.exceptions import RestValidationError, \
     RestInputValidationError
-from aiida.restapi.common.utils import PK_DBSYNONYM
+from aiida.restapi.common.utils import PK_DBSYNONYM, COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE, COUNT_MODES, \
+    STREAM_BATCH_SIZE
 
 
 class BaseTranslator(object):
@@ -53,6 +54,7 @@ class BaseTranslator(object):
     _is_qb_initialized = False
     _is_id_query = None
     _total_count = None
+    _count_mode = COUNT_EXACT
 
     def __init__(self, Class=None, **kwargs):
         """
@@ -84,6 +86,7 @@ class BaseTranslator(object):
         self._is_qb_initialized = Class._is_qb_initialized  # pylint: disable=protected-access
         self._is_id_query = Class._is_id_query  # pylint: disable=protected-access
         self._total_count = Class._total_count  # pylint: disable=protected-access
+        self._count_mode = Class._count_mode  # pylint: disable=protected-access
 
         # Basic filter (dict) to set the identity of the uuid. None if
         #  no specific node is requested
@@ -188,25 +191,31 @@ class BaseTranslator(object):
         else:
             raise InvalidOperation("query builder object has not been " "initialized.")
 
-            # def caching_method(self):
-            #     """
-            #     class method for caching. It is a wrapper of the
-            # flask_cache memoize
-            #     method. To be used as a decorator
-            #     :return: the flask_cache memoize method with the timeout kwarg
-            #     corrispondent to the class
-            #     """
-            #     return cache.memoize()
-            #
+    def set_count_mode(self, count_mode):
+        """
+        Set how get_total_count obtains the number of rows of the query.
 
-            #    @cache.memoize(timeout=CACHING_TIMEOUTS[self.__label__])
+        :param count_mode: one of COUNT_MODES: run a count query, estimate it from
+            the statistics of the database, or do not count at all
+        """
+        if count_mode not in COUNT_MODES:
+            raise InputValidationError("count mode must be one of {}".format(COUNT_MODES))
+        self._count_mode = count_mode
 
     def get_total_count(self):
         """
-        Returns the number of rows of the query.
+        Returns the number of rows of the query, according to the count mode.
 
-        :return: total_count
+        :return: total_count, the estimated count, or None if the count mode is COUNT_NONE
         """
+        if self._count_mode == COUNT_NONE:
+            return None
+
+        if self._count_mode == COUNT_ESTIMATE:
+            if not self._is_qb_initialized:
+                raise InvalidOperation("query builder object has not been " "initialized.")
+            return self.qbobj.estimate_count()
+
         ## Count the results if needed
         if not self._total_count:
             self.count()
@@ -397,6 +406,14 @@ class BaseTranslator(object):
         ## Initialize the query_object
         self.init_qb()
 
+    def get_id(self):
+        """
+        :return: the pk of the object selected by the id of the request, None if no id was given
+        """
+        if self._id_filter is None:
+            return None
+        return self._id_filter['id']['==']
+
     def get_query_help(self):
         """
         :return: return QB json dictionary
@@ -458,7 +475,7 @@ class BaseTranslator(object):
             raise InvalidOperation("query builder object has not been " "initialized.")
 
         results = []
-        if self._total_count > 0:
+        if self._total_count is None or self._total_count > 0:
             results = [res[label] for res in self.qbobj.dict()]
 
         # TODO think how to make it less hardcoded
@@ -481,14 +498,36 @@ class BaseTranslator(object):
             raise InvalidOperation("query builder object has not been " "initialized.")
 
         ## Count the total number of rows returned by the query (if not
-        # already done)
-        if self._total_count is None:
+        # already done), unless counting was disabled
+        if self._total_count is None and self._count_mode == COUNT_EXACT:
             self.count()
 
         ## Retrieve data
         data = self.get_formatted_result(self._result_type)
         return data
 
+    def iter_results(self, limit=None, offset=None, batch_size=STREAM_BATCH_SIZE):
+        """
+        Iterate over the rows of the query, fetching them from the database in batches
+        through a server side cursor. Unlike get_results, there is no default limit and
+        the memory usage does not depend on the number of rows.
+
+        :param limit: the maximum number of rows, None for all of them
+        :param offset: the number of rows to skip
+        :param batch_size: the number of rows fetched from the database at a time
+        :return: a generator of the rows
+        """
+        if not self._is_qb_initialized:
+            raise InvalidOperation("query builder object has not been " "initialized.")
+
+        if limit is not None:
+            self.qbobj.limit(int(limit))
+        if offset is not None:
+            self.qbobj.offset(int(offset))
+
+        for res in self.qbobj.iterdict(batch_size=batch_size):
+            yield res[self._result_type]
+
     def _check_id_validity(self, node_id):
         """
         Checks whether id corresponds to an object of the expected type,
@@ -24,6 +24,9 @@ from aiida.common.exceptions import AiidaException, FeatureNotAvailable
 from aiida.plugins.factory import BaseFactory
 from aiida.scheduler.datastructures import JobTemplate, JobInfo, JOB_STATES
 
+# Line printed to stdout and stderr after each job submitted by `Scheduler.submit_from_scripts`, to split their output
+SUBMIT_SEPARATOR = '__AIIDA_SUBMIT_SEPARATOR__'
+
 
 def SchedulerFactory(entry_point):
     """
@@ -314,6 +317,62 @@ class Scheduler(object):
         with self.transport:
             retval, stdout, stderr = self.transport.exec_command_wait(command)
 
+        return self._format_detailed_jobinfo(command, retval, stdout, stderr)
+
+    def _get_detailed_jobsinfo_command(self, jobids):
+        """
+        Return the command to run to get the detailed information on several
+        jobs at once, see `_get_detailed_jobinfo_command`. Plugins that can do
+        it should implement this method together with
+        `_split_detailed_jobsinfo_output`.
+
+        :param jobids: a list of job ids
+        :raises: :class:`aiida.common.exceptions.FeatureNotAvailable`
+        """
+        # pylint: disable=no-self-use, unused-argument
+        raise FeatureNotAvailable("Cannot get detailed job info of several jobs at once")
+
+    def _split_detailed_jobsinfo_output(self, stdout, jobids):
+        """
+        Split the output of the command returned by `_get_detailed_jobsinfo_command`
+        into the output of each job.
+
+        :param stdout: the standard output of the command
+        :param jobids: the list of job ids passed to the command
+        :return: a dictionary {jobid: stdout of the job}
+        """
+        raise NotImplementedError
+
+    def get_detailed_jobsinfo(self, jobids):
+        """
+        Return the output of the detailed_jobinfo command for several jobs,
+        with a single command if the plugin supports it and otherwise with
+        one command per job.
+
+        :param jobids: a list of job ids
+        :return: a dictionary {jobid: string}, with the strings as returned by `get_detailed_jobinfo`
+        :raises: :class:`aiida.common.exceptions.FeatureNotAvailable`
+        """
+        if not jobids:
+            return {}
+
+        try:
+            command = self._get_detailed_jobsinfo_command(jobids=jobids)
+        except FeatureNotAvailable:
+            return {jobid: self.get_detailed_jobinfo(jobid) for jobid in jobids}
+
+        with self.transport:
+            retval, stdout, stderr = self.transport.exec_command_wait(command)
+
+        outputs = self._split_detailed_jobsinfo_output(stdout, jobids)
+
+        return {
+            jobid: self._format_detailed_jobinfo(command, retval, outputs.get(jobid, ''), stderr) for jobid in jobids
+        }
+
+    @staticmethod
+    def _format_detailed_jobinfo(command, retval, stdout, stderr):
+        """Return the string with the detailed job info, from the output of the command that retrieved it."""
         return u"""Detailed jobinfo obtained with command '{}'
 Return Code: {}
 -------------------------------------------------------------
@@ -414,6 +473,88 @@ stderr:
             self._get_submit_command(escape_for_bash(submit_script)))
         return self._parse_submit_output(retval, stdout, stderr)
 
+    def submit_from_scripts(self, submissions):
+        """
+        Submit several scripts with a single command executed over the transport,
+        such that submitting many jobs takes one round trip to the machine instead
+        of one per job.
+
+        Each script is submitted with the command returned by _get_submit_command,
+        in its own working directory, and its output is parsed separately, so the
+        failure of one submission does not affect the others.
+
+        :param submissions: a list of tuples (working_directory, submit_script)
+        :return: a list with, for each submission in the same order, either the
+            JobID or the exception raised while parsing the output of its submission
+        """
+        if not submissions:
+            return []
+
+        commands = []
+        for working_directory, submit_script in submissions:
+            commands.append('(cd {} || exit 1; {}); echo {} $?; echo {} >&2'.format(
+                escape_for_bash(working_directory), self._get_submit_command(escape_for_bash(submit_script)),
+                SUBMIT_SEPARATOR, SUBMIT_SEPARATOR))
+
+        _, stdout, stderr = self.transport.exec_command_wait('; '.join(commands))
+
+        outputs = self._split_submit_output(stdout, stderr)
+
+        results = []
+        for index in range(len(submissions)):
+            try:
+                retval, job_stdout, job_stderr = outputs[index]
+            except IndexError:
+                results.append(SchedulerError('Error during submission, no output for the submission of the script'))
+                continue
+            try:
+                results.append(self._parse_submit_output(retval, job_stdout, job_stderr))
+            except Exception as exception:  # pylint: disable=broad-except
+                results.append(exception)
+
+        return results
+
+    @staticmethod
+    def _split_submit_output(stdout, stderr):
+        """
+        Split the output of the command executed by submit_from_scripts into the
+        outputs of the single submissions.
+
+        :return: a list of tuples (retval, stdout, stderr), one for each
+            submission whose output is complete
+        """
+        retvals = []
+        stdouts = []
+        lines = []
+        for line in stdout.splitlines(True):
+            # The output of a submission does not necessarily end with a newline, so the separator can follow it
+            # on the same line
+            before, separator, after = line.partition(SUBMIT_SEPARATOR)
+            if separator:
+                try:
+                    retvals.append(int(after))
+                except ValueError:
+                    retvals.append(-1)
+                lines.append(before)
+                stdouts.append(''.join(lines))
+                lines = []
+            else:
+                lines.append(line)
+
+        stderrs = []
+        lines = []
+        for line in stderr.splitlines(True):
+            before, separator, after = line.partition(SUBMIT_SEPARATOR)
+            if separator and not after.strip():
+                lines.append(before)
+                stderrs.append(''.join(lines))
+                lines = []
+            else:
+                lines.append(line)
+        stderrs.extend([''] * (len(stdouts) - len(stderrs)))
+
+        return list(zip(retvals, stdouts, stderrs))
+
     def kill(self, jobid):
         """
         Kill a remote job, and try to parse the output message of the scheduler
@@ -231,13 +231,46 @@ class SlurmScheduler(aiida.scheduler.Scheduler):
         --parsable split the fields with a pipe (|), adding a pipe also at
         the end.
         """
+        return self._get_detailed_jobsinfo_command([jobid])
+
+    def _get_detailed_jobsinfo_command(self, jobids):
+        """
+        Return the command to get the detailed information on several jobs
+        with a single call to sacct, which accepts a comma separated list of jobs.
+        """
         return "sacct --format=AllocCPUS,Account,AssocID,AveCPU,AvePages," \
                "AveRSS,AveVMSize,Cluster,Comment,CPUTime,CPUTimeRAW,DerivedExitCode," \
                "Elapsed,Eligible,End,ExitCode,GID,Group,JobID,JobName,MaxRSS,MaxRSSNode," \
                "MaxRSSTask,MaxVMSize,MaxVMSizeNode,MaxVMSizeTask,MinCPU,MinCPUNode," \
                "MinCPUTask,NCPUS,NNodes,NodeList,NTasks,Priority,Partition,QOSRAW,ReqCPUS," \
                "Reserved,ResvCPU,ResvCPURAW,Start,State,Submit,Suspended,SystemCPU,Timelimit," \
-               "TotalCPU,UID,User,UserCPU --parsable --jobs={}".format(jobid)
+               "TotalCPU,UID,User,UserCPU --parsable --jobs={}".format(','.join(jobids))
+
+    def _split_detailed_jobsinfo_output(self, stdout, jobids):
+        """
+        Split the output of sacct by job: the header line is kept for each job,
+        followed by the lines of the job and of its steps (with ids `jobid.step`).
+        """
+        lines = stdout.splitlines()
+        if not lines:
+            return {}
+
+        header = lines[0]
+        try:
+            index = header.split('|').index('JobID')
+        except ValueError:
+            raise SchedulerError("Error during sacct parsing, JobID field not found in header '{}'".format(header))
+
+        job_lines = {jobid: [header] for jobid in jobids}
+        for line in lines[1:]:
+            fields = line.split('|')
+            if len(fields) <= index:
+                continue
+            jobid = fields[index].split('.')[0]
+            if jobid in job_lines:
+                job_lines[jobid].append(line)
+
+        return {jobid: '\n'.join(job_lines[jobid]) + '\n' for jobid in jobids}
 
     def _get_submit_script_header(self, job_tmpl):
         """
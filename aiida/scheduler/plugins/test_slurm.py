@@ -97,6 +97,31 @@ class TestParserSqueue(unittest.TestCase):
         #                self.assertTrue( j.num_mpiprocs==num_mpiprocs )
 
 
+class TestDetailedJobsinfo(unittest.TestCase):
+
+    def test_detailed_jobsinfo_command(self):
+        scheduler = SlurmScheduler()
+
+        command = scheduler._get_detailed_jobsinfo_command(['123', '456'])
+        self.assertTrue(command.startswith('sacct '))
+        self.assertIn('--jobs=123,456', command)
+        self.assertEqual(
+            scheduler._get_detailed_jobinfo_command('123'), scheduler._get_detailed_jobsinfo_command(['123']))
+
+    def test_split_detailed_jobsinfo_output(self):
+        scheduler = SlurmScheduler()
+
+        stdout = ('AllocCPUS|JobID|State|\n'
+                  '4|123|COMPLETED|\n'
+                  '4|123.batch|COMPLETED|\n'
+                  '8|456|FAILED|\n')
+        outputs = scheduler._split_detailed_jobsinfo_output(stdout, ['123', '456', '789'])
+
+        self.assertEqual(outputs['123'], 'AllocCPUS|JobID|State|\n4|123|COMPLETED|\n4|123.batch|COMPLETED|\n')
+        self.assertEqual(outputs['456'], 'AllocCPUS|JobID|State|\n8|456|FAILED|\n')
+        self.assertEqual(outputs['789'], 'AllocCPUS|JobID|State|\n')
+
+
 class TestTimes(unittest.TestCase):
 
     def test_time_conversion(self):
@@ -320,5 +345,72 @@ class TestSubmitScript(unittest.TestCase):
                 num_machines=1, num_mpiprocs_per_machine=1, num_cores_per_machine=24, num_cores_per_mpiproc=23)
 
 
+class TestSubmitFromScripts(unittest.TestCase):
+
+    class MockTransport(object):
+        """Transport that returns a fixed output for the executed command, and records it."""
+
+        def __init__(self, stdout, stderr):
+            self.command = None
+            self._output = (0, stdout, stderr)
+
+        def exec_command_wait(self, command):
+            self.command = command
+            return self._output
+
+    def test_submit_from_scripts(self):
+        from aiida.scheduler import SUBMIT_SEPARATOR, SchedulerError
+
+        stdout = ('Submitted batch job 123\n'
+                  '{0} 0\n'
+                  '{0} 1\n'
+                  'Submitted batch job 456\n'
+                  '{0} 0\n').format(SUBMIT_SEPARATOR)
+        stderr = ('{0}\n'
+                  'sbatch: error: Batch job submission failed\n'
+                  '{0}\n'
+                  '{0}\n').format(SUBMIT_SEPARATOR)
+
+        scheduler = SlurmScheduler()
+        transport = self.MockTransport(stdout, stderr)
+        scheduler.set_transport(transport)
+
+        results = scheduler.submit_from_scripts([('/a', '_aiidasubmit.sh'), ('/b', '_aiidasubmit.sh'),
+                                                 ('/c', '_aiidasubmit.sh')])
+
+        self.assertEqual(transport.command.count('sbatch'), 3)
+        self.assertEqual(results[0], '123')
+        self.assertIsInstance(results[1], SchedulerError)
+        self.assertEqual(results[2], '456')
+
+    def test_submit_from_scripts_incomplete_output(self):
+        from aiida.scheduler import SUBMIT_SEPARATOR, SchedulerError
+
+        scheduler = SlurmScheduler()
+        scheduler.set_transport(self.MockTransport('Submitted batch job 123\n{} 0\n'.format(SUBMIT_SEPARATOR), ''))
+
+        results = scheduler.submit_from_scripts([('/a', '_aiidasubmit.sh'), ('/b', '_aiidasubmit.sh')])
+
+        self.assertEqual(results[0], '123')
+        self.assertIsInstance(results[1], SchedulerError)
+
+    def test_submit_from_scripts_no_trailing_newline(self):
+        """The separator can follow the output of a submission that does not end with a newline."""
+        from aiida.scheduler import SUBMIT_SEPARATOR
+
+        stdout = 'Submitted batch job 123{0} 0\nSubmitted batch job 456\n{0} 0\n'.format(SUBMIT_SEPARATOR)
+        stderr = 'sbatch: warning: no newline{0}\n{0}\n'.format(SUBMIT_SEPARATOR)
+
+        scheduler = SlurmScheduler()
+        scheduler.set_transport(self.MockTransport(stdout, stderr))
+
+        results = scheduler.submit_from_scripts([('/a', '_aiidasubmit.sh'), ('/b', '_aiidasubmit.sh')])
+
+        self.assertEqual(results, ['123', '456'])
+        self.assertEqual(
+            SlurmScheduler._split_submit_output(stdout, stderr),  # pylint: disable=protected-access
+            [(0, 'Submitted batch job 123', 'sbatch: warning: no newline'), (0, 'Submitted batch job 456\n', '')])
+
+
 if __name__ == '__main__':
     unittest.main()
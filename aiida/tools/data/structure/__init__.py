@@ -54,7 +54,7 @@ def structure_to_spglib_tuple(structure):
     Z = {v['symbol']: k for k, v in elements.items()}
 
     cell = np.array(structure.cell)
-    abs_pos = np.array([_.position for _ in structure.sites])
+    abs_pos = structure.get_positions()
     rel_pos = np.dot(abs_pos, np.linalg.inv(cell))
     kinds = {k.name: k for k in structure.kinds}
 
@@ -72,7 +72,7 @@ def structure_to_spglib_tuple(structure):
             number = get_new_number(list(kind_numbers.values()), start_from=200000)
             kind_numbers[kind.name] = number
 
-    numbers = [kind_numbers[s.kind_name] for s in structure.sites]
+    numbers = [kind_numbers[kind_name] for kind_name in structure.get_site_kindnames()]
 
     return ((cell, rel_pos, numbers), kind_numbers, list(structure.kinds))
 
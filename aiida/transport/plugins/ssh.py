@@ -10,9 +10,14 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
-from stat import S_ISDIR, S_ISREG
+from stat import S_ISDIR, S_ISLNK, S_ISREG
+import fnmatch
 import io
 import os
+import shutil
+import tarfile
+import tempfile
+import threading
 import click
 import glob
 
@@ -58,6 +63,127 @@ def convert_to_bool(string):
         raise ValueError("Invalid boolean value provided")
 
 
+class SftpBatch(object):
+    """
+    A batch of SFTP requests that are pipelined on the SFTP channel: each request is sent without waiting
+    for the responses to the previous ones, such that a batch of many requests takes about one round trip
+    instead of one round trip per request.
+
+    The requests are sent as they are added, and `wait` collects the results in the same order::
+
+        batch = transport.sftp_batch()
+        for path in paths:
+            batch.stat(path)
+        attributes = batch.wait()
+
+    .. note:: The server may process the requests of a batch in any order, so a batch should not contain
+        requests that depend on each other, e.g. the creation of a folder and of its subfolders.
+    """
+
+    def __init__(self, sftp, max_in_flight=64):
+        """
+        :param sftp: the paramiko SFTPClient
+        :param max_in_flight: the maximum number of requests waiting for a response
+        """
+        self._sftp = sftp
+        self._max_in_flight = max_in_flight
+        self._requests = []  # List of (request number, function parsing the response) in the order they were sent
+        self._responses = {}  # Mapping: {request number: (response type, message)}
+
+    def _async_response(self, response_type, msg, num):
+        """
+        Store the response to one of the requests of the batch, called by the paramiko SFTPClient.
+        """
+        self._responses[num] = (response_type, msg)
+
+    def _request(self, parse, request_type, path, *args):
+        """
+        Send a request, first waiting for responses if there are too many requests in flight.
+
+        :param parse: the function that returns the result from the response type and message
+        :param request_type: the SFTP request type
+        :param path: the path the request acts on, relative to the current directory of the SFTP session
+        """
+        # pylint: disable=protected-access
+        while len(self._requests) - len(self._responses) >= self._max_in_flight:
+            self._sftp._read_response()
+
+        num = self._sftp._async_request(self, request_type, self._sftp._adjust_cwd(path), *args)
+        self._requests.append((num, parse))
+
+    @staticmethod
+    def _parse_attributes(response_type, msg):
+        from paramiko.sftp import CMD_ATTRS, SFTPError
+        from paramiko.sftp_attr import SFTPAttributes
+
+        if response_type != CMD_ATTRS:
+            raise SFTPError('Expected attributes')
+        return SFTPAttributes._from_msg(msg)  # pylint: disable=protected-access
+
+    @staticmethod
+    def _parse_status(response_type, msg):  # pylint: disable=unused-argument
+        return None
+
+    def stat(self, path):
+        """Request the attributes of the file at path, following symbolic links."""
+        from paramiko.sftp import CMD_STAT
+        self._request(self._parse_attributes, CMD_STAT, path)
+
+    def lstat(self, path):
+        """Request the attributes of the file at path, without following symbolic links."""
+        from paramiko.sftp import CMD_LSTAT
+        self._request(self._parse_attributes, CMD_LSTAT, path)
+
+    def mkdir(self, path, mode=0o777):
+        """Request the creation of the folder at path."""
+        from paramiko.sftp import CMD_MKDIR
+        from paramiko.sftp_attr import SFTPAttributes
+
+        attributes = SFTPAttributes()
+        attributes.st_mode = mode
+        self._request(self._parse_status, CMD_MKDIR, path, attributes)
+
+    def chmod(self, path, mode):
+        """Request the change of the permissions of the file at path."""
+        from paramiko.sftp import CMD_SETSTAT
+        from paramiko.sftp_attr import SFTPAttributes
+
+        attributes = SFTPAttributes()
+        attributes.st_mode = mode
+        self._request(self._parse_status, CMD_SETSTAT, path, attributes)
+
+    def remove(self, path):
+        """Request the removal of the file at path."""
+        from paramiko.sftp import CMD_REMOVE
+        self._request(self._parse_status, CMD_REMOVE, path)
+
+    def wait(self):
+        """
+        Wait for the responses to all the requests of the batch.
+
+        :return: a list with, for each request in the order they were made, either its result (the
+            SFTPAttributes for `stat` and `lstat`, None otherwise) or the exception raised by the server,
+            e.g. an IOError with errno ENOENT if the path does not exist
+        """
+        # pylint: disable=protected-access
+        from paramiko.sftp import CMD_STATUS, SFTPError
+
+        while len(self._responses) < len(self._requests):
+            self._sftp._read_response()
+
+        results = []
+        for num, parse in self._requests:
+            response_type, msg = self._responses.pop(num)
+            try:
+                if response_type == CMD_STATUS:
+                    self._sftp._convert_status(msg)
+                results.append(parse(response_type, msg))
+            except (IOError, EOFError, SFTPError) as exc:
+                results.append(exc)
+
+        self._requests = []
+        return results
+
 
 class SshTransport(aiida.transport.Transport):
     """
@@ -366,6 +492,31 @@ class SshTransport(aiida.transport.Transport):
         self._client.close()
         self._is_open = False
 
+    def is_alive(self):
+        """
+        Check that the SSH connection is still active, sending an ignored
+        packet to the server, which also keeps the connection alive.
+
+        :return: True if the transport is open and the connection active
+        :rtype: bool
+        """
+        import socket
+        import paramiko
+
+        if not self._is_open:
+            return False
+
+        transport = self._client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+
+        try:
+            transport.send_ignore()
+        except (EOFError, socket.error, paramiko.SSHException):
+            return False
+
+        return True
+
     @property
     def sshclient(self):
         if not self._is_open:
@@ -380,6 +531,15 @@ class SshTransport(aiida.transport.Transport):
                                                                    "without opening the channel first")
         return self._sftp
 
+    def sftp_batch(self, max_in_flight=64):
+        """
+        Return a new batch of SFTP requests that are pipelined on the SFTP channel of this transport.
+
+        :param max_in_flight: the maximum number of requests waiting for a response
+        :rtype: :class:`aiida.transport.plugins.ssh.SftpBatch`
+        """
+        return SftpBatch(self.sftp, max_in_flight)
+
     def __str__(self):
         """
         Return a useful string.
@@ -473,15 +633,25 @@ class SshTransport(aiida.transport.Transport):
             to_create = path.strip().split('/')
             this_dir = ''
 
+        paths = []
         for count, element in enumerate(to_create):
             if count > 0:
                 this_dir += '/'
             this_dir += element
-            if count + 1 == len(to_create) and self.isdir(this_dir) and ignore_existing:
+            paths.append(this_dir)
+
+        # Check all the levels at once
+        batch = self.sftp_batch()
+        for this_dir in paths:
+            batch.stat(this_dir)
+        isdirs = [self._is_dir_attributes(attributes) for attributes in batch.wait()]
+
+        for count, (this_dir, isdir) in enumerate(zip(paths, isdirs)):
+            if count + 1 == len(paths) and isdir and ignore_existing:
                 return
-            if count + 1 == len(to_create) and self.isdir(this_dir) and not ignore_existing:
+            if count + 1 == len(paths) and isdir and not ignore_existing:
                 self.mkdir(this_dir)
-            if not self.isdir(this_dir):
+            if not isdir:
                 self.mkdir(this_dir)
 
     def mkdir(self, path, ignore_existing=False):
@@ -566,6 +736,18 @@ class SshTransport(aiida.transport.Transport):
             else:
                 raise  # Typically if I don't have permissions (errno=13)
 
+    @staticmethod
+    def _is_dir_attributes(attributes):
+        """
+        Return whether the result of a `stat` request of a SftpBatch is a directory, with the same
+        conventions as isdir: False if the path does not exist, re-raise any other error.
+        """
+        if isinstance(attributes, Exception):
+            if getattr(attributes, "errno", None) == 2:
+                return False
+            raise attributes
+        return S_ISDIR(attributes.st_mode)
+
     def chmod(self, path, mode):
         """
         Change permissions to path
@@ -594,6 +776,34 @@ class SshTransport(aiida.transport.Transport):
         parts.reverse()
         return parts
 
+    def putarchive(self, fileobj, remotepath):
+        """
+        Extract a gzip-compressed tar archive into a remote folder, streaming it
+        through the stdin of a single 'tar' command.
+
+        :param fileobj: a file-like object open in binary mode, positioned at the start of the archive
+        :param str remotepath: path to the existing remote folder where to extract the archive
+
+        :raise IOError: if the extraction fails
+        """
+        command = 'tar -xzf - -C {}'.format(escape_for_bash(remotepath))
+        ssh_stdin, _, stderr, channel = self._exec_command_internal(command)
+
+        try:
+            shutil.copyfileobj(fileobj, ssh_stdin)
+            ssh_stdin.flush()
+        except (EnvironmentError, EOFError):
+            # The command may exit before reading the whole archive, e.g. if tar is missing: report its exit status
+            pass
+        ssh_stdin.channel.shutdown_write()
+
+        retval = channel.recv_exit_status()
+        stderr_text = stderr.read().decode('utf-8')
+
+        if retval != 0:
+            raise IOError("Error while extracting the archive into {}, exit code: {}, stderr: {}".format(
+                remotepath, retval, stderr_text))
+
     def put(self, localpath, remotepath, callback=None, dereference=True, overwrite=True, ignore_nonexisting=False):
         """
         Put a file or a folder from local to remote.
@@ -739,25 +949,51 @@ class SshTransport(aiida.transport.Transport):
             remotepath = os.path.join(remotepath, os.path.split(localpath)[1])
             self.mkdir(remotepath)  # create a nested folder
 
+        # Transfer the whole folder as a single archive, or file by file if the remote machine cannot extract it
+        with tempfile.TemporaryFile() as handle:
+            with tarfile.open(fileobj=handle, mode='w:gz', dereference=True) as archive:
+                for name in os.listdir(localpath):
+                    archive.add(os.path.join(localpath, name), arcname=name)
+            handle.seek(0)
+            try:
+                self.putarchive(handle, remotepath)
+                return
+            except IOError as exc:
+                self.logger.warning("Putting {} as an archive failed, putting it file by file: {}".format(
+                    localpath, exc))
+
         # TODO, NOTE: we are not using 'onerror' because we checked above that
         # the folder exists, but it would be better to use it
+        folders = {}  # Mapping: {depth: list of subfolders}
+        files = []
         for this_source in os.walk(localpath):
             # Get the relative path
             this_basename = os.path.relpath(path=this_source[0], start=localpath)
-
-            try:
-                self.sftp.stat(os.path.join(remotepath, this_basename))
-            except IOError as e:
-                import errno
-                if e.errno == errno.ENOENT:  # Missing file
-                    self.mkdir(os.path.join(remotepath, this_basename))
-                else:
-                    raise
+            if this_basename != '.':
+                folders.setdefault(this_basename.count(os.sep), []).append(this_basename)
 
             for this_file in this_source[2]:
-                this_local_file = os.path.join(localpath, this_basename, this_file)
-                this_remote_file = os.path.join(remotepath, this_basename, this_file)
-                self.putfile(this_local_file, this_remote_file)
+                files.append(os.path.join(this_basename, this_file))
+
+        # Check and create the subfolders of each depth at once, after their parents
+        for depth in sorted(folders):
+            batch = self.sftp_batch()
+            for this_basename in folders[depth]:
+                batch.stat(os.path.join(remotepath, this_basename))
+            missing = [
+                this_basename for this_basename, attributes in zip(folders[depth], batch.wait())
+                if not self._is_dir_attributes(attributes)
+            ]
+
+            for this_basename in missing:
+                batch.mkdir(os.path.join(remotepath, this_basename))
+            for this_basename, result in zip(missing, batch.wait()):
+                if isinstance(result, Exception):
+                    raise OSError("Error during mkdir of '{}': {}".format(os.path.join(remotepath, this_basename),
+                                                                          result))
+
+        for this_file in files:
+            self.sftp.put(os.path.join(localpath, this_file), os.path.join(remotepath, this_file))
 
     def get(self, remotepath, localpath, callback=None, dereference=True, overwrite=True, ignore_nonexisting=False):
         """
@@ -900,16 +1136,105 @@ class SshTransport(aiida.transport.Transport):
             localpath = os.path.join(localpath, os.path.split(remotepath)[1])
             os.mkdir(localpath)  # create a nested folder
 
-        item_list = self.listdir(remotepath)
+        # Transfer the whole folder as a single archive, or file by file if the remote machine cannot create it
+        try:
+            self._getarchive(remotepath, localpath)
+            return
+        except IOError as exc:
+            self.logger.warning("Getting {} as an archive failed, getting it file by file: {}".format(remotepath, exc))
+
         dest = str(localpath)
 
-        for item in item_list:
-            item = str(item)
+        for item in self.listdir_withattributes(remotepath):
+            name = str(item['name'])
+
+            if item['isdir']:
+                self.gettree(os.path.join(remotepath, name), os.path.join(dest, name))
+            else:
+                self.getfile(os.path.join(remotepath, name), os.path.join(dest, name))
+
+    def _getarchive(self, remotepath, localpath):
+        """
+        Get the content of a remote folder into an existing local folder, streaming it as a gzip-compressed
+        tar archive from the stdout of a single 'tar' command. Symbolic links are followed.
+
+        :param remotepath: a remote path
+        :param localpath: an (absolute) local path of an existing folder
+
+        :raise IOError: if the archive could not be created or if it contains paths outside of the folder
+        """
+        command = 'tar -czhf - -C {} .'.format(escape_for_bash(remotepath))
+        ssh_stdin, stdout, stderr, channel = self._exec_command_internal(command)
+        ssh_stdin.channel.shutdown_write()
+
+        # The stderr is drained while the archive is read from the stdout, otherwise a command that fills the window
+        # of the stderr blocks, and with it the stdout that is being read
+        stderr_chunks = []
+        stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(stderr.read()))
+        stderr_reader.daemon = True
+        stderr_reader.start()
+
+        with tempfile.TemporaryFile() as handle:
+            try:
+                shutil.copyfileobj(stdout, handle)
+            finally:
+                stderr_reader.join()
+
+            retval = channel.recv_exit_status()
+            stderr_text = b''.join(stderr_chunks).decode('utf-8', errors='replace')
 
-            if self.isdir(os.path.join(remotepath, item)):
-                self.gettree(os.path.join(remotepath, item), os.path.join(dest, item))
+            if retval != 0:
+                raise IOError("Error while creating the archive of {}, exit code: {}, stderr: {}".format(
+                    remotepath, retval, stderr_text))
+
+            handle.seek(0)
+            with tarfile.open(fileobj=handle, mode='r:gz') as archive:
+                members = []
+                for member in archive.getmembers():
+                    if os.path.isabs(member.name) or '..' in member.name.split('/'):
+                        raise IOError("The archive of {} contains the invalid path {}".format(remotepath, member.name))
+                    if member.isfile() or member.isdir():
+                        members.append(member)
+                archive.extractall(localpath, members=members)
+
+    def listdir_withattributes(self, path='.', pattern=None):
+        """
+        Return a list of the names of the entries in the given path, with their attributes.
+        The names and attributes are read with a single directory listing, rather than
+        with one request per entry.
+
+        :param str path: path to list (default to '.')
+        :param str pattern: if used, returns only the entries whose name matches the pattern, Unix style
+        :return: a list of dictionaries, one per entry, see `Transport.listdir_withattributes`
+        """
+        from aiida.transport.util import FileAttribute
+
+        entries = self.sftp.listdir_attr(path)
+        if pattern:
+            entries = [entry for entry in entries if fnmatch.fnmatch(entry.filename, pattern)]
+
+        # The attributes are those of the symbolic links themselves, as for get_attribute, but isdir follows them
+        links = [entry.filename for entry in entries if S_ISLNK(entry.st_mode)]
+        batch = self.sftp_batch()
+        for name in links:
+            batch.stat(os.path.join(path, name))
+        link_targets = dict(zip(links, batch.wait()))
+
+        retlist = []
+        for entry in entries:
+            attributes = FileAttribute()
+            for key in attributes._valid_fields:  # pylint: disable=protected-access
+                attributes[key] = getattr(entry, key)
+
+            if entry.filename in link_targets:
+                target = link_targets[entry.filename]
+                isdir = not isinstance(target, Exception) and S_ISDIR(target.st_mode)
             else:
-                self.getfile(os.path.join(remotepath, item), os.path.join(dest, item))
+                isdir = S_ISDIR(entry.st_mode)
+
+            retlist.append({'name': entry.filename, 'attributes': attributes, 'isdir': isdir})
+
+        return retlist
 
     def get_attribute(self, path):
         """
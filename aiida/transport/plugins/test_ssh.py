@@ -61,5 +61,74 @@ class TestBasicConnection(unittest.TestCase):
         logging.disable(logging.NOTSET)
 
 
+class TestPutArchive(unittest.TestCase):
+    """
+    Test the extraction of archives streamed to the remote machine.
+    """
+
+    def test_putarchive(self):
+        import io
+        import os
+        import shutil
+        import tarfile
+        import tempfile
+
+        content = b'some content'
+        handle = io.BytesIO()
+        with tarfile.open(fileobj=handle, mode='w:gz') as archive:
+            info = tarfile.TarInfo('subfolder/file.txt')
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+        handle.seek(0)
+
+        remote_folder = tempfile.mkdtemp()
+        try:
+            with SshTransport(machine='localhost', timeout=30, load_system_host_keys=True,
+                              key_policy='AutoAddPolicy') as transport:
+                transport.putarchive(handle, remote_folder)
+
+                with self.assertRaises(IOError):
+                    transport.putarchive(io.BytesIO(b'not an archive'), remote_folder)
+
+            with open(os.path.join(remote_folder, 'subfolder', 'file.txt'), 'rb') as fhandle:
+                self.assertEqual(fhandle.read(), content)
+        finally:
+            shutil.rmtree(remote_folder)
+
+
+class TestSftpBatch(unittest.TestCase):
+    """
+    Test the pipelined SFTP requests.
+    """
+
+    def test_batch(self):
+        import errno
+        import os
+        import shutil
+        import tempfile
+        from stat import S_ISDIR
+
+        remote_folder = tempfile.mkdtemp()
+        try:
+            with SshTransport(machine='localhost', timeout=30, load_system_host_keys=True,
+                              key_policy='AutoAddPolicy') as transport:
+                batch = transport.sftp_batch(max_in_flight=2)
+                for index in range(5):
+                    batch.mkdir(os.path.join(remote_folder, str(index)))
+                self.assertEqual(batch.wait(), [None] * 5)
+
+                batch.stat(os.path.join(remote_folder, '0'))
+                batch.stat(os.path.join(remote_folder, 'missing'))
+                batch.mkdir(os.path.join(remote_folder, '0'))
+                attributes, missing, existing = batch.wait()
+
+                self.assertTrue(S_ISDIR(attributes.st_mode))
+                self.assertIsInstance(missing, IOError)
+                self.assertEqual(missing.errno, errno.ENOENT)
+                self.assertIsInstance(existing, IOError)
+        finally:
+            shutil.rmtree(remote_folder)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -98,6 +98,20 @@ class Transport(object):
     def is_open(self):
         return self._is_open
 
+    def is_alive(self):
+        """
+        Check that an open transport can still be used, e.g. that its
+        connection was not dropped. For transports that use a connection,
+        this may also serve to keep it alive.
+
+        In the main class, it returns whether the transport is open.
+        Plugins should override it.
+
+        :return: True if the transport is open and usable
+        :rtype: bool
+        """
+        return self.is_open
+
     def open(self):
         """
         Opens a local transport channel
@@ -577,6 +591,20 @@ class Transport(object):
         """
         raise NotImplementedError
 
+    def putarchive(self, fileobj, remotepath):
+        """
+        Extract a gzip-compressed tar archive into a remote folder, streaming it
+        to a single command executed on the remote machine instead of putting
+        the files one by one.
+
+        :param fileobj: a file-like object open in binary mode, positioned at the start of the archive
+        :param str remotepath: path to the existing remote folder where to extract the archive
+
+        :raise NotImplementedError: if the transport cannot stream data to a remote command
+        :raise IOError: if the extraction fails
+        """
+        raise NotImplementedError
+
     def remove(self, path):
         """
         Remove the file at the given path. This only works on files;
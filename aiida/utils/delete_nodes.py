@@ -12,18 +12,49 @@
 from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
+import io
+import itertools
+import json
+import os
+
+import six
 from six.moves import zip, input
+from concurrent.futures import ThreadPoolExecutor
 
+from aiida.common.exceptions import InvalidOperation
 from aiida.orm import User
 
+# Number of nodes deleted from the database in each transaction
+DELETE_CHUNK_SIZE = 1000
+
+# Number of threads removing the repository folders of the deleted nodes
+DELETE_WORKERS = 4
+
+# Name of the journal of the deletions in progress, in the repository folder
+DELETE_JOURNAL_FILENAME = 'delete_nodes.journal'
+
+
+def get_default_journal():
+    """
+    Return the path of the journal that records the deletion in progress, to resume it if it is interrupted.
+    """
+    from aiida.common.utils import get_repository_folder
+    return os.path.join(get_repository_folder(), DELETE_JOURNAL_FILENAME)
+
 
 def delete_nodes(pks, follow_calls=False, follow_returns=False,
-                 dry_run=False, force=False, disable_checks=False, verbosity=0):
+                 dry_run=False, force=False, disable_checks=False, verbosity=0,
+                 chunk_size=DELETE_CHUNK_SIZE, workers=DELETE_WORKERS, journal=None):
     """
     Delete nodes by a list of pks
 
     :note: The script will also delete all children calculations generated from the specified nodes.
 
+    The nodes to delete are found with a single recursive query, whose result is streamed into a journal. They are
+    then deleted from the database in chunks, each in its own transaction, and the repository folders of each chunk
+    are removed by a pool of threads. The journal records the progress of the deletion, such that if it is
+    interrupted it can be completed with :py:func:`resume_delete_nodes`.
+
     :param pks: a list of the PKs of the nodes to delete
     :param bool follow_calls: Follow calls
     :param bool follow_returns:
@@ -36,17 +67,15 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
         If checks are disabled, also logging is disabled.
     :param bool force: Do not ask for confirmation to delete nodes.
     :param int verbosity:
-        The verbosity levels, 0 prints nothing, 1 prints just sums and total, 2 prints individual nodes.
+        The verbosity levels, 0 prints nothing, 1 prints just sums, total and progress, 2 prints individual nodes.
+    :param int chunk_size: the number of nodes deleted from the database in each transaction
+    :param int workers: the number of threads removing the repository folders
+    :param str journal: the path of the journal of the deletion, by default in the repository folder
     """
 
-    from aiida.orm.querybuilder import QueryBuilder
     from aiida.common.links import LinkType
-    from aiida.orm.node import Node
-    from aiida.orm.calculation import Calculation
-    from aiida.orm.data import Data
     from aiida.orm import load_node
     from aiida.orm.backends import construct_backend
-    from aiida.backends.utils import delete_nodes_and_connections
 
     user_email = User.objects.get_default().email
 
@@ -57,60 +86,63 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
             print("Nothing to delete")
         return
 
+    if journal is None:
+        journal = get_default_journal()
+
+    if not dry_run and os.path.exists(journal):
+        raise InvalidOperation("a previous deletion of nodes was interrupted, complete it first with "
+                               "resume_delete_nodes or 'verdi node delete --resume' (journal: {})".format(journal))
+
     # The following code is just for the querying of downwards provenance.
     # Ideally, there should be a module to interface with, but this is the solution for now.
-    # By only dealing with ids, and keeping track of what has been already
-    # visited in the query, there's good performance and no infinite loops.
-    link_types_to_follow = [LinkType.CREATE.value, LinkType.INPUT.value]
+    # The closure is computed by the database with a recursive query, that only deals with ids
+    # and has no infinite loops since it does not visit the same node twice.
+    link_types_to_follow = [LinkType.CREATE, LinkType.INPUT]
     if follow_calls:
-        link_types_to_follow.append(LinkType.CALL.value)
+        link_types_to_follow.append(LinkType.CALL)
     if follow_returns:
-        link_types_to_follow.append(LinkType.RETURN.value)
+        link_types_to_follow.append(LinkType.RETURN)
+
+    query_manager = construct_backend().query_manager
+    closure = query_manager.iter_deletion_closure(pks, link_types_to_follow, chunk_size)
 
-    edge_filters = {'type': {'in': link_types_to_follow}}
+    if verbosity > 1:
+        print("The nodes I {} delete:".format('would' if dry_run else 'will'))
 
-    # Operational set always includes the recently (in the last iteration added) nodes.
-    operational_set = set().union(set(pks))  # Union to copy the set!
-    pks_set_to_delete = set().union(set(pks))
-    while operational_set:
-        # new_pks_set are the the pks of all nodes that are connected to the operational node set
-        # with the links specified.
-        new_pks_set = set([i for i, in QueryBuilder().append(
-            Node, filters={'id': {'in': operational_set}}).append(
-            Node, project='id', edge_filters=edge_filters).iterall()])
-        # The operational set is only those pks that haven't been yet put into the pks_set_to_delete.
-        operational_set = new_pks_set.difference(pks_set_to_delete)
+    # The closure is streamed from the database into the journal, in chunks, such that it is never held in memory.
+    # The journal is only complete, and the nodes only deleted, once the deletion is confirmed.
+    if dry_run:
+        number_to_delete = _consume_closure(closure, None, chunk_size, verbosity)
+    else:
+        with io.open(journal, 'w', encoding='utf8') as handle:
+            number_to_delete = _consume_closure(closure, handle, chunk_size, verbosity)
 
-        # I add these pks in the pks_set_to_delete with a union
-        pks_set_to_delete = pks_set_to_delete.union(new_pks_set)
+    if not number_to_delete:
+        if verbosity:
+            print("Nothing to delete")
+        if not dry_run:
+            os.remove(journal)
+        return
 
     if verbosity > 0:
         print("I {} delete {} node{}"
               .format('would' if dry_run else 'will',
-                      len(pks_set_to_delete),
-                      's' if len(pks_set_to_delete) > 1 else ''))
-        if verbosity > 1:
-            qb = QueryBuilder().append(Node, filters={'id': {'in': pks_set_to_delete}},
-                                       project=('uuid', 'id', 'type', 'label'))
-            print("The nodes I {} delete:".format('would' if dry_run else 'will'))
-            for uuid, pk, type_string, label in qb.iterall():
-                try:
-                    short_type_string = type_string.split('.')[-2]
-                except IndexError:
-                    short_type_string = type_string
-                print("   {} {} {} {}".format(uuid, pk, short_type_string, label))
+                      number_to_delete,
+                      's' if number_to_delete > 1 else ''))
 
     # Here I am checking whether I am deleting
     ## A data instance without also deleting the creator, which brakes relationship between a calculation and its data
     ## A calculation instance that was called, without also deleting the caller.
+    # The links are found by the database, joining the links with the closure, instead of passing the closure back.
 
     if not disable_checks:
-        called_qb = QueryBuilder()
-        called_qb.append(Calculation, filters={'id': {'!in': pks_set_to_delete}}, project='id')
-        called_qb.append(Calculation, project='type', edge_project='label',
-                         filters={'id': {'in': pks_set_to_delete}},
-                         edge_filters={'type': {'==': LinkType.CALL.value}})
-        caller_to_called2delete = called_qb.all()
+        losses = query_manager.get_deletion_closure_losses(pks, link_types_to_follow)
+        caller_to_called2delete = [(calc_pk, node_type, link_label)
+                                   for calc_pk, node_type, link_label, link_type in losses
+                                   if link_type == LinkType.CALL.value]
+        creator_to_created2delete = [(calc_pk, node_type, link_label)
+                                     for calc_pk, node_type, link_label, link_type in losses
+                                     if link_type == LinkType.CREATE.value]
 
         if verbosity > 0 and caller_to_called2delete:
             calculation_pks_losing_called = set(next(zip(*caller_to_called2delete)))
@@ -124,13 +156,6 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
                 for calc_losing_called_pk in calculation_pks_losing_called:
                     print('  ', load_node(calc_losing_called_pk))
 
-        created_qb = QueryBuilder()
-        created_qb.append(Calculation, filters={'id': {'!in': pks_set_to_delete}}, project='id')
-        created_qb.append(Data, project='type', edge_project='label',
-                          filters={'id': {'in': pks_set_to_delete}},
-                          edge_filters={'type': {'==': LinkType.CREATE.value}})
-
-        creator_to_created2delete = created_qb.all()
         if verbosity > 0 and creator_to_created2delete:
             calculation_pks_losing_created = set(next(zip(*creator_to_created2delete)))
             print("\n{} calculation{} {} lose at least one created data-instance"
@@ -152,18 +177,19 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
     if force:
         pass
     else:
-        print("YOU ARE ABOUT TO DELETE {} NODES! THIS CANNOT BE UNDONE!".format(len(pks_set_to_delete)))
+        print("YOU ARE ABOUT TO DELETE {} NODES! THIS CANNOT BE UNDONE!".format(number_to_delete))
         if input("Shall I continue? [Y/N] ").lower() != 'y':
             print("Exiting without deleting")
+            os.remove(journal)
             return
 
-    # Recover the list of folders to delete before actually deleting
-    # the nodes.  I will delete the folders only later, so that if
-    # there is a problem during the deletion of the nodes in
-    # the DB, I don't delete the folders
-    folders = [load_node(_).folder for _ in pks_set_to_delete]
+    # Confirm the deletion in the journal, then delete the nodes from the DB and their folders, chunk by chunk.
+    # The uuids of the nodes of each chunk are added to the journal before deleting them, such that their folders
+    # can be removed later even if the deletion is interrupted.
+    with io.open(journal, 'a', encoding='utf8') as handle:
+        _write_journal_entry(handle, {'total': number_to_delete})
 
-    delete_nodes_and_connections(pks_set_to_delete)
+    _delete_journal_nodes(journal, number_to_delete, chunk_size, workers, verbosity)
 
     if not disable_checks:
         # I pass now to the log the information for calculations losing created data or called instances
@@ -183,7 +209,159 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
                                 "by this calculation".format(
                 user_email, data_type_string, link_label))
 
-    # If we are here, we managed to delete the entries from the DB.
-    # I can now delete the folders
-    for f in folders:
-        f.erase()
+    os.remove(journal)
+
+
+def resume_delete_nodes(journal=None, chunk_size=DELETE_CHUNK_SIZE, workers=DELETE_WORKERS, verbosity=0):
+    """
+    Complete a deletion of nodes by :py:func:`delete_nodes` that was interrupted, e.g. by a crash.
+
+    The nodes recorded in the journal that are still in the database are deleted, then the
+    repository folders of all the deleted nodes are removed.
+
+    :param str journal: the path of the journal of the deletion, by default in the repository folder
+    :param int chunk_size: the number of nodes deleted from the database in each transaction
+    :param int workers: the number of threads removing the repository folders
+    :param int verbosity: 0 prints nothing, 1 prints the progress
+    :return: True if a deletion was completed, False if there was no interrupted deletion
+    """
+    if journal is None:
+        journal = get_default_journal()
+
+    if not os.path.exists(journal):
+        if verbosity > 0:
+            print("There is no interrupted deletion to resume")
+        return False
+
+    with io.open(journal, 'r', encoding='utf8') as handle:
+        number_to_delete = next((entry['total'] for entry in _iter_journal_entries(handle) if 'total' in entry), None)
+
+    if number_to_delete is None:
+        # The deletion was interrupted before it was confirmed, so nothing was deleted
+        os.remove(journal)
+        return False
+
+    if verbosity > 0:
+        print("Resuming the deletion of {} nodes".format(number_to_delete))
+
+    _delete_journal_nodes(journal, number_to_delete, chunk_size, workers, verbosity)
+
+    # The folders of the chunks that were recorded before the interruption may not have been removed yet
+    with io.open(journal, 'r', encoding='utf8') as handle:
+        with ThreadPoolExecutor(max(workers, 1)) as executor:
+            for entry in _iter_journal_entries(handle):
+                _erase_folders(entry.get('uuids', []), executor)
+
+    os.remove(journal)
+
+    return True
+
+
+def _write_journal_entry(handle, entry):
+    """
+    Append an entry to the journal and flush it to disk.
+    """
+    handle.write(u'{}\n'.format(json.dumps(entry)))
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+def _iter_journal_entries(handle):
+    """
+    Iterate over the entries of the journal.
+
+    The last line may be incomplete if the deletion was interrupted while writing it, in which case the deletion
+    of its chunk did not start, so it is skipped.
+    """
+    for line in handle:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def _consume_closure(closure, handle, chunk_size, verbosity):
+    """
+    Record the pks of the nodes of the closure in the journal, in chunks, printing them according to the verbosity.
+
+    :param closure: an iterator over tuples (pk, uuid, type, label) of the nodes to delete
+    :param handle: the handle of the journal, or None for a dry run
+    :return: the number of nodes to delete
+    """
+    number_of_nodes = 0
+    chunk = []
+
+    for pk, uuid, type_string, label in closure:
+        number_of_nodes += 1
+        chunk.append(pk)
+
+        if verbosity > 1:
+            try:
+                short_type_string = type_string.split('.')[-2]
+            except IndexError:
+                short_type_string = type_string
+            print("   {} {} {} {}".format(uuid, pk, short_type_string, label))
+
+        if len(chunk) >= chunk_size:
+            if handle is not None:
+                _write_journal_entry(handle, {'pks': chunk})
+            chunk = []
+
+    if chunk and handle is not None:
+        _write_journal_entry(handle, {'pks': chunk})
+
+    return number_of_nodes
+
+
+def _delete_journal_nodes(journal, number_to_delete, chunk_size, workers, verbosity):
+    """
+    Delete the nodes recorded in the journal from the database in chunks, each in its own transaction, then their
+    repository folders, recording the uuids of the nodes of each chunk in the journal before deleting them.
+
+    The pks are read from the journal as the deletion goes, and nodes that are not in the database anymore are
+    skipped, so this can be called again for the same journal after an interruption.
+    """
+    from aiida.backends.utils import delete_nodes_and_connections
+    from aiida.orm.node import Node
+    from aiida.orm.querybuilder import QueryBuilder
+
+    number_deleted = 0
+
+    with io.open(journal, 'r', encoding='utf8') as reader, io.open(journal, 'a', encoding='utf8') as handle, \
+            ThreadPoolExecutor(max(workers, 1)) as executor:
+        # The entries appended while deleting follow the confirmation of the deletion, so they are never read here
+        recorded = itertools.takewhile(lambda entry: 'total' not in entry, _iter_journal_entries(reader))
+        pks_to_delete = itertools.chain.from_iterable(entry.get('pks', []) for entry in recorded)
+
+        while True:
+            chunk = list(itertools.islice(pks_to_delete, chunk_size))
+            if not chunk:
+                break
+
+            entries = QueryBuilder().append(Node, filters={'id': {'in': chunk}}, project=['id', 'uuid']).all()
+
+            if entries:
+                # The SQLAlchemy backend projects the uuids as `uuid.UUID` instances
+                chunk_uuids = [six.text_type(uuid) for _, uuid in entries]
+                _write_journal_entry(handle, {'uuids': chunk_uuids})
+                delete_nodes_and_connections([pk for pk, _ in entries])
+                # Once the nodes are deleted from the DB, their folders can be removed
+                _erase_folders(chunk_uuids, executor)
+
+            number_deleted += len(chunk)
+            if verbosity > 0:
+                print("Deleted {} of {} nodes".format(number_deleted, number_to_delete))
+
+
+def _erase_folders(uuids, executor):
+    """
+    Remove the repository folders of the nodes with the given uuids, with the threads of the executor.
+    """
+    from aiida.common.folders import RepositoryFolder
+    from aiida.orm.node import Node
+
+    def erase(uuid):
+        RepositoryFolder(section=Node._section_name, uuid=uuid).erase()  # pylint: disable=protected-access
+
+    for _ in executor.map(erase, uuids):
+        pass
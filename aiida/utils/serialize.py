@@ -19,7 +19,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 
 from functools import partial
+import io
+
 import yaml
+from six.moves import cPickle as pickle
 
 import plumpy
 from plumpy.utils import AttributesFrozendict
@@ -33,6 +36,9 @@ _ATTRIBUTE_DICT_TAG = '!aiida_attributedict'
 _PLUMPY_ATTRIBUTES_FROZENDICT_TAG = '!plumpy:attributes_frozendict'
 _PLUMPY_BUNDLE = '!plumpy:bundle'
 
+# The highest protocol that python 2 can read
+_PICKLE_PROTOCOL = 2
+
 
 def represent_node(dumper, node):
     """
@@ -244,3 +250,70 @@ def deserialize(serialized):
     :return: the deserialized data structure
     """
     return yaml.load(serialized, Loader=AiiDALoader)
+
+
+def _get_persistent_id(obj):
+    """
+    Return the reference by which nodes, groups and computers are pickled, None for other objects
+
+    :param obj: the object to pickle
+    :return: a tuple with the tag of the type and the UUID of the object, or None
+    """
+    if isinstance(obj, orm.Node):
+        tag = _NODE_TAG
+    elif isinstance(obj, orm.Group):
+        tag = _GROUP_TAG
+    elif isinstance(obj, orm.Computer):
+        tag = _COMPUTER_TAG
+    else:
+        return None
+
+    if not obj.is_stored:
+        raise ValueError("The {} must be stored to be able to represent".format(obj.__class__.__name__))
+    return tag, u'%s' % obj.uuid
+
+
+def _load_persistent_id(persistent_id):
+    """
+    Load the node, group or computer that is referenced in a pickle
+
+    :param persistent_id: the reference returned by `_get_persistent_id`
+    :return: the object
+    """
+    tag, uuid = persistent_id
+    if tag == _NODE_TAG:
+        return orm.load_node(uuid=uuid)
+    if tag == _GROUP_TAG:
+        return orm.load_group(uuid=uuid)
+    if tag == _COMPUTER_TAG:
+        return orm.Computer.get(uuid=uuid)
+    raise pickle.UnpicklingError('unknown persistent id {}'.format(persistent_id))
+
+
+def serialize_binary(data):
+    """
+    Serialize the given data structure into bytes
+
+    Much faster to dump and load than `serialize`, but not human readable. Nodes, groups and computers are stored as a
+    reference to their UUID, like in `serialize`. Other objects have to be picklable.
+
+    :param data: the general data to serialize
+    :return: the serialized data structure as bytes
+    """
+    stream = io.BytesIO()
+    pickler = pickle.Pickler(stream, _PICKLE_PROTOCOL)
+    pickler.persistent_id = _get_persistent_id
+    pickler.dump(data)
+    return stream.getvalue()
+
+
+def deserialize_binary(serialized):
+    """
+    Deserialize bytes returned by `serialize_binary`
+
+    :param serialized: the serialized data structure as bytes
+    :return: the deserialized data structure
+    """
+    unpickler = pickle.Unpickler(io.BytesIO(serialized))
+    unpickler.persistent_load = _load_persistent_id
+    return unpickler.load()
@@ -17,7 +17,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 import contextlib
 from functools import partial
+import logging
+import random
 import time
+import uuid
 from six import iteritems, itervalues
 from tornado import concurrent, gen
 
@@ -27,28 +30,48 @@ from .utils import RefObjectStore
 
 __all__ = tuple()
 
+LOGGER = logging.getLogger(__name__)
+
+# Subject of the broadcasts with the jobs polled from the scheduler, formatted with the authinfo id
+JOBS_UPDATE_SUBJECT = 'jobs_update.{}'
+
 
 class JobsList(object):
     """
     A list of submitted jobs on a machine connected to by transport based on the
     authorisation information.
+
+    If a communicator is given, the jobs list of all the runners connected to it
+    is shared: the runner that polls the scheduler broadcasts the result, and the
+    other runners use it instead of polling the scheduler themselves.  The runners
+    receiving the broadcasts postpone their own polls to a random time between one
+    and two minimum intervals later, such that they take over only if the polling
+    runner stops broadcasting.
     """
 
-    def __init__(self, authinfo, transport_queue):
+    def __init__(self, authinfo, transport_queue, communicator=None):
         """
         :param authinfo: The authinfo used to check the jobs list
         :type authinfo: :class:`aiida.orm.AuthInfo`
         :param transport_queue: A transport queue
         :type: :class:`aiida.work.transports.TransportQueue`
+        :param communicator: An optional communicator to share the jobs list with other runners
+        :type communicator: :class:`kiwipy.Communicator`
         """
         self._authinfo = authinfo
         self._transport_queue = transport_queue
         self._loop = transport_queue.loop()
+        self._communicator = communicator
+        # Identifies the broadcasts sent by this jobs list, that it should ignore
+        self._identifier = uuid.uuid4().hex
 
         self._jobs_cache = {}
         self._last_updated = None  # type: float
+        self._follower_delay = 0.
         self._job_update_requests = {}  # Mapping: {job_id: Future}
+        self._job_update_request_times = {}  # Mapping: {job_id: time of the request as produced by `time.time()`}
         self._update_handle = None
+        self._broadcast_filter = None
 
     def get_minimum_update_interval(self):
         """
@@ -87,23 +110,93 @@ class JobsList(object):
             else:
                 kwargs['jobs'] = self._get_jobs_with_scheduler()
 
+            poll_time = time.time()
             scheduler_response = scheduler.getJobs(**kwargs)
-            jobs_cache = {}
 
+            # Get the detailed job information of the jobs that are done, at once if the scheduler supports it
+            done_job_ids = [
+                job_id for job_id, job_info in iteritems(scheduler_response)
+                if job_info.job_state == schedulers.JOB_STATES.DONE
+            ]
+            try:
+                detailed_job_infos = scheduler.get_detailed_jobsinfo(done_job_ids)
+            except exceptions.FeatureNotAvailable:
+                detailed_job_infos = {
+                    job_id: 'This scheduler does not implement get_detailed_jobinfo' for job_id in done_job_ids
+                }
+
+            jobs_cache = {}
             for job_id, job_info in iteritems(scheduler_response):
-                # If the job is done then get detailed job information
-                detailed_job_info = None
-                if job_info.job_state == schedulers.JOB_STATES.DONE:
-                    try:
-                        detailed_job_info = scheduler.get_detailed_jobinfo(job_id)
-                    except exceptions.FeatureNotAvailable:
-                        detailed_job_info = 'This scheduler does not implement get_detailed_jobinfo'
-
-                job_info.detailedJobinfo = detailed_job_info
+                job_info.detailedJobinfo = detailed_job_infos.get(job_id, None)
                 jobs_cache[job_id] = job_info
 
+            self._broadcast_jobs(jobs_cache, kwargs.get('jobs', None), poll_time)
+
             raise gen.Return(jobs_cache)
 
+    def _broadcast_jobs(self, jobs_cache, job_ids, poll_time):
+        """
+        Broadcast the jobs polled from the scheduler to the other runners, if there is a communicator.
+
+        :param jobs_cache: the dictionary of {job_id: job info} polled from the scheduler
+        :param job_ids: the list of job ids that were queried, or None if all the jobs of the user were
+        :param poll_time: the time at which the scheduler was polled as produced by `time.time()`
+        """
+        if self._communicator is None:
+            return
+
+        body = {
+            'job_ids': job_ids,
+            'time': poll_time,
+            'jobs': {job_id: job_info.serialize() for job_id, job_info in iteritems(jobs_cache)},
+        }
+
+        try:
+            self._communicator.broadcast_send(
+                body, sender=self._identifier, subject=JOBS_UPDATE_SUBJECT.format(self._authinfo.id))
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('failed to broadcast the jobs list of %s', self._authinfo)
+
+    def _receive_jobs(self, body, sender, subject, correlation_id):  # pylint: disable=unused-argument
+        """
+        Receive the jobs broadcast by another runner, called on the thread of the communicator.
+        """
+        if sender != self._identifier:
+            self._loop.add_callback(self._update_from_broadcast, body)
+
+    def _update_from_broadcast(self, body):
+        """
+        Resolve the pending update requests of the jobs that were polled by another runner,
+        and postpone the next poll.
+
+        Only the requests made before the scheduler was polled are resolved: a job missing
+        from an older poll may simply have been submitted after it, and must not be taken
+        as done.
+
+        :param body: the body of the broadcast, see `_broadcast_jobs`
+        """
+        jobs_cache = {}
+        for job_id, serialized in iteritems(body['jobs']):
+            job_info = schedulers.JobInfo()
+            job_info.load_from_serialized(serialized)
+            jobs_cache[job_id] = job_info
+
+        polled_job_ids = body['job_ids']
+        poll_time = body['time']
+        for job_id, future in list(iteritems(self._job_update_requests)):
+            if polled_job_ids is not None and job_id not in polled_job_ids:
+                continue
+            if self._job_update_request_times[job_id] >= poll_time:
+                continue
+            if not future.done():
+                future.set_result(jobs_cache.get(job_id, None))
+            self._job_update_requests.pop(job_id)
+            self._job_update_request_times.pop(job_id)
+
+        self._jobs_cache.update(jobs_cache)
+        self._last_updated = time.time()
+        self._follower_delay = self._authinfo.computer.get_minimum_job_poll_interval() * (1. + random.random())
+
     @gen.coroutine
     def _update_job_info(self):
         """
@@ -119,6 +212,8 @@ class JobsList(object):
 
             # Update our cache of the job states
             self._jobs_cache = yield self._get_jobs_from_scheduler()
+            self._last_updated = time.time()
+            self._follower_delay = 0.
         except Exception as exception:
             # Set the exception on all the update futures
             for future in itervalues(self._job_update_requests):
@@ -131,6 +226,7 @@ class JobsList(object):
                     future.set_result(self._jobs_cache.get(job_id, None))
         finally:
             self._job_update_requests = {}
+            self._job_update_request_times = {}
 
     @contextlib.contextmanager
     def request_job_info_update(self, job_id):
@@ -143,6 +239,7 @@ class JobsList(object):
         """
         # Get or create the future
         request = self._job_update_requests.setdefault(job_id, concurrent.Future())
+        self._job_update_request_times.setdefault(job_id, time.time())
         assert not request.done(), "The future should be no be in the done state"
 
         try:
@@ -160,17 +257,38 @@ class JobsList(object):
         @gen.coroutine
         def updating():
             """ Do the actual update, stop if not requests left """
-            yield self._update_job_info()
+            # The jobs may have been received from another runner in the meantime, postponing the update
+            if self._update_requests_outstanding() and self._get_next_update_delay() == 0.:
+                yield self._update_job_info()
             # Any outstanding requests?
             if self._update_requests_outstanding():
                 self._update_handle = self._loop.call_later(self._get_next_update_delay(), updating)
             else:
                 self._update_handle = None
+                self._unsubscribe()
 
         # Check if we're already updating
         if self._update_handle is None:
+            self._subscribe()
             self._update_handle = self._loop.call_later(self._get_next_update_delay(), updating)
 
+    def _subscribe(self):
+        """ Start listening to the jobs broadcast by other runners """
+        if self._communicator is None or self._broadcast_filter is not None:
+            return
+
+        import kiwipy
+
+        self._broadcast_filter = kiwipy.BroadcastFilter(
+            self._receive_jobs, subject=JOBS_UPDATE_SUBJECT.format(self._authinfo.id))
+        self._communicator.add_broadcast_subscriber(self._broadcast_filter)
+
+    def _unsubscribe(self):
+        """ Stop listening to the jobs broadcast by other runners """
+        if self._broadcast_filter is not None:
+            self._communicator.remove_broadcast_subscriber(self._broadcast_filter)
+            self._broadcast_filter = None
+
     @staticmethod
     def _has_job_state_changed(old, new):
         """
@@ -205,7 +323,7 @@ class JobsList(object):
         minimum_interval = self._authinfo.computer.get_minimum_job_poll_interval()
         elapsed = time.time() - self._last_updated
 
-        return max(minimum_interval - elapsed, 0.)
+        return max(minimum_interval + self._follower_delay - elapsed, 0.)
 
     def _update_requests_outstanding(self):
         return any(not request.done() for request in itervalues(self._job_update_requests))
@@ -217,7 +335,140 @@ class JobsList(object):
         :return: the list of jobs with the scheduler
         :rtype: list
         """
-        return [str(job_id) for job_id, _ in self._job_update_requests.items()]
+        job_ids = set(str(job_id) for job_id, _ in self._job_update_requests.items())
+
+        if self._communicator is not None:
+            # The jobs list is shared with the other runners, so also poll the jobs they are waiting for
+            job_ids.update(self._get_jobs_with_scheduler_from_database())
+
+        return sorted(job_ids)
+
+    def _get_jobs_with_scheduler_from_database(self):
+        """
+        Get the ids of the jobs of all the calculations of this authinfo that are with the scheduler
+
+        :return: the list of job ids
+        :rtype: list
+        """
+        from aiida.common.datastructures import calc_states
+        from aiida.orm.calculation.job import JobCalculation
+        from aiida.orm.querybuilder import QueryBuilder
+
+        builder = QueryBuilder()
+        builder.append(
+            JobCalculation,
+            filters={
+                'dbcomputer_id': self._authinfo.computer.pk,
+                'user_id': self._authinfo.user.pk,
+                'attributes.state': calc_states.WITHSCHEDULER,
+            },
+            project=['attributes.job_id'])
+
+        return [str(job_id) for job_id, in builder.iterall() if job_id is not None]
+
+
+class SubmissionsList(object):
+    """
+    A list of the pending submissions of jobs on a machine connected to by transport
+    based on the authorisation information.
+
+    The submissions requested within a time window are submitted together, with a
+    single command executed over the transport instead of one command per job.
+    """
+
+    def __init__(self, authinfo, transport_queue, window=0.):
+        """
+        :param authinfo: The authinfo used to submit the jobs
+        :type authinfo: :class:`aiida.orm.AuthInfo`
+        :param transport_queue: A transport queue
+        :type: :class:`aiida.work.transports.TransportQueue`
+        :param window: The time in seconds to wait for further requests after the first one of a batch
+        """
+        self._authinfo = authinfo
+        self._transport_queue = transport_queue
+        self._loop = transport_queue.loop()
+        self._window = window
+
+        self._submission_requests = []  # List of (calculation, script_filename, Future)
+        self._withdrawn = set()  # The futures of the requests that were withdrawn before being submitted
+        self._submit_handle = None
+
+    @gen.coroutine
+    def _submit_jobs(self):
+        """
+        Submit the jobs of all the pending requests, and set their futures with the job ids.
+
+        The requests that were withdrawn, see `request_submission`, by the time the transport
+        is open are left out of the batch.
+        """
+        from aiida.daemon import execmanager
+
+        requests = self._submission_requests
+        self._submission_requests = []
+        # Requests made from now on are submitted in the next batch
+        self._submit_handle = None
+
+        try:
+            requests = self._get_requests_not_withdrawn(requests)
+            if not requests:
+                return
+
+            with self._transport_queue.request_transport(self._authinfo) as request:
+                transport = yield request
+                requests = self._get_requests_not_withdrawn(requests)
+                if not requests:
+                    return
+                results = execmanager.submit_calculations([(calculation, script_filename)
+                                                           for calculation, script_filename, _ in requests], transport)
+        except Exception as exception:  # pylint: disable=broad-except
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(exception)
+        else:
+            LOGGER.info('submitted %d jobs with %s', len(requests), self._authinfo)
+            for (_, _, future), result in zip(requests, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _get_requests_not_withdrawn(self, requests):
+        """
+        Filter out the withdrawn requests, which are then forgotten.
+
+        :param requests: a list of (calculation, script_filename, Future)
+        :return: the requests that were not withdrawn
+        """
+        withdrawn = set(future for _, _, future in requests if future in self._withdrawn)
+        self._withdrawn.difference_update(withdrawn)
+
+        return [request for request in requests if request[2] not in withdrawn]
+
+    @contextlib.contextmanager
+    def request_submission(self, calculation, script_filename):
+        """
+        Request the submission of the job of a calculation with the next batch.  This is a context
+        manager: if the context is left before the job is submitted, the request is withdrawn.
+
+        :param calculation: The calculation whose job to submit
+        :type calculation: :class:`aiida.orm.calculation.job.JobCalculation`
+        :param script_filename: The job launch script returned by `JobCalculation._presubmit`
+        :return: A future that will resolve to the job id once the job is submitted
+        """
+        request = concurrent.Future()
+        self._submission_requests.append((calculation, script_filename, request))
+
+        if self._submit_handle is None:
+            self._submit_handle = self._loop.call_later(self._window, self._submit_jobs)
+
+        try:
+            yield request
+        finally:
+            # Tornado futures cannot be cancelled, so the request is marked as withdrawn for `_submit_jobs` to skip it
+            if not request.done():
+                self._withdrawn.add(request)
 
 
 class JobManager(object):
@@ -225,9 +476,37 @@ class JobManager(object):
     A manager for jobs on a (usually) remote resource such as a supercomputer
     """
 
-    def __init__(self, transport_queue):
+    def __init__(self, transport_queue, communicator=None, submission_window=0.):
+        """
+        :param transport_queue: A transport queue
+        :type: :class:`aiida.work.transports.TransportQueue`
+        :param communicator: An optional communicator to share the jobs lists with other runners
+        :type communicator: :class:`kiwipy.Communicator`
+        :param submission_window: The time in seconds during which the submissions of jobs with the same
+            authinfo are collected to be submitted together
+        """
         self._transport_queue = transport_queue
+        self._communicator = communicator
+        self._submission_window = submission_window
         self._job_lists = RefObjectStore()
+        self._submission_lists = RefObjectStore()
+
+    @contextlib.contextmanager
+    def request_job_submission(self, authinfo, calculation, script_filename):
+        """
+        Get a future that will resolve to the job id of a calculation once its job is submitted,
+        together with the other jobs whose submission is requested for the same authinfo within
+        the submission window.  This is a context manager so that if the user leaves the context
+        before the batch is submitted, the request is withdrawn and the job is not submitted.
+
+        :return: A future that will resolve to the job id
+        :rtype: :class:`tornado.concurrent.Future`
+        """
+        create = partial(SubmissionsList, authinfo, self._transport_queue, self._submission_window)
+
+        with self._submission_lists.get(authinfo.id, create) as submissions_list:
+            with submissions_list.request_submission(calculation, script_filename) as request:
+                yield request
 
     @contextlib.contextmanager
     def request_job_info_update(self, authinfo, job_id):
@@ -239,7 +518,7 @@ class JobManager(object):
         :rtype: :class:`tornado.concurrent.Future`
         """
         # Define a way to create a JobsList if needed
-        create = partial(JobsList, authinfo, self._transport_queue)
+        create = partial(JobsList, authinfo, self._transport_queue, self._communicator)
 
         with self._job_lists.get(authinfo.id, create) as job_list:
             with job_list.request_job_info_update(job_id) as request:
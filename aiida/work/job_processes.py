@@ -40,6 +40,7 @@ UPLOAD_COMMAND = 'upload'
 SUBMIT_COMMAND = 'submit'
 UPDATE_COMMAND = 'update'
 RETRIEVE_COMMAND = 'retrieve'
+PARSE_COMMAND = 'parse'
 KILL_COMMAND = 'kill'
 
 TRANSPORT_TASK_RETRY_INITIAL_INTERVAL = 20
@@ -101,17 +102,19 @@ def task_upload_job(node, transport_queue, calc_info, script_filename, cancellab
 
 
 @coroutine
-def task_submit_job(node, transport_queue, calc_info, script_filename, cancellable):
+def task_submit_job(node, job_manager, calc_info, script_filename, cancellable):  # pylint: disable=unused-argument
     """
     Transport task that will attempt to submit a job calculation
 
-    The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
-    If all retries fail, the task will raise a TransportTaskException
+    The task will request the submission from the job manager, which submits the jobs requested for the same authinfo
+    within a short window together, with a single command over one transport. The request is wrapped in the
+    exponential_backoff_retry coroutine, which, in case of a caught exception, will retry after an interval that
+    increases exponentially with the number of retries, for a maximum number of retries. If all retries fail, the
+    task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
-    :param transport_queue: the TransportQueue from which to request a Transport
+    :param job_manager: The job manager
+    :type job_manager: :class:`aiida.work.job_calcs.JobManager`
     :param calc_info: the calculation info datastructure returned by `JobCalculation._presubmit`
     :param script_filename: the job launch script returned by `JobCalculation._presubmit`
     :param cancellable: the cancelled flag that will be queried to determine whether the task was cancelled
@@ -131,11 +134,11 @@ def task_submit_job(node, transport_queue, calc_info, script_filename, cancellab
 
     @coroutine
     def do_submit():
-        with transport_queue.request_transport(authinfo) as request:
-            transport = yield cancellable.with_interrupt(request)
+        logger.info('submitting calculation<{}>'.format(node.pk))
+        with job_manager.request_job_submission(authinfo, node, script_filename) as request:
+            job_id = yield cancellable.with_interrupt(request)
 
-            logger.info('submitting calculation<{}>'.format(node.pk))
-            raise Return(execmanager.submit_calculation(node, transport, calc_info, script_filename))
+        raise Return(job_id)
 
     try:
         result = yield exponential_backoff_retry(
@@ -350,7 +353,7 @@ class Waiting(plumpy.Waiting):
                 raise Return(self.submit(calc_info, script_filename))
 
             elif command == SUBMIT_COMMAND:
-                yield self._launch_task(task_submit_job, calculation, transport_queue, *args)
+                yield self._launch_task(task_submit_job, calculation, self.process.runner.job_manager, *args)
                 raise Return(self.scheduler_update())
 
             elif self.data == UPDATE_COMMAND:
@@ -368,6 +371,12 @@ class Waiting(plumpy.Waiting):
                 yield self._launch_task(task_retrieve_job, calculation, transport_queue, temp_folder)
                 raise Return(self.retrieved(temp_folder))
 
+            elif command == PARSE_COMMAND:
+                # Parsing is not a transport task and is not interrupted, such that the outputs are stored only once
+                calculation._set_process_status('Parsing')
+                exit_code = yield self.process.parse(*args)
+                raise Return(self.parsed(exit_code))
+
             else:
                 raise RuntimeError('Unknown waiting command')
 
@@ -452,12 +461,25 @@ class Waiting(plumpy.Waiting):
         Create the next state to go to after retrieving
         :param retrieved_temporary_folder: The temporary folder used in retrieving, this will
             be used in parsing.
+        :return: The appropriate WAITING state
+        """
+        return self.create_state(
+            processes.ProcessState.WAITING,
+            None,
+            msg='Waiting to parse',
+            data=(PARSE_COMMAND, retrieved_temporary_folder))
+
+    def parsed(self, exit_code):
+        """
+        Create the next state to go to after parsing
+        :param exit_code: The exit code returned by the parser
         :return: The appropriate RUNNING state
         """
         return self.create_state(
             processes.ProcessState.RUNNING,
-            self.process.retrieved,
-            retrieved_temporary_folder)
+            self.process.parsed,
+            exit_code.status,
+            exit_code.message)
 
     def interrupt(self, reason):
         """Interrupt the Waiting state by calling interrupt on the transport task InterruptableFuture."""
@@ -652,24 +674,62 @@ class JobProcess(processes.Process):
         try:
             exit_code = execmanager.parse_results(self.calc, retrieved_temporary_folder)
         except Exception:
-            try:
-                self.calc._set_state(calc_states.PARSINGFAILED)
-            except exceptions.ModificationNotAllowed:
-                pass
+            self._set_parsing_failed()
             raise
         finally:
-            # Delete the temporary folder
-            try:
-                shutil.rmtree(retrieved_temporary_folder)
-            except OSError as exception:
-                if exception.errno != 2:
-                    raise
-
-        # Finally link up the outputs and we're done
+            self._remove_retrieved_temporary_folder(retrieved_temporary_folder)
+
+        return self.parsed(exit_code.status, exit_code.message)
+
+    @coroutine
+    def parse(self, retrieved_temporary_folder=None):
+        """
+        Parse a retrieved job calculation with the parser executor of the runner,
+        which may run the parser outside of the event loop.
+
+        :param retrieved_temporary_folder: The temporary folder used in retrieving
+        :return: a future resolving to the exit code returned by the parser
+        """
+        try:
+            exit_code = yield self.runner.parser_executor.parse(self.calc, retrieved_temporary_folder)
+        except Exception:
+            self._set_parsing_failed()
+            raise
+        finally:
+            self._remove_retrieved_temporary_folder(retrieved_temporary_folder)
+
+        raise Return(exit_code)
+
+    def parsed(self, status, message=None):
+        """
+        Link up the outputs of a parsed job calculation.
+
+        :param status: The exit status returned by the parser
+        :param message: The exit message returned by the parser
+        :return: the exit code
+        """
+        from aiida.work import ExitCode
+
         for label, node in self.calc.get_outputs_dict().items():
             self.out(label, node)
 
-        return exit_code
+        return ExitCode(status, message)
+
+    def _set_parsing_failed(self):
+        """Set the calculation in the PARSINGFAILED state, unless its state was already set."""
+        try:
+            self.calc._set_state(calc_states.PARSINGFAILED)
+        except exceptions.ModificationNotAllowed:
+            pass
+
+    @staticmethod
+    def _remove_retrieved_temporary_folder(retrieved_temporary_folder):
+        """Delete the temporary folder used in retrieving, if it still exists."""
+        try:
+            shutil.rmtree(retrieved_temporary_folder)
+        except OSError as exception:
+            if exception.errno != 2:
+                raise
 
 
 class ContinueJobCalculation(JobProcess):
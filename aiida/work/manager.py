@@ -173,6 +173,15 @@ class AiiDAManager(object):
         poll_interval = 0.0 if profile.is_test_profile else profile.get_option('runner.poll.interval')
 
         settings = {'rmq_submit': False, 'poll_interval': poll_interval}
+
+        if not profile.is_test_profile:
+            settings['transport_options'] = {
+                'idle_timeout': profile.get_option('transport.idle_timeout'),
+                'max_transports': profile.get_option('transport.max_per_authinfo'),
+                'keepalive_interval': profile.get_option('transport.keepalive_interval'),
+            }
+            settings['parser_workers'] = profile.get_option('runner.parser_workers')
+            settings['submission_window'] = profile.get_option('runner.submission_window')
         settings.update(kwargs)
 
         if 'communicator' not in settings:
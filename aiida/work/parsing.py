@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""An executor to parse the results of job calculations off the event loop."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import logging
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from tornado import gen
+
+__all__ = ('ParserExecutor',)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParserExecutor(object):
+    """
+    Parse the results of job calculations in a pool of threads, such that a slow
+    parser does not block the event loop of the runner, and with it all the other
+    processes, heartbeats and transport tasks.
+
+    Each parse loads the calculation node again in the worker thread, which therefore
+    uses its own connection to the database, and stores the output nodes there. With
+    `max_workers=0` the parsers are instead run directly on the event loop.
+
+    The time spent parsing is recorded per parser entry point, see `get_statistics`.
+    """
+
+    def __init__(self, max_workers=0):
+        """
+        :param max_workers: the number of threads that run parsers, 0 to run them on the calling thread
+        """
+        self._executor = ThreadPoolExecutor(max_workers) if max_workers > 0 else None
+        self._statistics = {}
+        self._lock = threading.Lock()
+
+    @gen.coroutine
+    def parse(self, calculation, retrieved_temporary_folder=None):
+        """
+        Parse the results of a calculation, see :func:`aiida.daemon.execmanager.parse_results`.
+
+        :param calculation: the calculation in the PARSING state
+        :param retrieved_temporary_folder: the folder with the retrieved temporary files, if any
+        :return: a future resolving to the exit code of the parser
+        """
+        if self._executor is None:
+            exit_code = self._parse(calculation, retrieved_temporary_folder)
+        else:
+            try:
+                exit_code = yield self._executor.submit(self._parse_in_thread, calculation.pk,
+                                                        retrieved_temporary_folder)
+            finally:
+                # The node was modified through another connection to the database
+                calculation._ensure_model_uptodate()
+
+        raise gen.Return(exit_code)
+
+    def get_statistics(self):
+        """
+        Return the statistics of the time spent parsing, per parser entry point.
+
+        :return: a dictionary {parser entry point: {'count': int, 'total': float, 'max': float}},
+            where the times are in seconds
+        """
+        with self._lock:
+            return {name: dict(statistics) for name, statistics in self._statistics.items()}
+
+    def close(self):
+        """Shut down the threads, without waiting for the running parsers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _parse_in_thread(self, pk, retrieved_temporary_folder):
+        """Load the calculation with the connection to the database of this thread and parse its results."""
+        from aiida.backends.utils import release_thread_database_connection
+        from aiida.orm import load_node
+
+        try:
+            return self._parse(load_node(pk), retrieved_temporary_folder)
+        finally:
+            # The session or connection of the thread would otherwise stay open, with its transaction, until the
+            # thread parses again
+            release_thread_database_connection()
+
+    def _parse(self, calculation, retrieved_temporary_folder):
+        """Parse the results of a calculation and record the time it took."""
+        from aiida.daemon import execmanager
+
+        parser_name = calculation.get_parser_name() or 'none'
+        time_start = time.time()
+
+        try:
+            return execmanager.parse_results(calculation, retrieved_temporary_folder)
+        finally:
+            elapsed = time.time() - time_start
+            self._record(parser_name, elapsed)
+            _LOGGER.debug('parsing calculation<%d> with parser %s took %.3f s', calculation.pk, parser_name, elapsed)
+
+    def _record(self, parser_name, elapsed):
+        """Add the time of a parse to the statistics of the parser."""
+        with self._lock:
+            statistics = self._statistics.setdefault(parser_name, {'count': 0, 'total': 0., 'max': 0.})
+            statistics['count'] += 1
+            statistics['total'] += elapsed
+            statistics['max'] = max(statistics['max'], elapsed)
@@ -12,10 +12,13 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import contextlib
+import hashlib
 import logging
 import traceback
 
 import plumpy
+import six
 
 from aiida.utils import serialize
 
@@ -24,6 +27,12 @@ __all__ = 'AiiDAPersister', 'ObjectLoader', 'get_object_loader'
 LOGGER = logging.getLogger(__name__)
 OBJECT_LOADER = None
 
+#: The key of the context in the bundles of workchains, see `aiida.work.workchain.WorkChain`
+CONTEXT_KEY = 'CONTEXT'
+
+#: The prefix of the keys of the checkpoint entries of the items of the context
+CONTEXT_ENTRY_PREFIX = CONTEXT_KEY + '/'
+
 
 def get_object_loader():
     """
@@ -38,12 +47,141 @@ def get_object_loader():
     return OBJECT_LOADER
 
 
+def split_bundle(bundle):
+    """
+    Split a bundle into the entries that are stored separately in the checkpoint table.
+
+    These are its items, except for the context of workchains, whose items are separate entries, such that a step
+    that changes one item of the context only has to write that item.
+
+    :param bundle: the bundle
+    :type bundle: :class:`plumpy.Bundle`
+    :return: a dictionary with the entries
+    """
+    entries = {}
+    for key, value in bundle.items():
+        context_keys = value.keys() if key == CONTEXT_KEY and isinstance(value, dict) else []
+        if context_keys and all(isinstance(name, six.string_types) for name in context_keys):
+            # The context itself is stored empty, to recreate it with the right type
+            entries[key] = value.__class__()
+            for name, item in value.items():
+                entries[CONTEXT_ENTRY_PREFIX + name] = item
+        else:
+            entries[key] = value
+
+    return entries
+
+
+def join_bundle(entries):
+    """
+    Recreate a bundle from the entries returned by `split_bundle`.
+
+    :param entries: a dictionary with the entries
+    :return: the bundle
+    :rtype: :class:`plumpy.Bundle`
+    """
+    bundle = plumpy.Bundle.__new__(plumpy.Bundle)
+    for key, value in entries.items():
+        if not key.startswith(CONTEXT_ENTRY_PREFIX):
+            bundle[key] = value
+
+    for key, value in entries.items():
+        if key.startswith(CONTEXT_ENTRY_PREFIX):
+            bundle[CONTEXT_KEY][key[len(CONTEXT_ENTRY_PREFIX):]] = value
+
+    return bundle
+
+
+@contextlib.contextmanager
+def checkpoint_session():
+    """
+    Return an SQLAlchemy session for the checkpoint table, whatever the backend, and commit at the end.
+
+    The session is created for the occasion, such that the transaction of the session of the thread is left alone.
+    """
+    from aiida.backends import settings
+    from aiida.backends.profile import BACKEND_DJANGO
+
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.orm.implementation.django.dummy_model import get_aldjemy_session
+        session = get_aldjemy_session()
+    else:
+        from sqlalchemy.orm import Session
+        from aiida.backends import sqlalchemy as sa
+        session = Session(bind=sa.engine)
+
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def write_checkpoint_entries(pk, entries, deleted_keys=(), replace=False):
+    """
+    Write entries of the checkpoint of a process in a single transaction.
+
+    :param pk: the pk of the node of the process
+    :param entries: a dictionary with the serialized entries to write, replacing those with the same keys
+    :param deleted_keys: the keys of the entries to delete
+    :param replace: if True, all the other entries of the checkpoint are deleted
+    """
+    from sqlalchemy.sql import bindparam, text
+    from sqlalchemy.types import LargeBinary
+
+    with checkpoint_session() as session:
+        if replace:
+            session.execute(text('DELETE FROM db_dbcheckpoint WHERE dbnode_id = :pk'), {'pk': pk})
+        elif entries or deleted_keys:
+            statement = text('DELETE FROM db_dbcheckpoint WHERE dbnode_id = :pk AND key IN :keys').bindparams(
+                bindparam('keys', expanding=True))
+            session.execute(statement, {'pk': pk, 'keys': list(entries.keys()) + list(deleted_keys)})
+
+        if entries:
+            statement = text('INSERT INTO db_dbcheckpoint (dbnode_id, key, data) VALUES (:pk, :key, :data)').bindparams(
+                bindparam('data', type_=LargeBinary))
+            session.execute(statement, [{'pk': pk, 'key': key, 'data': data} for key, data in entries.items()])
+
+
+def read_checkpoint_entries(pk):
+    """
+    Read the entries of the checkpoint of a process.
+
+    :param pk: the pk of the node of the process
+    :return: a dictionary with the serialized entries, empty if there is no checkpoint
+    """
+    from sqlalchemy.sql import text
+    from sqlalchemy.types import LargeBinary, String
+
+    statement = text('SELECT key, data FROM db_dbcheckpoint WHERE dbnode_id = :pk').columns(
+        key=String, data=LargeBinary)
+    with checkpoint_session() as session:
+        return {key: bytes(data) for key, data in session.execute(statement, {'pk': pk})}
+
+
+def get_entry_digest(data):
+    """Return the digest by which serialized checkpoint entries are compared."""
+    return hashlib.sha256(data).digest()
+
+
 class AiiDAPersister(plumpy.Persister):
     """
     This node is responsible to taking saved process instance states and
     persisting them to the database.
+
+    The checkpoints are stored in the checkpoint table, split into entries by `split_bundle` that are serialized with
+    `aiida.utils.serialize.serialize_binary`. The persister remembers the digests of the entries that it last wrote
+    or read for each process, such that it only writes the entries that changed. Checkpoints that were stored as YAML
+    in the attributes of the node of a process are still loaded.
     """
 
+    def __init__(self):
+        super(AiiDAPersister, self).__init__()
+        self._digests = {}
+
     def save_checkpoint(self, process, tag=None):
         """
         Persist a Process instance
@@ -65,13 +203,38 @@ class AiiDAPersister(plumpy.Persister):
                 process, traceback.format_exc()))
 
         try:
-            process.calc.set_checkpoint(serialize.serialize(bundle))
+            if process.pid not in self._digests and process.calc.checkpoint is not None:
+                # The checkpoint is written whole, so a checkpoint in the attributes is no longer needed
+                process.calc.del_checkpoint()
+            self.save_bundle(process.pid, bundle)
         except Exception:
             raise plumpy.PersistenceError("Failed to store a checkpoint for '{}': {}".format(
                 process, traceback.format_exc()))
 
         return bundle
 
+    def save_bundle(self, pid, bundle):
+        """
+        Write the entries of the bundle that changed since the last checkpoint written or read for the process.
+
+        :param pid: the process id, i.e. the pk of the node of the process
+        :param bundle: the bundle with the process state
+        """
+        entries = {key: serialize.serialize_binary(value) for key, value in split_bundle(bundle).items()}
+        digests = {key: get_entry_digest(data) for key, data in entries.items()}
+
+        # Without previous digests, the entries in the table are unknown and the whole checkpoint is replaced
+        previous = self._digests.pop(pid, None)
+        if previous is None:
+            write_checkpoint_entries(pid, entries, replace=True)
+        else:
+            changed = {key: data for key, data in entries.items() if previous.get(key, None) != digests[key]}
+            deleted = [key for key in previous if key not in entries]
+            write_checkpoint_entries(pid, changed, deleted)
+
+        # Only set after a successful write, such that a failure leads to the whole checkpoint being written again
+        self._digests[pid] = digests
+
     def load_checkpoint(self, pid, tag=None):
         """
         Load a process from a persisted checkpoint by its process id
@@ -88,6 +251,25 @@ class AiiDAPersister(plumpy.Persister):
         if tag is not None:
             raise NotImplementedError('Checkpoint tags not supported yet')
 
+        try:
+            entries = read_checkpoint_entries(pid)
+        except Exception:
+            raise plumpy.PersistenceError("Failed to load the checkpoint for process<{}>: {}".format(
+                pid, traceback.format_exc()))
+
+        if entries:
+            try:
+                bundle = join_bundle({key: serialize.deserialize_binary(data) for key, data in entries.items()})
+            except Exception:
+                raise plumpy.PersistenceError("Failed to load the checkpoint for process<{}>: {}".format(
+                    pid, traceback.format_exc()))
+
+            self._digests[pid] = {key: get_entry_digest(data) for key, data in entries.items()}
+            return bundle
+
+        # Fall back to a checkpoint stored in the attributes by a previous version
+        self._digests.pop(pid, None)
+
         try:
             calculation = load_node(pid)
         except (MultipleObjectsError, NotExistent):
@@ -136,6 +318,9 @@ class AiiDAPersister(plumpy.Persister):
         """
         from aiida.orm import load_node
 
+        self._digests.pop(pid, None)
+        write_checkpoint_entries(pid, {}, replace=True)
+
         calc = load_node(pid)
         calc.del_checkpoint()
 
@@ -21,6 +21,7 @@ from aiida.orm import load_node, load_workflow
 from aiida.work.processes import instantiate_process
 from . import job_calcs
 from . import futures
+from . import parsing
 from . import transports
 from . import utils
 
@@ -40,7 +41,8 @@ class Runner(object):
     _controller = None
     _closed = False
 
-    def __init__(self, poll_interval=0, loop=None, communicator=None, rmq_submit=False, persister=None):
+    def __init__(self, poll_interval=0, loop=None, communicator=None, rmq_submit=False, persister=None,
+                 transport_options=None, parser_workers=0, submission_window=0):
         """
         Construct a new runner
 
@@ -52,6 +54,12 @@ class Runner(object):
         :param rmq_submit: if True, processes will be submitted to RabbitMQ, otherwise they will be scheduled here
         :param persister: the persister to use to persist processes
         :type persister: :class:`plumpy.Persister`
+        :param transport_options: keyword arguments for the transport queue, see
+            :class:`aiida.work.transports.TransportQueue`
+        :param parser_workers: the number of threads that parse the results of job calculations,
+            if 0 they are parsed on the event loop
+        :param submission_window: the time in seconds during which the submissions of jobs to the same computer
+            and user are collected, to submit them together
         """
         assert not (rmq_submit and persister is None), \
             'Must supply a persister if you want to submit using communicator'
@@ -59,8 +67,8 @@ class Runner(object):
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop()
         self._poll_interval = poll_interval
         self._rmq_submit = rmq_submit
-        self._transport = transports.TransportQueue(self._loop)
-        self._job_manager = job_calcs.JobManager(self._transport)
+        self._transport = transports.TransportQueue(self._loop, **(transport_options or {}))
+        self._parser_executor = parsing.ParserExecutor(parser_workers)
         self._persister = persister
 
         if communicator is not None:
@@ -70,6 +78,8 @@ class Runner(object):
             LOGGER.warning('Disabling RabbitMQ submission, no communicator provided')
             self._rmq_submit = False
 
+        self._job_manager = job_calcs.JobManager(self._transport, self._communicator, submission_window)
+
     def __enter__(self):
         return self
 
@@ -108,6 +118,10 @@ class Runner(object):
     def job_manager(self):
         return self._job_manager
 
+    @property
+    def parser_executor(self):
+        return self._parser_executor
+
     @property
     def controller(self):
         return self._controller
@@ -132,6 +146,8 @@ class Runner(object):
         """Close the runner by stopping the loop."""
         assert not self._closed
         self.stop()
+        self._transport.close()
+        self._parser_executor.close()
         self._closed = True
 
     def submit(self, process, *args, **inputs):
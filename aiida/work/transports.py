@@ -28,6 +28,15 @@ class TransportRequest(object):
         super(TransportRequest, self).__init__()
         self.future = concurrent.Future()
         self.count = 0
+        # Handle of the callback that opens the transport
+        self.open_handle = None
+        # Handles of the callbacks scheduled while the transport is open but not used
+        self.idle_handles = []
+
+    @property
+    def is_open(self):
+        """ Whether the transport of this request was opened successfully """
+        return self.future.done() and self.future.exception() is None
 
 
 class TransportQueue(object):
@@ -40,15 +49,29 @@ class TransportQueue(object):
     it will open the transport and give it to all the clients that asked for it
     up to that point.  This way opening of transports (a costly operation) can
     be minimised.
+
+    Open transports are shared by all the clients that request one for the same
+    authinfo.  A new transport is only opened if all the open ones are in use and
+    there are less than `max_transports` of them.  Optionally, a transport that
+    is no longer used is kept open for `idle_timeout` seconds, such that clients
+    requesting it in the meantime get it immediately.  While idle, its connection
+    is checked every `keepalive_interval` seconds, which also keeps it alive, and
+    it is discarded if it was lost.
     """
     AuthInfoEntry = namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, idle_timeout=0, max_transports=1, keepalive_interval=0):
         """
         :param loop: The event loop to use, will use `tornado.ioloop.IOLoop.current()` if not supplied
         :type loop: :class:`tornado.ioloop.IOLoop`
+        :param idle_timeout: seconds an unused transport is kept open, if 0 it is closed as soon as it is unused
+        :param max_transports: maximum number of transports that are open at the same time for each authinfo
+        :param keepalive_interval: seconds between the checks of the connection of idle transports, 0 to disable
         """
         self._loop = loop if loop is not None else ioloop.IOLoop.current()
+        self._idle_timeout = idle_timeout
+        self._max_transports = max(max_transports, 1)
+        self._keepalive_interval = keepalive_interval
         self._transport_requests = {}
 
     def loop(self):
@@ -71,35 +94,7 @@ class TransportQueue(object):
         :param authinfo: The authinfo to be used to get transport
         :return: A future that can be yielded to give the transport
         """
-        open_callback_handle = None
-        transport_request = self._transport_requests.get(authinfo.id, None)
-
-        if transport_request is None:
-            # There is no existing request for this transport (i.e. on this authinfo)
-            transport_request = TransportRequest()
-            self._transport_requests[authinfo.id] = transport_request
-
-            transport = authinfo.get_transport()
-            safe_open_interval = transport.get_safe_open_interval()
-
-            def do_open():
-                """ Actually open the transport """
-                if transport_request.count > 0:
-                    # The user still wants the transport so open it
-                    _LOGGER.debug('Transport request opening transport for %s', authinfo)
-                    try:
-                        transport.open()
-                    except Exception as exception:  # pylint: disable=broad-except
-                        _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
-                        transport_request.future.set_exception(exception)
-
-                        # Cleanup of the stale TransportRequest with the excepted transport future
-                        self._transport_requests.pop(authinfo.id, None)
-                    else:
-                        transport_request.future.set_result(transport)
-
-            # Save the handle so that we can cancel the callback if the user no longer wants it
-            open_callback_handle = self._loop.call_later(safe_open_interval, do_open)
+        transport_request = self._get_transport_request(authinfo)
 
         try:
             transport_request.count += 1
@@ -115,10 +110,143 @@ class TransportQueue(object):
             assert transport_request.count >= 0, "Transport request count dropped below 0!"
             # Check if there are no longer any users that want the transport
             if transport_request.count == 0:
-                if transport_request.future.done():
-                    _LOGGER.debug('Transport request closing transport for %s', authinfo)
-                    transport_request.future.result().close()
-                elif open_callback_handle is not None:
-                    self._loop.remove_timeout(open_callback_handle)
+                if transport_request.is_open and self._idle_timeout > 0:
+                    self._keep_idle(authinfo, transport_request)
+                else:
+                    self._discard(authinfo, transport_request)
+
+    def close(self):
+        """ Close all the transports that are kept open while idle """
+        for authinfo_id, transport_requests in list(self._transport_requests.items()):
+            for transport_request in list(transport_requests):
+                if transport_request.count == 0:
+                    self._discard(authinfo_id, transport_request)
+
+    def _get_transport_request(self, authinfo):
+        """
+        Return the request of an open (or opening) transport that can be shared, or create a new one.
+
+        :param authinfo: The authinfo to be used to get transport
+        :return: the transport request
+        """
+        transport_requests = self._transport_requests.setdefault(authinfo.id, [])
+
+        # Health check of the transports that were idle, their connection may have been lost in the meantime
+        for transport_request in list(transport_requests):
+            if transport_request.count == 0 and transport_request.is_open:
+                if not transport_request.future.result().is_alive():
+                    _LOGGER.debug('Transport request discarding dead transport for %s', authinfo)
+                    self._discard(authinfo, transport_request)
+
+        idle = [request for request in transport_requests if request.count == 0 and request.is_open]
+        if idle:
+            self._cancel_idle_handles(idle[0])
+            return idle[0]
+
+        opening = [request for request in transport_requests if not request.future.done()]
+        if opening:
+            return opening[0]
+
+        if len(transport_requests) >= self._max_transports:
+            return min(transport_requests, key=lambda request: request.count)
+
+        return self._open_transport(authinfo)
+
+    def _open_transport(self, authinfo):
+        """
+        Create a new transport request and schedule the opening of its transport after the safe open interval.
 
-                self._transport_requests.pop(authinfo.id, None)
+        :param authinfo: The authinfo to be used to get transport
+        :return: the new transport request
+        """
+        transport_request = TransportRequest()
+        self._transport_requests.setdefault(authinfo.id, []).append(transport_request)
+
+        transport = authinfo.get_transport()
+        safe_open_interval = transport.get_safe_open_interval()
+
+        def do_open():
+            """ Actually open the transport """
+            transport_request.open_handle = None
+            if transport_request.count > 0:
+                # The user still wants the transport so open it
+                _LOGGER.debug('Transport request opening transport for %s', authinfo)
+                try:
+                    transport.open()
+                except Exception as exception:  # pylint: disable=broad-except
+                    _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
+                    transport_request.future.set_exception(exception)
+
+                    # Cleanup of the stale TransportRequest with the excepted transport future
+                    self._remove(authinfo.id, transport_request)
+                else:
+                    transport_request.future.set_result(transport)
+
+        # Save the handle so that we can cancel the callback if the user no longer wants it
+        transport_request.open_handle = self._loop.call_later(safe_open_interval, do_open)
+
+        return transport_request
+
+    def _keep_idle(self, authinfo, transport_request):
+        """
+        Keep an unused transport open, close it after the idle timeout and check its connection periodically.
+
+        :param authinfo: The authinfo of the transport
+        :param transport_request: the transport request of the unused transport
+        """
+
+        def close():
+            """ Close the transport that was not requested during the idle timeout """
+            _LOGGER.debug('Transport request closing idle transport for %s', authinfo)
+            self._discard(authinfo, transport_request)
+
+        def keepalive():
+            """ Check the connection of the idle transport and discard it if it was lost """
+            if transport_request.future.result().is_alive():
+                transport_request.idle_handles.append(self._loop.call_later(self._keepalive_interval, keepalive))
+            else:
+                _LOGGER.debug('Transport request discarding dead transport for %s', authinfo)
+                self._discard(authinfo, transport_request)
+
+        transport_request.idle_handles.append(self._loop.call_later(self._idle_timeout, close))
+        if 0 < self._keepalive_interval < self._idle_timeout:
+            transport_request.idle_handles.append(self._loop.call_later(self._keepalive_interval, keepalive))
+
+    def _discard(self, authinfo, transport_request):
+        """
+        Close the transport of an unused transport request, or cancel its opening, and forget about it.
+
+        :param authinfo: The authinfo, or its id, of the transport
+        :param transport_request: the unused transport request
+        """
+        self._cancel_idle_handles(transport_request)
+
+        if transport_request.open_handle is not None:
+            self._loop.remove_timeout(transport_request.open_handle)
+            transport_request.open_handle = None
+
+        if transport_request.is_open:
+            _LOGGER.debug('Transport request closing transport for %s', authinfo)
+            transport = transport_request.future.result()
+            try:
+                transport.close()
+            except Exception:  # pylint: disable=broad-except
+                if transport.is_alive():
+                    raise
+                # Closing a transport whose connection was lost can fail, it is discarded anyway
+
+        self._remove(getattr(authinfo, 'id', authinfo), transport_request)
+
+    def _remove(self, authinfo_id, transport_request):
+        """ Remove a transport request from the pool of its authinfo """
+        transport_requests = self._transport_requests.get(authinfo_id, [])
+        if transport_request in transport_requests:
+            transport_requests.remove(transport_request)
+        if not transport_requests:
+            self._transport_requests.pop(authinfo_id, None)
+
+    def _cancel_idle_handles(self, transport_request):
+        """ Cancel the callbacks scheduled for a transport request that is about to be used or discarded """
+        for handle in transport_request.idle_handles:
+            self._loop.remove_timeout(handle)
+        transport_request.idle_handles = []
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the checkpoints of the `AiiDAPersister` against the YAML checkpoints stored in the attributes of the node.
+
+The bundle is a synthetic workchain state with a large context, and each step changes a single item of the context.
+Run it against a test profile, since it creates nodes in the database::
+
+    python utils/benchmarks/checkpoints.py --profile test_profile --number 1000 --steps 20
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import time
+
+import click
+
+
+def create_bundle(number):
+    """Create a bundle with a context of `number` items, referencing stored nodes like the context of a workchain."""
+    import plumpy
+    from aiida.common.extendeddicts import AttributeDict
+    from aiida.orm.data.int import Int
+    from aiida.work.persistence import CONTEXT_KEY
+
+    context = AttributeDict()
+    for index in range(number):
+        context['item_{}'.format(index)] = {
+            'node': Int(index).store(),
+            'values': list(range(10)),
+            'label': 'iteration {}'.format(index),
+        }
+
+    bundle = plumpy.Bundle.__new__(plumpy.Bundle)
+    bundle[CONTEXT_KEY] = context
+    bundle['_state'] = {'name': 'running', 'step': 0}
+    return bundle
+
+
+def time_yaml(calculation, bundle, steps):
+    """Return the time per step and the size of checkpoints serialized to YAML and stored in the attributes."""
+    from aiida.utils import serialize
+    from aiida.work.persistence import CONTEXT_KEY
+
+    start = time.time()
+    for step in range(steps):
+        bundle[CONTEXT_KEY]['item_0']['values'].append(step)
+        checkpoint = serialize.serialize(bundle)
+        calculation.set_checkpoint(checkpoint)
+    elapsed = (time.time() - start) / steps
+
+    start = time.time()
+    serialize.deserialize(calculation.checkpoint)
+    elapsed_load = time.time() - start
+
+    calculation.del_checkpoint()
+
+    return elapsed, elapsed_load, len(checkpoint.encode('utf-8'))
+
+
+def time_persister(calculation, bundle, steps):
+    """Return the time per step and the size of checkpoints written by the persister, with and without deltas."""
+    from aiida.utils import serialize
+    from aiida.work.persistence import AiiDAPersister, CONTEXT_KEY, split_bundle
+
+    persister = AiiDAPersister()
+
+    start = time.time()
+    for step in range(steps):
+        bundle[CONTEXT_KEY]['item_0']['values'].append(step)
+        persister.save_bundle(calculation.pk, bundle)
+        persister._digests.clear()  # pylint: disable=protected-access
+    elapsed_full = (time.time() - start) / steps
+
+    persister.save_bundle(calculation.pk, bundle)
+    start = time.time()
+    for step in range(steps):
+        bundle[CONTEXT_KEY]['item_0']['values'].append(step)
+        persister.save_bundle(calculation.pk, bundle)
+    elapsed_delta = (time.time() - start) / steps
+
+    start = time.time()
+    AiiDAPersister().load_checkpoint(calculation.pk)
+    elapsed_load = time.time() - start
+
+    persister.delete_checkpoint(calculation.pk)
+
+    size = sum(len(serialize.serialize_binary(value)) for value in split_bundle(bundle).values())
+    return elapsed_full, elapsed_delta, elapsed_load, size
+
+
+@click.command()
+@click.option('-p', '--profile', type=click.STRING, default=None, help='The profile to run the benchmark on.')
+@click.option('-n', '--number', type=click.INT, default=1000, show_default=True, help='The number of context items.')
+@click.option('-s', '--steps', type=click.INT, default=20, show_default=True, help='The number of checkpoints.')
+def benchmark_checkpoints(profile, number, steps):
+    """Compare the time to save STEPS checkpoints of a workchain with a context of NUMBER items."""
+    from aiida import load_dbenv
+    load_dbenv(profile=profile)
+
+    from aiida.orm.calculation.work import WorkCalculation
+
+    calculation = WorkCalculation().store()
+    bundle = create_bundle(number)
+
+    yaml_save, yaml_load, yaml_size = time_yaml(calculation, bundle, steps)
+    full_save, delta_save, binary_load, binary_size = time_persister(calculation, bundle, steps)
+
+    click.echo('{:20} {:>12} {:>12} {:>12}'.format('', 'save/step', 'load', 'size'))
+    click.echo('{:20} {:10.4f} s {:10.4f} s {:10d} B'.format('yaml attribute', yaml_save, yaml_load, yaml_size))
+    click.echo('{:20} {:10.4f} s {:>12} {:10d} B'.format('binary full', full_save, '', binary_size))
+    click.echo('{:20} {:10.4f} s {:10.4f} s'.format('binary delta', delta_save, binary_load))
+    click.echo('speedup of the delta: {:8.1f}x'.format(yaml_save / delta_save))
+
+
+if __name__ == '__main__':
+    benchmark_checkpoints()  # pylint: disable=no-value-for-parameter
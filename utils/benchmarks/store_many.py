@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the bulk storage of nodes through `Backend.store_many` against a loop of `Node.store` calls.
+
+Run it against a test profile, since it creates nodes in the database::
+
+    python utils/benchmarks/store_many.py --profile test_profile --number 10000
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import time
+
+import click
+
+
+def create_outputs(calculation, number):
+    """Create `number` unstored Int nodes, linked as outputs of the given calculation."""
+    from aiida.common.links import LinkType
+    from aiida.orm.data.int import Int
+
+    outputs = []
+    for index in range(number):
+        node = Int(index)
+        node.add_link_from(calculation, label='output_{}'.format(index), link_type=LinkType.CREATE)
+        outputs.append(node)
+
+    return outputs
+
+
+@click.command()
+@click.option('-p', '--profile', type=click.STRING, default=None, help='The profile to run the benchmark on.')
+@click.option('-n', '--number', type=click.INT, default=1000, show_default=True, help='The number of nodes to store.')
+def benchmark_store_many(profile, number):
+    """Compare the time to store NUMBER output nodes one by one and in bulk."""
+    from aiida import load_dbenv
+    load_dbenv(profile=profile)
+
+    from aiida.orm.backends import construct_backend
+    from aiida.orm.calculation import Calculation
+
+    backend = construct_backend()
+    calculation = Calculation().store()
+
+    outputs = create_outputs(calculation, number)
+    start = time.time()
+    for node in outputs:
+        node.store()
+    time_loop = time.time() - start
+
+    outputs = create_outputs(calculation, number)
+    start = time.time()
+    backend.store_many(outputs)
+    time_bulk = time.time() - start
+
+    click.echo('store() loop: {:8.3f} s ({:8.1f} nodes/s)'.format(time_loop, number / time_loop))
+    click.echo('store_many:   {:8.3f} s ({:8.1f} nodes/s)'.format(time_bulk, number / time_bulk))
+    click.echo('speedup:      {:8.1f}x'.format(time_loop / time_bulk))
+
+
+if __name__ == '__main__':
+    benchmark_store_many()  # pylint: disable=no-value-for-parameter
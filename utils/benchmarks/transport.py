@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the transfer of folders with many small files through `SshTransport` against `LocalTransport`.
+
+It needs a SSH server accepting key based logins that shares the temporary folder of this machine, by default
+the one on localhost, but it does not need a profile::
+
+    python utils/benchmarks/transport.py --machine localhost --number 200
+
+To emulate a high latency link to localhost, add a delay to the loopback interface, e.g. with
+``tc qdisc add dev lo root netem delay 25ms``.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import time
+
+import click
+
+
+def create_folder(path, number, size):
+    """Create a folder with `number` files of `size` bytes, spread over ten subfolders."""
+    os.mkdir(path)
+    for index in range(number):
+        subfolder = os.path.join(path, 'sub{}'.format(index % 10))
+        if not os.path.isdir(subfolder):
+            os.mkdir(subfolder)
+        with open(os.path.join(subfolder, 'file{}'.format(index)), 'wb') as handle:
+            handle.write(os.urandom(size))
+
+
+def time_operations(transport, source, workdir):
+    """Return the time taken by puttree, listdir_withattributes and gettree of the source folder."""
+    timings = []
+    remote = os.path.join(workdir, 'remote')
+    local = os.path.join(workdir, 'local')
+
+    start = time.time()
+    transport.puttree(source, remote)
+    timings.append(time.time() - start)
+
+    start = time.time()
+    transport.listdir_withattributes(os.path.join(remote, 'sub0'))
+    timings.append(time.time() - start)
+
+    start = time.time()
+    transport.gettree(remote, local)
+    timings.append(time.time() - start)
+
+    transport.rmtree(remote)
+    shutil.rmtree(local)
+
+    return timings
+
+
+def time_putfile_loop(transport, source, workdir):
+    """Return the time taken to put the files of the source folder one by one, as done before puttree batching."""
+    remote = os.path.join(workdir, 'remote')
+
+    start = time.time()
+    transport.mkdir(remote)
+    for dirpath, _, filenames in os.walk(source):
+        relpath = os.path.relpath(dirpath, source)
+        if relpath != '.':
+            transport.mkdir(os.path.join(remote, relpath))
+        for filename in filenames:
+            transport.putfile(os.path.join(dirpath, filename), os.path.join(remote, relpath, filename))
+    elapsed = time.time() - start
+
+    transport.rmtree(remote)
+
+    return elapsed
+
+
+@click.command()
+@click.option('-m', '--machine', type=click.STRING, default='localhost', show_default=True, help='The SSH server.')
+@click.option('-n', '--number', type=click.INT, default=200, show_default=True, help='The number of files.')
+@click.option('-s', '--size', type=click.INT, default=1024, show_default=True, help='The size of the files in bytes.')
+def benchmark_transport(machine, number, size):
+    """Compare the transfer of a folder with NUMBER files with the local and the ssh transport."""
+    from aiida.transport.plugins.local import LocalTransport
+    from aiida.transport.plugins.ssh import SshTransport
+
+    workdir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(workdir, 'source')
+        create_folder(source, number, size)
+
+        with LocalTransport() as transport:
+            time_local = time_operations(transport, source, workdir)
+
+        with SshTransport(machine=machine, load_system_host_keys=True, key_policy='AutoAddPolicy') as transport:
+            time_ssh = time_operations(transport, source, workdir)
+            time_loop = time_putfile_loop(transport, source, workdir)
+    finally:
+        shutil.rmtree(workdir)
+
+    click.echo('{:24} {:>10} {:>10}'.format('', 'local', 'ssh'))
+    for label, local, ssh in zip(['puttree', 'listdir_withattributes', 'gettree'], time_local, time_ssh):
+        click.echo('{:24} {:8.3f} s {:8.3f} s'.format(label, local, ssh))
+    click.echo('{:24} {:>10} {:8.3f} s'.format('putfile loop', '', time_loop))
+
+
+if __name__ == '__main__':
+    benchmark_transport()  # pylint: disable=no-value-for-parameter